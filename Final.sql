@@ -113,3 +113,107 @@ create table humid (
     sensor_digit int not null,
     humid_date datetime default now()
 );
+
+-- 이하 서비스 테이블/전문 검색 인덱스는 backend/app/db/migrations.py 3번과 같음 (기존 DB는 python migrate.py up)
+
+-- 습도 시간/일 집계 (MQTT 적재 시 증분 갱신, avg = sum_humidity / cnt)
+create table humid_hourly (
+	device_id int not null,
+    bucket datetime not null,
+    min_humidity int not null,
+    max_humidity int not null,
+    sum_humidity bigint not null,
+    cnt int not null,
+    last_humidity int not null,
+    last_at datetime not null,
+    primary key (device_id, bucket)
+);
+create table humid_daily (
+	device_id int not null,
+    bucket date not null,
+    min_humidity int not null,
+    max_humidity int not null,
+    sum_humidity bigint not null,
+    cnt int not null,
+    last_humidity int not null,
+    last_at datetime not null,
+    primary key (device_id, bucket)
+);
+
+-- 자동 감지된 물주기 이벤트 (MQTT 적재 시 기록, (device_id, event_at) 중복 무시)
+create table watering_event (
+	event_id int auto_increment primary key,
+    device_id int not null,
+    event_at datetime not null,
+    humidity_before float not null,
+    humidity_after float not null,
+    increase_pct float not null,
+    created_at datetime default now(),
+    unique key uq_watering_event (device_id, event_at)
+);
+
+-- 등록된 습도 센서 (설치 시 device_id만 등록, 처음 연결한 사용자가 소유자가 됨, migrations.py 4번)
+create table device (
+	device_id int primary key,
+    owner_user_id varchar(100),
+    registered_at datetime default now(),
+    key idx_device_owner (owner_user_id),
+    foreign key (owner_user_id) references users(user_id) on delete set null on update cascade
+);
+-- 공통 센서 (DEFAULT_DEVICE_ID 기본값, 소유자 없음)
+insert into device (device_id) values (1);
+
+-- 식물 ↔ 습도 센서 매핑 (매핑이 없는 식물은 공통 센서 DEFAULT_DEVICE_ID 사용)
+create table plant_device (
+	plant_id int primary key,
+    device_id int not null,
+    registered_at datetime default now(),
+    key idx_plant_device_device (device_id),
+    foreign key (plant_id) references user_plant(plant_id) on delete cascade on update cascade,
+    -- 등록된 센서만 연결 가능 (migrations.py 6번)
+    constraint fk_plant_device_device foreign key (device_id) references device(device_id) on update cascade
+);
+create index idx_humid_device_date on humid (device_id, humid_date);
+
+-- 일기 전문 검색 (한글 부분 일치를 위한 ngram 파서, ngram_token_size 기본값 2)
+alter table diary add fulltext index ft_diary_text (user_title, user_content, hashtag) with parser ngram;
+
+-- 일기 해시태그 인덱스 (diary.hashtag를 태그 단위로 분리, 태그 필터/통계/자동완성용)
+create table diary_tag (
+	user_id varchar(100) not null,
+    tag varchar(100) not null,
+    diary_id int not null,
+    primary key (user_id, tag, diary_id),
+    key idx_diary_tag_diary (diary_id),
+    foreign key (diary_id) references diary(diary_id) on delete cascade on update cascade
+);
+
+-- 일기 식물 답장 생성 대기 작업 (backend/app/services/diary_reply.py, 답장 저장 시 삭제, 재시도/점유 컬럼은 migrations.py 5번)
+create table diary_reply_job (
+	diary_id int primary key,
+    seq int not null default 1,
+    species varchar(100),
+    moisture float,
+    attempts int not null default 0,
+    last_error varchar(500),
+    requested_at datetime default now(),
+    next_attempt_at datetime not null default now(),
+    claimed_until datetime null,
+    key idx_diary_reply_job_next (next_attempt_at),
+    foreign key (diary_id) references diary(diary_id) on delete cascade on update cascade
+);
+
+-- 조회 패턴 인덱스 (backend/app/db/migrations.py 2번과 같음, 기존 DB는 python migrate.py up)
+create index idx_diary_user_created on diary (user_id, created_at);
+create index idx_diary_plant_created on diary (plant_id, created_at);
+create index idx_user_plant_user_meet on user_plant (user_id, meet_day);
+create index idx_user_plant_pest_plant_date on user_plant_pest (plant_id, pest_date);
+create index idx_img_address_diary on img_address (diary_id, img_url);
+create index idx_img_address_plant on img_address (plant_id, img_url);
+
+-- 마이그레이션 적용 기록 (Final.sql로 새로 만든 DB는 migrate.py up 시 이미 있는 인덱스를 건너뛰고 기록만 남김)
+create table schema_migrations (
+	version int primary key,
+    name varchar(200) not null,
+    applied_at datetime default now()
+);
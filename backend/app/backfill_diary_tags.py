@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일기 해시태그 인덱스(diary_tag) 백필 스크립트
+
+새로 작성/수정되는 일기는 저장 시 diary_tag가 함께 갱신되므로,
+태그 인덱스 도입 이전에 작성된 일기의 hashtag를 옮길 때 한 번 실행합니다.
+(일기별로 태그를 교체하므로 여러 번 실행해도 결과는 같습니다.)
+
+사용법:
+    python backfill_diary_tags.py          # 500건씩 처리
+    python backfill_diary_tags.py 1000     # 배치 크기 지정
+"""
+
+import asyncio
+import sys
+import os
+
+# 백엔드 앱 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db.pool import init_pool, close_pool
+from repositories.diary_tag import backfill_diary_tags
+
+
+async def main():
+    """메인 함수"""
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"🏷️  일기 해시태그 백필 시작 (배치 {batch_size}건)")
+    print("=" * 50)
+
+    await init_pool()
+    try:
+        processed = await backfill_diary_tags(batch_size)
+        print(f"   📊 일기 {processed}건 처리")
+    except Exception as e:
+        print(f"❌ 백필 오류: {e}")
+    finally:
+        await close_pool()
+
+    print("\n✅ 백필 완료!")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+습도 집계(humid_hourly / humid_daily) 백필 스크립트
+
+집계 테이블은 MQTT 적재 시 증분 갱신되므로, 집계 도입 이전 데이터나
+spill 복구 등으로 어긋난 구간을 원본 humid 테이블로부터 다시 계산할 때 사용합니다.
+
+원본 보존 기간(HUMID_RAW_RETENTION_DAYS)이 지나 원본이 삭제된 날의 집계는 건드리지 않습니다.
+(그 구간은 집계가 유일한 기록이므로, 더 이른 날짜를 지정해도 원본이 온전한 날부터 재계산)
+
+MQTT 적재를 멈춘 상태(오프라인)에서 실행하세요. 재계산하는 동안 집계 잠금(GET_LOCK)을 잡으므로
+서버가 떠 있어도 집계가 중복되지는 않지만, 그동안 적재 배치는 실패해 재시도/spill 파일로 밀립니다.
+
+사용법:
+    python backfill_humid_rollups.py              # 원본이 남아 있는 구간 전체 재계산
+    python backfill_humid_rollups.py 2025-09-01   # 해당 날짜부터 재계산
+"""
+
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+# 백엔드 앱 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db.pool import init_pool, close_pool
+from repositories.humid import raw_complete_since, rebuild_rollups
+
+
+async def main():
+    """메인 함수"""
+    since = datetime.strptime(sys.argv[1], "%Y-%m-%d") if len(sys.argv) > 1 else None
+
+    floor = raw_complete_since()
+    if floor and (since is None or since < floor):
+        since = floor
+    print("🌡️  습도 집계 백필 시작", f"({since:%Y-%m-%d} 부터)" if since else "(전체)")
+    print("=" * 50)
+
+    await init_pool()
+    try:
+        result = await rebuild_rollups(since)
+        for table, count in result.items():
+            print(f"   📊 {table}: {count}개 버킷 생성")
+    except Exception as e:
+        print(f"❌ 백필 오류: {e}")
+    finally:
+        await close_pool()
+
+    print("\n✅ 백필 완료!")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+조회 패턴 인덱스(마이그레이션 2번) 전후 비교 벤치마크
+
+로컬 MySQL에 벤치마크 전용 DB를 새로 만들고(Final.sql 스키마), 실제와 비슷한 규모의 데이터를 넣은 뒤
+주요 API가 쓰는 저장소 함수를 인덱스 없이/있이 각각 반복 실행해 중앙값과 p95를 비교합니다.
+DB_HOST/DB_USER/DB_PASSWORD는 .env 설정을 사용하며, DB 이름은 운영 DB와 겹치지 않도록 "bench"가 들어가야 합니다.
+
+사용법:
+    python benchmark_indexes.py                          # pland_bench, 기본 규모
+    python benchmark_indexes.py --users 2000 --runs 30   # 규모/반복 횟수 지정
+    python benchmark_indexes.py --db pland_bench --keep  # 끝난 뒤 DB 유지
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+
+# 백엔드 앱 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import aiomysql
+
+from core.config import settings
+from db.pool import init_pool, close_pool, get_db_connection
+from db.instrument import query_metrics
+from db.migrations import migrate_down, migrate_up
+from repositories.dashboard import get_user_plants_with_status
+from repositories.diary_list import get_diary_stats, get_user_diary_list
+from repositories.humid import get_humidity_series, get_latest_humidity_rows
+from repositories.plant_detail import get_plant_diaries, get_plant_pest_records
+from repositories.plant_registration import get_user_plants
+from services.user_stats import user_stats
+from utils.pagination import count_cache
+
+FINAL_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Final.sql")
+SPECIES = ["몬스테라", "산세베리아", "스투키", "금전수", "홍콩야자", "스파티필럼", "고무나무", "행운목"]
+INSERT_CHUNK = 5000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="조회 패턴 인덱스 전후 비교")
+    parser.add_argument("--db", default="pland_bench")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--plants", type=int, default=5, help="사용자당 식물 수")
+    parser.add_argument("--diaries", type=int, default=200, help="사용자당 일기 수")
+    parser.add_argument("--pests", type=int, default=3, help="식물당 병해충 기록 수")
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--humid", type=int, default=20000, help="센서당 습도 행 수")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="끝난 뒤 벤치마크 DB 유지")
+    return parser.parse_args()
+
+
+async def create_database(name: str) -> None:
+    """벤치마크 DB를 새로 만들고 Final.sql 스키마 적용"""
+    conn = await aiomysql.connect(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD.get_secret_value(),
+        charset="utf8mb4",
+        autocommit=True,
+    )
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+            await cursor.execute(f"CREATE DATABASE `{name}` DEFAULT CHARACTER SET utf8mb4")
+            await cursor.execute(f"USE `{name}`")
+            # Final.sql은 참조 테이블보다 먼저 만드는 테이블이 있어 외래 키 검사를 잠시 끔
+            await cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            with open(FINAL_SQL, encoding="utf-8") as f:
+                script = "\n".join(line for line in f if not line.strip().startswith("--"))
+            for statement in script.split(";"):
+                statement = statement.strip()
+                head = statement.lower()
+                if not statement or head.startswith(("use ", "delete ", "set sql_safe_updates")):
+                    continue
+                await cursor.execute(statement)
+            await cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    finally:
+        conn.close()
+
+
+async def drop_database(name: str) -> None:
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+
+
+async def insert_rows(cursor, table: str, columns, rows) -> None:
+    placeholders = ", ".join(["%s"] * len(columns))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    for i in range(0, len(rows), INSERT_CHUNK):
+        await cursor.executemany(sql, rows[i:i + INSERT_CHUNK])
+
+
+async def seed(args) -> dict:
+    """사용자/식물/일기/병해충/이미지/습도 데이터 생성"""
+    rng = random.Random(42)
+    today = date.today()
+    now = datetime.now()
+    users = [f"bench_user_{i:05d}" for i in range(args.users)]
+    sample = {"users": users[:: max(1, len(users) // 10)], "plants": {}, "devices": list(range(1, args.devices + 1))}
+
+    async with get_db_connection() as (conn, cursor):
+        await insert_rows(cursor, "users", ("user_id", "user_pw", "email", "hp", "nickname"), [
+            (u, "x", f"{u}@bench.local", f"010{i:08d}", f"벤치{i}") for i, u in enumerate(users)
+        ])
+        await insert_rows(cursor, "pest_wiki", ("pest_name", "symptom", "cure"), [
+            (f"병해충{i}", "증상", "방제") for i in range(20)
+        ])
+        await insert_rows(cursor, "plant_wiki", ("sci_name", "name_jong"), [(s, s) for s in SPECIES])
+        await insert_rows(cursor, "user_plant", ("user_id", "plant_name", "species", "meet_day"), [
+            (u, f"식물{p}", rng.choice(SPECIES),
+             None if rng.random() < 0.1 else today - timedelta(days=rng.randint(0, 1000)))
+            for u in users for p in range(args.plants)
+        ])
+        await conn.commit()
+
+        await cursor.execute("SELECT plant_id, user_id FROM user_plant")
+        plants_by_user = {}
+        for row in await cursor.fetchall():
+            plants_by_user.setdefault(row["user_id"], []).append(row["plant_id"])
+        sample["plants"] = {u: plants_by_user[u] for u in sample["users"]}
+        all_plants = [p for ps in plants_by_user.values() for p in ps]
+
+        await insert_rows(cursor, "plant_device", ("plant_id", "device_id"), [
+            (p, rng.randint(1, args.devices)) for p in all_plants
+        ])
+        await insert_rows(cursor, "user_plant_pest", ("plant_id", "pest_id", "pest_date"), [
+            (p, rng.randint(1, 20), today - timedelta(days=rng.randint(0, 700)))
+            for p in all_plants for _ in range(args.pests)
+        ])
+        await insert_rows(cursor, "img_address", ("plant_id", "img_url"), [
+            (p, f"/media/plants/{p}.jpg") for p in all_plants
+        ])
+        await insert_rows(cursor, "diary", (
+            "user_id", "user_title", "user_content", "hashtag", "plant_id", "hist_watered", "created_at",
+        ), [
+            (u, f"{rng.choice(SPECIES)} 관찰 {d}", "오늘은 잎이 조금 더 자랐다. " * 5, "#관찰",
+             rng.choice(plants_by_user[u]), int(rng.random() < 0.3), today - timedelta(days=rng.randint(0, 730)))
+            for u in users for d in range(args.diaries)
+        ])
+        await conn.commit()
+
+        await cursor.execute("SELECT diary_id FROM diary WHERE diary_id % 3 = 0")
+        await insert_rows(cursor, "img_address", ("diary_id", "img_url"), [
+            (row["diary_id"], f"/media/diary/{row['diary_id']}.jpg") for row in await cursor.fetchall()
+        ])
+        await insert_rows(cursor, "humid", ("device_id", "humidity", "sensor_digit", "humid_date"), [
+            (device, rng.randint(20, 80), rng.randint(300, 900), now - timedelta(minutes=5 * n))
+            for device in sample["devices"] for n in range(args.humid)
+        ])
+        await conn.commit()
+    return sample
+
+
+def build_cases(sample: dict):
+    """(이름, 비동기 호출 생성 함수) 목록 - 실행마다 표본 사용자/식물/센서를 돌아가며 사용"""
+    users = sample["users"]
+    plants = sample["plants"]
+    devices = sample["devices"]
+    now = datetime.now()
+
+    def user(i):
+        return users[i % len(users)]
+
+    def plant(i):
+        u = user(i)
+        return plants[u][i % len(plants[u])], u
+
+    return [
+        ("일기 목록 1페이지 (+전체 개수)", lambda i: get_user_diary_list(user(i), limit=20)),
+        ("일기 목록 10페이지", lambda i: get_user_diary_list(user(i), page=10, limit=20, include_total=False)),
+        ("일기 통계", lambda i: get_diary_stats(user(i))),
+        ("내 식물 목록", lambda i: get_user_plants(user(i))),
+        ("대시보드", lambda i: get_user_plants_with_status(user(i))),
+        ("식물 상세 일기", lambda i: get_plant_diaries(*plant(i))),
+        ("병해충 기록", lambda i: get_plant_pest_records(*plant(i))),
+        ("최근 습도 7건", lambda i: get_latest_humidity_rows(devices[i % len(devices)], 7)),
+        ("습도 24시간 원본", lambda i: get_humidity_series(devices[i % len(devices)], now - timedelta(hours=24), None, "raw")),
+    ]
+
+
+async def run_cases(cases, runs: int, users) -> dict:
+    """케이스별 실행 시간(ms) 목록 (개수/통계 캐시는 매번 비워 DB 조회 시간만 비교)"""
+    results = {}
+    for name, call in cases:
+        timings = []
+        for i in range(runs + 1):
+            count_cache.clear()
+            for u in users:
+                user_stats.invalidate(u)
+            started = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                await call(i)
+            if i:  # 첫 실행은 워밍업
+                timings.append((time.perf_counter() - started) * 1000)
+        results[name] = timings
+    return results
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return statistics.median(ordered), ordered[max(0, int(len(ordered) * 0.95) - 1)]
+
+
+def print_top_queries(title: str, limit: int = 5) -> None:
+    print(f"\n   [{title}] 총 소요 시간 상위 쿼리")
+    for q in query_metrics.top(limit):
+        print(f"   - {q['total_ms']:>9.1f}ms  x{q['calls']:<4} p95 {q['p95_ms']:>7.1f}ms  {q['fingerprint'][:90]}")
+
+
+async def main():
+    """메인 함수"""
+    args = parse_args()
+    if "bench" not in args.db or args.db == settings.DB_NAME:
+        print("❌ 벤치마크 DB 이름에는 'bench'가 들어가야 하며 운영 DB와 달라야 합니다.")
+        return
+
+    print(f"📊 인덱스 벤치마크 ({args.db}: 사용자 {args.users}, 식물 {args.users * args.plants}, "
+          f"일기 {args.users * args.diaries}, 습도 {args.devices * args.humid}행)")
+    print("=" * 70)
+
+    await create_database(args.db)
+    settings.DB_NAME = args.db
+    await init_pool()
+    try:
+        # Final.sql에 포함된 인덱스를 빼서 "이전" 상태를 만든 뒤 데이터 적재
+        await migrate_up()
+        await migrate_down(1)
+        started = time.perf_counter()
+        sample = await seed(args)
+        print(f"   🌱 데이터 생성 {time.perf_counter() - started:.1f}초")
+        cases = build_cases(sample)
+
+        query_metrics.reset()
+        before = await run_cases(cases, args.runs, sample["users"])
+        print_top_queries("인덱스 없음")
+
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            await migrate_up()
+        print(f"\n   🔧 마이그레이션 2번 적용 {time.perf_counter() - started:.1f}초")
+
+        query_metrics.reset()
+        after = await run_cases(cases, args.runs, sample["users"])
+        print_top_queries("인덱스 적용")
+
+        print(f"\n   {'케이스':<24} {'이전 중앙값':>10} {'이후 중앙값':>10} {'이전 p95':>9} {'이후 p95':>9} {'배율':>7}")
+        for name, _ in cases:
+            b_med, b_p95 = summarize(before[name])
+            a_med, a_p95 = summarize(after[name])
+            ratio = b_med / a_med if a_med else float("inf")
+            print(f"   {name:<24} {b_med:>9.1f}ms {a_med:>9.1f}ms {b_p95:>8.1f}ms {a_p95:>8.1f}ms {ratio:>6.1f}x")
+    except Exception as e:
+        print(f"❌ 벤치마크 오류: {e}")
+    finally:
+        if not args.keep:
+            try:
+                await drop_database(args.db)
+            except Exception as e:
+                print(f"⚠️  벤치마크 DB 삭제 실패: {e}")
+        await close_pool()
+
+    print("\n✅ 벤치마크 완료!")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,20 +16,33 @@ from db.pool import execute_query, execute_one
 async def get_humidity_plant_mapping():
     """습도 정보와 매칭된 식물 조회"""
     try:
-        # 습도 정보 조회 쿼리 (humid 테이블 사용, device_id=1 공통)
+        # 습도 정보 조회 쿼리 (humid + plant_device 센서 매핑)
+        # 센서 1개를 여러 식물이 공유하면 측정값이 식물 수만큼 중복되므로 매핑을 센서별로 먼저 묶음
         query = """
         SELECT 
             h.device_id,
             h.humidity,
             h.sensor_digit,
             h.humid_date,
-            '공통' as plant_id,
-            '모든 식물' as plant_name,
-            '공통 센서' as location,
-            '공통 데이터' as species,
-            '시스템' as user_nickname
+            COALESCE(m.plant_ids, '미연결') as plant_id,
+            COALESCE(m.plant_names, '미연결 센서') as plant_name,
+            m.locations as location,
+            m.species,
+            COALESCE(m.user_nicknames, '시스템') as user_nickname
         FROM humid h
-        WHERE h.device_id = 1
+        LEFT JOIN (
+            SELECT
+                pd.device_id,
+                GROUP_CONCAT(up.plant_id ORDER BY up.plant_id SEPARATOR ', ') as plant_ids,
+                GROUP_CONCAT(up.plant_name ORDER BY up.plant_id SEPARATOR ', ') as plant_names,
+                GROUP_CONCAT(DISTINCT up.location SEPARATOR ', ') as locations,
+                GROUP_CONCAT(DISTINCT up.species SEPARATOR ', ') as species,
+                GROUP_CONCAT(DISTINCT u.nickname SEPARATOR ', ') as user_nicknames
+            FROM plant_device pd
+            JOIN user_plant up ON up.plant_id = pd.plant_id
+            LEFT JOIN users u ON u.user_id = up.user_id
+            GROUP BY pd.device_id
+        ) m ON m.device_id = h.device_id
         ORDER BY h.humid_date DESC
         LIMIT 50
         """
@@ -62,9 +75,8 @@ async def get_humidity_plant_mapping():
         # 최근 24시간 내 데이터
         recent_query = """
         SELECT COUNT(*) as recent_count
-        FROM humid_info hi
-        JOIN device_info di ON hi.device_id = di.device_id
-        WHERE hi.humid_date >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
+        FROM humid h
+        WHERE h.humid_date >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
         """
         recent_result = await execute_one(recent_query)
         recent_count = recent_result['recent_count'] if recent_result else 0
@@ -72,10 +84,9 @@ async def get_humidity_plant_mapping():
         
         # 평균 습도
         avg_query = """
-        SELECT AVG(hi.humidity) as avg_humidity
-        FROM humid_info hi
-        JOIN device_info di ON hi.device_id = di.device_id
-        WHERE hi.humid_date >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+        SELECT AVG(h.humidity) as avg_humidity
+        FROM humid h
+        WHERE h.humid_date >= DATE_SUB(NOW(), INTERVAL 7 DAY)
         """
         avg_result = await execute_one(avg_query)
         if avg_result and avg_result['avg_humidity']:
@@ -89,19 +100,19 @@ async def get_device_plant_summary():
     try:
         query = """
         SELECT 
-            di.device_id,
+            pd.device_id,
             up.plant_name,
             up.species,
             u.nickname as user_nickname,
-            COUNT(hi.humidity) as humidity_count,
-            MAX(hi.humid_date) as last_measurement,
-            AVG(hi.humidity) as avg_humidity
-        FROM device_info di
-        JOIN user_plant up ON di.plant_id = up.plant_id
+            COUNT(h.humidity) as humidity_count,
+            MAX(h.humid_date) as last_measurement,
+            AVG(h.humidity) as avg_humidity
+        FROM plant_device pd
+        JOIN user_plant up ON pd.plant_id = up.plant_id
         JOIN users u ON up.user_id = u.user_id
-        LEFT JOIN humid_info hi ON di.device_id = hi.device_id
-        GROUP BY di.device_id, up.plant_id
-        ORDER BY di.device_id
+        LEFT JOIN humid h ON pd.device_id = h.device_id
+        GROUP BY pd.device_id, up.plant_id
+        ORDER BY pd.device_id
         """
         
         results = await execute_query(query)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from .plant_llm import plant_talk, get_plant_reply
+from .plant_llm import plant_talk, plant_talk_stream, get_plant_reply, request_plant_reply, ModelServerError
 from .humidity_prediction import humidity_client
 
 __all__ = [
     "plant_talk",
+    "plant_talk_stream",
     "get_plant_reply",
+    "request_plant_reply",
+    "ModelServerError",
     "humidity_client"
 ]
@@ -1,8 +1,9 @@
 # backend/app/ml/plant_llm.py
 # 모델 서버(포트 5000)의 LLM API를 호출하는 클라이언트
 
+import json
 import httpx
-from typing import Optional, Literal
+from typing import AsyncIterator, Optional, Literal
 from pydantic import BaseModel
 from core.config import settings
 
@@ -15,40 +16,54 @@ class TalkResult(BaseModel):
     state: Optional[str] = None
     reply: str
 
-async def plant_talk(species: str, user_text: str, moisture: Optional[float] = None) -> TalkResult:
+class ModelServerError(Exception):
+    """모델 서버가 답변을 주지 못함 (HTTP 오류, success=false)"""
+
+async def _request_talk(
+    species: str,
+    user_text: str,
+    moisture: Optional[float],
+    priority: Literal["chat", "diary"],
+    timeout: float,
+) -> TalkResult:
+    """모델 서버 /llm 호출 (실패하면 예외)"""
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        response = await client.post(
+            f"{MODEL_SERVER_URL}/llm",
+            json={
+                "species": species,
+                "user_text": user_text,
+                "moisture": moisture,
+                "priority": priority
+            }
+        )
+    if response.status_code != 200:
+        raise ModelServerError(f"모델 서버 HTTP {response.status_code}")
+    data = response.json()
+    if not data.get("success"):
+        raise ModelServerError(f"모델 서버 오류: {data.get('error') or data}")
+    return TalkResult(
+        mode=data["mode"],
+        species=data["species"],
+        state=data.get("state"),
+        reply=data["reply"]
+    )
+
+async def plant_talk(
+    species: str,
+    user_text: str,
+    moisture: Optional[float] = None,
+    priority: Literal["chat", "diary"] = "chat",
+) -> TalkResult:
     """
     모델 서버의 LLM API를 호출하여 식물 대화 처리
+    priority: 모델 서버 LLM 게이트웨이 우선순위 (백그라운드 일기 답장은 "diary")
     """
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{MODEL_SERVER_URL}/llm",
-                json={
-                    "species": species,
-                    "user_text": user_text,
-                    "moisture": moisture
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("success"):
-                    return TalkResult(
-                        mode=data["mode"],
-                        species=data["species"],
-                        state=data.get("state"),
-                        reply=data["reply"]
-                    )
-                else:
-                    # 모델 서버에서 에러가 발생한 경우 더미 답변 반환
-                    return _get_dummy_response(species, user_text, moisture)
-            else:
-                # HTTP 에러가 발생한 경우 더미 답변 반환
-                return _get_dummy_response(species, user_text, moisture)
-                
+        return await _request_talk(species, user_text, moisture, priority, 30.0)
     except Exception as e:
         print(f"모델 서버 호출 실패: {e}")
-        # 네트워크 에러 등이 발생한 경우 더미 답변 반환
+        # 네트워크/HTTP/모델 서버 에러 등이 발생한 경우 더미 답변 반환
         return _get_dummy_response(species, user_text, moisture)
 
 def _get_dummy_response(species: str, user_text: str, moisture: Optional[float] = None) -> TalkResult:
@@ -80,9 +95,67 @@ def _get_dummy_response(species: str, user_text: str, moisture: Optional[float]
     )
 
 # 기존 함수들과의 호환성을 위한 래퍼 함수들
-async def get_plant_reply(species: str, user_text: str, moisture: Optional[float] = None) -> str:
+async def get_plant_reply(
+    species: str,
+    user_text: str,
+    moisture: Optional[float] = None,
+    priority: Literal["chat", "diary"] = "chat",
+) -> str:
     """
     식물 답변만 반환하는 간단한 함수
     """
-    result = await plant_talk(species, user_text, moisture)
-    return result.reply
\ No newline at end of file
+    result = await plant_talk(species, user_text, moisture, priority)
+    return result.reply
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+async def plant_talk_stream(species: str, user_text: str, moisture: Optional[float] = None) -> AsyncIterator[bytes]:
+    """
+    모델 서버 /llm/stream의 SSE 바이트를 그대로 중계
+    - 이벤트: meta → delta(문장) ... → done, 실패 시 error
+    - 첫 바이트 전에 연결에 실패하면 더미 답변을 같은 이벤트 형식으로 보냄
+    """
+    started = False
+    try:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=60.0)) as client:
+            async with client.stream(
+                "POST",
+                f"{MODEL_SERVER_URL}/llm/stream",
+                json={
+                    "species": species,
+                    "user_text": user_text,
+                    "moisture": moisture
+                }
+            ) as response:
+                if response.status_code == 200:
+                    async for chunk in response.aiter_raw():
+                        started = True
+                        yield chunk
+                    return
+                print(f"모델 서버 스트리밍 응답 오류: {response.status_code}")
+    except Exception as e:
+        print(f"모델 서버 스트리밍 호출 실패: {e}")
+        if started:
+            yield _sse("error", {"message": "답변 생성 중 연결이 끊어졌습니다.", "error": "llm_stream_interrupted"})
+            return
+
+    dummy = _get_dummy_response(species, user_text, moisture)
+    yield _sse("meta", {"mode": dummy.mode, "species": dummy.species, "state": dummy.state})
+    yield _sse("delta", {"text": dummy.reply})
+    yield _sse("done", {"reply": dummy.reply})
+
+async def request_plant_reply(
+    species: str,
+    user_text: str,
+    moisture: Optional[float] = None,
+    priority: Literal["chat", "diary"] = "chat",
+    timeout: float = 30.0,
+) -> str:
+    """
+    식물 답변만 반환 (get_plant_reply와 달리 실패하면 더미 답변 대신 예외)
+    재시도를 직접 하는 백그라운드 작업용
+    """
+    result = await _request_talk(species, user_text, moisture, priority, timeout)
+    return result.reply
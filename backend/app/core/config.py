@@ -56,7 +56,28 @@ class Settings(BaseSettings):
 
     DB_POOL_SIZE: int = Field(default=20, validation_alias='DB_POOL_SIZE')
     DB_MAX_OVERFLOW: int = Field(default=0, validation_alias='DB_MAX_OVERFLOW')
-    SQL_ECHO: bool = Field(default=False, validation_alias='SQL_ECHO')
+    DB_POOL_RECYCLE: int = Field(default=3600, validation_alias='DB_POOL_RECYCLE')              # 이 시간(초)보다 오래된 연결은 재생성 (wait_timeout보다 짧게)
+    DB_PING_IDLE_SECONDS: float = Field(default=30.0, validation_alias='DB_PING_IDLE_SECONDS')  # 이 시간(초) 이상 쉬던 연결만 체크아웃 시 PING
+    DB_CHECKOUT_RETRIES: int = Field(default=3, validation_alias='DB_CHECKOUT_RETRIES')         # 연결 계열 오류 시 체크아웃 재시도 횟수
+    DB_CONNECT_TIMEOUT: int = Field(default=10, validation_alias='DB_CONNECT_TIMEOUT')
+
+    # 읽기 복제본 ("host1,host2:3307", 비우면 모든 조회를 주 서버에서 처리, 계정/DB명은 주 서버와 같음)
+    DB_READ_HOSTS: str = Field(default="", validation_alias='DB_READ_HOSTS')
+    DB_READ_POOL_SIZE: int = Field(default=20, validation_alias='DB_READ_POOL_SIZE')
+    DB_READ_STICKY_SECONDS: float = Field(default=5.0, validation_alias='DB_READ_STICKY_SECONDS')  # 사용자 쓰기 후 주 서버에서 읽는 시간(초), 복제 지연보다 길게
+    DB_READ_COOLDOWN_SECONDS: float = Field(default=30.0, validation_alias='DB_READ_COOLDOWN_SECONDS')  # 연결에 실패한 복제본을 건너뛰는 시간(초), 지나면 요청 하나로 다시 확인
+    SQL_ECHO: bool = Field(default=False, validation_alias='SQL_ECHO')                          # 모든 쿼리 지문/소요 시간 출력
+
+    # 쿼리 계측 (/metrics)
+    SQL_SLOW_MS: float = Field(default=200.0, validation_alias='SQL_SLOW_MS')                     # 느린 쿼리 기준(ms)
+    SQL_EXPLAIN_SLOW: bool = Field(default=True, validation_alias='SQL_EXPLAIN_SLOW')             # 느린 쿼리 EXPLAIN 자동 수집
+    SQL_EXPLAIN_INTERVAL: int = Field(default=300, validation_alias='SQL_EXPLAIN_INTERVAL')       # 같은 지문 EXPLAIN 최소 간격(초)
+    SQL_SLOW_LOG_SIZE: int = Field(default=200, validation_alias='SQL_SLOW_LOG_SIZE')             # 보관할 느린 쿼리 수
+    SQL_METRICS_MAX_FINGERPRINTS: int = Field(default=500, validation_alias='SQL_METRICS_MAX_FINGERPRINTS')
+
+    # 정보방 위키 인메모리 저장소
+    WIKI_REFRESH_INTERVAL: int = Field(default=300, validation_alias='WIKI_REFRESH_INTERVAL')     # 변경 확인(CHECKSUM TABLE) 주기(초), 0이면 끔
+    WIKI_CACHE_MAX_AGE: int = Field(default=300, validation_alias='WIKI_CACHE_MAX_AGE')           # 정보방 응답 Cache-Control max-age(초)
     
     # SQLite 사용 여부 (개발용)
     USE_SQLITE: bool = Field(default=False, validation_alias='USE_SQLITE')
@@ -65,6 +86,16 @@ class Settings(BaseSettings):
     MODEL_SERVER_URL: str = Field(default='http://127.0.0.1:5000', validation_alias='MODEL_SERVER_URL')
     MODEL_SERVER_TIMEOUT: int = Field(default=30, validation_alias='MODEL_SERVER_TIMEOUT')
 
+    # 일기 식물 답장 백그라운드 생성 (services.diary_reply)
+    DIARY_REPLY_WORKERS: int = Field(default=2, validation_alias="DIARY_REPLY_WORKERS")                  # 동시에 LLM을 호출할 워커 수
+    DIARY_REPLY_TIMEOUT: float = Field(default=45.0, validation_alias="DIARY_REPLY_TIMEOUT")             # 답장 1건 생성 제한 시간(초)
+    DIARY_REPLY_LEASE_SECONDS: int = Field(default=120, validation_alias="DIARY_REPLY_LEASE_SECONDS")    # 처리 중인 작업 점유 시간(초), DIARY_REPLY_TIMEOUT보다 길게
+    DIARY_REPLY_MAX_ATTEMPTS: int = Field(default=3, validation_alias="DIARY_REPLY_MAX_ATTEMPTS")        # 넘으면 기본 답변 저장
+    DIARY_REPLY_RETRY_BACKOFF: float = Field(default=5.0, validation_alias="DIARY_REPLY_RETRY_BACKOFF")  # 재시도 기본 대기(초), 지수 증가
+    DIARY_REPLY_QUEUE_MAXSIZE: int = Field(default=1000, validation_alias="DIARY_REPLY_QUEUE_MAXSIZE")
+    DIARY_REPLY_SWEEP_INTERVAL: int = Field(default=60, validation_alias="DIARY_REPLY_SWEEP_INTERVAL")   # DB에 남은 작업 재등록 주기(초)
+    DIARY_REPLY_MAX_WAIT: float = Field(default=25.0, validation_alias="DIARY_REPLY_MAX_WAIT")           # 답장 조회 롱 폴링 최대 대기(초)
+
     # MQTT Connect
     MQTT_HOST: str = Field(default="", validation_alias='MQTT_HOST')
     MQTT_PORT: int = 8883
@@ -72,7 +103,39 @@ class Settings(BaseSettings):
     MQTT_PASS: str = Field(default="", validation_alias="MQTT_PASS")
     MQTT_TOPICS: str = Field(default="", validation_alias="MQTT_TOPICS")
     MQTT_CA_PATH: str = "certs/emqxsl-ca.pem"
-   
+
+    # MQTT → DB 배치 적재
+    MQTT_QUEUE_MAXSIZE: int = Field(default=5000, validation_alias="MQTT_QUEUE_MAXSIZE")
+    MQTT_BATCH_SIZE: int = Field(default=200, validation_alias="MQTT_BATCH_SIZE")              # 한 번에 INSERT할 최대 행 수
+    MQTT_FLUSH_INTERVAL: float = Field(default=1.0, validation_alias="MQTT_FLUSH_INTERVAL")    # 최대 대기 시간(초)
+    MQTT_FLUSH_RETRIES: int = Field(default=3, validation_alias="MQTT_FLUSH_RETRIES")
+    MQTT_RETRY_BACKOFF: float = Field(default=0.5, validation_alias="MQTT_RETRY_BACKOFF")      # 재시도 기본 대기(초), 지수 증가
+    MQTT_SPILL_PATH: str = Field(default="spool/humid_spill.jsonl", validation_alias="MQTT_SPILL_PATH")
+
+    # 습도 센서 (plant_device에 매핑이 없는 식물이 사용하는 공통 센서)
+    DEFAULT_DEVICE_ID: int = Field(default=1, validation_alias="DEFAULT_DEVICE_ID")
+
+    # 습도 시계열 집계/보존
+    HUMID_RAW_RETENTION_DAYS: int = Field(default=90, validation_alias="HUMID_RAW_RETENTION_DAYS")      # 원본 행 보존 기간(일), 0이면 삭제 안 함
+    HUMID_RETENTION_INTERVAL: int = Field(default=3600, validation_alias="HUMID_RETENTION_INTERVAL")    # 보존 작업 주기(초)
+    HUMID_PRUNE_CHUNK: int = Field(default=5000, validation_alias="HUMID_PRUNE_CHUNK")                  # 한 번에 삭제할 최대 행 수
+    HUMID_RAW_MAX_RANGE_HOURS: int = Field(default=48, validation_alias="HUMID_RAW_MAX_RANGE_HOURS")    # 이 구간까지는 원본 조회
+    HUMID_HOURLY_MAX_RANGE_DAYS: int = Field(default=60, validation_alias="HUMID_HOURLY_MAX_RANGE_DAYS")  # 이 구간까지는 시간 집계, 초과 시 일 집계
+
+    # 물주기 자동 감지 (MQTT 적재 파이프라인)
+    WATERING_RISE_THRESHOLD: float = Field(default=10.0, validation_alias="WATERING_RISE_THRESHOLD")    # 최저점 대비 상승률(%)
+    WATERING_SMOOTHING_ALPHA: float = Field(default=0.5, validation_alias="WATERING_SMOOTHING_ALPHA")   # 지수 평활 계수 (1이면 평활 없음)
+    WATERING_REARM_DROP: float = Field(default=3.0, validation_alias="WATERING_REARM_DROP")            # 재감지를 위해 최고점에서 내려가야 할 습도(%p)
+    WATERING_RECENT_HOURS: int = Field(default=24, validation_alias="WATERING_RECENT_HOURS")           # 이 시간 안의 이벤트를 "최근 물주기"로 판단
+    WATERING_SEED_HOURS: int = Field(default=6, validation_alias="WATERING_SEED_HOURS")               # 재시작 시 감지 상태 복원에 다시 흘려 볼 원본 구간(시간)
+
+    # 일기 전문 검색 (MySQL ngram_token_size와 같게 설정, 이보다 짧은 검색어는 LIKE 사용)
+    DIARY_SEARCH_NGRAM_SIZE: int = Field(default=2, validation_alias="DIARY_SEARCH_NGRAM_SIZE")
+
+    # 사용자별 통계 캐시 (쓰기 시 무효화, TTL은 "최근 7일" 등 시간 기준 값의 최대 지연)
+    USER_STATS_TTL: int = Field(default=600, validation_alias="USER_STATS_TTL")
+    USER_STATS_MAX_ENTRIES: int = Field(default=10000, validation_alias="USER_STATS_MAX_ENTRIES")
+
 
     @property
     def ROOT_DIR(self) -> Path:
@@ -0,0 +1,72 @@
+"""
+연결 풀 상태 관리
+
+- 체크아웃 시 오래 쉬고 있던 연결만 PING으로 확인하고, 끊긴 연결은 그 연결만 풀에서 제거합니다.
+- 재시도는 연결 계열 오류(서버 끊김/연결 실패)에만 적용합니다.
+  SQL 문법 오류·중복 키 같은 업무 오류는 그대로 호출자에게 전달되고 연결은 풀로 돌아갑니다.
+- 사용 중/유휴 연결 수, 대기 시간, 제거된 연결 수 등을 stats()로 제공합니다.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import aiomysql
+
+# 연결이 끊겼거나 서버에 닿지 못한 경우의 MySQL 클라이언트 오류 코드
+# 2003: 연결 불가, 2006: server has gone away, 2013: 쿼리 중 연결 끊김, 2055: 읽기/쓰기 중 연결 끊김
+CONNECTION_ERROR_CODES = {2003, 2006, 2013, 2055}
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """재시도/연결 제거 대상인 연결 계열 오류인지 확인"""
+    if isinstance(exc, aiomysql.InterfaceError):
+        return True
+    if isinstance(exc, aiomysql.OperationalError):
+        code = exc.args[0] if exc.args else None
+        return code in CONNECTION_ERROR_CODES
+    return isinstance(exc, (ConnectionError, asyncio.TimeoutError))
+
+
+class PoolHealth:
+    """연결 풀 체크아웃 통계"""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.pings = 0
+        self.ping_failures = 0
+        self.evicted = 0
+        self.retries = 0
+        self.failures = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        if seconds > self.wait_max:
+            self.wait_max = seconds
+
+    def stats(self, pool: Optional[aiomysql.Pool]) -> Dict[str, Any]:
+        size = pool.size if pool else 0
+        idle = pool.freesize if pool else 0
+        return {
+            "size": size,
+            "max_size": pool.maxsize if pool else 0,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+            "evicted": self.evicted,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+# 싱글톤 인스턴스
+pool_health = PoolHealth()
@@ -0,0 +1,235 @@
+"""
+쿼리 계측 (저장소 계층 커서 래퍼)
+
+- get_db_connection()이 돌려주는 커서는 InstrumentedDictCursor로, execute() 시간을 잽니다.
+- 쿼리는 리터럴/플레이스홀더를 ?로 바꾼 지문(fingerprint)으로 묶어 지연 시간 히스토그램,
+  반환·변경 행 수, 오류 수를 집계합니다.
+- SQL_SLOW_MS 이상 걸린 쿼리는 느린 쿼리 로그에 남기고, 지문별로 SQL_EXPLAIN_INTERVAL초에 한 번
+  별도 연결에서 EXPLAIN을 실행해 실행 계획과 예상 검사 행 수(rows)를 함께 저장합니다.
+  (RDS 계정에 performance_schema 권한이 없어 실제 검사 행 수 대신 EXPLAIN 추정치를 사용)
+- 집계는 /metrics(Prometheus 형식)와 /metrics/queries(JSON)로 노출됩니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Set
+
+import aiomysql
+
+from core.config import settings
+from utils.metrics import Histogram
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_RE = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))*", re.I)
+_SPACE_RE = re.compile(r"\s+")
+_EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.I)
+
+OTHER_FINGERPRINT = "(other)"
+# 서버 측 커서는 행 수를 모르면 rowcount가 -1(부호 없는 최댓값)
+_UNKNOWN_ROWCOUNT = 1 << 62
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    """SQL → 지문 (값만 다른 쿼리를 하나로 묶음)"""
+    text = _COMMENT_RE.sub(" ", query)
+    text = _STRING_RE.sub("?", text)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("IN (?+)", text)
+    text = _VALUES_RE.sub(r"VALUES \1+", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def fingerprint_id(text: str) -> str:
+    """지문의 짧은 ID (Prometheus 라벨용)"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+class _QueryStat:
+    __slots__ = ("text", "histogram", "rows", "errors", "slow", "rows_examined_est", "explained_at", "plan")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.histogram = Histogram()
+        self.rows = 0
+        self.errors = 0
+        self.slow = 0
+        self.rows_examined_est = 0
+        self.explained_at = 0.0
+        self.plan: Optional[List[Dict[str, Any]]] = None
+
+
+class QueryMetrics:
+    """지문별 쿼리 통계 + 느린 쿼리 로그"""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, _QueryStat] = {}
+        self._slow_log: Deque[Dict[str, Any]] = deque(maxlen=settings.SQL_SLOW_LOG_SIZE)
+        self._explain_tasks: Set[asyncio.Task] = set()
+
+    def _stat(self, text: str) -> _QueryStat:
+        stat = self._stats.get(text)
+        if stat is None:
+            if len(self._stats) >= settings.SQL_METRICS_MAX_FINGERPRINTS:
+                text = OTHER_FINGERPRINT
+                stat = self._stats.get(text)
+            if stat is None:
+                stat = self._stats[text] = _QueryStat(text)
+        return stat
+
+    def observe(self, cursor: aiomysql.Cursor, query: str, args: Any, elapsed: float, error: bool = False) -> None:
+        text = fingerprint(query)
+        stat = self._stat(text)
+        stat.histogram.observe(elapsed)
+        if error:
+            stat.errors += 1
+        elif 0 < cursor.rowcount < _UNKNOWN_ROWCOUNT:
+            stat.rows += cursor.rowcount
+
+        if settings.SQL_ECHO:
+            print(f"[SQL] {elapsed * 1000:.1f}ms {text[:200]}", flush=True)
+        if elapsed * 1000 >= settings.SQL_SLOW_MS:
+            self._record_slow(stat, cursor, query, args, elapsed)
+
+    def _record_slow(self, stat: _QueryStat, cursor: aiomysql.Cursor, query: str, args: Any, elapsed: float) -> None:
+        stat.slow += 1
+        entry: Dict[str, Any] = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "id": fingerprint_id(stat.text),
+            "fingerprint": stat.text,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "rows": cursor.rowcount,
+            "plan": stat.plan,
+        }
+        self._slow_log.append(entry)
+        print(f"[SQL-SLOW] {entry['elapsed_ms']}ms {stat.text[:300]}", flush=True)
+
+        now = time.monotonic()
+        if (
+            settings.SQL_EXPLAIN_SLOW
+            and _EXPLAINABLE_RE.match(query)
+            and now - stat.explained_at >= settings.SQL_EXPLAIN_INTERVAL
+        ):
+            stat.explained_at = now
+            try:
+                # 값이 들어간 SQL은 EXPLAIN에만 쓰고 로그에는 남기지 않음 (사용자 데이터 노출 방지)
+                sql = cursor.mogrify(query, args)
+            except Exception:
+                return
+            task = asyncio.get_running_loop().create_task(self._explain(stat, entry, sql))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, stat: _QueryStat, entry: Dict[str, Any], sql: str) -> None:
+        """별도 연결에서 EXPLAIN 실행 (요청 처리 경로를 막지 않음)"""
+        from db.pool import checkout  # 순환 임포트 방지
+
+        try:
+            async with checkout() as conn:
+                async with conn.cursor(aiomysql.DictCursor) as cursor:
+                    await cursor.execute("EXPLAIN " + sql)
+                    plan = [
+                        {k: row.get(k) for k in ("table", "type", "possible_keys", "key", "rows", "filtered", "Extra")}
+                        for row in await cursor.fetchall()
+                    ]
+                await conn.rollback()
+        except Exception as e:
+            print(f"[SQL-SLOW] EXPLAIN 실패: {e}", flush=True)
+            return
+        stat.plan = plan
+        stat.rows_examined_est += sum(int(row.get("rows") or 0) for row in plan)
+        entry["plan"] = plan
+        print(f"[SQL-SLOW] plan {fingerprint_id(stat.text)}: {plan}", flush=True)
+
+    def top(self, limit: int = 20, order_by: str = "total") -> List[Dict[str, Any]]:
+        """지문별 통계 (총 소요 시간 순)"""
+        def summary(stat: _QueryStat) -> Dict[str, Any]:
+            h = stat.histogram
+            return {
+                "id": fingerprint_id(stat.text),
+                "fingerprint": stat.text,
+                "calls": h.count,
+                "total_ms": round(h.sum * 1000, 1),
+                "avg_ms": round(h.sum / h.count * 1000, 2) if h.count else 0.0,
+                "p50_ms": round(h.quantile(0.5) * 1000, 1),
+                "p95_ms": round(h.quantile(0.95) * 1000, 1),
+                "max_ms": round(h.max * 1000, 1),
+                "rows": stat.rows,
+                "rows_examined_est": stat.rows_examined_est,
+                "errors": stat.errors,
+                "slow": stat.slow,
+                "plan": stat.plan,
+            }
+
+        keys = {
+            "total": lambda s: s.histogram.sum,
+            "calls": lambda s: s.histogram.count,
+            "max": lambda s: s.histogram.max,
+            "slow": lambda s: s.slow,
+        }
+        stats = sorted(self._stats.values(), key=keys.get(order_by, keys["total"]), reverse=True)
+        return [summary(stat) for stat in stats[:limit]]
+
+    def reset(self) -> None:
+        """통계 초기화 (벤치마크 구간 비교용)"""
+        self._stats.clear()
+        self._slow_log.clear()
+
+    def slow_log(self) -> List[Dict[str, Any]]:
+        return list(reversed(self._slow_log))
+
+    def prometheus_lines(self) -> List[str]:
+        name = "pland_sql_query_duration_seconds"
+        lines = [
+            f"# HELP {name} 쿼리 지문별 실행 시간 (지문 원문은 /metrics/queries)",
+            f"# TYPE {name} histogram",
+        ]
+        for stat in self._stats.values():
+            lines.extend(stat.histogram.prometheus_lines(name, f'query="{fingerprint_id(stat.text)}"'))
+        for metric, attr in (("rows_total", "rows"), ("errors_total", "errors"), ("slow_total", "slow"),
+                             ("rows_examined_estimate_total", "rows_examined_est")):
+            lines.append(f"# TYPE pland_sql_query_{metric} counter")
+            for stat in self._stats.values():
+                lines.append(f'pland_sql_query_{metric}{{query="{fingerprint_id(stat.text)}"}} {getattr(stat, attr)}')
+        return lines
+
+
+# 싱글톤 인스턴스
+query_metrics = QueryMetrics()
+
+
+class _InstrumentedMixin:
+    """execute() 시간 측정"""
+
+    async def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            result = await super().execute(query, args)
+        except Exception:
+            query_metrics.observe(self, query, args, time.perf_counter() - started, error=True)
+            raise
+        query_metrics.observe(self, query, args, time.perf_counter() - started)
+        return result
+
+
+class InstrumentedCursor(_InstrumentedMixin, aiomysql.Cursor):
+    pass
+
+
+class InstrumentedDictCursor(_InstrumentedMixin, aiomysql.DictCursor):
+    pass
+
+
+class InstrumentedSSDictCursor(_InstrumentedMixin, aiomysql.SSDictCursor):
+    pass
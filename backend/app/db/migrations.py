@@ -0,0 +1,413 @@
+"""
+버전 관리 스키마 마이그레이션
+
+- 적용된 버전은 schema_migrations 테이블에 기록되고, 아직 적용되지 않은 버전만 순서대로 실행합니다.
+- 각 단계는 멱등(이미 있는 인덱스/컬럼은 건너뜀)이라 중간에 실패한 마이그레이션을 다시 실행해도 안전합니다.
+- 인덱스는 ALGORITHM=INPLACE, LOCK=NONE 온라인 DDL로 추가해 적재 중인 humid 테이블 쓰기를 막지 않습니다.
+  (FULLTEXT 인덱스는 온라인 추가가 안 되므로 기본 알고리즘으로 추가)
+- 앱 시작 시에는 DDL을 실행하지 않고 적용되지 않은 버전만 경고합니다. 스키마 변경은 여기에만 추가하세요.
+- 여러 워커가 동시에 실행하지 않도록 GET_LOCK으로 직렬화합니다.
+- 실행: python migrate.py [status|up|down <version>]
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import aiomysql
+
+from core.config import settings
+from db.pool import get_db_connection
+
+MIGRATION_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version int primary key,
+    name varchar(200) not null,
+    applied_at datetime default now()
+)
+"""
+
+MIGRATION_LOCK = "pland_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 60
+
+# 외래 키가 쓰던 인덱스를 지우려 할 때의 오류 (ER_DROP_INDEX_FK)
+_ER_DROP_INDEX_FK = 1553
+
+
+async def _index_columns(cursor, table: str) -> Dict[str, List[str]]:
+    """테이블의 인덱스 → 컬럼 목록"""
+    await cursor.execute(
+        """
+        SELECT index_name, column_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s
+        ORDER BY index_name, seq_in_index
+        """,
+        (table,),
+    )
+    indexes: Dict[str, List[str]] = {}
+    for row in await cursor.fetchall():
+        indexes.setdefault(row["index_name"], []).append(row["column_name"])
+    return indexes
+
+
+@dataclass(frozen=True)
+class Index:
+    """보조 인덱스 추가 (같은 이름이나 같은 컬럼 구성의 인덱스가 있으면 건너뜀)"""
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+    # FULLTEXT 인덱스 파서 (예: "ngram"), None이면 일반 인덱스
+    fulltext_parser: Optional[str] = None
+
+    def describe(self) -> str:
+        return f"{self.table}({', '.join(self.columns)}) {self.name}"
+
+    def _add_sql(self) -> str:
+        columns = ", ".join(self.columns)
+        if self.fulltext_parser:
+            return f"ALTER TABLE {self.table} ADD FULLTEXT INDEX {self.name} ({columns}) WITH PARSER {self.fulltext_parser}"
+        return f"ALTER TABLE {self.table} ADD INDEX {self.name} ({columns}), ALGORITHM=INPLACE, LOCK=NONE"
+
+    async def up(self, cursor) -> None:
+        indexes = await _index_columns(cursor, self.table)
+        if self.name in indexes:
+            return
+        same = [name for name, cols in indexes.items() if tuple(cols) == self.columns]
+        if same:
+            print(f"[MIGRATE] {self.describe()}: 같은 컬럼 인덱스 {same[0]} 존재, 건너뜀", flush=True)
+            return
+        print(f"[MIGRATE] 인덱스 생성: {self.describe()}", flush=True)
+        await cursor.execute(self._add_sql())
+
+    async def down(self, cursor) -> None:
+        indexes = await _index_columns(cursor, self.table)
+        if self.name not in indexes:
+            return
+        print(f"[MIGRATE] 인덱스 삭제: {self.describe()}", flush=True)
+        try:
+            await cursor.execute(f"ALTER TABLE {self.table} DROP INDEX {self.name}")
+        except aiomysql.OperationalError as e:
+            if not e.args or e.args[0] != _ER_DROP_INDEX_FK:
+                raise
+            # 이 인덱스가 외래 키 인덱스를 대신하고 있었으면 첫 컬럼 인덱스를 되살린 뒤 삭제
+            await cursor.execute(
+                f"ALTER TABLE {self.table} ADD INDEX {self.columns[0]} ({self.columns[0]}), "
+                f"DROP INDEX {self.name}"
+            )
+
+
+async def _has_column(cursor, table: str, column: str) -> bool:
+    await cursor.execute(
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """,
+        (table, column),
+    )
+    return await cursor.fetchone() is not None
+
+
+@dataclass(frozen=True)
+class Column:
+    """컬럼 추가 (이미 있으면 건너뜀)"""
+    table: str
+    name: str
+    definition: str
+
+    def describe(self) -> str:
+        return f"{self.table}.{self.name} {self.definition}"
+
+    async def up(self, cursor) -> None:
+        if await _has_column(cursor, self.table, self.name):
+            return
+        print(f"[MIGRATE] 컬럼 추가: {self.describe()}", flush=True)
+        await cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN {self.name} {self.definition}")
+
+    async def down(self, cursor) -> None:
+        if not await _has_column(cursor, self.table, self.name):
+            return
+        print(f"[MIGRATE] 컬럼 삭제: {self.table}.{self.name}", flush=True)
+        await cursor.execute(f"ALTER TABLE {self.table} DROP COLUMN {self.name}")
+
+
+async def _foreign_keys(cursor, table: str, column: str, ref_table: str) -> List[str]:
+    """table.column → ref_table 외래 키 이름 목록"""
+    await cursor.execute(
+        """
+        SELECT constraint_name FROM information_schema.key_column_usage
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+          AND referenced_table_name = %s
+        """,
+        (table, column, ref_table),
+    )
+    return [row["constraint_name"] for row in await cursor.fetchall()]
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    """외래 키 추가 (같은 컬럼 → 같은 테이블 외래 키가 있으면 건너뜀)"""
+    table: str
+    name: str
+    column: str
+    ref_table: str
+    ref_column: str
+    on_update: str = "cascade"
+
+    def describe(self) -> str:
+        return f"{self.table}({self.column}) → {self.ref_table}({self.ref_column}) {self.name}"
+
+    async def up(self, cursor) -> None:
+        if await _foreign_keys(cursor, self.table, self.column, self.ref_table):
+            return
+        print(f"[MIGRATE] 외래 키 추가: {self.describe()}", flush=True)
+        await cursor.execute(
+            f"ALTER TABLE {self.table} ADD CONSTRAINT {self.name} FOREIGN KEY ({self.column}) "
+            f"REFERENCES {self.ref_table}({self.ref_column}) ON UPDATE {self.on_update}"
+        )
+
+    async def down(self, cursor) -> None:
+        if self.name not in await _foreign_keys(cursor, self.table, self.column, self.ref_table):
+            return
+        print(f"[MIGRATE] 외래 키 삭제: {self.describe()}", flush=True)
+        await cursor.execute(f"ALTER TABLE {self.table} DROP FOREIGN KEY {self.name}")
+
+
+@dataclass(frozen=True)
+class Sql:
+    """임의 SQL 단계 (down이 없으면 되돌리지 않음)"""
+    up_sql: str
+    down_sql: Optional[str] = None
+
+    def describe(self) -> str:
+        return " ".join(self.up_sql.split())[:80]
+
+    async def up(self, cursor) -> None:
+        await cursor.execute(self.up_sql)
+
+    async def down(self, cursor) -> None:
+        if self.down_sql:
+            await cursor.execute(self.down_sql)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    steps: Sequence[Any] = field(default_factory=tuple)
+
+
+# 조회 패턴에서 뽑은 인덱스 (WHERE 동등 조건 컬럼 → 정렬/범위 컬럼 순)
+QUERY_INDEXES = (
+    # 대시보드/습도 이력: 센서별 최신값, 기간 조회
+    Index("humid", "idx_humid_device_date", ("device_id", "humid_date")),
+    # 일기 목록/통계/내보내기: user_id = ? ORDER BY created_at DESC, diary_id DESC
+    Index("diary", "idx_diary_user_created", ("user_id", "created_at")),
+    # 식물 상세의 일기 목록/물주기 기록: plant_id = ? ORDER BY created_at DESC
+    Index("diary", "idx_diary_plant_created", ("plant_id", "created_at")),
+    # 내 식물 목록/대시보드: user_id = ? ORDER BY meet_day DESC
+    Index("user_plant", "idx_user_plant_user_meet", ("user_id", "meet_day")),
+    # 병해충 기록: plant_id = ? ORDER BY pest_date DESC
+    Index("user_plant_pest", "idx_user_plant_pest_plant_date", ("plant_id", "pest_date")),
+    # 대표 이미지 서브쿼리: diary_id/plant_id = ? ORDER BY img_url LIMIT 1 (인덱스만으로 처리)
+    Index("img_address", "idx_img_address_diary", ("diary_id", "img_url")),
+    Index("img_address", "idx_img_address_plant", ("plant_id", "img_url")),
+)
+
+# 예전에 앱 시작 시 CREATE TABLE IF NOT EXISTS로 만들던 테이블 (Final.sql과 같은 정의)
+# 기존 DB에는 이미 데이터가 있을 수 있으므로 테이블은 되돌리지 않습니다.
+SERVICE_TABLES = (
+    # 습도 시간/일 집계 (services.mqtt_service가 적재 시 증분 갱신)
+    Sql("""
+        CREATE TABLE IF NOT EXISTS humid_hourly (
+            device_id int not null,
+            bucket datetime not null,
+            min_humidity int not null,
+            max_humidity int not null,
+            sum_humidity bigint not null,
+            cnt int not null,
+            last_humidity int not null,
+            last_at datetime not null,
+            primary key (device_id, bucket)
+        )
+    """),
+    Sql("""
+        CREATE TABLE IF NOT EXISTS humid_daily (
+            device_id int not null,
+            bucket date not null,
+            min_humidity int not null,
+            max_humidity int not null,
+            sum_humidity bigint not null,
+            cnt int not null,
+            last_humidity int not null,
+            last_at datetime not null,
+            primary key (device_id, bucket)
+        )
+    """),
+    # 자동 감지된 물주기 이벤트
+    Sql("""
+        CREATE TABLE IF NOT EXISTS watering_event (
+            event_id int auto_increment primary key,
+            device_id int not null,
+            event_at datetime not null,
+            humidity_before float not null,
+            humidity_after float not null,
+            increase_pct float not null,
+            created_at datetime default now(),
+            unique key uq_watering_event (device_id, event_at)
+        )
+    """),
+    # 식물 ↔ 습도 센서 매핑
+    Sql("""
+        CREATE TABLE IF NOT EXISTS plant_device (
+            plant_id int primary key,
+            device_id int not null,
+            registered_at datetime default now(),
+            key idx_plant_device_device (device_id),
+            foreign key (plant_id) references user_plant(plant_id) on delete cascade on update cascade
+        )
+    """),
+    # 일기 해시태그 인덱스
+    Sql("""
+        CREATE TABLE IF NOT EXISTS diary_tag (
+            user_id varchar(100) not null,
+            tag varchar(100) not null,
+            diary_id int not null,
+            primary key (user_id, tag, diary_id),
+            key idx_diary_tag_diary (diary_id),
+            foreign key (diary_id) references diary(diary_id) on delete cascade on update cascade
+        )
+    """),
+    # 일기 식물 답장 생성 대기 작업
+    Sql("""
+        CREATE TABLE IF NOT EXISTS diary_reply_job (
+            diary_id int primary key,
+            seq int not null default 1,
+            species varchar(100),
+            moisture float,
+            attempts int not null default 0,
+            last_error varchar(500),
+            requested_at datetime default now(),
+            foreign key (diary_id) references diary(diary_id) on delete cascade on update cascade
+        )
+    """),
+    # 일기 전문 검색 (한글 부분 일치를 위한 ngram 파서)
+    Index("diary", "ft_diary_text", ("user_title", "user_content", "hashtag"), fulltext_parser="ngram"),
+)
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "drop_legacy_humid_tables", (
+        # 예전 apply_final_sql_changes.py가 하던 작업
+        Sql("DROP TABLE IF EXISTS humid_info"),
+        Sql("DROP TABLE IF EXISTS device_info"),
+    )),
+    Migration(2, "query_pattern_indexes", QUERY_INDEXES),
+    Migration(3, "service_tables", SERVICE_TABLES),
+    Migration(4, "device_registry", (
+        # 등록된 습도 센서와 소유자 (소유자 없음 = 아직 아무도 연결하지 않은 센서)
+        Sql("""
+            CREATE TABLE IF NOT EXISTS device (
+                device_id int primary key,
+                owner_user_id varchar(100),
+                registered_at datetime default now(),
+                key idx_device_owner (owner_user_id),
+                foreign key (owner_user_id) references users(user_id) on delete set null on update cascade
+            )
+        """, "DROP TABLE IF EXISTS device"),
+        # 이미 연결된 센서는 가장 먼저 연결한 사용자 소유로 등록 (INSERT IGNORE라 센서별 첫 행만 들어감)
+        Sql("""
+            INSERT IGNORE INTO device (device_id, owner_user_id)
+            SELECT pd.device_id, up.user_id
+            FROM plant_device pd
+            JOIN user_plant up ON up.plant_id = pd.plant_id
+            ORDER BY pd.registered_at, pd.plant_id
+        """),
+    )),
+    Migration(5, "diary_reply_job_lease", (
+        # 재시도 대기 중인 작업은 이 시각 전까지 다시 꺼내지 않음
+        Column("diary_reply_job", "next_attempt_at", "datetime not null default now()"),
+        # 처리 중인 작업의 점유 만료 시각 (여러 프로세스가 같은 작업을 동시에 처리하지 않도록)
+        Column("diary_reply_job", "claimed_until", "datetime null"),
+        Index("diary_reply_job", "idx_diary_reply_job_next", ("next_attempt_at",)),
+    )),
+    Migration(6, "plant_device_fk", (
+        # 공통 센서와 이미 매핑된 센서를 먼저 등록 (소유자 없음)
+        Sql(f"INSERT IGNORE INTO device (device_id) VALUES ({int(settings.DEFAULT_DEVICE_ID)})"),
+        Sql("INSERT IGNORE INTO device (device_id) SELECT DISTINCT device_id FROM plant_device"),
+        # 등록되지 않은 센서 ID로는 식물을 연결할 수 없음
+        ForeignKey("plant_device", "fk_plant_device_device", "device_id", "device", "device_id"),
+    )),
+)
+
+
+async def _applied_versions(cursor) -> Dict[int, Any]:
+    await cursor.execute(MIGRATION_TABLE_DDL)
+    await cursor.execute("SELECT version, applied_at FROM schema_migrations ORDER BY version")
+    return {row["version"]: row["applied_at"] for row in await cursor.fetchall()}
+
+
+async def migration_status() -> List[Dict[str, Any]]:
+    """버전별 적용 여부"""
+    async with get_db_connection() as (conn, cursor):
+        applied = await _applied_versions(cursor)
+    return [
+        {"version": m.version, "name": m.name, "applied_at": applied.get(m.version)}
+        for m in MIGRATIONS
+    ]
+
+
+async def pending_migrations() -> List[Migration]:
+    async with get_db_connection() as (conn, cursor):
+        applied = await _applied_versions(cursor)
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+async def _with_lock(cursor) -> None:
+    await cursor.execute("SELECT GET_LOCK(%s, %s) AS locked", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+    if not (await cursor.fetchone())["locked"]:
+        raise RuntimeError("다른 프로세스가 마이그레이션을 실행 중입니다.")
+
+
+async def migrate_up(target: Optional[int] = None) -> List[int]:
+    """target 버전까지(생략 시 전부) 적용, 반환: 이번에 적용한 버전"""
+    done: List[int] = []
+    async with get_db_connection() as (conn, cursor):
+        await _with_lock(cursor)
+        try:
+            applied = await _applied_versions(cursor)
+            for migration in MIGRATIONS:
+                if migration.version in applied or (target is not None and migration.version > target):
+                    continue
+                print(f"[MIGRATE] {migration.version:04d} {migration.name} 적용 중...", flush=True)
+                for step in migration.steps:
+                    await step.up(cursor)
+                await cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name),
+                )
+                await conn.commit()
+                done.append(migration.version)
+        finally:
+            await cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+    return done
+
+
+async def migrate_down(target: int) -> List[int]:
+    """target 버전보다 큰 적용 버전을 역순으로 되돌림, 반환: 되돌린 버전"""
+    done: List[int] = []
+    async with get_db_connection() as (conn, cursor):
+        await _with_lock(cursor)
+        try:
+            applied = await _applied_versions(cursor)
+            for migration in reversed(MIGRATIONS):
+                if migration.version <= target or migration.version not in applied:
+                    continue
+                print(f"[MIGRATE] {migration.version:04d} {migration.name} 되돌리는 중...", flush=True)
+                for step in reversed(migration.steps):
+                    await step.down(cursor)
+                await cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (migration.version,))
+                await conn.commit()
+                done.append(migration.version)
+        finally:
+            await cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+    return done
@@ -2,30 +2,51 @@
 
 from __future__ import annotations
 
-from typing import AsyncGenerator, Dict, Any, List, Optional
+from typing import AsyncGenerator, Callable, Dict, Any, List, Optional
 import aiomysql
 import asyncio
+import weakref
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
 from core.config import settings
+from db.health import is_connection_error, pool_health
+from db.instrument import InstrumentedCursor, InstrumentedDictCursor
+from db.routing import parse_read_hosts, read_router
 
 # MySQL 연결 설정
-def _get_mysql_config() -> Dict[str, Any]:
-    """MySQL 연결 설정 반환"""
+def _get_mysql_config(host: Optional[str] = None, port: Optional[int] = None, maxsize: Optional[int] = None) -> Dict[str, Any]:
+    """MySQL 연결 설정 반환 (host/port를 지정하면 읽기 복제본용)"""
     return {
-        'host': settings.DB_HOST,
-        'port': settings.DB_PORT,
+        'host': host or settings.DB_HOST,
+        'port': port or settings.DB_PORT,
         'user': settings.DB_USER,
         'password': settings.DB_PASSWORD.get_secret_value(),
         'db': settings.DB_NAME,
         'charset': 'utf8mb4',
         'autocommit': False,
+        'cursorclass': InstrumentedCursor,   # conn.cursor() 기본 커서도 쿼리 계측
         'minsize': 1,
-        'maxsize': settings.DB_POOL_SIZE,
+        'maxsize': maxsize or settings.DB_POOL_SIZE,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'connect_timeout': settings.DB_CONNECT_TIMEOUT,
     }
 
+class _Replica:
+    """읽기 복제본 하나 (pool이 None이면 아직 연결 못 함 → 쿨다운 뒤 다시 생성)"""
+    __slots__ = ("host", "port", "pool")
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.pool: Optional[aiomysql.Pool] = None
+
+    def __str__(self) -> str:
+        return f"{self.host}:{self.port}"
+
 # aiomysql 연결 풀 관리
-_pool: Optional[aiomysql.Pool] = None
+_pool: Optional[aiomysql.Pool] = None            # 쓰기(주) 서버
+_replicas: List[_Replica] = []                    # 읽기 복제본 (DB_READ_HOSTS)
 
 async def init_pool():
     """데이터베이스 연결 풀 초기화"""
@@ -38,8 +59,51 @@ async def init_pool():
         except Exception as e:
             print(f"[DB] 연결 실패: {e}")
             raise
+        await _init_read_pools()
     return _pool
 
+async def _init_read_pools() -> None:
+    """읽기 복제본 풀 생성 (연결에 실패한 복제본은 쿨다운 뒤 다시 시도, 그동안 주 서버에서 읽음)"""
+    if _replicas:  # recreate_pool()은 주 서버 풀만 다시 만듦
+        return
+    for host, port in parse_read_hosts(settings.DB_READ_HOSTS, settings.DB_PORT):
+        replica = _Replica(host, port)
+        _replicas.append(replica)
+        if not await _open_replica(replica):
+            read_router.mark_down(replica)
+
+async def _open_replica(replica: _Replica) -> bool:
+    """복제본 풀 생성 (실패하면 False)"""
+    try:
+        replica.pool = await aiomysql.create_pool(**_get_mysql_config(replica.host, replica.port, settings.DB_READ_POOL_SIZE))
+        print(f"[DB] read replica = '{replica}'")
+        return True
+    except Exception as e:
+        print(f"[DB] 읽기 복제본 연결 실패, {settings.DB_READ_COOLDOWN_SECONDS:g}초 뒤 다시 시도: {replica} ({e})")
+        return False
+
+def _replica_of(pool: aiomysql.Pool) -> Optional[_Replica]:
+    for replica in _replicas:
+        if replica.pool is pool:
+            return replica
+    return None
+
+async def get_read_pool(user_id: Optional[str] = None) -> aiomysql.Pool:
+    """
+    읽기 전용 조회에 쓸 풀 반환
+    복제본이 없거나(모두 쿨다운 중 포함) user_id가 방금 쓰기를 했으면 주 서버 풀을 반환합니다.
+    """
+    pool = await get_pool()
+    replica = read_router.pick(_replicas, user_id)
+    if replica is None:
+        return pool
+    if replica.pool is None and not await _open_replica(replica):
+        # 시작 시 실패한 복제본 재확인 실패
+        read_router.mark_down(replica)
+        read_router.record_fallback()
+        return pool
+    return replica.pool
+
 async def get_pool() -> aiomysql.Pool:
     """연결 풀 반환"""
     if _pool is None:
@@ -47,7 +111,10 @@ async def get_pool() -> aiomysql.Pool:
     return _pool
 
 async def recreate_pool():
-    """연결 풀 재생성 (연결 문제 해결용)"""
+    """
+    연결 풀 재생성 (수동 복구용)
+    모든 연결을 닫으므로 요청 처리 중에는 호출하지 않습니다. 끊긴 연결은 checkout()이 개별 제거합니다.
+    """
     global _pool
     if _pool:
         try:
@@ -65,38 +132,182 @@ async def close_pool():
         _pool.close()
         await _pool.wait_closed()
         _pool = None
+    while _replicas:
+        replica = _replicas.pop()
+        read_router.mark_up(replica)
+        if replica.pool is not None:
+            replica.pool.close()
+            await replica.pool.wait_closed()
+
+# 요청 단위 작업(unit of work) 연결: (연결, 소유 태스크)
+# db.transaction.unit_of_work()가 설정하며, 설정되어 있으면 get_db_connection()이 이 연결을 공유합니다.
+request_connection: ContextVar[Optional[tuple]] = ContextVar("request_connection", default=None)
+
+def _shared_connection() -> Optional[aiomysql.Connection]:
+    """현재 태스크가 소유한 요청 단위 연결 (없으면 None)"""
+    current = request_connection.get()
+    if current is None:
+        return None
+    conn, owner = current
+    # asyncio.gather 등으로 만든 하위 태스크는 컨텍스트를 복사해 오지만
+    # 한 연결을 동시에 쓸 수 없으므로 풀에서 따로 연결을 받습니다.
+    if owner is not asyncio.current_task() or conn.closed:
+        return None
+    return conn
+
+# 커밋 후 실행할 콜백 (연결별, 롤백되거나 연결이 반환되면 버림)
+_after_commit: "weakref.WeakKeyDictionary[aiomysql.Connection, List[Callable[[], Any]]]" = weakref.WeakKeyDictionary()
+
+def after_commit(conn: aiomysql.Connection, callback: Callable[..., Any], *args: Any) -> None:
+    """
+    conn의 현재 트랜잭션이 커밋된 뒤 callback(*args)를 실행합니다. (롤백되면 실행하지 않음)
+    캐시 무효화용: 커밋 전에 지우면 그 사이 다른 요청이 이전 값을 다시 캐시할 수 있습니다.
+    """
+    _after_commit.setdefault(conn, []).append(lambda: callback(*args))
+
+async def commit(conn: aiomysql.Connection) -> None:
+    """커밋 후 등록된 after_commit 콜백 실행"""
+    await conn.commit()
+    for callback in _after_commit.pop(conn, ()):
+        try:
+            callback()
+        except Exception as e:
+            print(f"[DB] 커밋 후 콜백 실패: {e}")
+
+def discard_after_commit(conn: aiomysql.Connection) -> None:
+    """롤백 시 등록된 콜백 버리기"""
+    _after_commit.pop(conn, None)
 
 @asynccontextmanager
-async def get_db_connection():
-    """데이터베이스 연결 컨텍스트 매니저"""
-    if _pool is None:
-        await init_pool()
-    
-    max_retries = 3
-    for attempt in range(max_retries):
+async def get_db_connection(read_only: bool = False, user_id: Optional[str] = None):
+    """
+    데이터베이스 연결 컨텍스트 매니저
+    read_only=True면 읽기 복제본으로 보냅니다. user_id를 넘기면 그 사용자가 방금 쓴 경우 주 서버에서 읽습니다.
+    """
+    shared = _shared_connection()
+    if shared is not None:
+        # 요청 단위 작업 안: 커밋/롤백은 unit_of_work()가 요청 끝에서 한 번만 처리
+        async with shared.cursor(InstrumentedDictCursor) as cursor:
+            yield shared, cursor
+        return
+
+    pool = await get_read_pool(user_id) if read_only else None
+    # 읽기 연결도 커밋/롤백으로 끝내야 다음 사용 시 오래된 스냅샷(REPEATABLE READ)을 보지 않음
+    async with checkout(pool) as conn:
+        async with conn.cursor(InstrumentedDictCursor) as cursor:
+            try:
+                yield conn, cursor
+                await commit(conn)
+            except BaseException:
+                await _safe_rollback(conn)
+                raise
+
+async def _safe_rollback(conn: aiomysql.Connection) -> None:
+    """롤백 (연결이 이미 끊겼으면 체크인 시 제거되도록 닫기만 함)"""
+    discard_after_commit(conn)
+    if conn.closed:
+        return
+    try:
+        await conn.rollback()
+    except Exception as rollback_error:
+        print(f"[DB] 롤백 실패, 연결 제거: {rollback_error}")
+        conn.close()
+
+async def _acquire_healthy(pool: aiomysql.Pool) -> aiomysql.Connection:
+    """
+    풀에서 정상 연결 하나를 꺼냅니다.
+    - DB_PING_IDLE_SECONDS 이상 쉬던 연결은 PING으로 확인하고, 실패하면 그 연결만 제거 후 다시 꺼냄
+    - 연결 생성 실패 같은 연결 계열 오류만 DB_CHECKOUT_RETRIES회까지 재시도
+    """
+    loop = asyncio.get_running_loop()
+    attempts = max(1, settings.DB_CHECKOUT_RETRIES)
+    for attempt in range(attempts):
+        started = loop.time()
+        pool_health.waiting += 1
+        try:
+            conn = await pool.acquire()
+        except Exception as e:
+            if not is_connection_error(e) or attempt == attempts - 1:
+                pool_health.failures += 1
+                raise
+            pool_health.retries += 1
+            print(f"[DB] 연결 획득 실패 ({attempt + 1}/{attempts}), 재시도 중...: {e}")
+            await asyncio.sleep(0.1 * (2 ** attempt))
+            continue
+        finally:
+            pool_health.waiting -= 1
+        pool_health.record_wait(loop.time() - started)
+
+        if loop.time() - conn.last_usage < settings.DB_PING_IDLE_SECONDS:
+            return conn
+        pool_health.pings += 1
         try:
-            async with _pool.acquire() as conn:
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
-                    try:
-                        yield conn, cursor
-                        await conn.commit()
-                        return
-                    except Exception as e:
-                        # 연결 상태를 확인하고 안전하게 rollback
-                        try:
-                            if conn and hasattr(conn, '_closed') and not conn._closed:
-                                await conn.rollback()
-                        except Exception as rollback_error:
-                            print(f"Rollback failed: {rollback_error}")
-                        raise e
+            await conn.ping(reconnect=False)
+            return conn
         except Exception as e:
-            if attempt < max_retries - 1:
-                print(f"[DB] 연결 시도 {attempt + 1} 실패, 재시도 중...: {e}")
-                await recreate_pool()
-                continue
-            else:
-                print(f"[DB] 최대 재시도 횟수 초과: {e}")
+            pool_health.ping_failures += 1
+            pool_health.evicted += 1
+            print(f"[DB] 끊긴 연결 제거: {e}")
+            conn.close()
+            await pool.release(conn)
+            if attempt == attempts - 1:
+                pool_health.failures += 1
                 raise
+            pool_health.retries += 1
+    raise RuntimeError("unreachable")
+
+@asynccontextmanager
+async def checkout(pool: Optional[aiomysql.Pool] = None) -> AsyncGenerator[aiomysql.Connection, None]:
+    """
+    상태 확인된 연결 체크아웃 (커밋/롤백은 호출자 책임, pool을 생략하면 주 서버)
+    블록 안에서 연결 계열 오류나 취소가 발생하면 연결 상태를 알 수 없으므로 그 연결만 제거합니다.
+    """
+    primary = await get_pool()
+    pool = pool or primary
+    replica = None if pool is primary else _replica_of(pool)
+    try:
+        conn = await _acquire_healthy(pool)
+    except Exception as e:
+        if pool is primary or not is_connection_error(e):
+            raise
+        # 복제본 장애 시 쿨다운 동안 건너뛰고 주 서버에서 읽기
+        print(f"[DB] 읽기 복제본 연결 실패, 주 서버 사용: {e}")
+        if replica is not None:
+            read_router.mark_down(replica)
+        read_router.record_fallback()
+        pool, replica = primary, None
+        conn = await _acquire_healthy(pool)
+    if replica is not None:
+        read_router.mark_up(replica)
+    try:
+        yield conn
+    except BaseException as e:
+        if not conn.closed and (isinstance(e, asyncio.CancelledError) or is_connection_error(e)):
+            pool_health.evicted += 1
+            conn.close()
+            if replica is not None and is_connection_error(e):
+                read_router.mark_down(replica)
+        raise
+    finally:
+        discard_after_commit(conn)
+        await pool.release(conn)
+
+def pool_stats() -> Dict[str, Any]:
+    """연결 풀 상태 (사용 중/유휴/대기 시간 등)"""
+    return {
+        **pool_health.stats(_pool),
+        "replicas": [
+            {
+                "host": str(replica),
+                "down": read_router.is_down(replica),
+                "size": replica.pool.size if replica.pool else 0,
+                "in_use": replica.pool.size - replica.pool.freesize if replica.pool else 0,
+                "idle": replica.pool.freesize if replica.pool else 0,
+            }
+            for replica in _replicas
+        ],
+        "routing": read_router.stats(),
+    }
 
 async def get_db() -> AsyncGenerator[tuple[aiomysql.Connection, aiomysql.DictCursor], None]:
     """
@@ -107,15 +318,15 @@ async def get_db() -> AsyncGenerator[tuple[aiomysql.Connection, aiomysql.DictCur
         yield conn, cursor
 
 # 유틸리티 함수들
-async def execute_query(query: str, params: tuple = None) -> List[Dict[str, Any]]:
-    """SELECT 쿼리 실행"""
-    async with get_db_connection() as (conn, cursor):
+async def execute_query(query: str, params: tuple = None, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """SELECT 쿼리 실행 (읽기 복제본)"""
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
         await cursor.execute(query, params)
         return await cursor.fetchall()
 
-async def execute_one(query: str, params: tuple = None) -> Optional[Dict[str, Any]]:
-    """SELECT 쿼리 실행 (단일 결과)"""
-    async with get_db_connection() as (conn, cursor):
+async def execute_one(query: str, params: tuple = None, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """SELECT 쿼리 실행 (단일 결과, 읽기 복제본)"""
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
         await cursor.execute(query, params)
         return await cursor.fetchone()
 
@@ -0,0 +1,127 @@
+"""
+읽기 전용 복제본(read replica) 라우팅
+
+- DB_READ_HOSTS에 복제본을 지정하면 읽기 전용 조회는 복제본 풀로 라운드로빈 분산합니다.
+- 사용자가 직접 쓴 직후 DB_READ_STICKY_SECONDS 동안은 그 사용자의 읽기를 쓰기(주) 서버로 보내
+  복제 지연 때문에 방금 쓴 일기/식물이 목록에서 안 보이는 일을 막습니다. (read-your-writes)
+- 쓰기 기록은 services.user_stats의 변경 훅(diary_changed 등)에서 mark_written()으로 남깁니다.
+- 연결에 실패한 복제본(시작 시 실패 포함)은 DB_READ_COOLDOWN_SECONDS 동안 건너뛰고,
+  쿨다운이 끝나면 요청 하나만 보내 다시 확인합니다. 성공하면 복구, 실패하면 다시 쿨다운.
+- 고착/장애 정보는 프로세스 메모리에만 있으므로 워커가 여러 개면 워커별로 따로 판단합니다.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.config import settings
+
+# 고착 기록이 이 수를 넘으면 만료된 항목을 정리
+_PRUNE_THRESHOLD = 10000
+
+
+def parse_read_hosts(value: str, default_port: int) -> List[Tuple[str, int]]:
+    """"host1,host2:3307" → [("host1", default_port), ("host2", 3307)]"""
+    hosts: List[Tuple[str, int]] = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(":")
+        hosts.append((host, int(port) if port else default_port))
+    return hosts
+
+
+class ReadRouter:
+    """읽기 요청을 복제본/주 서버 중 어디로 보낼지 결정"""
+
+    def __init__(self) -> None:
+        self._written_at: Dict[str, float] = {}
+        self._next = 0
+        self._replica_reads = 0
+        self._primary_reads = 0
+        self._sticky_reads = 0
+        self._fallbacks = 0
+        self._down_until: Dict[Any, float] = {}   # 복제본 → 다시 확인할 시각
+        self._down_reads = 0
+        self._probes = 0
+        self._replica_failures = 0
+
+    def mark_written(self, user_id: Optional[str]) -> None:
+        """사용자의 쓰기 시점 기록 (이후 일정 시간 읽기를 주 서버로 고정)"""
+        if not user_id or settings.DB_READ_STICKY_SECONDS <= 0:
+            return
+        now = time.monotonic()
+        if len(self._written_at) >= _PRUNE_THRESHOLD:
+            cutoff = now - settings.DB_READ_STICKY_SECONDS
+            self._written_at = {k: v for k, v in self._written_at.items() if v > cutoff}
+        self._written_at[user_id] = now
+
+    def is_sticky(self, user_id: Optional[str]) -> bool:
+        if not user_id:
+            return False
+        written = self._written_at.get(user_id)
+        if written is None:
+            return False
+        if time.monotonic() - written < settings.DB_READ_STICKY_SECONDS:
+            return True
+        self._written_at.pop(user_id, None)
+        return False
+
+    def pick(self, replicas: Sequence[Any], user_id: Optional[str] = None) -> Optional[Any]:
+        """읽을 복제본 반환 (None이면 주 서버 사용, 쿨다운 중인 복제본은 건너뜀)"""
+        if not replicas:
+            self._primary_reads += 1
+            return None
+        if self.is_sticky(user_id):
+            self._sticky_reads += 1
+            return None
+        now = time.monotonic()
+        for _ in range(len(replicas)):
+            replica = replicas[self._next % len(replicas)]
+            self._next += 1
+            down_until = self._down_until.get(replica)
+            if down_until is not None:
+                if now < down_until:
+                    continue
+                # 쿨다운이 끝난 복제본은 이 요청으로 확인 (결과가 나올 때까지 다른 요청은 계속 건너뜀)
+                self._down_until[replica] = now + settings.DB_READ_COOLDOWN_SECONDS
+                self._probes += 1
+            self._replica_reads += 1
+            return replica
+        # 모든 복제본이 쿨다운 중
+        self._down_reads += 1
+        return None
+
+    def mark_down(self, replica: Any) -> None:
+        """복제본 연결 실패 기록 (DB_READ_COOLDOWN_SECONDS 동안 건너뜀)"""
+        self._replica_failures += 1
+        self._down_until[replica] = time.monotonic() + settings.DB_READ_COOLDOWN_SECONDS
+
+    def mark_up(self, replica: Any) -> None:
+        """복제본 연결 성공 (쿨다운 해제)"""
+        self._down_until.pop(replica, None)
+
+    def is_down(self, replica: Any) -> bool:
+        return replica in self._down_until
+
+    def record_fallback(self) -> None:
+        """복제본 연결 실패로 주 서버에서 읽은 경우"""
+        self._fallbacks += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replica_reads": self._replica_reads,
+            "primary_reads": self._primary_reads,
+            "sticky_reads": self._sticky_reads,
+            "fallbacks": self._fallbacks,
+            "down_reads": self._down_reads,
+            "probes": self._probes,
+            "replica_failures": self._replica_failures,
+            "replicas_down": len(self._down_until),
+            "sticky_users": len(self._written_at),
+        }
+
+
+# 싱글톤 인스턴스
+read_router = ReadRouter()
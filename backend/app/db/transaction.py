@@ -1,40 +1,85 @@
 """
 트랜잭션 헬퍼
 """
+import asyncio
+import functools
 import aiomysql
-from typing import AsyncGenerator, Any, Dict
+from typing import AsyncGenerator, Any, Awaitable, Callable, Dict
 from contextlib import asynccontextmanager
-from .pool import get_pool
+from .instrument import InstrumentedDictCursor
+from .pool import checkout, commit, discard_after_commit, request_connection
 
 @asynccontextmanager
 async def get_connection() -> AsyncGenerator[aiomysql.Connection, None]:
     """데이터베이스 연결 획득"""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    async with checkout() as conn:
         yield conn
 
 @asynccontextmanager
 async def get_cursor() -> AsyncGenerator[aiomysql.Cursor, None]:
     """커서 획득 (자동 커밋)"""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    async with checkout() as conn:
         try:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
+            async with conn.cursor(InstrumentedDictCursor) as cursor:
                 yield cursor
-                await conn.commit()  # 자동 커밋
+                await commit(conn)  # 자동 커밋
         except Exception:
+            discard_after_commit(conn)
             await conn.rollback()  # 오류 시 롤백
             raise
 
 @asynccontextmanager
 async def transaction() -> AsyncGenerator[aiomysql.Connection, None]:
     """트랜잭션 컨텍스트"""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    async with checkout() as conn:
         try:
             await conn.begin()
             yield conn
-            await conn.commit()
+            await commit(conn)
         except Exception:
+            discard_after_commit(conn)
             await conn.rollback()
             raise
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[aiomysql.Connection, None]:
+    """
+    요청 단위 작업 (연결 1개, 커밋 1회)
+
+    블록 안에서 호출되는 저장소 함수의 get_db_connection()은 모두 이 연결을 공유합니다.
+    정상 종료 시 한 번 커밋하고, 예외가 나면 롤백한 뒤 연결을 풀에 반환합니다.
+    블록 안에서 등록한 after_commit 콜백(캐시 무효화)은 이 커밋 뒤에 한 번에 실행됩니다.
+    이미 요청 단위 작업 안이면 바깥 작업에 합류합니다.
+    """
+    current = request_connection.get()
+    if current is not None and current[1] is asyncio.current_task() and not current[0].closed:
+        yield current[0]
+        return
+
+    async with checkout() as conn:
+        token = request_connection.set((conn, asyncio.current_task()))
+        try:
+            yield conn
+            await commit(conn)
+        except BaseException:
+            discard_after_commit(conn)
+            if not conn.closed:
+                await conn.rollback()
+            raise
+        finally:
+            request_connection.reset(token)
+
+def in_unit_of_work(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    라우터 핸들러를 요청 단위 작업으로 감싸는 데코레이터
+    (functools.wraps로 시그니처를 유지하므로 FastAPI 파라미터 해석에 영향 없음)
+
+        @router.get("/{plant_idx}")
+        @in_unit_of_work
+        async def handler(...): ...
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        async with unit_of_work():
+            return await func(*args, **kwargs)
+    return wrapper
@@ -14,11 +14,13 @@ from repositories.plant_detail import (
     get_plant_detail_summary,
     get_plant_species_info
 )
+from db.transaction import in_unit_of_work
 from services.auth_service import get_current_user
 
 router = APIRouter(prefix="/plant-detail", tags=["plant-detail"])
 
 @router.get("/{plant_idx}", response_model=PlantDetailResponse)
+@in_unit_of_work
 async def get_plant_detail_info(
     plant_idx: int, 
     user: dict = Depends(get_current_user)
@@ -39,6 +41,7 @@ async def get_plant_detail_info(
         )
 
 @router.get("/{plant_idx}/summary", response_model=PlantDetailSummaryResponse)
+@in_unit_of_work
 async def get_plant_detail_summary_info(plant_idx: int, user_id: str):
     """
     식물의 상세 요약 정보를 조회합니다.
@@ -56,6 +59,7 @@ async def get_plant_detail_summary_info(plant_idx: int, user_id: str):
         )
 
 @router.put("/{plant_idx}")
+@in_unit_of_work
 async def update_plant_detail_info(plant_idx: int, user_id: str, update_data: PlantUpdateRequest):
     """
     식물 정보를 수정합니다.
@@ -88,6 +92,7 @@ async def update_plant_detail_info(plant_idx: int, user_id: str, update_data: Pl
         )
 
 @router.delete("/{plant_idx}")
+@in_unit_of_work
 async def delete_plant_detail(plant_idx: int, user_id: str, delete_request: PlantDeleteRequest):
     """
     식물을 삭제합니다.
@@ -118,6 +123,7 @@ async def delete_plant_detail(plant_idx: int, user_id: str, delete_request: Plan
         )
 
 @router.get("/{plant_idx}/health-check")
+@in_unit_of_work
 async def plant_detail_health_check(plant_idx: int, user_id: str):
     """
     식물 상세 정보 API 상태 확인
@@ -131,6 +137,7 @@ async def plant_detail_health_check(plant_idx: int, user_id: str):
     }
 
 @router.get("/{plant_idx}/species-info", response_model=PlantSpeciesInfoResponse)
+@in_unit_of_work
 async def get_plant_species_info_endpoint(plant_idx: int, user_id: str):
     """
     식물의 품종 정보를 plant_wiki에서 조회합니다.
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, HTTPException, Depends
+from schemas.device import PlantDeviceRequest, PlantDeviceResponse, PlantDeviceListResponse
+from repositories.device import (
+    DEVICE_FORBIDDEN,
+    DEVICE_NOT_FOUND,
+    claim_plant_device,
+    list_user_plant_devices,
+    delete_plant_device,
+    user_owns_plant
+)
+from core.config import settings
+from services.auth_service import get_current_user
+
+router = APIRouter(prefix="/devices", tags=["devices"])
+
+@router.get("", response_model=PlantDeviceListResponse)
+async def get_my_plant_devices(user: dict = Depends(get_current_user)):
+    """
+    현재 로그인한 사용자의 식물별 습도 센서 연결 현황을 조회합니다.
+    연결된 센서가 없는 식물은 공통 센서(DEFAULT_DEVICE_ID)를 사용합니다.
+    """
+    try:
+        rows = await list_user_plant_devices(user["user_id"])
+        return PlantDeviceListResponse(
+            user_id=user["user_id"],
+            devices=[PlantDeviceResponse(**row) for row in rows]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"센서 연결 현황 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@router.put("/plants/{plant_id}", response_model=PlantDeviceResponse)
+async def connect_plant_device(
+    plant_id: int,
+    request: PlantDeviceRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    식물에 습도 센서를 연결합니다. 이미 연결된 센서가 있으면 교체합니다.
+    등록된 센서 중 내 센서이거나 아직 소유자가 없는 센서만 연결할 수 있습니다.
+    """
+    try:
+        plant = await user_owns_plant(user["user_id"], plant_id)
+        if not plant:
+            raise HTTPException(status_code=404, detail="식물을 찾을 수 없습니다.")
+        
+        result = await claim_plant_device(user["user_id"], plant_id, request.device_id)
+        if result == DEVICE_NOT_FOUND:
+            raise HTTPException(status_code=404, detail="등록되지 않은 센서입니다.")
+        if result == DEVICE_FORBIDDEN:
+            raise HTTPException(status_code=403, detail="다른 사용자의 센서입니다.")
+        return PlantDeviceResponse(
+            plant_id=plant_id,
+            plant_name=plant["plant_name"],
+            device_id=request.device_id,
+            is_registered=True
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"센서 연결 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@router.delete("/plants/{plant_id}", response_model=PlantDeviceResponse)
+async def disconnect_plant_device(plant_id: int, user: dict = Depends(get_current_user)):
+    """
+    식물의 습도 센서 연결을 해제합니다. 이후에는 공통 센서를 사용합니다.
+    """
+    try:
+        plant = await user_owns_plant(user["user_id"], plant_id)
+        if not plant:
+            raise HTTPException(status_code=404, detail="식물을 찾을 수 없습니다.")
+        
+        await delete_plant_device(plant_id)
+        return PlantDeviceResponse(
+            plant_id=plant_id,
+            plant_name=plant["plant_name"],
+            device_id=settings.DEFAULT_DEVICE_ID,
+            is_registered=False
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"센서 연결 해제 중 오류가 발생했습니다: {str(e)}"
+        )
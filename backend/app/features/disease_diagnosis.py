@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from typing import Optional
 from datetime import date, datetime
-import aiomysql
 
 from schemas.disease_diagnosis import (
     DiseaseDiagnosisResponse,
@@ -12,8 +11,10 @@ from schemas.disease_diagnosis import (
 )
 from clients.disease_diagnosis import diagnose_disease_from_image
 from services.image_service import save_uploaded_image
-from db.pool import get_db_connection
+from db.pool import after_commit, get_db_connection
+from db.instrument import InstrumentedDictCursor
 from services.auth_service import get_current_user
+from services.user_stats import user_stats
 
 router = APIRouter(prefix="/disease-diagnosis", tags=["disease-diagnosis"])
 
@@ -103,7 +104,7 @@ async def get_user_plants_for_diagnosis(
     내 식물인지 아닌지 선택할 때 사용하는 API입니다.
     """
     try:
-        async with db.cursor(aiomysql.DictCursor) as cursor:
+        async with db.cursor(InstrumentedDictCursor) as cursor:
             await cursor.execute(
                 """
                 SELECT 
@@ -375,6 +376,7 @@ async def save_disease_diagnosis(
                     )
                 )
                 diagnosis_id = cursor.lastrowid
+                after_commit(conn, user_stats.pest_changed, user["user_id"])
                 print(f"[DEBUG] 1순위 진단 기록 저장 완료: {prediction['class_name']}")
             else:
                 print(f"[WARNING] predictions_list가 비어있음 - 저장할 진단 결과가 없습니다.")
@@ -438,7 +440,7 @@ async def get_pest_info(
     병충해 이름으로 상세 정보를 조회합니다.
     """
     try:
-        async with db.cursor(aiomysql.DictCursor) as cursor:
+        async with db.cursor(InstrumentedDictCursor) as cursor:
             await cursor.execute(
                 """
                 SELECT 
@@ -496,7 +498,7 @@ async def get_recent_diagnoses(
     최근 병충해 진단 기록을 조회합니다.
     """
     try:
-        async with db.cursor(aiomysql.DictCursor) as cursor:
+        async with db.cursor(InstrumentedDictCursor) as cursor:
             await cursor.execute(
                 """
                 SELECT 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, UploadFile, File, Form
 from typing import List, Optional
 from datetime import datetime
 import aiomysql
@@ -12,6 +12,7 @@ from schemas.medical import (
 )
 from repositories.medical import (
     get_user_medical_diagnoses,
+    list_user_medical_diagnoses_by_cursor,
     get_medical_diagnosis_by_id,
     create_medical_diagnosis,
     update_medical_diagnosis,
@@ -22,6 +23,8 @@ from repositories.medical import (
 from db.pool import get_db_connection
 from services.auth_service import get_current_user
 from services.image_service import save_uploaded_image
+from services.user_stats import user_stats
+from utils.pagination import InvalidCursor
 
 router = APIRouter(prefix="/medical", tags=["medical"])
 
@@ -61,26 +64,41 @@ def _to_detail_response(diagnosis, related_diagnoses: List = None) -> MedicalDia
 
 @router.get("/diagnoses", response_model=List[MedicalDiagnosisListResponse])
 async def get_medical_diagnoses(
+    response: Response,
     limit: int = Query(50, ge=1, le=100, description="조회할 진단 기록 수"),
     offset: int = Query(0, ge=0, description="건너뛸 진단 기록 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 X-Next-Cursor 헤더)"),
     user: dict = Depends(get_current_user)
 ):
     """
     사용자의 모든 병충해 진단 기록을 조회합니다.
     
     - **limit**: 조회할 진단 기록 수 (기본값: 50, 최대: 100)
-    - **offset**: 건너뛸 진단 기록 수 (기본값: 0)
+    - **offset**: 건너뛸 진단 기록 수 (기본값: 0, 하위 호환용)
+    - **cursor**: 다음 페이지 커서
     - 최신 진단 날짜 순으로 정렬됩니다.
+    - 응답 본문은 기존과 같은 배열이며, 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 전달합니다.
     """
     try:
-        print(f"[DEBUG] 진단 목록 조회 시작 - user_id: {user['user_id']}, limit: {limit}, offset: {offset}")
-        async with get_db_connection() as (conn, cursor):
-            diagnoses = await get_user_medical_diagnoses(
-                db=(conn, cursor),
-                user_id=user["user_id"],
-                limit=limit,
-                offset=offset
-            )
+        print(f"[DEBUG] 진단 목록 조회 시작 - user_id: {user['user_id']}, limit: {limit}, offset: {offset}, cursor: {cursor}")
+        async with get_db_connection() as (conn, db_cursor):
+            if offset and not cursor:
+                # 기존 offset 방식 (하위 호환)
+                diagnoses = await get_user_medical_diagnoses(
+                    db=(conn, db_cursor),
+                    user_id=user["user_id"],
+                    limit=limit,
+                    offset=offset
+                )
+            else:
+                diagnoses, next_cursor = await list_user_medical_diagnoses_by_cursor(
+                    db=(conn, db_cursor),
+                    user_id=user["user_id"],
+                    limit=limit,
+                    cursor=cursor
+                )
+                if next_cursor:
+                    response.headers["X-Next-Cursor"] = next_cursor
         print(f"[DEBUG] 조회된 진단 수: {len(diagnoses)}")
         for i, diagnosis in enumerate(diagnoses):
             print(f"[DEBUG] 진단 {i}: plant_name={diagnosis.plant_name}, plant_species={diagnosis.plant_species}, pest_date={diagnosis.pest_date}, diagnosis_image_url={diagnosis.diagnosis_image_url}")
@@ -88,6 +106,8 @@ async def get_medical_diagnoses(
         result = [_to_list_response(diagnosis) for diagnosis in diagnoses]
         print(f"[DEBUG] 변환된 응답 수: {len(result)}")
         return result
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         print(f"[DEBUG] 진단 목록 조회 오류: {e}")
         import traceback
@@ -177,6 +197,7 @@ async def create_medical_diagnosis_record(
                 pest_date=diagnosis_data.pest_date,
                 diagnosis_image_url=diagnosis_data.diagnosis_image_url
             )
+        user_stats.pest_changed(user["user_id"])
         
         return _to_detail_response(diagnosis)
     except HTTPException:
@@ -241,6 +262,7 @@ async def create_medical_diagnosis_with_image(
                 pest_date=parsed_date,
                 diagnosis_image_url=img_url
             )
+        user_stats.pest_changed(user["user_id"])
         
         return _to_detail_response(diagnosis)
     except HTTPException:
@@ -442,6 +464,7 @@ async def delete_medical_diagnosis(
             
             print(f"[DEBUG] 진단 기록 삭제 완료 - diagnosis_id: {diagnosis_id}")
             
+        user_stats.pest_changed(user["user_id"])
         return {
             "success": True,
             "message": f"진단 기록이 성공적으로 삭제되었습니다. (ID: {diagnosis_id})"
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 from schemas.plant_detail import (
     PlantPestRecordResponse, 
     HealthStatusResponse, 
@@ -14,10 +14,12 @@ from repositories.plant_detail import (
     get_plant_pest_records_by_user_plant,
     add_plant_pest_record
 )
+from db.transaction import in_unit_of_work
 
 router = APIRouter(prefix="/plant-detail", tags=["plant-detail-pest"])
 
 @router.get("/{plant_idx}/pest-records", response_model=List[PlantPestRecordResponse])
+@in_unit_of_work
 async def get_plant_pest_record_list(plant_idx: int, user_id: str):
     """
     특정 식물의 병해충 기록을 조회합니다.
@@ -32,13 +34,21 @@ async def get_plant_pest_record_list(plant_idx: int, user_id: str):
         )
 
 @router.get("/{plant_idx}/humidity-history")
-async def get_plant_humidity_history_info(plant_idx: int, user_id: str, limit: int = 7):
+@in_unit_of_work
+async def get_plant_humidity_history_info(
+    plant_idx: int,
+    user_id: str,
+    limit: int = 7,
+    days: Optional[int] = Query(None, ge=1, le=3650, description="최근 n일 구간 조회 (지정 시 해상도 자동 선택)"),
+    resolution: Optional[str] = Query(None, pattern="^(raw|hourly|daily)$"),
+):
     """
     특정 식물의 습도 기록을 조회합니다.
     습도 지수 n% 증가 시 물준날로 기록하는 기능과 연동할 수 있습니다.
+    days를 지정하면 구간 길이에 따라 원본/시간/일 집계 중 적절한 해상도로 반환합니다.
     """
     try:
-        humidity_history = await get_plant_humidity_history(plant_idx, user_id, limit)
+        humidity_history = await get_plant_humidity_history(plant_idx, user_id, limit, days, resolution)
         
         # 습도 변화 분석
         humidity_analysis = {
@@ -73,6 +83,7 @@ async def get_plant_humidity_history_info(plant_idx: int, user_id: str, limit: i
         )
 
 @router.get("/{plant_idx}/health-status", response_model=HealthStatusResponse)
+@in_unit_of_work
 async def get_plant_health_status(plant_idx: int, user_id: str, leaf_health_score: float = None):
     """
     식물의 종합적인 건강상태를 분석합니다.
@@ -88,6 +99,7 @@ async def get_plant_health_status(plant_idx: int, user_id: str, leaf_health_scor
         )
 
 @router.post("/{plant_idx}/health-analysis", response_model=HealthStatusResponse)
+@in_unit_of_work
 async def analyze_plant_health_with_ai(plant_idx: int, user_id: str, analysis_request: HealthAnalysisRequest):
     """
     AI 모델 결과를 포함하여 식물의 건강상태를 분석합니다.
@@ -112,6 +124,7 @@ async def analyze_plant_health_with_ai(plant_idx: int, user_id: str, analysis_re
         )
 
 @router.get("/{plant_idx}/health-summary")
+@in_unit_of_work
 async def get_plant_health_summary(plant_idx: int, user_id: str):
     """
     식물의 건강상태 요약 정보를 조회합니다.
@@ -158,6 +171,7 @@ async def get_plant_health_summary(plant_idx: int, user_id: str):
         )
 
 @router.get("/{plant_idx}/pest-records/user-plant", response_model=List[PlantPestRecordResponse])
+@in_unit_of_work
 async def get_user_plant_pest_records(plant_idx: int, user_id: str):
     """
     특정 유저의 특정 식물에 대한 병충해 기록을 조회합니다.
@@ -173,6 +187,7 @@ async def get_user_plant_pest_records(plant_idx: int, user_id: str):
         )
 
 @router.post("/{plant_idx}/pest-records", response_model=PlantPestRecordAddResponse)
+@in_unit_of_work
 async def add_plant_pest_record_endpoint(plant_idx: int, user_id: str, pest_request: PlantPestRecordRequest):
     """
     식물에 병충해 기록을 추가합니다.
@@ -22,6 +22,7 @@ from repositories.plant_registration import (
     search_plants,
     save_plant_image_to_db
 )
+from repositories.device import DEVICE_NOT_FOUND, DeviceClaimError
 from clients.species_classification import (
     classify_plant_species,
     get_species_korean_name,
@@ -31,6 +32,10 @@ from clients.species_classification import (
 from services.image_service import save_uploaded_image
 from services.auth_service import get_current_user
 from db.pool import get_db_connection
+from core.config import settings
+from repositories.device import get_device_ids
+from repositories.humid import get_latest_humidity_by_devices
+from utils.pagination import InvalidCursor
 
 router = APIRouter(prefix="/plants", tags=["plant-registration"])
 
@@ -97,6 +102,7 @@ async def register_plant(
     species: Optional[str] = Form(None),
     meet_day: date = Form(...),
     plant_id: Optional[int] = Form(None),
+    device_id: Optional[int] = Form(None),
     image: Optional[UploadFile] = File(None),
     user: dict = Depends(get_current_user)
 ):
@@ -108,6 +114,7 @@ async def register_plant(
     - **species**: 식물 품종 (선택사항)
     - **meet_day**: 키우기 시작한 날 (필수)
     - **plant_id**: 식물 위키 ID (선택사항)
+    - **device_id**: 연결할 습도 센서 ID (선택사항)
     - **image**: 식물 이미지 (선택사항)
     """
     try:
@@ -157,7 +164,8 @@ async def register_plant(
             location=location,
             species=species,
             meet_day=meet_day,
-            plant_id=plant_id
+            plant_id=plant_id,
+            device_id=device_id
         )
         
         print(f"[DEBUG] 식물 등록 요청: {plant_request}")
@@ -174,6 +182,10 @@ async def register_plant(
         
         return result
         
+    except DeviceClaimError as e:
+        if e.reason == DEVICE_NOT_FOUND:
+            raise HTTPException(status_code=404, detail="등록되지 않은 센서입니다.")
+        raise HTTPException(status_code=403, detail="다른 사용자의 센서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -184,6 +196,8 @@ async def register_plant(
 async def get_plants(
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -191,10 +205,16 @@ async def get_plants(
     
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
+    - **cursor**: 다음 페이지 커서 (지정 시 page 무시)
+    - **include_total**: false면 전체 개수 계산 생략
     """
     try:
-        result = await get_user_plants(user["user_id"], page, limit)
+        result = await get_user_plants(
+            user["user_id"], page, limit, cursor=cursor, include_total=include_total
+        )
         return result
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -206,6 +226,8 @@ async def search_user_plants(
     q: str = Query(..., min_length=1, description="검색어"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -214,10 +236,15 @@ async def search_user_plants(
     - **q**: 검색어 (필수) - 식물명 또는 품종에서 검색
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
+    - **cursor**: 다음 페이지 커서 (지정 시 page 무시)
     """
     try:
-        result = await search_plants(user["user_id"], q, page, limit)
+        result = await search_plants(
+            user["user_id"], q, page, limit, cursor=cursor, include_total=include_total
+        )
         return result
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -629,6 +656,60 @@ async def get_plant_diaries(
             detail=f"일기 목록 조회 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.get("/humidity/batch")
+async def get_plants_humidity_batch(
+    user: dict = Depends(get_current_user)
+):
+    """
+    사용자의 모든 식물에 대한 습도 데이터를 일괄 조회합니다.
+    각 식물에 연결된 센서의 최신 값을 사용합니다. (센서 조회/습도 조회 각 1회)
+    
+    - **기본값**: 습도 데이터가 없으면 50% 반환
+    """
+    try:
+        print(f"[DEBUG] 식물들 습도 일괄 조회 - user: {user['user_id']}")
+        
+        async with get_db_connection() as (conn, cursor):
+            await cursor.execute(
+                """
+                SELECT plant_id, plant_name
+                FROM user_plant
+                WHERE user_id = %s
+                ORDER BY plant_id
+                """,
+                (user['user_id'],)
+            )
+            plants = await cursor.fetchall()
+        
+        device_map = await get_device_ids(p['plant_id'] for p in plants)
+        latest_by_device = await get_latest_humidity_by_devices(device_map.values())
+        print(f"[DEBUG] 습도 일괄 조회 결과: {len(plants)}개 식물, {len(latest_by_device)}개 센서")
+        
+        humidity_data = []
+        for plant in plants:
+            device_id = device_map[plant['plant_id']]
+            latest = latest_by_device.get(device_id)
+            humidity_data.append({
+                "plant_id": plant['plant_id'],
+                "plant_name": plant['plant_name'],
+                "humidity": latest['humidity'] if latest else 50,  # 기본값
+                "humid_date": latest['humid_date'].strftime("%Y-%m-%d %H:%M:%S") if latest and latest['humid_date'] else None,
+                "device_id": device_id,
+                "has_data": latest is not None
+            })
+        
+        return {
+            "plants": humidity_data,
+            "count": len(humidity_data)
+        }
+                
+    except Exception as e:
+        print(f"[ERROR] 습도 일괄 조회 중 오류: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"습도 일괄 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
 @router.get("/humidity/{plant_id}")
 async def get_plant_humidity(
     plant_id: int,
@@ -644,22 +725,25 @@ async def get_plant_humidity(
         print(f"[DEBUG] 식물 습도 조회 - plant_id: {plant_id}, user: {user['user_id']}")
         
         async with get_db_connection() as (conn, cursor):
-            # 사용자가 해당 식물에 대한 권한이 있는지 확인
+            # 사용자가 해당 식물에 대한 권한이 있는지 확인 + 연결된 센서 조회
             await cursor.execute(
                 """
-                SELECT plant_id FROM user_plant 
-                WHERE plant_id = %s AND user_id = %s
+                SELECT up.plant_id, COALESCE(pd.device_id, %s) AS device_id
+                FROM user_plant up
+                LEFT JOIN plant_device pd ON pd.plant_id = up.plant_id
+                WHERE up.plant_id = %s AND up.user_id = %s
                 """,
-                (plant_id, user['user_id'])
+                (settings.DEFAULT_DEVICE_ID, plant_id, user['user_id'])
             )
             
-            if not await cursor.fetchone():
+            plant = await cursor.fetchone()
+            if not plant:
                 raise HTTPException(
                     status_code=403,
                     detail="해당 식물에 대한 권한이 없습니다."
                 )
             
-            # 해당 식물의 최근 습도 데이터 조회 (humid 테이블에서 직접 조회, device_id=1 공통 사용)
+            # 해당 식물 센서의 최근 습도 데이터 조회
             await cursor.execute(
                 """
                 SELECT 
@@ -667,11 +751,11 @@ async def get_plant_humidity(
                     h.humid_date,
                     h.device_id
                 FROM humid h
-                WHERE h.device_id = 1
+                WHERE h.device_id = %s
                 ORDER BY h.humid_date DESC
                 LIMIT 1
                 """,
-                (plant_id,)
+                (plant['device_id'],)
             )
             
             result = await cursor.fetchone()
@@ -691,7 +775,7 @@ async def get_plant_humidity(
                     "plant_id": plant_id,
                     "humidity": 50,  # 기본값
                     "humid_date": None,
-                    "device_id": None,
+                    "device_id": plant['device_id'],
                     "has_data": False
                 }
                 
@@ -703,64 +787,3 @@ async def get_plant_humidity(
             status_code=500,
             detail=f"습도 조회 중 오류가 발생했습니다: {str(e)}"
         )
-
-@router.get("/humidity/batch")
-async def get_plants_humidity_batch(
-    user: dict = Depends(get_current_user)
-):
-    """
-    사용자의 모든 식물에 대한 습도 데이터를 일괄 조회합니다.
-    
-    - **기본값**: 습도 데이터가 없으면 50% 반환
-    """
-    try:
-        print(f"[DEBUG] 식물들 습도 일괄 조회 - user: {user['user_id']}")
-        
-        async with get_db_connection() as (conn, cursor):
-            # 사용자의 모든 식물과 공통 습도 데이터 조회
-            await cursor.execute(
-                """
-                SELECT 
-                    up.plant_id,
-                    up.plant_name,
-                    h.humidity,
-                    h.humid_date,
-                    h.device_id
-                FROM user_plant up
-                LEFT JOIN humid h ON h.device_id = 1
-                WHERE up.user_id = %s
-                AND (h.humid_date IS NULL OR h.humid_date = (
-                    SELECT MAX(h2.humid_date) 
-                    FROM humid h2 
-                    WHERE h2.device_id = 1
-                ))
-                ORDER BY up.plant_id
-                """,
-                (user['user_id'],)
-            )
-            
-            results = await cursor.fetchall()
-            print(f"[DEBUG] 습도 일괄 조회 결과: {len(results)}개")
-            
-            humidity_data = []
-            for result in results:
-                humidity_data.append({
-                    "plant_id": result['plant_id'],
-                    "plant_name": result['plant_name'],
-                    "humidity": result['humidity'] if result['humidity'] is not None else 50,  # 기본값
-                    "humid_date": result['humid_date'].strftime("%Y-%m-%d %H:%M:%S") if result['humid_date'] else None,
-                    "device_id": result['device_id'],
-                    "has_data": result['humidity'] is not None
-                })
-            
-            return {
-                "plants": humidity_data,
-                "count": len(humidity_data)
-            }
-                
-    except Exception as e:
-        print(f"[ERROR] 습도 일괄 조회 중 오류: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"습도 일괄 조회 중 오류가 발생했습니다: {str(e)}"
-        )
@@ -9,12 +9,13 @@ from schemas.plant_detail import (
     WateringPredictionResponse
 )
 from repositories.plant_detail import (
-    check_humidity_increase_and_record_watering,
+    get_watering_detection_status,
     get_watering_records,
     record_manual_watering,
     update_watering_settings,
     get_watering_settings
 )
+from db.transaction import in_unit_of_work
 from clients.humidity_prediction import humidity_client
 from services.auth_service import get_current_user
 from fastapi import Depends
@@ -55,12 +56,14 @@ def calculate_default_watering_time(current_humidity: float, min_humidity: float
     return max(0.5, adjusted_hours)  # 최소 30분
 
 @router.post("/{plant_idx}/check-humidity-watering")
+@in_unit_of_work
 async def check_humidity_and_record_watering(plant_idx: int, user_id: str):
     """
-    습도 증가를 확인하고 10% 이상 증가 시 자동으로 물주기 기록을 생성합니다.
+    자동 물주기 감지 결과를 조회합니다.
+    감지/기록은 MQTT 적재 시 수행되므로 이 엔드포인트는 기록을 새로 만들지 않습니다.
     """
     try:
-        result = await check_humidity_increase_and_record_watering(plant_idx, user_id)
+        result = await get_watering_detection_status(plant_idx, user_id)
         return result
     except Exception as e:
         raise HTTPException(
@@ -69,6 +72,7 @@ async def check_humidity_and_record_watering(plant_idx: int, user_id: str):
         )
 
 @router.get("/{plant_idx}/watering-records", response_model=List[WateringRecordResponse])
+@in_unit_of_work
 async def get_plant_watering_records(plant_idx: int, user_id: str, limit: int = 10):
     """
     특정 식물의 물주기 기록을 조회합니다.
@@ -83,6 +87,7 @@ async def get_plant_watering_records(plant_idx: int, user_id: str, limit: int =
         )
 
 @router.post("/{plant_idx}/watering-records", response_model=WateringRecordResponse)
+@in_unit_of_work
 async def create_manual_watering_record(plant_idx: int, user_id: str, watering_request: WateringRecordRequest):
     """
     수동으로 물주기 기록을 생성합니다.
@@ -103,6 +108,7 @@ async def create_manual_watering_record(plant_idx: int, user_id: str, watering_r
         )
 
 @router.get("/{plant_idx}/watering-summary")
+@in_unit_of_work
 async def get_watering_summary(plant_idx: int, user_id: str):
     """
     식물의 물주기 요약 정보를 조회합니다.
@@ -111,8 +117,8 @@ async def get_watering_summary(plant_idx: int, user_id: str):
         # 최근 물주기 기록 조회
         watering_records = await get_watering_records(plant_idx, user_id, limit=5)
         
-        # 습도 증가 확인
-        humidity_check = await check_humidity_increase_and_record_watering(plant_idx, user_id)
+        # 자동 감지 결과 확인 (사전 계산된 이벤트 조회)
+        humidity_check = await get_watering_detection_status(plant_idx, user_id)
         
         # 통계 계산
         total_watering = len(watering_records)
@@ -139,13 +145,14 @@ async def get_watering_summary(plant_idx: int, user_id: str):
         )
 
 @router.get("/{plant_idx}/watering-status")
+@in_unit_of_work
 async def get_watering_status(plant_idx: int, user_id: str):
     """
     식물의 물주기 상태를 확인합니다.
     """
     try:
-        # 습도 증가 확인
-        humidity_check = await check_humidity_increase_and_record_watering(plant_idx, user_id)
+        # 자동 감지 결과 확인 (사전 계산된 이벤트 조회)
+        humidity_check = await get_watering_detection_status(plant_idx, user_id)
         
         # 최근 물주기 기록 조회
         recent_watering = await get_watering_records(plant_idx, user_id, limit=1)
@@ -181,6 +188,7 @@ async def get_watering_status(plant_idx: int, user_id: str):
         )
 
 @router.get("/{plant_idx}/watering-settings", response_model=WateringSettingsResponse)
+@in_unit_of_work
 async def get_plant_watering_settings(plant_idx: int, user_id: str):
     """
     식물의 현재 물주기 설정을 조회합니다.
@@ -198,6 +206,7 @@ async def get_plant_watering_settings(plant_idx: int, user_id: str):
         )
 
 @router.put("/{plant_idx}/watering-settings", response_model=WateringSettingsResponse)
+@in_unit_of_work
 async def update_plant_watering_settings(plant_idx: int, user_id: str, settings_request: WateringSettingsRequest):
     """
     식물의 물주기 설정을 업데이트합니다.
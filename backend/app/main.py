@@ -2,15 +2,25 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
 from core.config import settings
-from db.pool import init_pool, close_pool
+from db.pool import init_pool, close_pool, pool_stats
 from utils.errors import register_error_handlers
 from services.mqtt_service import mqtt_service
+from services.humid_retention import humid_retention
+from services.watering_detector import watering_detector
+from services.user_stats import user_stats
+from services.wiki_store import wiki_store
+from services.diary_reply import diary_reply_queue
+from db.instrument import query_metrics
+from utils.metrics import join_lines, render_gauges
+from repositories.diary_search import detect_diary_fulltext_index
+from db.migrations import pending_migrations
 
 # 라우터 임포트
 from routes import router
@@ -19,11 +29,28 @@ from routes import router
 async def lifespan(app: FastAPI):
     # 시작 시
     await init_pool()
+    try:
+        if not await detect_diary_fulltext_index():
+            print("[DB] 일기 FULLTEXT 인덱스 없음 (LIKE 검색 사용)", flush=True)
+    except Exception as e:
+        print(f"[DB] 일기 FULLTEXT 인덱스 확인 실패 (LIKE 검색 사용): {e}", flush=True)
+    try:
+        pending = await pending_migrations()
+        if pending:
+            print(f"[DB] 적용되지 않은 마이그레이션: {[m.version for m in pending]} (python migrate.py up)", flush=True)
+    except Exception as e:
+        print(f"[DB] 마이그레이션 상태 확인 실패: {e}", flush=True)
+    await wiki_store.start()
+    await diary_reply_queue.start()
+    await humid_retention.start()
     await mqtt_service.start(asyncio.get_running_loop())
     try:
         yield
     finally:
         await mqtt_service.stop()
+        await humid_retention.stop()
+        await diary_reply_queue.stop()
+        await wiki_store.stop()
         await close_pool()
 
 
@@ -71,6 +98,11 @@ async def health_db():
         await cursor.execute("SELECT 1")
     return {"db": "ok"}
 
+# DB 연결 풀 상태
+@app.get("/health/db/pool")
+def health_db_pool():
+    return pool_stats()
+
 # 버전 정보
 @app.get("/version")
 def version():
@@ -82,4 +114,37 @@ def version():
 
 @app.get("/mqtt/last")
 def mqtt_last():
-    return mqtt_service.last or {}
\ No newline at end of file
+    return mqtt_service.last or {}
+
+@app.get("/mqtt/stats")
+def mqtt_stats():
+    return {
+        **mqtt_service.stats(),
+        "retention": humid_retention.stats(),
+        "watering_detector": watering_detector.stats(),
+    }
+
+
+# 메트릭 (Prometheus 형식)
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return join_lines([
+        query_metrics.prometheus_lines(),
+        render_gauges("pland_db_pool", pool_stats()),
+        render_gauges("pland_db_routing", pool_stats()["routing"]),
+        render_gauges("pland_user_stats_cache", user_stats.stats()),
+        render_gauges("pland_mqtt", mqtt_service.stats()),
+        render_gauges("pland_wiki_store", wiki_store.stats()),
+        render_gauges("pland_diary_reply", diary_reply_queue.stats()),
+    ])
+
+# 쿼리 지문별 통계 + 느린 쿼리 로그 (EXPLAIN 포함)
+@app.get("/metrics/queries")
+def metrics_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: str = Query("total", pattern="^(total|calls|max|slow)$"),
+):
+    return {
+        "queries": query_metrics.top(limit, order_by),
+        "slow_log": query_metrics.slow_log(),
+    }
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스키마 마이그레이션 실행 스크립트 (db/migrations.py)
+
+사용법:
+    python migrate.py            # 적용 상태 출력
+    python migrate.py up         # 남은 마이그레이션 모두 적용
+    python migrate.py up 2       # 2번까지 적용
+    python migrate.py down 1     # 1번보다 큰 버전 되돌리기
+
+실패하면 종료 코드 1 (배포 스크립트에서 이후 단계를 멈출 수 있도록)
+"""
+
+import asyncio
+import sys
+import os
+
+# 백엔드 앱 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db.pool import init_pool, close_pool
+from db.migrations import migrate_down, migrate_up, migration_status
+
+
+async def main() -> int:
+    """메인 함수 (반환: 종료 코드)"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    version = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    await init_pool()
+    try:
+        if command == "up":
+            done = await migrate_up(version)
+            print(f"✅ 적용: {done or '없음'}")
+        elif command == "down":
+            if version is None:
+                print("❌ 되돌릴 기준 버전을 지정하세요. (예: python migrate.py down 1)")
+                return 1
+            done = await migrate_down(version)
+            print(f"✅ 되돌림: {done or '없음'}")
+        elif command != "status":
+            print(f"❌ 알 수 없는 명령: {command} (status|up|down)")
+            return 1
+        for row in await migration_status():
+            mark = "✅" if row["applied_at"] else "⏳"
+            print(f"   {mark} {row['version']:04d} {row['name']} {row['applied_at'] or ''}")
+    except Exception as e:
+        print(f"❌ 마이그레이션 오류: {e}")
+        return 1
+    finally:
+        await close_pool()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,41 +1,53 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, Form, File, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
+from datetime import datetime
 from schemas.diary import (
     DiaryListResponse,
     DiarySearchRequest,
     DiaryStatsResponse,
     DiaryListItemResponse,
     DiaryWriteRequest,
-    DiaryWriteResponse
+    DiaryWriteResponse,
+    DiaryTagListResponse,
+    DiaryPlantReplyResponse
 )
 from repositories.diary_list import (
     get_user_diary_list,
     search_user_diaries,
     get_diary_stats,
     get_plant_diary_summary,
-    get_recent_diaries
+    get_recent_diaries,
+    stream_user_diaries
 )
 from repositories.diary import create as create_diary, get_by_diary_id, patch as update_diary, delete_by_diary_id
+from repositories.diary_tag import get_tag_counts, autocomplete_tags
 from db.pool import get_db_connection
+from core.config import settings
 from services.auth_service import get_current_user
-from clients.plant_llm import get_plant_reply
+from clients.plant_llm import plant_talk_stream
+from repositories.diary_reply import has_reply_job, upsert_reply_job
+from services.diary_reply import diary_reply_queue
+from utils.pagination import InvalidCursor
+from utils.export_stream import csv_stream, ndjson_stream, json_array_stream, gzip_stream
 
 async def get_latest_humidity_for_plant(conn, plant_id: int) -> Optional[int]:
-    """특정 식물의 가장 최근 습도 정보를 가져옵니다. (humid 테이블 사용, device_id=1 공통)"""
+    """특정 식물의 가장 최근 습도 정보를 가져옵니다. (식물에 연결된 센서, 없으면 공통 센서)"""
     try:
         async with conn.cursor() as cursor:
-            # humid 테이블에서 device_id=1의 가장 최근 습도 정보를 가져옵니다
             await cursor.execute("""
                 SELECT h.humidity 
                 FROM humid h 
-                WHERE h.device_id = 1 
+                WHERE h.device_id = COALESCE(
+                    (SELECT pd.device_id FROM plant_device pd WHERE pd.plant_id = %s), %s
+                )
                 ORDER BY h.humid_date DESC 
                 LIMIT 1
-            """)
+            """, (plant_id, settings.DEFAULT_DEVICE_ID))
             
             result = await cursor.fetchone()
             if result:
-                print(f"[DEBUG] 공통 습도 센서 최근 습도: {result[0]}%")
+                print(f"[DEBUG] 식물 {plant_id} 센서 최근 습도: {result[0]}%")
                 return result[0]
             else:
                 print(f"[DEBUG] 습도 정보 없음")
@@ -57,11 +69,15 @@ async def get_diary_list(
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
     hashtag: Optional[str] = Query(None, description="해시태그로 필터링"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부 (무한 스크롤은 false 권장)"),
     user: dict = Depends(get_current_user)
 ):
     """
     사용자의 일기 목록을 조회합니다.
     
+    - **cursor**: 다음 페이지 커서 (지정 시 page 대신 사용, 깊은 페이지도 첫 페이지와 같은 비용)
+    - **include_total**: 전체 개수 포함 여부 (기본값: true, 잠시 캐시됨)
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
     - **order_by**: 정렬 기준 (created_at, updated_at, plant_nickname, plant_species, user_title)
@@ -70,7 +86,7 @@ async def get_diary_list(
     - **plant_species**: 식물 종류로 필터링
     - **start_date**: 시작 날짜 (YYYY-MM-DD 형식)
     - **end_date**: 종료 날짜 (YYYY-MM-DD 형식)
-    - **hashtag**: 해시태그로 필터링
+    - **hashtag**: 해시태그로 필터링 (태그 앞부분 일치)
     """
     print(f"[DEBUG] get_diary_list API 호출됨 - user: {user}")
     try:
@@ -113,11 +129,15 @@ async def get_diary_list(
             limit=limit,
             order_by=order_by,
             order_direction=order_direction,
-            search_request=search_request
+            search_request=search_request,
+            cursor=cursor,
+            include_total=include_total
         )
         return result
     except HTTPException:
         raise
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="커서 형식이 올바르지 않습니다.")
     except Exception as e:
         print(f"[DEBUG] get_diary_list API 오류: {e}")
         import traceback
@@ -132,23 +152,34 @@ async def search_diaries(
     q: str = Query(..., min_length=1, description="검색어"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
     user: dict = Depends(get_current_user)
 ):
     """
     일기 내용을 검색합니다.
     
-    - **q**: 검색어 (필수) - 제목과 내용에서 검색
+    - **q**: 검색어 (필수) - 제목, 내용, 해시태그에서 검색 (조사는 자동 제거)
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
+    - **cursor**: 다음 페이지 커서 (지정 시 page 대신 사용)
+    - 관련도순으로 정렬되며, 각 항목에 score / snippet / highlights가 포함됩니다.
     """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=422, detail="검색어를 입력해 주세요.")
     try:
         result = await search_user_diaries(
             user_id=user["user_id"],
             query=q,
             page=page,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total
         )
         return result
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="커서 형식이 올바르지 않습니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -220,107 +251,161 @@ async def get_recent_diaries_endpoint(
             detail=f"최근 일기 조회 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.get("/tags", response_model=DiaryTagListResponse)
+async def get_diary_tags(
+    limit: int = Query(50, ge=1, le=200, description="조회할 태그 수"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    사용자가 사용한 해시태그와 태그별 일기 수를 조회합니다. (많이 쓴 순)
+    
+    - **limit**: 조회할 태그 수 (기본값: 50, 최대: 200)
+    """
+    try:
+        tags = await get_tag_counts(user["user_id"], limit)
+        return DiaryTagListResponse(tags=tags)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"해시태그 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+@router.get("/tags/autocomplete", response_model=DiaryTagListResponse)
+async def autocomplete_diary_tags(
+    q: str = Query(..., min_length=1, description="입력 중인 태그 (# 생략 가능)"),
+    limit: int = Query(10, ge=1, le=50, description="추천 태그 수"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    입력 중인 해시태그를 자동완성합니다. (앞부분 일치, 많이 쓴 순)
+    
+    - **q**: 입력 중인 태그
+    - **limit**: 추천 태그 수 (기본값: 10, 최대: 50)
+    """
+    try:
+        tags = await autocomplete_tags(user["user_id"], q, limit)
+        return DiaryTagListResponse(tags=tags)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"해시태그 자동완성 중 오류가 발생했습니다: {str(e)}"
+        )
+
+# 내보내기 CSV 컬럼 (행 키, 헤더명)
+EXPORT_CSV_COLUMNS = [
+    ("user_title", "제목"),
+    ("user_content", "내용"),
+    ("plant_nickname", "식물별명"),
+    ("plant_species", "식물종류"),
+    ("weather", "날씨"),
+    ("hashtag", "해시태그"),
+    ("plant_reply", "식물답장"),
+    ("img_urls", "이미지"),
+    ("created_at", "작성일"),
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "json": ("application/json", "json"),
+}
+
 @router.get("/export")
 async def export_diaries(
-    format: str = Query("json", description="내보내기 형식 (json, csv)"),
+    format: str = Query("json", description="내보내기 형식 (json, ndjson, csv)"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
+    gzip: bool = Query(False, description="gzip 압축 여부"),
     user: dict = Depends(get_current_user)
 ):
     """
-    일기를 내보냅니다.
+    일기를 파일로 내보냅니다. (스트리밍, 개수 제한 없음)
     
-    - **format**: 내보내기 형식 (json, csv)
+    - **format**: 내보내기 형식 (json: JSON 배열, ndjson: 한 줄에 일기 하나, csv)
     - **start_date**: 시작 날짜 (선택사항)
     - **end_date**: 종료 날짜 (선택사항)
+    - **gzip**: true면 .gz 파일로 압축해서 전송
+    
+    DB 서버 측 커서로 읽은 행을 바로 전송하므로 일기 수와 관계없이 메모리 사용량이 일정하고
+    첫 바이트가 즉시 전달됩니다. 각 일기의 이미지 URL이 포함됩니다.
     """
-    try:
-        # 날짜 파싱
-        start_date_parsed = None
-        end_date_parsed = None
-        
-        if start_date:
-            try:
-                from datetime import datetime
-                start_date_parsed = datetime.strptime(start_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="시작 날짜 형식이 올바르지 않습니다."
-                )
-        
-        if end_date:
-            try:
-                from datetime import datetime
-                end_date_parsed = datetime.strptime(end_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="종료 날짜 형식이 올바르지 않습니다."
-                )
-        
-        # 검색 요청 구성
-        search_request = DiarySearchRequest(
-            start_date=start_date_parsed,
-            end_date=end_date_parsed
-        )
-        
-        # 모든 일기 조회 (페이지네이션 없이)
-        result = await get_user_diary_list(
-            user_id=user["user_id"],
-            page=1,
-            limit=10000,  # 큰 수로 설정하여 모든 일기 조회
-            search_request=search_request
-        )
-        
-        if format.lower() == "csv":
-            # CSV 형식으로 변환
-            import csv
-            import io
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # 헤더 작성
-            writer.writerow([
-                "제목", "내용", "식물별명", "식물종류", "날씨", "해시태그", 
-                "작성일", "수정일"
-            ])
-            
-            # 데이터 작성
-            for diary in result.diaries:
-                writer.writerow([
-                    diary.user_title,
-                    diary.user_content,
-                    diary.plant_nickname or "",
-                    diary.plant_species or "",
-                    diary.weather or "",
-                    diary.hashtag or "",
-                    diary.created_at.strftime("%Y-%m-%d %H:%M:%S") if diary.created_at else "",
-                    diary.updated_at.strftime("%Y-%m-%d %H:%M:%S") if diary.updated_at else ""
-                ])
-            
-            return {
-                "format": "csv",
-                "data": output.getvalue(),
-                "filename": f"diaries_{user['user_id']}_{datetime.now().strftime('%Y%m%d')}.csv"
-            }
-        else:
-            # JSON 형식
-            return {
-                "format": "json",
-                "data": [diary.dict() for diary in result.diaries],
-                "total_count": result.total_count,
-                "exported_at": datetime.now().isoformat()
-            }
-            
-    except HTTPException:
-        raise
-    except Exception as e:
+    export_format = format.lower()
+    if export_format not in EXPORT_FORMATS:
         raise HTTPException(
-            status_code=500,
-            detail=f"일기 내보내기 중 오류가 발생했습니다: {str(e)}"
+            status_code=400,
+            detail=f"지원하지 않는 형식입니다. 지원 형식: {', '.join(EXPORT_FORMATS)}"
         )
+    
+    # 날짜 파싱
+    start_date_parsed = None
+    end_date_parsed = None
+    
+    if start_date:
+        try:
+            start_date_parsed = datetime.strptime(start_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="시작 날짜 형식이 올바르지 않습니다."
+            )
+    
+    if end_date:
+        try:
+            end_date_parsed = datetime.strptime(end_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="종료 날짜 형식이 올바르지 않습니다."
+            )
+    
+    rows = stream_user_diaries(user["user_id"], start_date_parsed, end_date_parsed)
+    if export_format == "csv":
+        body = csv_stream(rows, EXPORT_CSV_COLUMNS)
+    elif export_format == "ndjson":
+        body = ndjson_stream(rows)
+    else:
+        body = json_array_stream(rows)
+    
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"diaries_{user['user_id']}_{datetime.now().strftime('%Y%m%d')}.{extension}"
+    if gzip:
+        body = gzip_stream(body)
+        media_type = "application/gzip"
+        filename += ".gz"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/plant-reply/stream")
+async def stream_plant_reply(
+    user_content: str = Form(...),
+    plant_id: Optional[str] = Form(None),
+    plant_species: Optional[str] = Form(None),
+    user: dict = Depends(get_current_user)
+):
+    """
+    일기 내용에 대한 식물 답변을 생성되는 대로 스트리밍합니다. (Server-Sent Events)
+
+    모델 서버 /llm/stream을 그대로 중계합니다.
+    - **meta**: mode, species, state
+    - **delta**: 후처리가 끝난 문장 하나 (text)
+    - **done**: 후처리된 전체 답변 (reply)
+    - **error**: 생성 중 오류
+    """
+    moisture = None
+    if plant_id:
+        # 스트리밍 동안 DB 연결을 잡고 있지 않도록 습도만 먼저 조회
+        async with get_db_connection(read_only=True, user_id=user["user_id"]) as (conn, _):
+            moisture = await get_latest_humidity_for_plant(conn, int(plant_id))
+
+    return StreamingResponse(
+        plant_talk_stream(plant_species or "식물", user_content, moisture),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/create", response_model=DiaryWriteResponse)
 async def create_diary_entry(
@@ -382,10 +467,7 @@ async def create_diary_entry(
         async with get_db_connection() as (conn, cursor):
             print("[DEBUG] 데이터베이스 연결 성공")
             
-            # AI 모델 호출하여 식물 답변 생성
-            print("[DEBUG] AI 모델 호출하여 식물 답변 생성 중...")
-            
-            # 습도 정보 가져오기 (plant_id가 있는 경우에만)
+            # 습도 정보 가져오기 (plant_id가 있는 경우에만, 답장 작업에 함께 저장)
             moisture = None
             if plant_id:
                 moisture = await get_latest_humidity_for_plant(conn, int(plant_id))
@@ -394,17 +476,6 @@ async def create_diary_entry(
                 else:
                     print("[DEBUG] 습도 정보 없음 - 습도 관련 정보 생략")
             
-            try:
-                plant_reply = await get_plant_reply(
-                    species=plant_species or "식물",
-                    user_text=user_content,
-                    moisture=moisture  # DB에서 가져온 습도 정보 또는 None
-                )
-                print(f"[DEBUG] AI 답변 생성 성공: {plant_reply[:50]}...")
-            except Exception as e:
-                print(f"[DEBUG] AI 답변 생성 실패: {e}")
-                plant_reply = "안녕! 오늘도 잘 지내고 있어? 나는 너의 일기를 들을 수 있어서 기뻐!"  # 기본 답변
-            
             # 현재 날짜를 created_at으로 설정
             from datetime import date
             current_date = date.today()
@@ -416,7 +487,7 @@ async def create_diary_entry(
                 user_content=user_content,
                 hashtag=hashtag,
                 plant_id=int(plant_id) if plant_id else None,
-                plant_content=plant_reply,
+                plant_content=None,  # 답장은 백그라운드에서 생성 후 채움
                 weather=weather,
                 hist_watered=int(hist_watered) if hist_watered else 0,
                 hist_repot=int(hist_repot) if hist_repot else 0,
@@ -424,6 +495,7 @@ async def create_diary_entry(
                 hist_fertilize=int(hist_fertilize) if hist_fertilize else 0,
                 created_at=current_date
             )
+            await upsert_reply_job(cursor, diary.diary_id, plant_species, moisture)
             
             print(f"[DEBUG] 일기 생성 성공: {diary}")
             
@@ -437,30 +509,34 @@ async def create_diary_entry(
                     print(f"[DEBUG] 이미지 URL 저장 성공: {image_url}")
                 except Exception as e:
                     print(f"[DEBUG] 이미지 URL 저장 실패: {e}")
-            
-            return DiaryWriteResponse(
-                success=True,
-                message="일기가 성공적으로 작성되었습니다.",
-                diary=DiaryListItemResponse(
-                    idx=diary.diary_id,
-                    user_title=diary.user_title,
-                    user_content=diary.user_content,
-                    plant_id=diary.plant_id,
-                    plant_nickname=plant_nickname,
-                    plant_species=plant_species,
-                    plant_reply=plant_reply,
-                    weather=weather,
-                    weather_icon=None,
-                    img_url=image_url,
-                    hashtag=hashtag,
-                    created_at=diary.created_at,
-                    updated_at=None,
-                    hist_watered=int(hist_watered) if hist_watered else 0,
-                    hist_repot=int(hist_repot) if hist_repot else 0,
-                    hist_pruning=int(hist_pruning) if hist_pruning else 0,
-                    hist_fertilize=int(hist_fertilize) if hist_fertilize else 0
-                )
+        
+        # 커밋 후 답장 생성 예약 (LLM 응답을 기다리지 않음)
+        diary_reply_queue.enqueue(diary.diary_id)
+        
+        return DiaryWriteResponse(
+            success=True,
+            message="일기가 성공적으로 작성되었습니다.",
+            diary=DiaryListItemResponse(
+                idx=diary.diary_id,
+                user_title=diary.user_title,
+                user_content=diary.user_content,
+                plant_id=diary.plant_id,
+                plant_nickname=plant_nickname,
+                plant_species=plant_species,
+                plant_reply=None,
+                plant_reply_status="pending",
+                weather=weather,
+                weather_icon=None,
+                img_url=image_url,
+                hashtag=hashtag,
+                created_at=diary.created_at,
+                updated_at=None,
+                hist_watered=int(hist_watered) if hist_watered else 0,
+                hist_repot=int(hist_repot) if hist_repot else 0,
+                hist_pruning=int(hist_pruning) if hist_pruning else 0,
+                hist_fertilize=int(hist_fertilize) if hist_fertilize else 0
             )
+        )
             
     except Exception as e:
         raise HTTPException(
@@ -468,6 +544,38 @@ async def create_diary_entry(
             detail=f"일기 작성 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.get("/{diary_id}/plant-reply", response_model=DiaryPlantReplyResponse)
+async def get_diary_plant_reply(
+    diary_id: int,
+    wait: float = Query(0, ge=0, description="답장이 아직이면 최대 대기 시간(초, 롱 폴링)"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    일기 식물 답장 상태를 조회합니다. (작성/수정 후 pending → done)
+    wait를 주면 답장이 저장될 때까지 최대 DIARY_REPLY_MAX_WAIT초까지 기다렸다가 응답합니다.
+    """
+    async def load():
+        async with get_db_connection() as (conn, cursor):
+            diary = await get_by_diary_id(conn, diary_id)
+            if not diary:
+                raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다.")
+            if diary.user_id != user["user_id"]:
+                raise HTTPException(status_code=403, detail="이 일기에 접근할 권한이 없습니다.")
+            pending = await has_reply_job(conn, diary_id)
+            return diary, pending
+
+    diary, pending = await load()
+    if pending and wait > 0:
+        # 대기 중에는 DB 연결을 잡지 않음
+        await diary_reply_queue.wait(diary_id, min(wait, settings.DIARY_REPLY_MAX_WAIT))
+        diary, pending = await load()
+
+    return DiaryPlantReplyResponse(
+        diary_id=diary_id,
+        status="pending" if pending else "done",
+        plant_reply=None if pending else diary.plant_content,
+    )
+
 @router.get("/{diary_id}", response_model=DiaryListItemResponse)
 async def get_diary_detail(
     diary_id: int,
@@ -496,6 +604,7 @@ async def get_diary_detail(
                 )
             
             print(f"[DEBUG] 일기 조회 성공: {diary}")
+            reply_pending = await has_reply_job(conn, diary_id)
             
             return DiaryListItemResponse(
                 idx=diary.diary_id,
@@ -505,6 +614,7 @@ async def get_diary_detail(
                 plant_nickname=getattr(diary, 'plant_nickname', None),
                 plant_species=getattr(diary, 'plant_species', None),
                 plant_reply=diary.plant_content,
+                plant_reply_status="pending" if reply_pending else "done",
                 weather=diary.weather,
                 weather_icon=getattr(diary, 'weather_icon', None),
                 img_url=diary.img_url,
@@ -615,10 +725,7 @@ async def update_diary_entry(
                     diary_id=diary_id
                 )
             
-            # AI 모델 호출하여 새로운 식물 답변 생성
-            print("[DEBUG] AI 모델 호출하여 새로운 식물 답변 생성 중...")
-            
-            # 습도 정보 가져오기 (plant_id가 있는 경우에만)
+            # 습도 정보 가져오기 (plant_id가 있는 경우에만, 답장 작업에 함께 저장)
             moisture = None
             if plant_id:
                 moisture = await get_latest_humidity_for_plant(conn, int(plant_id))
@@ -627,17 +734,6 @@ async def update_diary_entry(
                 else:
                     print("[DEBUG] 습도 정보 없음 - 습도 관련 정보 생략")
             
-            try:
-                plant_reply = await get_plant_reply(
-                    species=plant_species or "식물",
-                    user_text=user_content,
-                    moisture=moisture
-                )
-                print(f"[DEBUG] AI 답변 생성 성공: {plant_reply[:50]}...")
-            except Exception as e:
-                print(f"[DEBUG] AI 답변 생성 실패: {e}")
-                plant_reply = "안녕! 수정된 일기를 잘 읽었어. 나는 너의 변화를 느낄 수 있어서 기뻐!"  # 기본 답변
-            
             # 일기 수정
             updated_diary = await update_diary(
                 conn,
@@ -646,13 +742,14 @@ async def update_diary_entry(
                 user_content=user_content,
                 hashtag=hashtag,
                 plant_id=int(plant_id) if plant_id else None,
-                plant_content=plant_reply,
+                plant_content=None,  # 새 답장은 백그라운드에서 생성 후 채움
                 weather=weather,
                 hist_watered=int(hist_watered) if hist_watered else 0,
                 hist_repot=int(hist_repot) if hist_repot else 0,
                 hist_pruning=int(hist_pruning) if hist_pruning else 0,
                 hist_fertilize=int(hist_fertilize) if hist_fertilize else 0
             )
+            await upsert_reply_job(cursor, diary_id, plant_species, moisture)
             
             print(f"[DEBUG] 일기 수정 성공: {updated_diary}")
             
@@ -672,30 +769,34 @@ async def update_diary_entry(
                     print(f"[DEBUG] 이미지 URL 업데이트 성공: {image_url}")
                 except Exception as e:
                     print(f"[DEBUG] 이미지 URL 업데이트 실패: {e}")
-            
-            return DiaryWriteResponse(
-                success=True,
-                message="일기가 성공적으로 수정되었습니다.",
-                diary=DiaryListItemResponse(
-                    idx=updated_diary.diary_id,
-                    user_title=updated_diary.user_title,
-                    user_content=updated_diary.user_content,
-                    plant_id=updated_diary.plant_id,
-                    plant_nickname=plant_nickname,
-                    plant_species=plant_species,
-                    plant_reply=plant_reply,
-                    weather=weather,
-                    weather_icon=None,
-                    img_url=image_url or getattr(updated_diary, 'img_url', None),
-                    hashtag=hashtag,
-                    created_at=updated_diary.created_at,
-                    updated_at=None,
-                    hist_watered=int(hist_watered) if hist_watered else 0,
-                    hist_repot=int(hist_repot) if hist_repot else 0,
-                    hist_pruning=int(hist_pruning) if hist_pruning else 0,
-                    hist_fertilize=int(hist_fertilize) if hist_fertilize else 0
-                )
+        
+        # 커밋 후 답장 재생성 예약 (LLM 응답을 기다리지 않음)
+        diary_reply_queue.enqueue(diary_id)
+        
+        return DiaryWriteResponse(
+            success=True,
+            message="일기가 성공적으로 수정되었습니다.",
+            diary=DiaryListItemResponse(
+                idx=updated_diary.diary_id,
+                user_title=updated_diary.user_title,
+                user_content=updated_diary.user_content,
+                plant_id=updated_diary.plant_id,
+                plant_nickname=plant_nickname,
+                plant_species=plant_species,
+                plant_reply=None,
+                plant_reply_status="pending",
+                weather=weather,
+                weather_icon=None,
+                img_url=image_url or getattr(updated_diary, 'img_url', None),
+                hashtag=hashtag,
+                created_at=updated_diary.created_at,
+                updated_at=None,
+                hist_watered=int(hist_watered) if hist_watered else 0,
+                hist_repot=int(hist_repot) if hist_repot else 0,
+                hist_pruning=int(hist_pruning) if hist_pruning else 0,
+                hist_fertilize=int(hist_fertilize) if hist_fertilize else 0
             )
+        )
             
     except HTTPException:
         raise
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import Optional
 from schemas.info_room import (
     PlantWikiListResponse,
@@ -7,22 +7,21 @@ from schemas.info_room import (
     PestWikiDetailResponse,
     InfoRoomStatsResponse
 )
-from repositories.info_room import (
-    get_plant_wiki_list,
-    get_plant_wiki_detail,
-    get_pest_wiki_list,
-    get_pest_wiki_detail,
-    get_info_room_stats,
-    search_plant_wiki_by_category
-)
+from services.wiki_store import wiki_store, PLANT_CATEGORIES
+from utils.http_cache import conditional
+from utils.pagination import InvalidCursor
 
 router = APIRouter(prefix="/info-room", tags=["info-room"])
 
 @router.get("/plants", response_model=PlantWikiListResponse)
 async def get_plant_wiki_list_endpoint(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
-    search: Optional[str] = Query(None, description="식물명 검색")
+    search: Optional[str] = Query(None, description="식물명 검색"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부")
 ):
     """
     식물 위키 목록을 조회합니다.
@@ -30,10 +29,19 @@ async def get_plant_wiki_list_endpoint(
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
     - **search**: 식물명으로 검색 (선택사항)
+    - **cursor**: 다음 페이지 커서 (지정 시 page 무시)
+    - **include_total**: false면 전체 개수 계산 생략
     """
     try:
-        result = await get_plant_wiki_list(page=page, limit=limit, search=search)
-        return result
+        snap = await wiki_store.snapshot()
+        cached = conditional(request, response, snap.etag("plants", page, limit, search, cursor, include_total))
+        if cached is not None:
+            return cached
+        return await wiki_store.list_plants(
+            page=page, limit=limit, search=search, cursor=cursor, include_total=include_total, snap=snap
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -41,19 +49,23 @@ async def get_plant_wiki_list_endpoint(
         )
 
 @router.get("/plants/{wiki_plant_id}", response_model=PlantWikiDetailResponse)
-async def get_plant_wiki_detail_endpoint(wiki_plant_id: int):
+async def get_plant_wiki_detail_endpoint(wiki_plant_id: int, request: Request, response: Response):
     """
     특정 식물의 위키 상세 정보를 조회합니다.
     
     - **wiki_plant_id**: 식물 위키 ID
     """
     try:
-        result = await get_plant_wiki_detail(wiki_plant_id)
+        snap = await wiki_store.snapshot()
+        result = await wiki_store.get_plant(wiki_plant_id, snap=snap)
         if not result:
             raise HTTPException(
                 status_code=404,
                 detail="해당 식물 정보를 찾을 수 없습니다."
             )
+        cached = conditional(request, response, snap.etag("plant", wiki_plant_id))
+        if cached is not None:
+            return cached
         return result
     except HTTPException:
         raise
@@ -65,9 +77,13 @@ async def get_plant_wiki_detail_endpoint(wiki_plant_id: int):
 
 @router.get("/pests", response_model=PestWikiListResponse)
 async def get_pest_wiki_list_endpoint(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="페이지 번호"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
-    search: Optional[str] = Query(None, description="병충해명 검색")
+    search: Optional[str] = Query(None, description="병충해명 검색"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부")
 ):
     """
     병충해 위키 목록을 조회합니다.
@@ -75,10 +91,19 @@ async def get_pest_wiki_list_endpoint(
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
     - **search**: 병충해명으로 검색 (선택사항)
+    - **cursor**: 다음 페이지 커서 (지정 시 page 무시)
+    - **include_total**: false면 전체 개수 계산 생략
     """
     try:
-        result = await get_pest_wiki_list(page=page, limit=limit, search=search)
-        return result
+        snap = await wiki_store.snapshot()
+        cached = conditional(request, response, snap.etag("pests", page, limit, search, cursor, include_total))
+        if cached is not None:
+            return cached
+        return await wiki_store.list_pests(
+            page=page, limit=limit, search=search, cursor=cursor, include_total=include_total, snap=snap
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -86,19 +111,23 @@ async def get_pest_wiki_list_endpoint(
         )
 
 @router.get("/pests/{pest_id}", response_model=PestWikiDetailResponse)
-async def get_pest_wiki_detail_endpoint(pest_id: int):
+async def get_pest_wiki_detail_endpoint(pest_id: int, request: Request, response: Response):
     """
     특정 병충해의 위키 상세 정보를 조회합니다.
     
     - **pest_id**: 병충해 위키 ID
     """
     try:
-        result = await get_pest_wiki_detail(pest_id)
+        snap = await wiki_store.snapshot()
+        result = await wiki_store.get_pest(pest_id, snap=snap)
         if not result:
             raise HTTPException(
                 status_code=404,
                 detail="해당 병충해 정보를 찾을 수 없습니다."
             )
+        cached = conditional(request, response, snap.etag("pest", pest_id))
+        if cached is not None:
+            return cached
         return result
     except HTTPException:
         raise
@@ -109,7 +138,7 @@ async def get_pest_wiki_detail_endpoint(pest_id: int):
         )
 
 @router.get("/stats", response_model=InfoRoomStatsResponse)
-async def get_info_room_stats_endpoint():
+async def get_info_room_stats_endpoint(request: Request, response: Response):
     """
     정보방 통계 정보를 조회합니다.
     
@@ -118,7 +147,12 @@ async def get_info_room_stats_endpoint():
     - 마지막 업데이트 시간
     """
     try:
-        result = await get_info_room_stats()
+        snap = await wiki_store.snapshot()
+        result = await wiki_store.info_stats(snap=snap)
+        # last_updated는 워커별 적재 시각이라 ETag에 포함
+        cached = conditional(request, response, snap.etag("stats", result.last_updated))
+        if cached is not None:
+            return cached
         return result
     except Exception as e:
         raise HTTPException(
@@ -129,8 +163,11 @@ async def get_info_room_stats_endpoint():
 @router.get("/plants/category/{category}", response_model=PlantWikiListResponse)
 async def get_plant_wiki_by_category_endpoint(
     category: str,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="페이지 번호"),
-    limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수")
+    limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)")
 ):
     """
     카테고리별 식물 위키를 조회합니다.
@@ -138,6 +175,7 @@ async def get_plant_wiki_by_category_endpoint(
     - **category**: 카테고리 (flowering, indoor, outdoor, easy_care)
     - **page**: 페이지 번호 (기본값: 1)
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
+    - **cursor**: 다음 페이지 커서 (지정 시 page 무시)
     
     지원 카테고리:
     - flowering: 개화하는 식물
@@ -147,21 +185,22 @@ async def get_plant_wiki_by_category_endpoint(
     """
     try:
         # 지원되는 카테고리 검증
-        valid_categories = ["flowering", "indoor", "outdoor", "easy_care"]
+        valid_categories = list(PLANT_CATEGORIES)
         if category not in valid_categories:
             raise HTTPException(
                 status_code=400,
                 detail=f"지원되지 않는 카테고리입니다. 지원 카테고리: {', '.join(valid_categories)}"
             )
         
-        result = await search_plant_wiki_by_category(
-            category=category,
-            page=page,
-            limit=limit
-        )
-        return result
+        snap = await wiki_store.snapshot()
+        cached = conditional(request, response, snap.etag("category", category, page, limit, cursor))
+        if cached is not None:
+            return cached
+        return await wiki_store.list_plants(page=page, limit=limit, cursor=cursor, category=category, snap=snap)
     except HTTPException:
         raise
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -170,9 +209,13 @@ async def get_plant_wiki_by_category_endpoint(
 
 @router.get("/search", response_model=PlantWikiListResponse)
 async def search_plant_wiki_endpoint(
+    request: Request,
+    response: Response,
     q: str = Query(..., min_length=1, description="검색어"),
     page: int = Query(1, ge=1, description="페이지 번호"),
-    limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수")
+    limit: int = Query(20, ge=1, le=100, description="페이지당 항목 수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부")
 ):
     """
     식물 위키를 통합 검색합니다.
@@ -182,10 +225,42 @@ async def search_plant_wiki_endpoint(
     - **limit**: 페이지당 항목 수 (기본값: 20, 최대: 100)
     """
     try:
-        result = await get_plant_wiki_list(page=page, limit=limit, search=q)
-        return result
+        snap = await wiki_store.snapshot()
+        cached = conditional(request, response, snap.etag("plants", page, limit, q, cursor, include_total))
+        if cached is not None:
+            return cached
+        return await wiki_store.list_plants(
+            page=page, limit=limit, search=q, cursor=cursor, include_total=include_total, snap=snap
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"식물 위키 검색 중 오류가 발생했습니다: {str(e)}"
         )
+
+@router.get("/suggest")
+async def suggest_wiki_endpoint(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="이름 앞부분"),
+    limit: int = Query(10, ge=1, le=50, description="종류별 최대 개수")
+):
+    """
+    식물/병충해 이름 자동완성
+
+    - **q**: 이름 앞부분 (대소문자 무시)
+    - **limit**: 식물/병충해 각각 최대 개수
+    """
+    try:
+        snap = await wiki_store.snapshot()
+        cached = conditional(request, response, snap.etag("suggest", q, limit))
+        if cached is not None:
+            return cached
+        return await wiki_store.suggest(q, limit, snap=snap)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"위키 자동완성 중 오류가 발생했습니다: {str(e)}"
+        )
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Optional
 from schemas.dashboard import DashboardResponse, PlantStatusResponse
 from repositories.dashboard import get_user_plants_with_status, get_plant_humidity_history, get_plant_diary_count
 from services.auth_service import get_current_user
@@ -78,14 +78,21 @@ async def get_user_plants_summary(user_id: str):
         )
 
 @router.get("/plants/{plant_id}/humidity-history")
-async def get_plant_humidity_history_endpoint(plant_id: int, limit: int = 7):
+async def get_plant_humidity_history_endpoint(
+    plant_id: int,
+    limit: int = 7,
+    days: Optional[int] = Query(None, ge=1, le=3650, description="최근 n일 구간 조회 (지정 시 해상도 자동 선택)"),
+    resolution: Optional[str] = Query(None, pattern="^(raw|hourly|daily)$"),
+):
     """
     특정 식물의 습도 기록을 조회합니다.
+    days를 지정하면 구간 길이에 따라 원본/시간/일 집계 중 적절한 해상도로 반환합니다.
     """
     try:
-        history = await get_plant_humidity_history(plant_id, limit)
+        resolution, history = await get_plant_humidity_history(plant_id, limit, days, resolution)
         return {
             "plant_id": plant_id,
+            "resolution": resolution,
             "humidity_history": history,
             "count": len(history)
         }
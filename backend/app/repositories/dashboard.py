@@ -1,7 +1,14 @@
 import aiomysql
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
 from db.pool import get_db_connection
+from repositories.device import get_device_id, get_device_ids
+from repositories.humid import (
+    RESOLUTION_RAW,
+    get_humidity_series,
+    get_latest_humidity_by_devices,
+    get_latest_humidity_rows,
+)
 from schemas.dashboard import PlantStatusResponse, DashboardResponse
 
 async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
@@ -9,7 +16,7 @@ async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
     사용자의 모든 식물 정보와 상태를 조회합니다.
     습도 정보와 식물 위키 정보, 병해충 정보를 포함합니다.
     """
-    async with get_db_connection() as (conn, cursor):
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
         
         # 단순한 쿼리로 복원 (식물 목록만 먼저 표시)
         query = """
@@ -25,24 +32,6 @@ async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
              WHERE ia.plant_id = up.plant_id 
              ORDER BY ia.img_url 
              LIMIT 1) as user_plant_image,
-            -- 최신 습도 정보 (humid 테이블에서 직접 조회, device_id=1 공통 사용)
-            (SELECT h.humidity 
-             FROM humid h 
-             WHERE h.device_id = 1 
-             ORDER BY h.humid_date DESC 
-             LIMIT 1) as current_humidity,
-             
-            -- 최신 습도 측정 시간
-            (SELECT h.humid_date 
-             FROM humid h 
-             WHERE h.device_id = 1 
-             ORDER BY h.humid_date DESC 
-             LIMIT 1) as humidity_date,
-             
-            -- 습도 데이터 존재 여부 확인
-            (SELECT COUNT(*) 
-             FROM humid h 
-             WHERE h.device_id = 1) as humidity_data_count,
             -- 품종별 최적 습도 범위 (plant_wiki와 best_humid 조인)
             (SELECT bh.min_humid 
              FROM plant_wiki pw 
@@ -69,6 +58,10 @@ async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
         await cursor.execute(query, (user_id,))
         results = await cursor.fetchall()
         
+        # 식물별 센서 → 센서별 최신 습도 (식물 수와 무관하게 쿼리 2회)
+        device_map = await get_device_ids(row['plant_id'] for row in results)
+        latest_by_device = await get_latest_humidity_by_devices(device_map.values())
+        
         print(f"[DEBUG] 대시보드 쿼리 결과: {len(results)}개 식물 조회됨")
         for i, row in enumerate(results):
             print(f"[DEBUG] 식물 {i+1}: {row.get('plant_name')} - 품종: {row.get('species')}, 최적범위: {row.get('min_humid')}-{row.get('max_humid')}%")
@@ -76,20 +69,16 @@ async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
         plants = []
         for row in results:
             # 습도 데이터 검증 및 처리
-            humidity_data_count = row.get('humidity_data_count', 0)
-            current_humidity = row.get('current_humidity')
-            humidity_date = row.get('humidity_date')
+            latest = latest_by_device.get(device_map[row['plant_id']])
+            current_humidity = latest['humidity'] if latest else None
+            humidity_date = latest['humid_date'] if latest else None
             
             # 품종별 최적 습도 범위 가져오기
             min_humidity = row.get('min_humid')
             max_humidity = row.get('max_humid')
             
             # 습도 데이터 검증 로직
-            if humidity_data_count == 0:
-                # 습도 데이터가 전혀 없는 경우
-                humidity = 50  # 기본값
-                print(f"[DEBUG] 식물 {row['plant_id']}: 습도 데이터 없음, 기본값 50% 사용")
-            elif current_humidity is None:
+            if current_humidity is None:
                 # 습도 데이터가 없는 경우
                 humidity = 50  # 기본값
                 print(f"[DEBUG] 식물 {row['plant_id']}: 습도 데이터 없음, 기본값 50% 사용")
@@ -97,7 +86,7 @@ async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
                 # 실제 습도 데이터가 있는 경우 (0값도 포함)
                 humidity = int(current_humidity)
                 # 습도 데이터 신선도 검증
-                freshness_info = await validate_humidity_data_freshness(row['plant_id'])
+                freshness_info = _freshness_info(latest)
                 if not freshness_info['is_fresh']:
                     print(f"[WARNING] 식물 {row['plant_id']}: 습도 데이터가 오래됨 - {freshness_info['message']}")
                 print(f"[DEBUG] 식물 {row['plant_id']}: 실제 습도 데이터 사용 - {humidity}% (측정시간: {humidity_date}, 신선도: {freshness_info['message']})")
@@ -161,24 +150,21 @@ async def get_user_plants_with_status(user_id: str) -> DashboardResponse:
             plants=plants
         )
 
-async def get_plant_humidity_history(plant_id: int, limit: int = 7) -> List[dict]:
+async def get_plant_humidity_history(
+    plant_id: int,
+    limit: int = 7,
+    days: Optional[int] = None,
+    resolution: Optional[str] = None,
+) -> Tuple[str, List[dict]]:
     """
-    특정 식물의 최근 습도 기록을 조회합니다.
+    특정 식물의 습도 기록을 조회합니다.
+    days가 없으면 최근 원본 기록 limit건, 있으면 최근 days일 구간을 집계 해상도로 조회합니다.
+    반환: (resolution, 기록 목록)
     """
-    async with get_db_connection() as (conn, cursor):
-        query = """
-        SELECT 
-            humidity,
-            humid_date
-        FROM humid
-        WHERE device_id = 1
-        ORDER BY humid_date DESC
-        LIMIT %s
-        """
-        
-        await cursor.execute(query, (limit,))
-        results = await cursor.fetchall()
-        return results
+    device_id = await get_device_id(plant_id)
+    if days is None:
+        return RESOLUTION_RAW, await get_latest_humidity_rows(device_id, limit)
+    return await get_humidity_series(device_id, datetime.now() - timedelta(days=days), resolution=resolution)
 
 async def get_plant_diary_count(plant_id: int) -> int:
     """
@@ -196,46 +182,37 @@ async def get_plant_diary_count(plant_id: int) -> int:
         result = await cursor.fetchone()
         return result['count'] if result else 0
 
+def _freshness_info(latest: Optional[dict]) -> dict:
+    """최신 습도 행(humidity, humid_date, minutes_ago) → 신선도 정보"""
+    if not latest:
+        return {
+            "has_data": False,
+            "humidity": None,
+            "humidity_date": None,
+            "minutes_ago": None,
+            "is_fresh": False,
+            "message": "습도 데이터가 없습니다"
+        }
+    
+    minutes_ago = latest['minutes_ago']
+    is_fresh = minutes_ago <= 60  # 1시간 이내 데이터를 신선한 것으로 간주
+    
+    return {
+        "has_data": True,
+        "humidity": latest['humidity'],
+        "humidity_date": latest['humid_date'],
+        "minutes_ago": minutes_ago,
+        "is_fresh": is_fresh,
+        "message": f"{minutes_ago}분 전 데이터" + (" (신선함)" if is_fresh else " (오래됨)")
+    }
+
 async def validate_humidity_data_freshness(plant_id: int) -> dict:
     """
     특정 식물의 습도 데이터 신선도를 검증합니다.
     """
-    async with get_db_connection() as (conn, cursor):
-        query = """
-        SELECT 
-            h.humidity,
-            h.humid_date,
-            TIMESTAMPDIFF(MINUTE, h.humid_date, NOW()) as minutes_ago
-        FROM humid h 
-        WHERE h.device_id = 1 
-        ORDER BY h.humid_date DESC 
-        LIMIT 1
-        """
-        
-        await cursor.execute(query)
-        result = await cursor.fetchone()
-        
-        if not result:
-            return {
-                "has_data": False,
-                "humidity": None,
-                "humidity_date": None,
-                "minutes_ago": None,
-                "is_fresh": False,
-                "message": "습도 데이터가 없습니다"
-            }
-        
-        minutes_ago = result['minutes_ago']
-        is_fresh = minutes_ago <= 60  # 1시간 이내 데이터를 신선한 것으로 간주
-        
-        return {
-            "has_data": True,
-            "humidity": result['humidity'],
-            "humidity_date": result['humid_date'],
-            "minutes_ago": minutes_ago,
-            "is_fresh": is_fresh,
-            "message": f"{minutes_ago}분 전 데이터" + (" (신선함)" if is_fresh else " (오래됨)")
-        }
+    device_id = await get_device_id(plant_id)
+    latest = await get_latest_humidity_by_devices([device_id])
+    return _freshness_info(latest.get(device_id))
 
 async def get_plant_optimal_humidity_range(plant_id: int) -> dict:
     """
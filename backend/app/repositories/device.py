@@ -0,0 +1,134 @@
+"""
+습도 센서(device) ↔ 식물 매핑 저장소
+
+- device: 등록된 센서와 소유자 (설치 시 등록, 소유자가 없으면 처음 연결한 사용자가 소유)
+- plant_device: 식물 1개당 센서 1개 (같은 사용자의 여러 식물이 센서 1개를 공유하는 것은 허용)
+- 매핑이 없는 식물은 DEFAULT_DEVICE_ID(기존 공통 센서)를 사용합니다.
+- 여러 식물의 센서는 get_device_ids()로 한 번에 조회합니다. (식물 수와 무관하게 쿼리 1회)
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from core.config import settings
+from db.pool import get_db_connection
+
+async def get_device_ids(plant_ids: Iterable[int]) -> Dict[int, int]:
+    """식물 ID 목록 → {plant_id: device_id} (매핑이 없으면 DEFAULT_DEVICE_ID)"""
+    plant_ids = list(dict.fromkeys(plant_ids))
+    if not plant_ids:
+        return {}
+    devices = {plant_id: settings.DEFAULT_DEVICE_ID for plant_id in plant_ids}
+    placeholders = ", ".join(["%s"] * len(plant_ids))
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            f"SELECT plant_id, device_id FROM plant_device WHERE plant_id IN ({placeholders})",
+            plant_ids,
+        )
+        for row in await cursor.fetchall():
+            devices[row["plant_id"]] = row["device_id"]
+    return devices
+
+
+async def get_device_id(plant_id: int) -> int:
+    """식물의 습도 센서 ID"""
+    devices = await get_device_ids([plant_id])
+    return devices[plant_id]
+
+
+# claim_plant_device 결과
+DEVICE_CONNECTED = "connected"
+DEVICE_NOT_FOUND = "not_found"
+DEVICE_FORBIDDEN = "forbidden"
+
+
+class DeviceClaimError(Exception):
+    """센서를 연결할 수 없음 (reason: DEVICE_NOT_FOUND 또는 DEVICE_FORBIDDEN)"""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+async def claim_plant_device(user_id: str, plant_id: int, device_id: int) -> str:
+    """
+    사용자 식물에 센서를 연결합니다. (이미 연결돼 있으면 교체)
+    등록되지 않은 센서는 DEVICE_NOT_FOUND, 다른 사용자 소유 센서는 DEVICE_FORBIDDEN.
+    소유자가 없는 센서는 이 사용자가 소유하고, 공통 센서(DEFAULT_DEVICE_ID)는 소유 확인 없이 연결합니다.
+    """
+    async with get_db_connection() as (conn, cursor):
+        return await connect_plant_device(cursor, user_id, plant_id, device_id)
+
+
+async def connect_plant_device(cursor, user_id: str, plant_id: int, device_id: int) -> str:
+    """claim_plant_device와 같은 소유 확인 + 매핑 저장 (호출자의 트랜잭션 사용)"""
+    if device_id != settings.DEFAULT_DEVICE_ID:
+        await cursor.execute(
+            "SELECT owner_user_id FROM device WHERE device_id = %s FOR UPDATE",
+            (device_id,),
+        )
+        device = await cursor.fetchone()
+        if not device:
+            return DEVICE_NOT_FOUND
+        if device["owner_user_id"] is None:
+            await cursor.execute(
+                "UPDATE device SET owner_user_id = %s WHERE device_id = %s",
+                (user_id, device_id),
+            )
+        elif device["owner_user_id"] != user_id:
+            return DEVICE_FORBIDDEN
+    await set_plant_device(cursor, plant_id, device_id)
+    return DEVICE_CONNECTED
+
+
+async def set_plant_device(cursor, plant_id: int, device_id: int) -> None:
+    """식물 ↔ 센서 매핑 저장 (호출자의 트랜잭션 사용, 소유 확인은 connect_plant_device)"""
+    await cursor.execute(
+        """
+        INSERT INTO plant_device (plant_id, device_id)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE device_id = VALUES(device_id), registered_at = now()
+        """,
+        (plant_id, device_id),
+    )
+
+
+async def delete_plant_device(plant_id: int) -> bool:
+    """식물의 센서 연결을 해제합니다. (이후 DEFAULT_DEVICE_ID 사용)"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute("DELETE FROM plant_device WHERE plant_id = %s", (plant_id,))
+        return cursor.rowcount > 0
+
+
+async def list_user_plant_devices(user_id: str) -> List[dict]:
+    """사용자 식물별 센서 연결 현황"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT
+                up.plant_id,
+                up.plant_name,
+                COALESCE(pd.device_id, %s) AS device_id,
+                pd.device_id IS NOT NULL AS is_registered,
+                pd.registered_at
+            FROM user_plant up
+            LEFT JOIN plant_device pd ON pd.plant_id = up.plant_id
+            WHERE up.user_id = %s
+            ORDER BY up.plant_id
+            """,
+            (settings.DEFAULT_DEVICE_ID, user_id),
+        )
+        rows = await cursor.fetchall()
+    for row in rows:
+        row["is_registered"] = bool(row["is_registered"])
+    return rows
+
+
+async def user_owns_plant(user_id: str, plant_id: int) -> Optional[dict]:
+    """사용자 소유 식물이면 (plant_id, plant_name) 반환"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            "SELECT plant_id, plant_name FROM user_plant WHERE plant_id = %s AND user_id = %s",
+            (plant_id, user_id),
+        )
+        return await cursor.fetchone()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 from typing import Optional, List, Dict, Any
-import aiomysql
 import os
 import uuid
 from datetime import datetime, date
 
 from models.diary import Diary
+from repositories.diary_tag import delete_diary_tags, replace_diary_tags
+from services.user_stats import user_stats
+from db.instrument import InstrumentedDictCursor
+from db.pool import after_commit
 
 
 async def save_image_file(image_data: bytes, filename: str) -> str:
@@ -29,7 +32,7 @@ async def save_image_file(image_data: bytes, filename: str) -> str:
 
 async def get_by_diary_id(db, diary_id: int) -> Optional[Diary]:
     """diary_id로 일기 조회 (이미지 정보 포함)"""
-    async with db.cursor(aiomysql.DictCursor) as cursor:
+    async with db.cursor(InstrumentedDictCursor) as cursor:
         await cursor.execute("""
             SELECT d.*, ia.img_url 
             FROM diary d 
@@ -62,7 +65,7 @@ async def create(
     print(f"[DEBUG] create_diary 호출됨 - user_id: {user_id}")
     print(f"[DEBUG] 데이터: title={user_title}, content={user_content[:50]}..., weather={weather}")
     
-    async with db.cursor(aiomysql.DictCursor) as cursor:
+    async with db.cursor(InstrumentedDictCursor) as cursor:
         # 1. diary 테이블에 일기 생성
         print("[DEBUG] diary 테이블에 INSERT 시도")
         
@@ -81,6 +84,9 @@ async def create(
             )
             diary_id = cursor.lastrowid
             print(f"[DEBUG] diary INSERT 성공 - diary_id: {diary_id}")
+            after_commit(db, user_stats.diary_changed, user_id)
+            # 해시태그 인덱스 갱신 (같은 트랜잭션)
+            await replace_diary_tags(cursor, user_id, diary_id, hashtag)
         except Exception as e:
             print(f"[DEBUG] diary INSERT 실패: {e}")
             print(f"[DEBUG] INSERT 데이터: user_id={user_id}, title={user_title}, content={user_content[:50]}...")
@@ -147,6 +153,14 @@ async def patch(
     async with db.cursor() as cursor:
         await cursor.execute(query, values)
         
+        await cursor.execute("SELECT user_id FROM diary WHERE diary_id = %s", (diary_id,))
+        row = await cursor.fetchone()
+        if row:
+            after_commit(db, user_stats.diary_changed, row[0])
+            # 해시태그가 바뀌면 태그 인덱스도 교체
+            if "hashtag" in fields:
+                await replace_diary_tags(cursor, row[0], diary_id, fields["hashtag"])
+        
     # 수정된 일기 조회
     return await get_by_diary_id(db, diary_id)
 
@@ -154,13 +168,22 @@ async def patch(
 async def delete_by_idx(db, idx: int) -> int:
     """일기 삭제 (idx 기준)"""
     async with db.cursor() as cursor:
+        await cursor.execute("SELECT user_id FROM diary WHERE idx = %s", (idx,))
+        row = await cursor.fetchone()
         await cursor.execute("DELETE FROM diary WHERE idx = %s", (idx,))
+        if row:
+            after_commit(db, user_stats.diary_changed, row[0])
         return cursor.rowcount
 
 async def delete_by_diary_id(db, diary_id: int) -> int:
     """일기 삭제 (diary_id 기준)"""
     async with db.cursor() as cursor:
+        await cursor.execute("SELECT user_id FROM diary WHERE diary_id = %s", (diary_id,))
+        row = await cursor.fetchone()
+        await delete_diary_tags(cursor, diary_id)
         await cursor.execute("DELETE FROM diary WHERE diary_id = %s", (diary_id,))
+        if row:
+            after_commit(db, user_stats.diary_changed, row[0])
         return cursor.rowcount
 
 
@@ -172,7 +195,7 @@ async def list_by_user_cursor(
     last_idx: int | None,
 ) -> List[Diary]:
     """사용자별 일기 목록 조회 (커서 기반)"""
-    async with db.cursor(aiomysql.DictCursor) as cursor:
+    async with db.cursor(InstrumentedDictCursor) as cursor:
         if last_idx is not None:
             await cursor.execute(
                 """
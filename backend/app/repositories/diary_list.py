@@ -1,7 +1,12 @@
 import aiomysql
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
-from db.pool import get_db_connection
+from db.instrument import InstrumentedSSDictCursor
+from db.pool import checkout, get_db_connection, get_read_pool
+from repositories.diary_search import fulltext_condition, search_diaries
+from repositories.diary_tag import tag_filter_condition
+from services.user_stats import user_stats, DIARY_STATS, PLANT_DIARY_SUMMARY
+from utils.pagination import InvalidCursor, count_cache, decode_cursor, keyset_condition, next_cursor_from
 from schemas.diary import (
     DiaryListItemResponse,
     DiaryListResponse,
@@ -15,78 +20,85 @@ async def get_user_diary_list(
     limit: int = 20,
     order_by: str = "created_at",
     order_direction: str = "desc",
-    search_request: Optional[DiarySearchRequest] = None
+    search_request: Optional[DiarySearchRequest] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> DiaryListResponse:
-    """사용자의 일기 목록을 조회합니다."""
-    print(f"[DEBUG] get_user_diary_list 호출됨 - user_id: {user_id}, page: {page}, limit: {limit}")
+    """
+    사용자의 일기 목록을 조회합니다.
+    cursor가 있으면 키셋 페이지네이션(정렬 키 + diary_id)으로 다음 페이지를 조회하고,
+    없으면 page 번호(OFFSET)로 조회합니다. 응답의 next_cursor로 다음 페이지를 이어 받을 수 있습니다.
+    전체 개수는 include_total일 때만 계산하며 잠시 캐시합니다.
+    """
+    print(f"[DEBUG] get_user_diary_list 호출됨 - user_id: {user_id}, page: {page}, limit: {limit}, cursor: {cursor}")
     try:
-        async with get_db_connection() as (conn, cursor):
-            
-            # 정렬 방향 검증
-            if order_direction.lower() not in ["asc", "desc"]:
-                order_direction = "desc"
-            
-            # 정렬 기준 검증 및 매핑
-            order_mapping = {
-                "created_at": "d.created_at",
-                "user_title": "d.user_title"
-            }
-            
-            order_column = order_mapping.get(order_by, "d.created_at")
-            
-            # 검색 조건 구성
-            where_conditions = ["d.user_id = %s"]
-            params = [user_id]
+        # 정렬 방향 검증
+        if order_direction.lower() not in ["asc", "desc"]:
+            order_direction = "desc"
+        
+        # 정렬 기준 검증 및 매핑 - diary_id로 동률 정렬
+        # 두 컬럼 모두 NULL 가능: NULL이면 키셋 비교가 불가능하므로 대체값(가장 작은 값)으로 정렬
+        order_mapping = {
+            "created_at": "IFNULL(d.created_at, DATE('1000-01-01'))",
+            "user_title": "IFNULL(d.user_title, '')"
+        }
+        order_column = order_mapping.get(order_by, order_mapping["created_at"])
+        sort_columns = [(order_column, order_direction), ("d.diary_id", order_direction)]
+        sort_keys = ["sort_key", "idx"]
+        
+        # 검색 조건 구성
+        where_conditions = ["d.user_id = %s"]
+        params = [user_id]
+        
+        if search_request:
+            if search_request.query and search_request.query.strip():
+                # ngram FULLTEXT 인덱스 사용 (짧은 검색어는 LIKE로 대체, 공백뿐인 검색어는 조건 없음)
+                match_sql, match_params = fulltext_condition(search_request.query.strip())
+                where_conditions.append(match_sql)
+                params.extend(match_params)
             
-            if search_request:
-                if search_request.query:
-                    where_conditions.append("(d.user_title LIKE %s OR d.user_content LIKE %s)")
-                    search_term = f"%{search_request.query}%"
-                    params.extend([search_term, search_term])
-                
-                if search_request.plant_nickname:
-                    # plant_nickname은 user_plant 테이블에서 조인해서 가져와야 함
-                    where_conditions.append("up.plant_name LIKE %s")
-                    params.append(f"%{search_request.plant_nickname}%")
-                
-                if search_request.plant_species:
-                    # plant_species도 user_plant 테이블에서 조인해서 가져와야 함
-                    where_conditions.append("up.species LIKE %s")
-                    params.append(f"%{search_request.plant_species}%")
-                
-                if search_request.start_date:
-                    where_conditions.append("DATE(d.created_at) >= %s")
-                    params.append(search_request.start_date)
-                
-                if search_request.end_date:
-                    where_conditions.append("DATE(d.created_at) <= %s")
-                    params.append(search_request.end_date)
-                
-                if search_request.hashtag:
-                    where_conditions.append("d.hashtag LIKE %s")
-                    params.append(f"%{search_request.hashtag}%")
+            if search_request.plant_nickname:
+                # plant_nickname은 user_plant 테이블에서 조인해서 가져와야 함
+                where_conditions.append("up.plant_name LIKE %s")
+                params.append(f"%{search_request.plant_nickname}%")
             
-            where_clause = " AND ".join(where_conditions)
+            if search_request.plant_species:
+                # plant_species도 user_plant 테이블에서 조인해서 가져와야 함
+                where_conditions.append("up.species LIKE %s")
+                params.append(f"%{search_request.plant_species}%")
             
-            # 전체 개수 조회 (user_plant 조인 필요시)
-            if any(cond in where_clause for cond in ["up.plant_name", "up.species"]):
-                count_query = f"""
-                SELECT COUNT(*) as total 
-                FROM diary d 
-                LEFT JOIN user_plant up ON d.plant_id = up.plant_id 
-                WHERE {where_clause}
-                """
-            else:
-                count_query = f"SELECT COUNT(*) as total FROM diary d WHERE {where_clause}"
+            if search_request.start_date:
+                where_conditions.append("d.created_at >= %s")
+                params.append(search_request.start_date)
             
-            await cursor.execute(count_query, params)
-            count_result = await cursor.fetchone()
-            total_count = count_result['total']
+            if search_request.end_date:
+                # 인덱스를 타도록 DATE() 대신 다음날 0시 미만으로 비교
+                where_conditions.append("d.created_at < %s")
+                params.append(search_request.end_date + timedelta(days=1))
             
-            # 페이지네이션 계산
+            if search_request.hashtag:
+                # diary_tag 인덱스로 태그 필터
+                tag_sql, tag_params = tag_filter_condition(search_request.hashtag)
+                where_conditions.append(tag_sql)
+                params.extend(tag_params)
+        
+        where_clause = " AND ".join(where_conditions)
+        needs_plant_join = any(cond in where_clause for cond in ["up.plant_name", "up.species"])
+        
+        # 커서 조건 (키셋)
+        page_conditions = list(where_conditions)
+        page_params = list(params)
+        offset = 0
+        if cursor:
+            keyset_sql, keyset_params = keyset_condition(sort_columns, decode_cursor(cursor, len(sort_columns)))
+            page_conditions.append(keyset_sql)
+            page_params.extend(keyset_params)
+        else:
             offset = (page - 1) * limit
-            
-            # 일기 목록 조회
+        
+        async with get_db_connection(read_only=True, user_id=user_id) as (conn, db_cursor):
+            # 일기 목록 조회 (limit + 1건으로 다음 페이지 존재 여부 확인)
+            # 이미지는 일기당 1장만 서브쿼리로 가져와 행이 중복되지 않도록 함
             list_query = f"""
             SELECT 
                 d.diary_id as idx,
@@ -100,28 +112,52 @@ async def get_user_diary_list(
                 d.hashtag,
                 d.created_at,
                 d.created_at as updated_at,
-                ia.img_url
+                (SELECT ia.img_url FROM img_address ia
+                 WHERE ia.diary_id = d.diary_id
+                 ORDER BY ia.img_url LIMIT 1) as img_url,
+                {order_column} as sort_key
             FROM diary d
             LEFT JOIN user_plant up ON d.plant_id = up.plant_id
-            LEFT JOIN img_address ia ON d.diary_id = ia.diary_id
-            WHERE {where_clause}
-            ORDER BY {order_column} {order_direction.upper()}
+            WHERE {" AND ".join(page_conditions)}
+            ORDER BY sort_key {order_direction.upper()}, d.diary_id {order_direction.upper()}
             LIMIT %s OFFSET %s
             """
             
-            list_params = params + [limit, offset]
-            await cursor.execute(list_query, list_params)
-            results = await cursor.fetchall()
-            
-            diaries = [DiaryListItemResponse(**result) for result in results]
+            await db_cursor.execute(list_query, page_params + [limit + 1, offset])
+            results, next_cursor = next_cursor_from(await db_cursor.fetchall(), limit, sort_keys)
             
-            return DiaryListResponse(
-                diaries=diaries,
-                total_count=total_count,
-                page=page,
-                limit=limit,
-                has_more=(offset + limit) < total_count
-            )
+            total_count = None
+            if include_total:
+                if needs_plant_join:
+                    count_query = f"""
+                    SELECT COUNT(*) as total 
+                    FROM diary d 
+                    LEFT JOIN user_plant up ON d.plant_id = up.plant_id 
+                    WHERE {where_clause}
+                    """
+                else:
+                    count_query = f"SELECT COUNT(*) as total FROM diary d WHERE {where_clause}"
+                
+                async def _count() -> int:
+                    await db_cursor.execute(count_query, params)
+                    return (await db_cursor.fetchone())['total']
+                
+                total_count = await count_cache.get_or_compute(
+                    (("diary", user_id), where_clause, tuple(str(p) for p in params)), _count
+                )
+        
+        diaries = [DiaryListItemResponse(**result) for result in results]
+        
+        return DiaryListResponse(
+            diaries=diaries,
+            total_count=total_count,
+            page=page,
+            limit=limit,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor
+        )
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"[DEBUG] get_user_diary_list 오류: {e}")
         import traceback
@@ -132,99 +168,108 @@ async def search_user_diaries(
     user_id: str,
     query: str,
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> DiaryListResponse:
-    """사용자의 일기를 검색합니다."""
-    search_request = DiarySearchRequest(query=query)
-    return await get_user_diary_list(
+    """사용자의 일기를 관련도순으로 검색합니다. (스니펫/강조 구간 포함)"""
+    return await search_diaries(
         user_id=user_id,
+        query=query,
         page=page,
         limit=limit,
-        search_request=search_request
+        cursor=cursor,
+        include_total=include_total
     )
 
 async def get_diary_stats(user_id: str) -> DiaryStatsResponse:
     """사용자의 일기 통계를 조회합니다."""
-    async with get_db_connection() as (conn, cursor):
+    async def _compute():
+        async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
         
-        # 기본 통계 조회
-        stats_query = """
-        SELECT 
-            COUNT(*) as total_diaries,
-            COUNT(DISTINCT d.plant_id) as total_plants,
-            COUNT(CASE WHEN d.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 END) as recent_diary_count
-        FROM diary d
-        WHERE d.user_id = %s
-        """
+            # 기본 통계 조회
+            stats_query = """
+            SELECT 
+                COUNT(*) as total_diaries,
+                COUNT(DISTINCT d.plant_id) as total_plants,
+                COUNT(CASE WHEN d.created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 END) as recent_diary_count
+            FROM diary d
+            WHERE d.user_id = %s
+            """
         
-        await cursor.execute(stats_query, (user_id,))
-        stats_result = await cursor.fetchone()
+            await cursor.execute(stats_query, (user_id,))
+            stats_result = await cursor.fetchone()
         
-        # 가장 활발한 식물 조회
-        most_active_query = """
-        SELECT 
-            up.plant_name as plant_nickname,
-            COUNT(*) as diary_count
-        FROM diary d
-        LEFT JOIN user_plant up ON d.plant_id = up.plant_id
-        WHERE d.user_id = %s AND d.plant_id IS NOT NULL
-        GROUP BY d.plant_id, up.plant_name
-        ORDER BY diary_count DESC
-        LIMIT 1
-        """
+            # 가장 활발한 식물 조회
+            most_active_query = """
+            SELECT 
+                up.plant_name as plant_nickname,
+                COUNT(*) as diary_count
+            FROM diary d
+            LEFT JOIN user_plant up ON d.plant_id = up.plant_id
+            WHERE d.user_id = %s AND d.plant_id IS NOT NULL
+            GROUP BY d.plant_id, up.plant_name
+            ORDER BY diary_count DESC
+            LIMIT 1
+            """
         
-        await cursor.execute(most_active_query, (user_id,))
-        most_active_result = await cursor.fetchone()
-        
-        total_diaries = stats_result['total_diaries']
-        total_plants = stats_result['total_plants']
-        recent_diary_count = stats_result['recent_diary_count']
-        most_active_plant = most_active_result['plant_nickname'] if most_active_result else None
-        average_diaries_per_plant = total_diaries / total_plants if total_plants > 0 else 0
-        
-        return DiaryStatsResponse(
-            total_diaries=total_diaries,
-            total_plants=total_plants,
-            recent_diary_count=recent_diary_count,
-            most_active_plant=most_active_plant,
-            average_diaries_per_plant=round(average_diaries_per_plant, 2)
-        )
+            await cursor.execute(most_active_query, (user_id,))
+            most_active_result = await cursor.fetchone()
+        
+            total_diaries = stats_result['total_diaries']
+            total_plants = stats_result['total_plants']
+            recent_diary_count = stats_result['recent_diary_count']
+            most_active_plant = most_active_result['plant_nickname'] if most_active_result else None
+            average_diaries_per_plant = total_diaries / total_plants if total_plants > 0 else 0
+        
+            return DiaryStatsResponse(
+                total_diaries=total_diaries,
+                total_plants=total_plants,
+                recent_diary_count=recent_diary_count,
+                most_active_plant=most_active_plant,
+                average_diaries_per_plant=round(average_diaries_per_plant, 2)
+            )
+    
+    return await user_stats.get_or_compute(user_id, DIARY_STATS, _compute)
 
 async def get_plant_diary_summary(user_id: str) -> List[Dict[str, Any]]:
     """식물별 일기 요약을 조회합니다."""
-    async with get_db_connection() as (conn, cursor):
+    async def _compute():
+        async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
         
-        query = """
-        SELECT 
-            up.plant_name as plant_nickname,
-            up.species as plant_species,
-            COUNT(*) as diary_count,
-            MAX(d.created_at) as last_diary_date,
-            MIN(d.created_at) as first_diary_date
-        FROM diary d
-        LEFT JOIN user_plant up ON d.plant_id = up.plant_id
-        WHERE d.user_id = %s AND d.plant_id IS NOT NULL
-        GROUP BY d.plant_id, up.plant_name, up.species
-        ORDER BY diary_count DESC
-        """
+            query = """
+            SELECT 
+                up.plant_name as plant_nickname,
+                up.species as plant_species,
+                COUNT(*) as diary_count,
+                MAX(d.created_at) as last_diary_date,
+                MIN(d.created_at) as first_diary_date
+            FROM diary d
+            LEFT JOIN user_plant up ON d.plant_id = up.plant_id
+            WHERE d.user_id = %s AND d.plant_id IS NOT NULL
+            GROUP BY d.plant_id, up.plant_name, up.species
+            ORDER BY diary_count DESC
+            """
         
-        await cursor.execute(query, (user_id,))
-        results = await cursor.fetchall()
+            await cursor.execute(query, (user_id,))
+            results = await cursor.fetchall()
         
-        return [
-            {
-                "plant_nickname": row['plant_nickname'],
-                "plant_species": row['plant_species'],
-                "diary_count": row['diary_count'],
-                "last_diary_date": row['last_diary_date'],
-                "first_diary_date": row['first_diary_date']
-            }
-            for row in results
-        ]
+            return [
+                {
+                    "plant_nickname": row['plant_nickname'],
+                    "plant_species": row['plant_species'],
+                    "diary_count": row['diary_count'],
+                    "last_diary_date": row['last_diary_date'],
+                    "first_diary_date": row['first_diary_date']
+                }
+                for row in results
+            ]
+    
+    return await user_stats.get_or_compute(user_id, PLANT_DIARY_SUMMARY, _compute)
 
 async def get_recent_diaries(user_id: str, limit: int = 5) -> List[DiaryListItemResponse]:
     """사용자의 최근 일기를 조회합니다."""
-    async with get_db_connection() as (conn, cursor):
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
         
         query = """
         SELECT 
@@ -252,3 +297,66 @@ async def get_recent_diaries(user_id: str, limit: int = 5) -> List[DiaryListItem
         results = await cursor.fetchall()
         
         return [DiaryListItemResponse(**result) for result in results]
+
+async def stream_user_diaries(
+    user_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = 500
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    사용자 일기를 서버 측 커서(SSDictCursor)로 한 행씩 읽어 반환합니다. (내보내기용, 개수 제한 없음)
+    결과 전체를 클라이언트 메모리에 올리지 않으므로 일기 수와 무관하게 메모리 사용량이 일정합니다.
+    img_urls: 일기에 첨부된 이미지 URL을 공백으로 이은 문자열
+    """
+    conditions = ["d.user_id = %s"]
+    params: List[Any] = [user_id]
+    if start_date:
+        conditions.append("d.created_at >= %s")
+        params.append(start_date)
+    if end_date:
+        conditions.append("d.created_at < %s")
+        params.append(end_date + timedelta(days=1))
+    
+    query = f"""
+    SELECT 
+        d.diary_id as idx,
+        d.user_title,
+        d.user_content,
+        up.plant_name as plant_nickname,
+        up.species as plant_species,
+        d.plant_content as plant_reply,
+        d.weather,
+        d.hashtag,
+        d.hist_watered,
+        d.hist_repot,
+        d.hist_pruning,
+        d.hist_fertilize,
+        d.created_at,
+        (SELECT GROUP_CONCAT(ia.img_url ORDER BY ia.img_url SEPARATOR ' ')
+         FROM img_address ia WHERE ia.diary_id = d.diary_id) as img_urls
+    FROM diary d
+    LEFT JOIN user_plant up ON d.plant_id = up.plant_id
+    WHERE {" AND ".join(conditions)}
+    ORDER BY d.created_at DESC, d.diary_id DESC
+    """
+    
+    # checkout(): 연결 상태 확인, 복제본 장애 시 주 서버로 대체, 풀 지표 집계
+    async with checkout(await get_read_pool(user_id)) as conn:
+        completed = False
+        try:
+            cursor = await conn.cursor(InstrumentedSSDictCursor)
+            await cursor.execute(query, params)
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+            await cursor.close()
+            await conn.commit()
+            completed = True
+        finally:
+            if not completed:
+                # 중간에 끊긴 스트리밍(클라이언트 연결 종료 등)은 읽지 않은 결과가 남아 있으므로 연결을 재사용하지 않음
+                conn.close()
@@ -0,0 +1,119 @@
+"""
+일기 식물 답장 작업 저장소
+
+일기 작성/수정은 plant_content를 비워 둔 채 바로 커밋하고, 답장 생성 작업을
+diary_reply_job(diary_id 기본키) 테이블에 같은 트랜잭션으로 기록합니다.
+- services.diary_reply 워커가 작업을 꺼내 LLM 답장을 만든 뒤 diary.plant_content를 채우고 작업 행을 지웁니다.
+- 답장이 나오기 전에 일기를 다시 수정하면 seq가 올라가고, 이전 작업의 결과는 버려집니다.
+- 서버가 재시작되면 남아 있는 작업 행을 다시 큐에 넣습니다.
+- 워커는 claim_reply_job()으로 claimed_until(점유 만료)을 원자적으로 설정한 작업만 처리하므로
+  여러 프로세스가 같은 작업을 꺼내도 한 곳에서만 처리됩니다. 실패한 작업은 next_attempt_at까지 꺼내지 않습니다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from db.pool import get_db_connection
+
+async def upsert_reply_job(cursor, diary_id: int, species: Optional[str], moisture: Optional[float]) -> None:
+    """답장 작업 등록 (호출자의 트랜잭션 사용, 이미 있으면 seq 증가 후 재시작)"""
+    await cursor.execute(
+        """
+        INSERT INTO diary_reply_job (diary_id, species, moisture)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            seq = seq + 1, species = VALUES(species), moisture = VALUES(moisture),
+            attempts = 0, last_error = NULL, requested_at = now(),
+            next_attempt_at = now(), claimed_until = NULL
+        """,
+        (diary_id, species, moisture),
+    )
+
+
+async def claim_reply_job(diary_id: int, lease_seconds: int) -> Optional[Dict[str, Any]]:
+    """
+    작업 점유 + 현재 일기 본문
+    작업이 없거나, 재시도 대기 중이거나, 다른 워커가 점유 중이면 None
+    """
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            UPDATE diary_reply_job SET claimed_until = now() + INTERVAL %s SECOND
+            WHERE diary_id = %s AND next_attempt_at <= now()
+              AND (claimed_until IS NULL OR claimed_until < now())
+            """,
+            (lease_seconds, diary_id),
+        )
+        if cursor.rowcount != 1:
+            return None
+        await cursor.execute(
+            """
+            SELECT j.diary_id, j.seq, j.species, j.moisture, j.attempts, d.user_content
+            FROM diary_reply_job j
+            JOIN diary d ON d.diary_id = j.diary_id
+            WHERE j.diary_id = %s
+            """,
+            (diary_id,),
+        )
+        return await cursor.fetchone()
+
+
+async def has_reply_job(conn, diary_id: int) -> bool:
+    async with conn.cursor() as cursor:
+        await cursor.execute("SELECT 1 FROM diary_reply_job WHERE diary_id = %s", (diary_id,))
+        return await cursor.fetchone() is not None
+
+
+async def list_pending_job_ids(limit: int) -> List[int]:
+    """지금 처리할 수 있는 작업 (재시도 대기/점유 중 제외, 오래된 순)"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT diary_id FROM diary_reply_job
+            WHERE next_attempt_at <= now() AND (claimed_until IS NULL OR claimed_until < now())
+            ORDER BY requested_at LIMIT %s
+            """,
+            (limit,),
+        )
+        return [row["diary_id"] for row in await cursor.fetchall()]
+
+
+async def complete_reply_job(diary_id: int, seq: int, reply: str) -> bool:
+    """
+    답장 저장 + 작업 삭제 (한 트랜잭션)
+    그 사이 일기가 다시 수정되어 seq가 바뀌었으면 저장하지 않고 False
+    """
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            "DELETE FROM diary_reply_job WHERE diary_id = %s AND seq = %s",
+            (diary_id, seq),
+        )
+        if cursor.rowcount != 1:
+            return False
+        await cursor.execute(
+            "UPDATE diary SET plant_content = %s WHERE diary_id = %s",
+            (reply, diary_id),
+        )
+        return True
+
+
+async def record_reply_failure(diary_id: int, seq: int, error: str, retry_after: float) -> int:
+    """
+    실패 횟수 증가 + 점유 해제, retry_after초 뒤부터 다시 꺼낼 수 있음
+    반환: 누적 시도 횟수 (작업이 바뀌었거나 없으면 0)
+    """
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            UPDATE diary_reply_job
+            SET attempts = attempts + 1, last_error = %s,
+                next_attempt_at = now() + INTERVAL %s SECOND, claimed_until = NULL
+            WHERE diary_id = %s AND seq = %s
+            """,
+            (error[:500], int(retry_after), diary_id, seq),
+        )
+        if cursor.rowcount != 1:
+            return 0
+        await cursor.execute("SELECT attempts FROM diary_reply_job WHERE diary_id = %s", (diary_id,))
+        row = await cursor.fetchone()
+        return row["attempts"] if row else 0
@@ -0,0 +1,156 @@
+"""
+일기 전문 검색 저장소
+
+- diary(user_title, user_content, hashtag)에 MySQL ngram 파서 FULLTEXT 인덱스를 사용합니다.
+  (ngram 파서는 한글처럼 띄어쓰기와 무관한 부분 일치를 인덱스로 처리합니다.)
+- InnoDB FULLTEXT 인덱스는 INSERT/UPDATE/DELETE 커밋 시 함께 갱신되므로
+  일기 작성/수정/삭제 경로에서 별도의 색인 작업이 필요 없습니다.
+- 인덱스가 없거나(마이그레이션 3번 미적용) 검색어가 ngram 길이보다 짧으면 LIKE 검색으로 대체합니다.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+
+from core.config import settings
+from db.pool import get_db_connection
+from schemas.diary import DiaryListItemResponse, DiaryListResponse
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from utils.text_search import build_boolean_query, make_snippet, tokenize_query
+
+DIARY_FULLTEXT_INDEX = "ft_diary_text"
+DIARY_MATCH = "MATCH(d.user_title, d.user_content, d.hashtag)"
+
+_fulltext_ready = False
+
+
+async def detect_diary_fulltext_index() -> bool:
+    """diary ngram FULLTEXT 인덱스가 있는지 확인합니다. (앱 시작 시 1회, 생성은 마이그레이션 3번)"""
+    global _fulltext_ready
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT COUNT(*) AS count
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'diary' AND index_name = %s
+            """,
+            (DIARY_FULLTEXT_INDEX,),
+        )
+        result = await cursor.fetchone()
+    _fulltext_ready = bool(result and result["count"])
+    return _fulltext_ready
+
+
+def fulltext_condition(query: str) -> Tuple[str, List[Any]]:
+    """
+    검색어 → (WHERE 조건, 파라미터)
+    ngram 길이 이상인 토큰은 FULLTEXT로, 짧은 토큰(한 글자 등)은 LIKE로 검사합니다.
+    """
+    tokens = tokenize_query(query) or [query.strip().lower()]
+    indexed = [t for t in tokens if _fulltext_ready and len(t) >= settings.DIARY_SEARCH_NGRAM_SIZE]
+    short = [t for t in tokens if t not in indexed]
+
+    conditions: List[str] = []
+    params: List[Any] = []
+    if indexed:
+        conditions.append(f"{DIARY_MATCH} AGAINST (%s IN BOOLEAN MODE)")
+        params.append(build_boolean_query(indexed))
+    for token in short:
+        conditions.append("(d.user_title LIKE %s OR d.user_content LIKE %s OR d.hashtag LIKE %s)")
+        params.extend([f"%{token}%"] * 3)
+    return "(" + " AND ".join(conditions) + ")", params
+
+
+async def search_diaries(
+    user_id: str,
+    query: str,
+    page: int = 1,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+) -> DiaryListResponse:
+    """
+    사용자 일기를 관련도순으로 검색합니다.
+    - 점수는 FULLTEXT 관련도 + 제목 일치 가중치, 동점이면 최신 일기 우선
+    - 결과마다 본문 스니펫과 강조 구간(highlights)을 함께 반환
+    - 관련도 순서는 키셋으로 이어 붙일 수 없으므로 cursor에는 다음 위치(offset)를 담습니다.
+    - 공백뿐인 검색어는 (LIKE '%%'로 전체 일기가 걸리지 않도록) 빈 결과를 반환합니다.
+    """
+    query = query.strip()
+    if not query:
+        return DiaryListResponse(
+            diaries=[], total_count=0 if include_total else None, page=page, limit=limit, has_more=False
+        )
+    tokens = tokenize_query(query) or [query.lower()]
+    offset = decode_cursor(cursor, 1)[0] if cursor else (page - 1) * limit
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor("invalid search cursor")
+
+    match_sql, match_params = fulltext_condition(query)
+    indexed = [t for t in tokens if _fulltext_ready and len(t) >= settings.DIARY_SEARCH_NGRAM_SIZE]
+    if indexed:
+        boolean_query = build_boolean_query(indexed)
+        score_sql = f"{DIARY_MATCH} AGAINST (%s IN BOOLEAN MODE) + (d.user_title LIKE %s) * 2"
+        score_params: List[Any] = [boolean_query, f"%{indexed[0]}%"]
+    else:
+        score_sql = "(d.user_title LIKE %s) * 2"
+        score_params = [f"%{tokens[0]}%"]
+
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, db_cursor):
+        await db_cursor.execute(
+            f"""
+            SELECT
+                d.diary_id as idx,
+                d.user_title,
+                d.user_content,
+                d.plant_id,
+                up.plant_name as plant_nickname,
+                up.species as plant_species,
+                d.plant_content as plant_reply,
+                d.weather,
+                NULL as weather_icon,
+                d.hist_watered,
+                d.hist_repot,
+                d.hist_pruning,
+                d.hist_fertilize,
+                d.hashtag,
+                d.created_at,
+                d.created_at as updated_at,
+                (SELECT ia.img_url FROM img_address ia
+                 WHERE ia.diary_id = d.diary_id
+                 ORDER BY ia.img_url LIMIT 1) as img_url,
+                {score_sql} as score
+            FROM diary d
+            LEFT JOIN user_plant up ON d.plant_id = up.plant_id
+            WHERE d.user_id = %s AND {match_sql}
+            ORDER BY score DESC, d.diary_id DESC
+            LIMIT %s OFFSET %s
+            """,
+            score_params + [user_id] + match_params + [limit + 1, offset],
+        )
+        rows = await db_cursor.fetchall()
+
+        total_count = None
+        if include_total:
+            await db_cursor.execute(
+                f"SELECT COUNT(*) as total FROM diary d WHERE d.user_id = %s AND {match_sql}",
+                [user_id] + match_params,
+            )
+            total_count = (await db_cursor.fetchone())["total"]
+
+    has_more = len(rows) > limit
+    diaries = []
+    for row in rows[:limit]:
+        snippet, highlights = make_snippet(row.get("user_content") or row.get("user_title"), tokens)
+        row["score"] = float(row["score"] or 0)
+        row["snippet"] = snippet
+        row["highlights"] = [list(span) for span in highlights]
+        diaries.append(DiaryListItemResponse(**row))
+
+    return DiaryListResponse(
+        diaries=diaries,
+        total_count=total_count,
+        page=page,
+        limit=limit,
+        has_more=has_more,
+        next_cursor=encode_cursor([offset + limit]) if has_more else None,
+    )
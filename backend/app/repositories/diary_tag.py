@@ -0,0 +1,121 @@
+"""
+일기 해시태그 인덱스 저장소
+
+diary.hashtag 자유 텍스트("#물주기 #자동감지")를 작성 시점에 태그 단위로 분리해
+diary_tag(user_id, tag, diary_id) 테이블에 저장합니다.
+- 태그 필터/태그별 개수/자동완성은 (user_id, tag) 기본키 범위 조회로 처리합니다.
+- 일기 작성/수정/삭제(repositories.diary)에서 같은 트랜잭션으로 함께 갱신됩니다.
+- 기존 일기는 backfill_diary_tags()로 한 번 채워 넣습니다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from db.pool import get_db_connection
+from utils.text_search import parse_hashtags
+
+async def replace_diary_tags(cursor, user_id: str, diary_id: int, hashtag: Optional[str]) -> List[str]:
+    """
+    일기의 태그를 hashtag 문자열 기준으로 교체합니다. (호출자의 트랜잭션 사용)
+    반환: 저장된 태그 목록
+    """
+    tags = parse_hashtags(hashtag)
+    await cursor.execute("DELETE FROM diary_tag WHERE diary_id = %s", (diary_id,))
+    if tags:
+        placeholders = ", ".join(["(%s, %s, %s)"] * len(tags))
+        params: List[Any] = []
+        for tag in tags:
+            params.extend((user_id, tag, diary_id))
+        await cursor.execute(
+            f"INSERT IGNORE INTO diary_tag (user_id, tag, diary_id) VALUES {placeholders}",
+            params,
+        )
+    return tags
+
+
+async def delete_diary_tags(cursor, diary_id: int) -> None:
+    """일기의 태그를 삭제합니다. (호출자의 트랜잭션 사용)"""
+    await cursor.execute("DELETE FROM diary_tag WHERE diary_id = %s", (diary_id,))
+
+
+def _prefix_pattern(text: str) -> str:
+    """태그 앞부분 일치용 LIKE 패턴 (와일드카드 문자 이스케이프)"""
+    normalized = (parse_hashtags(text) or [""])[0]
+    escaped = normalized.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def tag_filter_condition(tag: str, alias: str = "d") -> Tuple[str, List[Any]]:
+    """
+    태그 필터 WHERE 조건 (태그 앞부분 일치, 예: "물" → #물주기, #물꽂이)
+    (user_id, tag) 인덱스 범위 조회로 처리됩니다.
+    """
+    return (
+        f"EXISTS (SELECT 1 FROM diary_tag dt WHERE dt.user_id = {alias}.user_id "
+        f"AND dt.diary_id = {alias}.diary_id AND dt.tag LIKE %s)",
+        [_prefix_pattern(tag)],
+    )
+
+
+async def get_tag_counts(user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """사용자 태그별 일기 수 (많은 순)"""
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT tag, COUNT(*) AS count
+            FROM diary_tag
+            WHERE user_id = %s
+            GROUP BY tag
+            ORDER BY count DESC, tag ASC
+            LIMIT %s
+            """,
+            (user_id, limit),
+        )
+        return await cursor.fetchall()
+
+
+async def autocomplete_tags(user_id: str, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """입력 중인 태그 자동완성 (앞부분 일치, 많이 쓴 순)"""
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT tag, COUNT(*) AS count
+            FROM diary_tag
+            WHERE user_id = %s AND tag LIKE %s
+            GROUP BY tag
+            ORDER BY count DESC, tag ASC
+            LIMIT %s
+            """,
+            (user_id, _prefix_pattern(prefix), limit),
+        )
+        return await cursor.fetchall()
+
+
+async def backfill_diary_tags(batch_size: int = 500) -> int:
+    """
+    기존 일기의 hashtag를 diary_tag로 옮깁니다. (diary_id 순으로 배치 처리, 반복 실행 가능)
+    반환: 처리한 일기 수
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        async with get_db_connection() as (conn, cursor):
+            await cursor.execute(
+                """
+                SELECT diary_id, user_id, hashtag
+                FROM diary
+                WHERE diary_id > %s
+                ORDER BY diary_id
+                LIMIT %s
+                """,
+                (last_id, batch_size),
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                await replace_diary_tags(cursor, row["user_id"], row["diary_id"], row["hashtag"])
+        processed += len(rows)
+        last_id = rows[-1]["diary_id"]
+        print(f"[TAG] backfill: diary_id <= {last_id} ({processed}건)", flush=True)
+    return processed
@@ -0,0 +1,348 @@
+"""
+습도(humid) 시계열 저장소
+
+- humid            : 센서 원본 (1 reading = 1 row, append-only)
+- humid_hourly     : 시간 단위 집계 (min/max/avg/last)
+- humid_daily      : 일 단위 집계 (min/max/avg/last)
+
+집계 테이블은 MQTT 적재 경로(services.mqtt_service)에서 배치 INSERT와 같은 트랜잭션으로
+증분 갱신되며, 원본 행은 보존 기간(HUMID_RAW_RETENTION_DAYS)이 지나면 삭제됩니다.
+avg는 sum/cnt로 계산하므로 증분 갱신해도 정확합니다.
+집계 재계산(rebuild_rollups)과 적재 배치는 rollup_lock()(GET_LOCK)으로 서로 겹치지 않습니다.
+"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, date
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.config import settings
+from db.pool import commit, get_db_connection
+
+# (device_id, humidity, sensor_digit, humid_date)
+HumidRow = Tuple[int, int, int, datetime]
+
+RESOLUTION_RAW = "raw"
+RESOLUTION_HOURLY = "hourly"
+RESOLUTION_DAILY = "daily"
+RESOLUTIONS = (RESOLUTION_RAW, RESOLUTION_HOURLY, RESOLUTION_DAILY)
+
+# 집계 테이블 정의: resolution → (테이블명, 버킷 계산 SQL 식)
+_ROLLUP_TABLES = {
+    RESOLUTION_HOURLY: ("humid_hourly", "DATE_FORMAT(humid_date, '%%Y-%%m-%%d %%H:00:00')"),
+    RESOLUTION_DAILY: ("humid_daily", "DATE(humid_date)"),
+}
+
+# ON DUPLICATE KEY UPDATE는 왼쪽부터 순서대로 적용되므로
+# last_humidity를 last_at보다 먼저 갱신해야 이전 last_at과 비교됩니다.
+_UPSERT_TAIL = """
+    ON DUPLICATE KEY UPDATE
+        min_humidity = LEAST(min_humidity, VALUES(min_humidity)),
+        max_humidity = GREATEST(max_humidity, VALUES(max_humidity)),
+        sum_humidity = sum_humidity + VALUES(sum_humidity),
+        cnt = cnt + VALUES(cnt),
+        last_humidity = IF(VALUES(last_at) >= last_at, VALUES(last_humidity), last_humidity),
+        last_at = GREATEST(last_at, VALUES(last_at))
+"""
+
+
+ROLLUP_LOCK = "pland_humid_rollups"
+ROLLUP_LOCK_WAIT_INGEST = 5      # 적재 배치: 재계산 중이면 잠시 기다린 뒤 실패 → 재시도/spill
+ROLLUP_LOCK_WAIT_REBUILD = 60    # 재계산: 진행 중인 적재 배치가 끝나길 기다림
+
+
+class RollupLockTimeout(RuntimeError):
+    """집계 잠금을 제한 시간 안에 얻지 못함 (재계산 또는 다른 적재 배치가 진행 중)"""
+
+
+@asynccontextmanager
+async def rollup_lock(cursor, timeout: float) -> AsyncIterator[None]:
+    """
+    집계 테이블 쓰기 잠금 (연결 세션 단위 GET_LOCK)
+    커밋한 뒤에 풀리도록 블록 안에서 커밋해야 합니다. 연결이 끊기면 서버가 자동으로 풉니다.
+    """
+    await cursor.execute("SELECT GET_LOCK(%s, %s) AS locked", (ROLLUP_LOCK, timeout))
+    if not (await cursor.fetchone())["locked"]:
+        raise RollupLockTimeout("습도 집계 재계산 또는 다른 적재 배치가 진행 중입니다.")
+    try:
+        yield
+    finally:
+        await cursor.execute("SELECT RELEASE_LOCK(%s)", (ROLLUP_LOCK,))
+
+
+def _bucket(resolution: str, ts: datetime):
+    if resolution == RESOLUTION_HOURLY:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.date()
+
+
+def aggregate_rows(rows: Iterable[HumidRow], resolution: str) -> List[Tuple[Any, ...]]:
+    """
+    원본 행을 (device_id, bucket) 단위로 미리 집계합니다.
+    반환: (device_id, bucket, min, max, sum, cnt, last_humidity, last_at)
+    """
+    buckets: Dict[Tuple[int, Any], List[Any]] = {}
+    for device_id, humidity, _sensor_digit, humid_date in rows:
+        key = (device_id, _bucket(resolution, humid_date))
+        acc = buckets.get(key)
+        if acc is None:
+            buckets[key] = [humidity, humidity, humidity, 1, humidity, humid_date]
+            continue
+        acc[0] = min(acc[0], humidity)
+        acc[1] = max(acc[1], humidity)
+        acc[2] += humidity
+        acc[3] += 1
+        if humid_date >= acc[5]:
+            acc[4] = humidity
+            acc[5] = humid_date
+    return [(device_id, bucket, *acc) for (device_id, bucket), acc in buckets.items()]
+
+
+async def upsert_rollups(cursor, rows: Sequence[HumidRow]) -> None:
+    """
+    원본 배치를 시간/일 집계 테이블에 증분 반영합니다.
+    호출자의 커서(트랜잭션)를 그대로 사용하므로 원본 INSERT와 함께 커밋/롤백됩니다.
+    호출자는 rollup_lock()을 잡은 상태여야 합니다. (재계산과 겹치면 중복 집계)
+    """
+    if not rows:
+        return
+    for resolution, (table, _expr) in _ROLLUP_TABLES.items():
+        aggregated = aggregate_rows(rows, resolution)
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(aggregated))
+        params: List[Any] = []
+        for values in aggregated:
+            params.extend(values)
+        await cursor.execute(
+            f"""
+            INSERT INTO {table}
+                (device_id, bucket, min_humidity, max_humidity, sum_humidity, cnt, last_humidity, last_at)
+            VALUES {placeholders}
+            {_UPSERT_TAIL}
+            """,
+            params,
+        )
+
+
+def raw_complete_since() -> Optional[datetime]:
+    """
+    원본 행이 하루 전체 남아 있는 가장 이른 날의 시작 시각
+    보존 작업(HUMID_RAW_RETENTION_DAYS)이 그보다 오래된 원본을 지우므로 그 이전 집계는 다시 만들 수 없습니다.
+    보존 삭제를 하지 않으면 None.
+    """
+    if settings.HUMID_RAW_RETENTION_DAYS <= 0:
+        return None
+    cutoff = datetime.now() - timedelta(days=settings.HUMID_RAW_RETENTION_DAYS)
+    return datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time())
+
+
+async def rebuild_rollups(since: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    원본 humid 테이블로부터 집계를 다시 계산합니다. (최초 도입/복구용 백필)
+    since가 주어지면 해당 시각이 속한 날부터만 재계산합니다.
+    원본이 이미 삭제된 구간의 집계는 유일한 기록이므로, 재계산 구간은 raw_complete_since() 이후로 제한합니다.
+
+    MQTT 적재를 멈춘 상태(오프라인)에서 실행하세요. 재계산 동안 rollup_lock()을 잡고 있으므로
+    적재 중에 실행해도 집계가 중복/누락되지는 않지만, 그동안 적재 배치는 실패해 재시도/spill로 밀립니다.
+    """
+    result: Dict[str, int] = {}
+    start = datetime.combine(since.date(), datetime.min.time()) if since else None
+    floor = raw_complete_since()
+    if floor is not None and (start is None or start < floor):
+        print(f"[HUMID] rollup rebuild limited to buckets from {floor:%Y-%m-%d} (raw rows before it are pruned)", flush=True)
+        start = floor
+    async with get_db_connection() as (conn, cursor), rollup_lock(cursor, ROLLUP_LOCK_WAIT_REBUILD):
+        for resolution, (table, expr) in _ROLLUP_TABLES.items():
+            where = "WHERE h.humid_date >= %s" if start else ""
+            # DATE_FORMAT의 %%를 풀기 위해 파라미터가 없어도 빈 튜플을 넘깁니다.
+            params = (start,) if start else ()
+            if start:
+                await cursor.execute(f"DELETE FROM {table} WHERE bucket >= %s", (start,))
+            else:
+                await cursor.execute(f"DELETE FROM {table}")
+            await cursor.execute(
+                f"""
+                INSERT INTO {table}
+                    (device_id, bucket, min_humidity, max_humidity, sum_humidity, cnt, last_humidity, last_at)
+                SELECT
+                    g.device_id, g.bucket, g.min_humidity, g.max_humidity, g.sum_humidity, g.cnt,
+                    (SELECT h2.humidity FROM humid h2
+                     WHERE h2.device_id = g.device_id AND h2.humid_date = g.last_at
+                     ORDER BY h2.idx DESC LIMIT 1),
+                    g.last_at
+                FROM (
+                    SELECT
+                        h.device_id,
+                        {expr.replace('humid_date', 'h.humid_date')} AS bucket,
+                        MIN(h.humidity) AS min_humidity,
+                        MAX(h.humidity) AS max_humidity,
+                        SUM(h.humidity) AS sum_humidity,
+                        COUNT(*) AS cnt,
+                        MAX(h.humid_date) AS last_at
+                    FROM humid h
+                    {where}
+                    GROUP BY h.device_id, bucket
+                ) g
+                """,
+                params,
+            )
+            result[table] = cursor.rowcount
+        await commit(conn)  # 잠금을 풀기 전에 커밋
+    return result
+
+
+def choose_resolution(start: datetime, end: datetime) -> str:
+    """조회 구간 길이에 맞는 해상도를 고릅니다."""
+    span = end - start
+    if span <= timedelta(hours=settings.HUMID_RAW_MAX_RANGE_HOURS):
+        return RESOLUTION_RAW
+    if span <= timedelta(days=settings.HUMID_HOURLY_MAX_RANGE_DAYS):
+        return RESOLUTION_HOURLY
+    return RESOLUTION_DAILY
+
+
+async def get_latest_humidity_rows(device_id: int, limit: int = 7) -> List[dict]:
+    """최근 원본 습도 기록 limit건 (최신순)"""
+    async with get_db_connection(read_only=True) as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT humidity, humid_date
+            FROM humid
+            WHERE device_id = %s
+            ORDER BY humid_date DESC
+            LIMIT %s
+            """,
+            (device_id, limit),
+        )
+        return await cursor.fetchall()
+
+
+async def get_latest_humidity_by_devices(device_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    센서별 최신 습도 1건을 한 번에 조회합니다.
+    반환: {device_id: {humidity, humid_date, minutes_ago}} (데이터 없는 센서는 제외)
+    humid(device_id, humid_date) 인덱스로 센서당 MAX 조회가 인덱스 탐색으로 끝납니다.
+    """
+    device_ids = list(dict.fromkeys(device_ids))
+    if not device_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(device_ids))
+    async with get_db_connection(read_only=True) as (conn, cursor):
+        await cursor.execute(
+            f"""
+            SELECT
+                h.device_id,
+                MAX(h.humidity) AS humidity,
+                m.last_date AS humid_date,
+                TIMESTAMPDIFF(MINUTE, m.last_date, NOW()) AS minutes_ago
+            FROM (
+                SELECT device_id, MAX(humid_date) AS last_date
+                FROM humid
+                WHERE device_id IN ({placeholders})
+                GROUP BY device_id
+            ) m
+            JOIN humid h ON h.device_id = m.device_id AND h.humid_date = m.last_date
+            GROUP BY h.device_id, m.last_date
+            """,
+            device_ids,
+        )
+        rows = await cursor.fetchall()
+    return {row["device_id"]: row for row in rows}
+
+
+async def get_raw_rows_since(since: datetime) -> List[HumidRow]:
+    """since 이후 전체 센서의 원본 행 (장치, 시각 순) - 재시작 시 물주기 감지 상태 복원용"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT device_id, humidity, sensor_digit, humid_date
+            FROM humid
+            WHERE humid_date >= %s
+            ORDER BY device_id, humid_date
+            """,
+            (since,),
+        )
+        rows = await cursor.fetchall()
+    return [(r["device_id"], r["humidity"], r["sensor_digit"], r["humid_date"]) for r in rows]
+
+
+async def get_humidity_series(
+    device_id: int,
+    start: datetime,
+    end: Optional[datetime] = None,
+    resolution: Optional[str] = None,
+) -> Tuple[str, List[dict]]:
+    """
+    구간 습도 시계열을 조회합니다. (최신순)
+    resolution을 지정하지 않으면 구간 길이에 따라 raw/hourly/daily 중 자동 선택합니다.
+    집계 행의 humidity는 구간 평균이며 min/max/last도 함께 반환합니다.
+    """
+    end = end or datetime.now()
+    if resolution not in RESOLUTIONS:
+        resolution = choose_resolution(start, end)
+
+    async with get_db_connection(read_only=True) as (conn, cursor):
+        if resolution == RESOLUTION_RAW:
+            await cursor.execute(
+                """
+                SELECT humidity, humid_date
+                FROM humid
+                WHERE device_id = %s AND humid_date >= %s AND humid_date <= %s
+                ORDER BY humid_date DESC
+                """,
+                (device_id, start, end),
+            )
+            return resolution, await cursor.fetchall()
+
+        table, _expr = _ROLLUP_TABLES[resolution]
+        bucket_start = _bucket(resolution, start)
+        await cursor.execute(
+            f"""
+            SELECT
+                bucket,
+                ROUND(sum_humidity / cnt, 1) AS avg_humidity,
+                min_humidity,
+                max_humidity,
+                last_humidity,
+                last_at,
+                cnt
+            FROM {table}
+            WHERE device_id = %s AND bucket >= %s AND bucket <= %s
+            ORDER BY bucket DESC
+            """,
+            (device_id, bucket_start, end),
+        )
+        rows = await cursor.fetchall()
+
+    series = []
+    for row in rows:
+        bucket = row["bucket"]
+        if isinstance(bucket, date) and not isinstance(bucket, datetime):
+            bucket = datetime.combine(bucket, datetime.min.time())
+        series.append({
+            "humidity": float(row["avg_humidity"]),
+            "humid_date": bucket,
+            "min_humidity": row["min_humidity"],
+            "max_humidity": row["max_humidity"],
+            "last_humidity": row["last_humidity"],
+            "last_at": row["last_at"],
+            "count": row["cnt"],
+        })
+    return resolution, series
+
+
+async def prune_raw_humid(before: datetime, chunk_size: int = 5000) -> int:
+    """
+    before 이전의 원본 행을 chunk_size 단위로 삭제합니다.
+    긴 락을 피하려고 청크마다 커밋합니다. 반환: 삭제된 행 수
+    """
+    total = 0
+    while True:
+        async with get_db_connection() as (conn, cursor):
+            await cursor.execute(
+                "DELETE FROM humid WHERE humid_date < %s LIMIT %s",
+                (before, chunk_size),
+            )
+            deleted = cursor.rowcount
+        total += deleted
+        if deleted < chunk_size:
+            return total
@@ -1,321 +1,49 @@
-import aiomysql
-from typing import List, Optional
-from datetime import datetime
+"""
+정보방(식물/병충해 위키) 저장소
+
+위키는 거의 바뀌지 않는 참고 자료라 요청마다 조회하지 않고,
+services.wiki_store가 시작 시 전체를 읽어 메모리 색인으로 제공합니다.
+이 모듈은 전체 적재와 변경 감지용 체크섬 조회만 담당합니다.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
 from db.pool import get_db_connection
-from schemas.info_room import (
-    PlantWikiInfo,
-    PestWikiInfo,
-    PlantWikiListResponse,
-    PestWikiListResponse,
-    PlantWikiDetailResponse,
-    PestWikiDetailResponse,
-    InfoRoomStatsResponse
+
+PLANT_WIKI_COLUMNS = (
+    "wiki_plant_id", "sci_name", "name_jong", "feature", "temp", "watering",
+    "flowering", "flower_color", "fertilizer", "pruning", "repot", "toxic",
 )
 
-async def get_plant_wiki_list(
-    page: int = 1,
-    limit: int = 20,
-    search: Optional[str] = None
-) -> PlantWikiListResponse:
-    """식물 위키 목록을 조회합니다."""
-    connection = None
-    try:
-        connection = await get_db_connection()
-        
-        # 검색 조건 설정
-        where_clause = ""
-        params = []
-        
-        if search:
-            where_clause = "WHERE name_jong LIKE %s"
-            params.append(f"%{search}%")
-        
-        # 전체 개수 조회
-        count_query = f"SELECT COUNT(*) as total FROM plant_wiki {where_clause}"
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(count_query, params)
-            count_result = await cursor.fetchone()
-            total_count = count_result['total']
-            
-            # 페이지네이션 계산
-            offset = (page - 1) * limit
-            
-            # 식물 위키 목록 조회
-            list_query = f"""
-            SELECT 
-                wiki_plant_id,
-                name_jong,
-                feature,
-                temp,
-                watering,
-                flowering,
-                flower_color,
-                fertilizer,
-                pruning,
-                repot,
-                toxic
-            FROM plant_wiki 
-            {where_clause}
-            ORDER BY name_jong ASC
-            LIMIT %s OFFSET %s
-            """
-            
-            list_params = params + [limit, offset]
-            await cursor.execute(list_query, list_params)
-            results = await cursor.fetchall()
-            
-            plants = [PlantWikiInfo(**result) for result in results]
-            
-            return PlantWikiListResponse(
-                plants=plants,
-                total_count=total_count,
-                page=page,
-                limit=limit
-            )
-            
-    except Exception as e:
-        print(f"Error in get_plant_wiki_list: {e}")
-        raise e
-    finally:
-        if connection:
-            connection.close()
 
-async def get_plant_wiki_detail(wiki_plant_id: int) -> Optional[PlantWikiDetailResponse]:
-    """특정 식물 위키 상세 정보를 조회합니다."""
-    connection = None
-    try:
-        connection = await get_db_connection()
-        
-        query = """
-        SELECT 
-            wiki_plant_id,
-            name_jong,
-            feature,
-            temp,
-            watering,
-            flowering,
-            flower_color,
-            fertilizer,
-            pruning,
-            repot,
-            toxic
-        FROM plant_wiki 
-        WHERE wiki_plant_id = %s
-        """
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (wiki_plant_id,))
-            result = await cursor.fetchone()
-            
-            if not result:
-                return None
-                
-            return PlantWikiDetailResponse(**result)
-            
-    except Exception as e:
-        print(f"Error in get_plant_wiki_detail: {e}")
-        raise e
-    finally:
-        if connection:
-            connection.close()
+async def load_plant_wiki_rows() -> List[Dict[str, Any]]:
+    """식물 위키 전체"""
+    async with get_db_connection(read_only=True) as (conn, cursor):
+        await cursor.execute(
+            f"SELECT {', '.join(PLANT_WIKI_COLUMNS)} FROM plant_wiki ORDER BY wiki_plant_id"
+        )
+        return await cursor.fetchall()
 
-async def get_pest_wiki_list(
-    page: int = 1,
-    limit: int = 20,
-    search: Optional[str] = None
-) -> PestWikiListResponse:
-    """병충해 위키 목록을 조회합니다."""
-    connection = None
-    try:
-        connection = await get_db_connection()
-        
-        # 검색 조건 설정
-        where_clause = ""
-        params = []
-        
-        if search:
-            where_clause = "WHERE pest_name LIKE %s"
-            params.append(f"%{search}%")
-        
-        # 전체 개수 조회
-        count_query = f"SELECT COUNT(*) as total FROM pest_wiki {where_clause}"
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(count_query, params)
-            count_result = await cursor.fetchone()
-            total_count = count_result['total']
-            
-            # 페이지네이션 계산
-            offset = (page - 1) * limit
-            
-            # 병충해 위키 목록 조회
-            list_query = f"""
-            SELECT 
-                pest_id,
-                pest_name,
-                cause,
-                cure,
-                prevention
-            FROM pest_wiki 
-            {where_clause}
-            ORDER BY pest_name ASC
-            LIMIT %s OFFSET %s
-            """
-            
-            list_params = params + [limit, offset]
-            await cursor.execute(list_query, list_params)
-            results = await cursor.fetchall()
-            
-            pests = [PestWikiInfo(**result) for result in results]
-            
-            return PestWikiListResponse(
-                pests=pests,
-                total_count=total_count,
-                page=page,
-                limit=limit
-            )
-            
-    except Exception as e:
-        print(f"Error in get_pest_wiki_list: {e}")
-        raise e
-    finally:
-        if connection:
-            connection.close()
 
-async def get_pest_wiki_detail(pest_id: int) -> Optional[PestWikiDetailResponse]:
-    """특정 병충해 위키 상세 정보를 조회합니다."""
-    connection = None
-    try:
-        connection = await get_db_connection()
-        
-        query = """
-        SELECT 
-            pest_id,
-            pest_name,
-            cause,
-            cure,
-            prevention
-        FROM pest_wiki 
-        WHERE pest_id = %s
-        """
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (pest_id,))
-            result = await cursor.fetchone()
-            
-            if not result:
-                return None
-                
-            return PestWikiDetailResponse(**result)
-            
-    except Exception as e:
-        print(f"Error in get_pest_wiki_detail: {e}")
-        raise e
-    finally:
-        if connection:
-            connection.close()
+async def load_pest_wiki_rows() -> List[Dict[str, Any]]:
+    """
+    병충해 위키 전체
+    응답 스키마의 cause는 병원체(pathogen) 컬럼을 사용합니다.
+    """
+    async with get_db_connection(read_only=True) as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT pest_id, pest_name, pathogen AS cause, symptom, cure
+            FROM pest_wiki
+            ORDER BY pest_id
+            """
+        )
+        return await cursor.fetchall()
 
-async def get_info_room_stats() -> InfoRoomStatsResponse:
-    """정보방 통계 정보를 조회합니다."""
-    connection = None
-    try:
-        connection = await get_db_connection()
-        
-        query = """
-        SELECT 
-            (SELECT COUNT(*) FROM plant_wiki) as total_plants,
-            (SELECT COUNT(*) FROM pest_wiki) as total_pests,
-            (SELECT MAX(updated_at) FROM plant_wiki) as last_updated
-        """
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query)
-            result = await cursor.fetchone()
-            
-            return InfoRoomStatsResponse(
-                total_plants=result['total_plants'],
-                total_pests=result['total_pests'],
-                last_updated=result['last_updated']
-            )
-            
-    except Exception as e:
-        print(f"Error in get_info_room_stats: {e}")
-        raise e
-    finally:
-        if connection:
-            connection.close()
 
-async def search_plant_wiki_by_category(
-    category: str,
-    page: int = 1,
-    limit: int = 20
-) -> PlantWikiListResponse:
-    """카테고리별 식물 위키를 검색합니다."""
-    connection = None
-    try:
-        connection = await get_db_connection()
-        
-        # 카테고리별 검색 조건 설정
-        where_clause = ""
-        params = []
-        
-        if category == "flowering":
-            where_clause = "WHERE flowering IS NOT NULL AND flowering != ''"
-        elif category == "indoor":
-            where_clause = "WHERE temp LIKE '%실내%' OR temp LIKE '%18-25%'"
-        elif category == "outdoor":
-            where_clause = "WHERE temp LIKE '%야외%' OR temp LIKE '%15-30%'"
-        elif category == "easy_care":
-            where_clause = "WHERE watering LIKE '%적게%' OR watering LIKE '%일주일%'"
-        
-        # 전체 개수 조회
-        count_query = f"SELECT COUNT(*) as total FROM plant_wiki {where_clause}"
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(count_query, params)
-            count_result = await cursor.fetchone()
-            total_count = count_result['total']
-            
-            # 페이지네이션 계산
-            offset = (page - 1) * limit
-            
-            # 식물 위키 목록 조회
-            list_query = f"""
-            SELECT 
-                wiki_plant_id,
-                name_jong,
-                feature,
-                temp,
-                watering,
-                flowering,
-                flower_color,
-                fertilizer,
-                pruning,
-                repot,
-                toxic
-            FROM plant_wiki 
-            {where_clause}
-            ORDER BY name_jong ASC
-            LIMIT %s OFFSET %s
-            """
-            
-            list_params = params + [limit, offset]
-            await cursor.execute(list_query, list_params)
-            results = await cursor.fetchall()
-            
-            plants = [PlantWikiInfo(**result) for result in results]
-            
-            return PlantWikiListResponse(
-                plants=plants,
-                total_count=total_count,
-                page=page,
-                limit=limit
-            )
-            
-    except Exception as e:
-        print(f"Error in search_plant_wiki_by_category: {e}")
-        raise e
-    finally:
-        if connection:
-            connection.close()
+async def get_wiki_checksum() -> Tuple[Any, ...]:
+    """위키 테이블 체크섬 (값이 바뀌면 다시 적재)"""
+    async with get_db_connection(read_only=True) as (conn, cursor):
+        await cursor.execute("CHECKSUM TABLE plant_wiki, pest_wiki")
+        return tuple(row["Checksum"] for row in await cursor.fetchall())
@@ -1,7 +1,10 @@
 import aiomysql
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, date
+from db.pool import after_commit
 from models.medical import MedicalDiagnosis
+from services.user_stats import user_stats, MEDICAL_STATS
+from utils.pagination import decode_cursor, keyset_condition, next_cursor_from
 
 
 async def get_user_medical_diagnoses(
@@ -41,6 +44,62 @@ async def get_user_medical_diagnoses(
         return [MedicalDiagnosis.from_dict(result) for result in results]
 
 
+# 진단 날짜가 없는 기록은 가장 뒤로 정렬 (NULL이면 키셋 비교가 불가능하므로 대체값 사용)
+_DIAGNOSIS_SORT_COLUMNS = [("IFNULL(upp.pest_date, DATE('1000-01-01'))", "desc"), ("upp.idx", "desc")]
+
+
+async def list_user_medical_diagnoses_by_cursor(
+    db: tuple[aiomysql.Connection, aiomysql.DictCursor],
+    user_id: str,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[MedicalDiagnosis], Optional[str]]:
+    """
+    사용자의 병충해 진단 기록을 키셋(진단 날짜, idx) 기준으로 조회합니다.
+    반환: (진단 목록, 다음 페이지 커서 또는 None)
+    """
+    conn, db_cursor = db
+    conditions = ["up.user_id = %s"]
+    params: List[Any] = [user_id]
+    if cursor:
+        keyset_sql, keyset_params = keyset_condition(
+            _DIAGNOSIS_SORT_COLUMNS, decode_cursor(cursor, len(_DIAGNOSIS_SORT_COLUMNS))
+        )
+        conditions.append(keyset_sql)
+        params.extend(keyset_params)
+    
+    async with db_cursor:
+        # 이미지는 진단당 1장만 서브쿼리로 가져와 행이 중복되지 않도록 함
+        await db_cursor.execute(
+            f"""
+            SELECT 
+                upp.idx,
+                upp.plant_id,
+                upp.pest_id,
+                upp.pest_date,
+                {_DIAGNOSIS_SORT_COLUMNS[0][0]} as sort_date,
+                up.plant_name,
+                pw.pest_name,
+                pw.symptom,
+                pw.cure,
+                up.species as plant_species,
+                up.meet_day,
+                (SELECT ia.img_url FROM img_address ia
+                 WHERE ia.pest_plant_idx = upp.idx
+                 ORDER BY ia.img_url LIMIT 1) as diagnosis_image_url
+            FROM user_plant_pest upp
+            JOIN user_plant up ON upp.plant_id = up.plant_id
+            JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY sort_date DESC, upp.idx DESC
+            LIMIT %s
+            """,
+            params + [limit + 1]
+        )
+        results, next_cursor = next_cursor_from(await db_cursor.fetchall(), limit, ["sort_date", "idx"])
+        return [MedicalDiagnosis.from_dict(result) for result in results], next_cursor
+
+
 async def get_medical_diagnosis_by_id(
     db: tuple[aiomysql.Connection, aiomysql.DictCursor],
     diagnosis_id: int,
@@ -185,6 +244,7 @@ async def update_medical_diagnosis(
         
         if cursor.rowcount == 0:
             return None
+        after_commit(conn, user_stats.pest_changed, user_id)
         
         # 수정된 진단 기록 조회
         await cursor.execute(
@@ -239,7 +299,10 @@ async def delete_medical_diagnosis(
             """,
             (diagnosis_id, user_id)
         )
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+        if deleted:
+            after_commit(conn, user_stats.pest_changed, user_id)
+        return deleted
 
 
 async def get_medical_stats(
@@ -247,70 +310,73 @@ async def get_medical_stats(
     user_id: str
 ) -> Dict[str, Any]:
     """사용자의 병충해 진단 통계를 조회합니다."""
-    conn, cursor = db
-    async with cursor:
-        # 총 진단 수
-        await cursor.execute(
-            """
-            SELECT COUNT(*) as total 
-            FROM user_plant_pest upp
-            JOIN user_plant up ON upp.plant_id = up.plant_id
-            WHERE up.user_id = %s
-            """,
-            (user_id,)
-        )
-        total_result = await cursor.fetchone()
-        total_diagnoses = total_result['total'] if total_result else 0
+    async def _compute():
+        conn, cursor = db
+        async with cursor:
+            # 총 진단 수
+            await cursor.execute(
+                """
+                SELECT COUNT(*) as total 
+                FROM user_plant_pest upp
+                JOIN user_plant up ON upp.plant_id = up.plant_id
+                WHERE up.user_id = %s
+                """,
+                (user_id,)
+            )
+            total_result = await cursor.fetchone()
+            total_diagnoses = total_result['total'] if total_result else 0
         
-        # 진단받은 식물 수
-        await cursor.execute(
-            """
-            SELECT COUNT(DISTINCT upp.plant_id) as active_plants 
-            FROM user_plant_pest upp
-            JOIN user_plant up ON upp.plant_id = up.plant_id
-            WHERE up.user_id = %s
-            """,
-            (user_id,)
-        )
-        plants_result = await cursor.fetchone()
-        active_plants = plants_result['active_plants'] if plants_result else 0
+            # 진단받은 식물 수
+            await cursor.execute(
+                """
+                SELECT COUNT(DISTINCT upp.plant_id) as active_plants 
+                FROM user_plant_pest upp
+                JOIN user_plant up ON upp.plant_id = up.plant_id
+                WHERE up.user_id = %s
+                """,
+                (user_id,)
+            )
+            plants_result = await cursor.fetchone()
+            active_plants = plants_result['active_plants'] if plants_result else 0
         
-        # 가장 흔한 병충해
-        await cursor.execute(
-            """
-            SELECT pw.pest_name, COUNT(*) as count 
-            FROM user_plant_pest upp
-            JOIN user_plant up ON upp.plant_id = up.plant_id
-            JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
-            WHERE up.user_id = %s 
-            GROUP BY pw.pest_name 
-            ORDER BY count DESC 
-            LIMIT 1
-            """,
-            (user_id,)
-        )
-        common_pest_result = await cursor.fetchone()
-        most_common_pest = common_pest_result['pest_name'] if common_pest_result else None
+            # 가장 흔한 병충해
+            await cursor.execute(
+                """
+                SELECT pw.pest_name, COUNT(*) as count 
+                FROM user_plant_pest upp
+                JOIN user_plant up ON upp.plant_id = up.plant_id
+                JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
+                WHERE up.user_id = %s 
+                GROUP BY pw.pest_name 
+                ORDER BY count DESC 
+                LIMIT 1
+                """,
+                (user_id,)
+            )
+            common_pest_result = await cursor.fetchone()
+            most_common_pest = common_pest_result['pest_name'] if common_pest_result else None
         
-        # 최근 7일 진단 수
-        await cursor.execute(
-            """
-            SELECT COUNT(*) as recent 
-            FROM user_plant_pest upp
-            JOIN user_plant up ON upp.plant_id = up.plant_id
-            WHERE up.user_id = %s AND upp.pest_date >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-            """,
-            (user_id,)
-        )
-        recent_result = await cursor.fetchone()
-        recent_diagnoses = recent_result['recent'] if recent_result else 0
+            # 최근 7일 진단 수
+            await cursor.execute(
+                """
+                SELECT COUNT(*) as recent 
+                FROM user_plant_pest upp
+                JOIN user_plant up ON upp.plant_id = up.plant_id
+                WHERE up.user_id = %s AND upp.pest_date >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+                """,
+                (user_id,)
+            )
+            recent_result = await cursor.fetchone()
+            recent_diagnoses = recent_result['recent'] if recent_result else 0
         
-        return {
-            'total_diagnoses': total_diagnoses,
-            'active_plants': active_plants,
-            'most_common_pest': most_common_pest,
-            'recent_diagnoses': recent_diagnoses
-        }
+            return {
+                'total_diagnoses': total_diagnoses,
+                'active_plants': active_plants,
+                'most_common_pest': most_common_pest,
+                'recent_diagnoses': recent_diagnoses
+            }
+    
+    return await user_stats.get_or_compute(user_id, MEDICAL_STATS, _compute)
 
 
 async def get_related_diagnoses(
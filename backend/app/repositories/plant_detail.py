@@ -1,7 +1,14 @@
-import aiomysql
 from typing import List, Optional
-from datetime import datetime
-from db.pool import get_db_connection
+from datetime import datetime, timedelta
+from db.pool import after_commit, get_db_connection
+from db.instrument import InstrumentedDictCursor
+from core.config import settings
+from repositories.device import get_device_id
+from repositories.humid import get_humidity_series, get_latest_humidity_rows
+from repositories.diary_tag import replace_diary_tags
+from repositories.watering_event import get_latest_watering_event, get_watering_events
+from services.user_stats import user_stats
+from services.watering_detector import watering_detector
 from schemas.plant_detail import (
     PlantDetailResponse, 
     PlantDiaryResponse, 
@@ -34,16 +41,16 @@ async def get_plant_detail(plant_idx: int, user_id: str) -> PlantDetailResponse:
             up.species,
             up.meet_day,
             
-            -- 최신 습도 정보 (humid 테이블에서 직접 조회, device_id=1 공통 사용)
+            -- 최신 습도 정보 (식물에 연결된 센서, 없으면 공통 센서)
             (SELECT h.humidity 
              FROM humid h 
-             WHERE h.device_id = 1 
+             WHERE h.device_id = COALESCE(pd.device_id, %s) 
              ORDER BY h.humid_date DESC 
              LIMIT 1) as current_humidity,
              
             (SELECT h.humid_date 
              FROM humid h 
-             WHERE h.device_id = 1 
+             WHERE h.device_id = COALESCE(pd.device_id, %s) 
              ORDER BY h.humid_date DESC 
              LIMIT 1) as humidity_date,
             
@@ -66,6 +73,7 @@ async def get_plant_detail(plant_idx: int, user_id: str) -> PlantDetailResponse:
             ia.img_url as user_plant_image
             
         FROM user_plant up
+        LEFT JOIN plant_device pd ON pd.plant_id = up.plant_id
         LEFT JOIN plant_wiki pw ON (pw.sci_name LIKE CONCAT('%%', up.species, '%%') OR up.species LIKE CONCAT('%%', TRIM(SUBSTRING_INDEX(pw.sci_name, '(', 1)), '%%'))
         LEFT JOIN best_humid bh ON pw.wiki_plant_id = bh.wiki_plant_id
         LEFT JOIN (
@@ -79,7 +87,7 @@ async def get_plant_detail(plant_idx: int, user_id: str) -> PlantDetailResponse:
         WHERE up.plant_id = %s AND up.user_id = %s
         """
         
-        await cursor.execute(query, (plant_idx, user_id))
+        await cursor.execute(query, (settings.DEFAULT_DEVICE_ID, settings.DEFAULT_DEVICE_ID, plant_idx, user_id))
         result = await cursor.fetchone()
         
         if not result:
@@ -138,204 +146,180 @@ async def get_plant_diaries(plant_idx: int, user_id: str, limit: int = 10) -> Li
     """
     특정 식물의 일기 목록을 조회합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        query = """
-        SELECT 
-            d.diary_id,
-            d.user_id,
-            d.user_title,
-            d.img_url,
-            d.user_content,
-            d.hashtag,
-            d.plant_content,
-            d.weather,
-            d.created_at
-        FROM diary d
-        JOIN user_plant up ON d.user_id = up.user_id
-        WHERE up.plant_id = %s AND up.user_id = %s
-        ORDER BY d.created_at DESC
-        LIMIT %s
-        """
+            query = """
+            SELECT 
+                d.diary_id,
+                d.user_id,
+                d.user_title,
+                d.img_url,
+                d.user_content,
+                d.hashtag,
+                d.plant_content,
+                d.weather,
+                d.created_at
+            FROM diary d
+            JOIN user_plant up ON d.user_id = up.user_id
+            WHERE up.plant_id = %s AND up.user_id = %s
+            ORDER BY d.created_at DESC
+            LIMIT %s
+            """
         
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (plant_idx, user_id, limit))
-            results = await cursor.fetchall()
-            
-            diaries = []
-            for row in results:
-                diary = PlantDiaryResponse(
-                    diary_id=row['diary_id'],
-                    user_id=row['user_id'],
-                    user_title=row['user_title'],
-                    img_url=row['img_url'],
-                    user_content=row['user_content'],
-                    hashtag=row['hashtag'],
-                    plant_content=row['plant_content'],
-                    weather=row['weather'],
-                    created_at=row['created_at']
-                )
-                diaries.append(diary)
-            
-            return diaries
+            async with connection.cursor(InstrumentedDictCursor) as cursor:
+                await cursor.execute(query, (plant_idx, user_id, limit))
+                results = await cursor.fetchall()
+            
+                diaries = []
+                for row in results:
+                    diary = PlantDiaryResponse(
+                        diary_id=row['diary_id'],
+                        user_id=row['user_id'],
+                        user_title=row['user_title'],
+                        img_url=row['img_url'],
+                        user_content=row['user_content'],
+                        hashtag=row['hashtag'],
+                        plant_content=row['plant_content'],
+                        weather=row['weather'],
+                        created_at=row['created_at']
+                    )
+                    diaries.append(diary)
+            
+                return diaries
             
     except Exception as e:
         print(f"Error in get_plant_diaries: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_plant_pest_records(plant_idx: int, user_id: str) -> List[PlantPestRecordResponse]:
     """
     특정 식물의 병해충 기록을 조회합니다.
     새로운 user_plant_pest 테이블을 사용합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        query = """
-        SELECT 
-            pw.pest_id,
-            pw.pest_name,
-            pw.cause,
-            pw.cure,
-            upp.idx as record_id,
-            upp.pest_date as recorded_date
-        FROM user_plant up
-        JOIN user_plant_pest upp ON up.plant_id = upp.plant_id
-        JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
-        WHERE up.plant_id = %s AND up.user_id = %s
-        ORDER BY upp.pest_date DESC
-        """
+            query = """
+            SELECT 
+                pw.pest_id,
+                pw.pest_name,
+                pw.cause,
+                pw.cure,
+                upp.idx as record_id,
+                upp.pest_date as recorded_date
+            FROM user_plant up
+            JOIN user_plant_pest upp ON up.plant_id = upp.plant_id
+            JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
+            WHERE up.plant_id = %s AND up.user_id = %s
+            ORDER BY upp.pest_date DESC
+            """
         
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (plant_idx, user_id))
-            results = await cursor.fetchall()
-            
-            pest_records = []
-            for row in results:
-                pest_record = PlantPestRecordResponse(
-                    pest_id=row['pest_id'],
-                    cause=row['cause'],
-                    cure=row['cure'],
-                    recorded_date=row['recorded_date']  # 현재 날짜 사용
-                )
-                pest_records.append(pest_record)
+            async with connection.cursor(InstrumentedDictCursor) as cursor:
+                await cursor.execute(query, (plant_idx, user_id))
+                results = await cursor.fetchall()
             
-            return pest_records
+                pest_records = []
+                for row in results:
+                    pest_record = PlantPestRecordResponse(
+                        pest_id=row['pest_id'],
+                        cause=row['cause'],
+                        cure=row['cure'],
+                        recorded_date=row['recorded_date']  # 현재 날짜 사용
+                    )
+                    pest_records.append(pest_record)
+            
+                return pest_records
             
     except Exception as e:
         print(f"Error in get_plant_pest_records: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
-async def get_plant_humidity_history(plant_idx: int, user_id: str, limit: int = 7) -> List[dict]:
+async def get_plant_humidity_history(
+    plant_idx: int,
+    user_id: str,
+    limit: int = 7,
+    days: Optional[int] = None,
+    resolution: Optional[str] = None,
+) -> List[dict]:
     """
     특정 식물의 습도 기록을 조회합니다.
+    days가 없으면 최근 원본 기록 limit건, 있으면 최근 days일 구간을
+    구간 길이에 맞는 해상도(raw/hourly/daily)로 조회합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
-        
-        query = """
-        SELECT 
-            h.humidity,
-            h.humid_date
-        FROM humid h
-        WHERE h.device_id = 1
-        ORDER BY h.humid_date DESC
-        LIMIT %s
-        """
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (limit,))
-            results = await cursor.fetchall()
-            return results
-            
+        device_id = await get_device_id(plant_idx)
+        if days is None:
+            return await get_latest_humidity_rows(device_id, limit)
+        _, series = await get_humidity_series(device_id, datetime.now() - timedelta(days=days), resolution=resolution)
+        return series
     except Exception as e:
         print(f"Error in get_plant_humidity_history: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def update_plant_info(plant_idx: int, user_id: str, update_data: dict) -> bool:
     """
     식물 정보를 수정합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # 업데이트할 필드들만 동적으로 구성
-        set_clauses = []
-        values = []
+            # 업데이트할 필드들만 동적으로 구성
+            set_clauses = []
+            values = []
         
-        if 'plant_name' in update_data:
-            set_clauses.append("plant_name = %s")
-            values.append(update_data['plant_name'])
+            if 'plant_name' in update_data:
+                set_clauses.append("plant_name = %s")
+                values.append(update_data['plant_name'])
         
-        if 'species' in update_data:
-            set_clauses.append("species = %s")
-            values.append(update_data['species'])
+            if 'species' in update_data:
+                set_clauses.append("species = %s")
+                values.append(update_data['species'])
         
-        if 'meet_day' in update_data:
-            set_clauses.append("meet_day = %s")
-            values.append(update_data['meet_day'])
+            if 'meet_day' in update_data:
+                set_clauses.append("meet_day = %s")
+                values.append(update_data['meet_day'])
         
-        if not set_clauses:
-            return False
+            if not set_clauses:
+                return False
         
-        values.extend([plant_idx, user_id])
+            values.extend([plant_idx, user_id])
         
-        query = f"""
-        UPDATE user_plant 
-        SET {', '.join(set_clauses)}
-        WHERE idx = %s AND user_id = %s
-        """
+            query = f"""
+            UPDATE user_plant 
+            SET {', '.join(set_clauses)}
+            WHERE idx = %s AND user_id = %s
+            """
         
-        async with connection.cursor() as cursor:
-            result = await cursor.execute(query, values)
-            await connection.commit()
-            return result > 0
+            async with connection.cursor() as cursor:
+                result = await cursor.execute(query, values)
+                after_commit(connection, user_stats.plant_changed, user_id)
+                return result > 0
             
     except Exception as e:
         print(f"Error in update_plant_info: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def delete_plant(plant_idx: int, user_id: str) -> bool:
     """
     식물을 삭제합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        query = """
-        DELETE FROM user_plant 
-        WHERE idx = %s AND user_id = %s
-        """
+            query = """
+            DELETE FROM user_plant 
+            WHERE idx = %s AND user_id = %s
+            """
         
-        async with connection.cursor() as cursor:
-            result = await cursor.execute(query, (plant_idx, user_id))
-            await connection.commit()
-            return result > 0
+            async with connection.cursor() as cursor:
+                result = await cursor.execute(query, (plant_idx, user_id))
+                after_commit(connection, user_stats.plant_changed, user_id)
+                return result > 0
             
     except Exception as e:
         print(f"Error in delete_plant: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_plant_detail_summary(plant_idx: int, user_id: str) -> PlantDetailSummaryResponse:
     """
@@ -385,168 +369,155 @@ async def get_plant_detail_summary(plant_idx: int, user_id: str) -> PlantDetailS
         print(f"Error in get_plant_detail_summary: {e}")
         raise e
 
-async def check_humidity_increase_and_record_watering(plant_idx: int, user_id: str) -> dict:
+async def get_watering_detection_status(plant_idx: int, user_id: str) -> dict:
     """
-    습도 증가를 확인하고 10% 이상 증가 시 자동으로 물주기 기록을 생성합니다.
+    자동 물주기 감지 결과를 조회합니다.
+    감지는 MQTT 적재 파이프라인(services.watering_detector)에서 이미 수행되어
+    watering_event 테이블에 기록되므로, 여기서는 저장된 이벤트와 감지기 상태만 읽습니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
-        
-        # 최근 2개의 습도 기록 조회 (공통 데이터)
-        query = """
-        SELECT 
-            h.humidity,
-            h.humid_date
-        FROM humid h
-        WHERE h.device_id = 1
-        ORDER BY h.humid_date DESC
-        LIMIT 2
-        """
-        
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query)
-            results = await cursor.fetchall()
-            
+        threshold = settings.WATERING_RISE_THRESHOLD
+        device_id = await get_device_id(plant_idx)
+        last_event = await get_latest_watering_event(device_id)
+        state = watering_detector.snapshot(device_id)
+
+        if state:
+            current_humidity = state["current_humidity"]
+            previous_humidity = state["baseline_humidity"]
+            humidity_increase = state["rise_pct"]
+        else:
+            # 재시작 직후 등 감지기 상태가 없으면 최근 원본 2건으로 대체
+            results = await get_latest_humidity_rows(device_id, 2)
             if len(results) < 2:
                 return {
                     "status": "insufficient_data",
                     "message": "습도 데이터가 부족합니다. 최소 2개의 기록이 필요합니다.",
-                    "watering_recorded": False
+                    "watering_recorded": False,
+                    "last_event": last_event
                 }
-            
             current_humidity = results[0]['humidity']
             previous_humidity = results[1]['humidity']
-            
-            # 습도 증가율 계산
             humidity_increase = ((current_humidity - previous_humidity) / previous_humidity) * 100 if previous_humidity != 0 else 0
-            
-            # 10% 이상 증가 시 물주기 기록 생성
-            if humidity_increase >= 10:
-                # 물주기 기록을 diary 테이블에 자동 생성
-                watering_query = """
-                INSERT INTO diary (user_id, user_title, user_content, hashtag, plant_content, weather, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                watering_title = "자동 감지된 물주기"
-                watering_content = f"습도가 {humidity_increase:.1f}% 증가하여 물을 준 것으로 자동 기록되었습니다."
-                watering_hashtag = "#물주기 #자동감지"
-                plant_content = f"이전 습도: {previous_humidity:.1f}% → 현재 습도: {current_humidity:.1f}%"
-                
-                await cursor.execute(watering_query, (
-                    user_id,
-                    watering_title,
-                    watering_content,
-                    watering_hashtag,
-                    plant_content,
-                    "자동",
-                    datetime.now()
-                ))
-                await connection.commit()
-                
-                return {
-                    "status": "watering_recorded",
-                    "message": f"습도가 {humidity_increase:.1f}% 증가하여 물주기가 자동 기록되었습니다.",
-                    "watering_recorded": True,
-                    "humidity_increase": humidity_increase,
-                    "current_humidity": current_humidity,
-                    "previous_humidity": previous_humidity
-                }
-            else:
-                return {
-                    "status": "no_watering_needed",
-                    "message": f"습도 증가율이 {humidity_increase:.1f}%로 물주기 기록 기준(10%)에 미달합니다.",
-                    "watering_recorded": False,
-                    "humidity_increase": humidity_increase,
-                    "current_humidity": current_humidity,
-                    "previous_humidity": previous_humidity
-                }
-                
+
+        recent_since = datetime.now() - timedelta(hours=settings.WATERING_RECENT_HOURS)
+        if last_event and last_event['event_at'] >= recent_since:
+            return {
+                "status": "watering_recorded",
+                "message": f"습도가 {last_event['increase_pct']:.1f}% 증가하여 물주기가 자동 기록되었습니다.",
+                "watering_recorded": True,
+                "humidity_increase": last_event['increase_pct'],
+                "current_humidity": current_humidity,
+                "previous_humidity": last_event['humidity_before'],
+                "last_event": last_event
+            }
+        return {
+            "status": "no_watering_needed",
+            "message": f"습도 증가율이 {humidity_increase:.1f}%로 물주기 기록 기준({threshold:g}%)에 미달합니다.",
+            "watering_recorded": False,
+            "humidity_increase": humidity_increase,
+            "current_humidity": current_humidity,
+            "previous_humidity": previous_humidity,
+            "last_event": last_event
+        }
+
     except Exception as e:
-        print(f"Error in check_humidity_increase_and_record_watering: {e}")
+        print(f"Error in get_watering_detection_status: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_watering_records(plant_idx: int, user_id: str, limit: int = 10) -> List[WateringRecordResponse]:
     """
     특정 식물의 물주기 기록을 조회합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # 물주기 관련 일기 조회 (hashtag에 #물주기가 포함된 것들)
-        query = """
-        SELECT 
-            d.diary_id,
-            d.user_id,
-            d.user_title,
-            d.user_content,
-            d.hashtag,
-            d.plant_content,
-            d.weather,
-            d.created_at
-        FROM diary d
-        JOIN user_plant up ON d.user_id = up.user_id
-        WHERE up.plant_id = %s AND up.user_id = %s 
-        AND (d.hashtag LIKE '%물주기%' OR d.user_title LIKE '%물주기%')
-        ORDER BY d.created_at DESC
-        LIMIT %s
-        """
+            # 물주기 관련 일기 조회 (#물주기 태그가 있거나 제목에 물주기가 포함된 것들)
+            query = """
+            SELECT 
+                d.diary_id,
+                d.user_id,
+                d.user_title,
+                d.user_content,
+                d.hashtag,
+                d.plant_content,
+                d.weather,
+                d.created_at
+            FROM diary d
+            JOIN user_plant up ON d.user_id = up.user_id
+            WHERE up.plant_id = %s AND up.user_id = %s 
+            AND (
+                EXISTS (SELECT 1 FROM diary_tag dt
+                        WHERE dt.user_id = d.user_id AND dt.tag = '물주기' AND dt.diary_id = d.diary_id)
+                OR d.user_title LIKE '%%물주기%%'
+            )
+            ORDER BY d.created_at DESC
+            LIMIT %s
+            """
         
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (plant_idx, user_id, limit))
-            results = await cursor.fetchall()
+            async with connection.cursor(InstrumentedDictCursor) as cursor:
+                await cursor.execute(query, (plant_idx, user_id, limit))
+                results = await cursor.fetchall()
             
-            watering_records = []
-            for row in results:
-                # 습도 정보 추출 (plant_content에서)
-                humidity_before = None
-                humidity_after = None
-                humidity_increase = None
+                watering_records = []
+                for row in results:
+                    # 습도 정보 추출 (plant_content에서)
+                    humidity_before = None
+                    humidity_after = None
+                    humidity_increase = None
                 
-                if row['plant_content']:
-                    import re
-                    humidity_match = re.search(r'이전 습도: ([\d.]+)% → 현재 습도: ([\d.]+)%', row['plant_content'])
-                    if humidity_match:
-                        humidity_before = float(humidity_match.group(1))
-                        humidity_after = float(humidity_match.group(2))
-                        humidity_increase = humidity_after - humidity_before
+                    if row['plant_content']:
+                        import re
+                        humidity_match = re.search(r'이전 습도: ([\d.]+)% → 현재 습도: ([\d.]+)%', row['plant_content'])
+                        if humidity_match:
+                            humidity_before = float(humidity_match.group(1))
+                            humidity_after = float(humidity_match.group(2))
+                            humidity_increase = humidity_after - humidity_before
                 
-                watering_record = WateringRecordResponse(
-                    record_id=row['diary_id'],
-                    plant_idx=plant_idx,
-                    user_id=row['user_id'],
-                    watering_date=row['created_at'],
-                    humidity_before=humidity_before,
-                    humidity_after=humidity_after,
-                    humidity_increase=humidity_increase,
-                    is_auto_detected="자동" in row['user_title'],
-                    notes=row['user_content']
+                    watering_record = WateringRecordResponse(
+                        record_id=row['diary_id'],
+                        plant_idx=plant_idx,
+                        user_id=row['user_id'],
+                        watering_date=row['created_at'],
+                        humidity_before=humidity_before,
+                        humidity_after=humidity_after,
+                        humidity_increase=humidity_increase,
+                        is_auto_detected="자동" in row['user_title'],
+                        notes=row['user_content']
+                    )
+                    watering_records.append(watering_record)
+            
+                # 자동 감지 이벤트 (watering_event) 병합
+                for event in await get_watering_events(await get_device_id(plant_idx), limit):
+                    watering_records.append(WateringRecordResponse(
+                        record_id=event['event_id'],
+                        plant_idx=plant_idx,
+                        user_id=user_id,
+                        watering_date=event['event_at'],
+                        humidity_before=event['humidity_before'],
+                        humidity_after=event['humidity_after'],
+                        humidity_increase=event['humidity_after'] - event['humidity_before'],
+                        is_auto_detected=True,
+                        notes=f"습도가 {event['increase_pct']:.1f}% 증가하여 물을 준 것으로 자동 기록되었습니다."
+                    ))
+                # diary.created_at은 DATE이므로 datetime으로 맞춰 정렬
+                watering_records.sort(
+                    key=lambda r: r.watering_date if isinstance(r.watering_date, datetime)
+                    else datetime.combine(r.watering_date, datetime.min.time()),
+                    reverse=True
                 )
-                watering_records.append(watering_record)
-            
-            return watering_records
+                return watering_records[:limit]
             
     except Exception as e:
         print(f"Error in get_watering_records: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def analyze_plant_health(plant_idx: int, user_id: str, leaf_health_score: Optional[float] = None) -> HealthStatusResponse:
     """
     식물의 종합적인 건강상태를 분석합니다.
     습도, 병해충, 잎 건강상태를 종합하여 "건강", "주의", "아픔"으로 판단합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
-        
+        # 식물 정보/병해충 기록 조회는 각 저장소 함수가 연결을 사용 (요청 단위 작업 안에서는 같은 연결 공유)
         # 기본 식물 정보 조회
         plant_info = await get_plant_detail(plant_idx, user_id)
         
@@ -662,346 +633,315 @@ async def analyze_plant_health(plant_idx: int, user_id: str, leaf_health_score:
     except Exception as e:
         print(f"Error in analyze_plant_health: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def record_manual_watering(plant_idx: int, user_id: str, watering_request: WateringRecordRequest) -> WateringRecordResponse:
     """
     수동으로 물주기 기록을 생성합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # 현재 습도 조회
-        current_humidity = None
-        if plant_info := await get_plant_detail(plant_idx, user_id):
-            current_humidity = plant_info.current_humidity
+            # 현재 습도 조회
+            current_humidity = None
+            if plant_info := await get_plant_detail(plant_idx, user_id):
+                current_humidity = plant_info.current_humidity
         
-        # 물주기 일기 생성
-        watering_query = """
-        INSERT INTO diary (user_id, user_title, user_content, hashtag, plant_content, weather, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
+            # 물주기 일기 생성
+            watering_query = """
+            INSERT INTO diary (user_id, user_title, user_content, hashtag, plant_content, weather, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
         
-        watering_title = "물주기 기록"
-        watering_content = watering_request.notes or "물을 주었습니다."
-        watering_hashtag = "#물주기 #수동기록"
-        plant_content = f"현재 습도: {current_humidity:.1f}%" if current_humidity else "습도 정보 없음"
-        watering_date = watering_request.watering_date or datetime.now()
-        
-        async with connection.cursor() as cursor:
-            result = await cursor.execute(watering_query, (
-                user_id,
-                watering_title,
-                watering_content,
-                watering_hashtag,
-                plant_content,
-                "수동",
-                watering_date
-            ))
-            await connection.commit()
-            
-            record_id = cursor.lastrowid
-            
-            return WateringRecordResponse(
-                record_id=record_id,
-                plant_idx=plant_idx,
-                user_id=user_id,
-                watering_date=watering_date,
-                humidity_before=current_humidity,
-                humidity_after=None,  # 물주기 후 습도는 별도로 측정 필요
-                humidity_increase=None,
-                is_auto_detected=False,
-                notes=watering_request.notes
-            )
+            watering_title = "물주기 기록"
+            watering_content = watering_request.notes or "물을 주었습니다."
+            watering_hashtag = "#물주기 #수동기록"
+            plant_content = f"현재 습도: {current_humidity:.1f}%" if current_humidity else "습도 정보 없음"
+            watering_date = watering_request.watering_date or datetime.now()
+        
+            async with connection.cursor() as cursor:
+                result = await cursor.execute(watering_query, (
+                    user_id,
+                    watering_title,
+                    watering_content,
+                    watering_hashtag,
+                    plant_content,
+                    "수동",
+                    watering_date
+                ))
+                record_id = cursor.lastrowid
+                await replace_diary_tags(cursor, user_id, record_id, watering_hashtag)
+                after_commit(connection, user_stats.diary_changed, user_id)
+            
+                return WateringRecordResponse(
+                    record_id=record_id,
+                    plant_idx=plant_idx,
+                    user_id=user_id,
+                    watering_date=watering_date,
+                    humidity_before=current_humidity,
+                    humidity_after=None,  # 물주기 후 습도는 별도로 측정 필요
+                    humidity_increase=None,
+                    is_auto_detected=False,
+                    notes=watering_request.notes
+                )
             
     except Exception as e:
         print(f"Error in record_manual_watering: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_plant_species_info(plant_idx: int, user_id: str) -> PlantSpeciesInfoResponse:
     """
     특정 식물의 품종 정보를 plant_wiki에서 조회합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        query = """
-        SELECT 
-            pw.name_jong as species,
-            pw.feature,
-            pw.temp,
-            pw.watering,
-            pw.flowering,
-            pw.flower_color,
-            pw.fertilizer,
-            pw.pruning,
-            pw.repot,
-            pw.toxic
-        FROM user_plant up
-        LEFT JOIN plant_wiki pw ON up.plant_id = pw.wiki_plant_id
-        WHERE up.plant_id = %s AND up.user_id = %s
-        """
+            query = """
+            SELECT 
+                pw.name_jong as species,
+                pw.feature,
+                pw.temp,
+                pw.watering,
+                pw.flowering,
+                pw.flower_color,
+                pw.fertilizer,
+                pw.pruning,
+                pw.repot,
+                pw.toxic
+            FROM user_plant up
+            LEFT JOIN plant_wiki pw ON up.plant_id = pw.wiki_plant_id
+            WHERE up.plant_id = %s AND up.user_id = %s
+            """
         
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (plant_idx, user_id))
-            result = await cursor.fetchone()
-            
-            if not result:
-                raise ValueError("식물 정보를 찾을 수 없습니다.")
-            
-            return PlantSpeciesInfoResponse(
-                species=result['species'] or "정보 없음",
-                wiki_img=None,  # plant_wiki 테이블에 wiki_img 컬럼 없음
-                feature=result['feature'],
-                temp=result['temp'],
-                watering=result['watering'],
-                flowering=result['flowering'],
-                flower_color=result['flower_color'],
-                fertilizer=result['fertilizer'],
-                pruning=result['pruning'],
-                repot=result['repot'],
-                toxic=result['toxic']
-            )
+            async with connection.cursor(InstrumentedDictCursor) as cursor:
+                await cursor.execute(query, (plant_idx, user_id))
+                result = await cursor.fetchone()
+            
+                if not result:
+                    raise ValueError("식물 정보를 찾을 수 없습니다.")
+            
+                return PlantSpeciesInfoResponse(
+                    species=result['species'] or "정보 없음",
+                    wiki_img=None,  # plant_wiki 테이블에 wiki_img 컬럼 없음
+                    feature=result['feature'],
+                    temp=result['temp'],
+                    watering=result['watering'],
+                    flowering=result['flowering'],
+                    flower_color=result['flower_color'],
+                    fertilizer=result['fertilizer'],
+                    pruning=result['pruning'],
+                    repot=result['repot'],
+                    toxic=result['toxic']
+                )
             
     except Exception as e:
         print(f"Error in get_plant_species_info: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def update_watering_settings(plant_idx: int, user_id: str, settings: WateringSettingsRequest) -> WateringSettingsResponse:
     """
     식물의 물주기 설정을 업데이트합니다.
     DB 저장 없이 세션/메모리에서 처리합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # 식물이 존재하는지 확인
-        check_query = """
-        SELECT idx FROM user_plant 
-        WHERE idx = %s AND user_id = %s
-        """
+            # 식물이 존재하는지 확인
+            check_query = """
+            SELECT idx FROM user_plant 
+            WHERE idx = %s AND user_id = %s
+            """
         
-        async with connection.cursor() as cursor:
-            await cursor.execute(check_query, (plant_idx, user_id))
-            result = await cursor.fetchone()
+            async with connection.cursor() as cursor:
+                await cursor.execute(check_query, (plant_idx, user_id))
+                result = await cursor.fetchone()
             
-            if not result:
-                raise ValueError("식물을 찾을 수 없습니다.")
+                if not result:
+                    raise ValueError("식물을 찾을 수 없습니다.")
             
-            # 임계값 범위 검증 (5-20% 사이)
-            if not (5 <= settings.humidity_threshold <= 20):
-                raise ValueError("습도 증가율 임계값은 5%에서 20% 사이여야 합니다.")
+                # 임계값 범위 검증 (5-20% 사이)
+                if not (5 <= settings.humidity_threshold <= 20):
+                    raise ValueError("습도 증가율 임계값은 5%에서 20% 사이여야 합니다.")
             
-            # DB 저장 없이 성공 응답 반환
-            return WateringSettingsResponse(
-                plant_idx=plant_idx,
-                user_id=user_id,
-                humidity_threshold=settings.humidity_threshold,
-                message=f"물주기 설정이 {settings.humidity_threshold}%로 설정되었습니다. (세션 저장)"
-            )
+                # DB 저장 없이 성공 응답 반환
+                return WateringSettingsResponse(
+                    plant_idx=plant_idx,
+                    user_id=user_id,
+                    humidity_threshold=settings.humidity_threshold,
+                    message=f"물주기 설정이 {settings.humidity_threshold}%로 설정되었습니다. (세션 저장)"
+                )
                 
     except Exception as e:
         print(f"Error in update_watering_settings: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_watering_settings(plant_idx: int, user_id: str) -> WateringSettingsResponse:
     """
     식물의 현재 물주기 설정을 조회합니다.
     기본값 10%를 반환합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # 식물이 존재하는지 확인
-        check_query = """
-        SELECT idx FROM user_plant
-        WHERE idx = %s AND user_id = %s
-        """
+            # 식물이 존재하는지 확인
+            check_query = """
+            SELECT idx FROM user_plant
+            WHERE idx = %s AND user_id = %s
+            """
         
-        async with connection.cursor() as cursor:
-            await cursor.execute(check_query, (plant_idx, user_id))
-            result = await cursor.fetchone()
+            async with connection.cursor() as cursor:
+                await cursor.execute(check_query, (plant_idx, user_id))
+                result = await cursor.fetchone()
             
-            if not result:
-                raise ValueError("식물 정보를 찾을 수 없습니다.")
+                if not result:
+                    raise ValueError("식물 정보를 찾을 수 없습니다.")
             
-            # 기본값 10% 반환 (DB 저장 없이 세션에서 관리)
-            threshold = 10  # 기본값 10%
+                # 기본값 10% 반환 (DB 저장 없이 세션에서 관리)
+                threshold = 10  # 기본값 10%
             
-            return WateringSettingsResponse(
-                plant_idx=plant_idx,
-                user_id=user_id,
-                humidity_threshold=threshold,
-                message=f"현재 물주기 설정: 습도 {threshold}% 증가 시 자동 기록 (기본값)"
-            )
+                return WateringSettingsResponse(
+                    plant_idx=plant_idx,
+                    user_id=user_id,
+                    humidity_threshold=threshold,
+                    message=f"현재 물주기 설정: 습도 {threshold}% 증가 시 자동 기록 (기본값)"
+                )
             
     except Exception as e:
         print(f"Error in get_watering_settings: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_plant_pest_records_by_user_plant(plant_idx: int, user_id: str) -> List[PlantPestRecordResponse]:
     """
     특정 유저의 특정 식물에 대한 병충해 기록을 조회합니다.
     새로운 user_plant_pest 테이블을 사용합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # user_plant_pest와 pest_wiki를 조인하여 해당 식물의 병충해 기록 조회
-        query = """
-        SELECT 
-            pw.pest_id,
-            pw.pest_name,
-            pw.cause,
-            pw.cure,
-            upp.idx as record_id,
-            upp.pest_date as recorded_date
-        FROM user_plant up
-        JOIN user_plant_pest upp ON up.plant_id = upp.plant_id
-        JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
-        WHERE up.plant_id = %s AND up.user_id = %s
-        ORDER BY upp.pest_date DESC
-        """
+            # user_plant_pest와 pest_wiki를 조인하여 해당 식물의 병충해 기록 조회
+            query = """
+            SELECT 
+                pw.pest_id,
+                pw.pest_name,
+                pw.cause,
+                pw.cure,
+                upp.idx as record_id,
+                upp.pest_date as recorded_date
+            FROM user_plant up
+            JOIN user_plant_pest upp ON up.plant_id = upp.plant_id
+            JOIN pest_wiki pw ON upp.pest_id = pw.pest_id
+            WHERE up.plant_id = %s AND up.user_id = %s
+            ORDER BY upp.pest_date DESC
+            """
         
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (plant_idx, user_id))
-            results = await cursor.fetchall()
-            
-            pest_records = []
-            for row in results:
-                pest_record = PlantPestRecordResponse(
-                    pest_id=row['pest_id'],
-                    cause=row['cause'],
-                    cure=row['cure'],
-                    recorded_date=row['recorded_date']  # 현재 날짜 사용
-                )
-                pest_records.append(pest_record)
+            async with connection.cursor(InstrumentedDictCursor) as cursor:
+                await cursor.execute(query, (plant_idx, user_id))
+                results = await cursor.fetchall()
             
-            return pest_records
+                pest_records = []
+                for row in results:
+                    pest_record = PlantPestRecordResponse(
+                        pest_id=row['pest_id'],
+                        cause=row['cause'],
+                        cure=row['cure'],
+                        recorded_date=row['recorded_date']  # 현재 날짜 사용
+                    )
+                    pest_records.append(pest_record)
+            
+                return pest_records
             
     except Exception as e:
         print(f"Error in get_plant_pest_records_by_user_plant: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def add_plant_pest_record(plant_idx: int, user_id: str, pest_id: int, pest_date: str = None) -> dict:
     """
     식물에 병충해 기록을 추가합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        # 식물이 존재하는지 확인
-        check_query = """
-        SELECT plant_id FROM user_plant 
-        WHERE idx = %s AND user_id = %s
-        """
+            # 식물이 존재하는지 확인
+            check_query = """
+            SELECT plant_id FROM user_plant 
+            WHERE idx = %s AND user_id = %s
+            """
         
-        async with connection.cursor() as cursor:
-            await cursor.execute(check_query, (plant_idx, user_id))
-            result = await cursor.fetchone()
+            async with connection.cursor() as cursor:
+                await cursor.execute(check_query, (plant_idx, user_id))
+                result = await cursor.fetchone()
             
-            if not result:
-                raise ValueError("식물을 찾을 수 없습니다.")
+                if not result:
+                    raise ValueError("식물을 찾을 수 없습니다.")
             
-            plant_id = result[0]
+                plant_id = result[0]
             
-            # 병충해 기록 추가
-            insert_query = """
-            INSERT INTO user_plant_pest (plant_id, pest_id, pest_date)
-            VALUES (%s, %s, %s)
-            """
+                # 병충해 기록 추가
+                insert_query = """
+                INSERT INTO user_plant_pest (plant_id, pest_id, pest_date)
+                VALUES (%s, %s, %s)
+                """
             
-            # 날짜가 제공되지 않으면 현재 날짜 사용
-            if pest_date is None:
-                pest_date = datetime.now().strftime('%Y-%m-%d')
+                # 날짜가 제공되지 않으면 현재 날짜 사용
+                if pest_date is None:
+                    pest_date = datetime.now().strftime('%Y-%m-%d')
             
-            await cursor.execute(insert_query, (plant_id, pest_id, pest_date))
-            await connection.commit()
+                await cursor.execute(insert_query, (plant_id, pest_id, pest_date))
+                after_commit(connection, user_stats.pest_changed, user_id)
             
-            record_id = cursor.lastrowid
+                record_id = cursor.lastrowid
             
-            return {
-                "success": True,
-                "record_id": record_id,
-                "plant_id": plant_id,
-                "pest_id": pest_id,
-                "pest_date": pest_date,
-                "message": "병충해 기록이 성공적으로 추가되었습니다."
-            }
+                return {
+                    "success": True,
+                    "record_id": record_id,
+                    "plant_id": plant_id,
+                    "pest_id": pest_id,
+                    "pest_date": pest_date,
+                    "message": "병충해 기록이 성공적으로 추가되었습니다."
+                }
                 
     except Exception as e:
         print(f"Error in add_plant_pest_record: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
 
 async def get_plant_recent_diary_summary(plant_idx: int, user_id: str) -> dict:
     """
     특정 식물과 연관된 최근 일기의 제목과 작성 날짜를 조회합니다.
     """
-    connection = None
     try:
-        connection = await get_db_connection()
+        async with get_db_connection() as (connection, _):
         
-        query = """
-        SELECT 
-            d.diary_id,
-            d.user_title,
-            d.created_at
-        FROM diary d
-        JOIN user_plant up ON d.user_id = up.user_id
-        WHERE up.plant_id = %s AND up.user_id = %s
-        ORDER BY d.created_at DESC
-        LIMIT 1
-        """
+            query = """
+            SELECT 
+                d.diary_id,
+                d.user_title,
+                d.created_at
+            FROM diary d
+            JOIN user_plant up ON d.user_id = up.user_id
+            WHERE up.plant_id = %s AND up.user_id = %s
+            ORDER BY d.created_at DESC
+            LIMIT 1
+            """
         
-        async with connection.cursor(aiomysql.DictCursor) as cursor:
-            await cursor.execute(query, (plant_idx, user_id))
-            result = await cursor.fetchone()
-            
-            if result:
-                return {
-                    "has_diary": True,
-                    "latest_diary": {
-                        "diary_id": result['diary_id'],
-                        "title": result['user_title'],
-                        "created_at": result['created_at']
+            async with connection.cursor(InstrumentedDictCursor) as cursor:
+                await cursor.execute(query, (plant_idx, user_id))
+                result = await cursor.fetchone()
+            
+                if result:
+                    return {
+                        "has_diary": True,
+                        "latest_diary": {
+                            "diary_id": result['diary_id'],
+                            "title": result['user_title'],
+                            "created_at": result['created_at']
+                        }
+                    }
+                else:
+                    return {
+                        "has_diary": False,
+                        "latest_diary": None,
+                        "message": "작성한 일기가 없어요."
                     }
-                }
-            else:
-                return {
-                    "has_diary": False,
-                    "latest_diary": None,
-                    "message": "작성한 일기가 없어요."
-                }
             
     except Exception as e:
         print(f"Error in get_plant_recent_diary_summary: {e}")
         raise e
-    finally:
-        if connection:
-            connection.close()
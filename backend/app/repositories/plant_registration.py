@@ -1,7 +1,10 @@
 import aiomysql
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
-from db.pool import get_db_connection
+from db.pool import after_commit, get_db_connection
+from repositories.device import DEVICE_CONNECTED, DeviceClaimError, connect_plant_device
+from services.user_stats import user_stats, PLANT_STATS
+from utils.pagination import InvalidCursor, count_cache, decode_cursor, keyset_condition, next_cursor_from
 from schemas.plant_registration import (
     PlantRegistrationRequest,
     PlantRegistrationResponse,
@@ -59,20 +62,11 @@ async def create_plant(
             
             print(f"[DEBUG] 생성된 plant_idx: {plant_idx}")
             
-            # device_info 테이블 자동 매핑 비활성화 (humid 테이블로 통합)
-            # try:
-            #     await cursor.execute(
-            #         """
-            #         INSERT INTO device_info (plant_id, device_id)
-            #         VALUES (%s, %s)
-            #         """,
-            #         (plant_idx, 1)
-            #     )
-            #     print(f"[DEBUG] device_info 등록 성공: plant_id={plant_idx}, device_id=1")
-            # except Exception as device_error:
-            #     print(f"[WARNING] device_info 등록 실패: {device_error}")
-            #     # device_info 등록 실패해도 식물 등록은 성공으로 처리
-            print(f"[DEBUG] device_info 자동 매핑 비활성화됨: plant_id={plant_idx}")
+            # 습도 센서 연결 (지정하지 않으면 공통 센서 사용, 연결할 수 없으면 식물 등록도 롤백)
+            if plant_request.device_id is not None:
+                result = await connect_plant_device(cursor, user_id, plant_idx, plant_request.device_id)
+                if result != DEVICE_CONNECTED:
+                    raise DeviceClaimError(result)
             
             # 생성된 식물 정보 조회 (plant_id로 조회)
             await cursor.execute(
@@ -80,6 +74,7 @@ async def create_plant(
                 (plant_idx,)
             )
             result = await cursor.fetchone()
+            after_commit(conn, user_stats.plant_changed, user_id)
             
             return PlantRegistrationResponse(
                 idx=result['plant_id'],  # plant_id를 idx로 사용
@@ -91,6 +86,8 @@ async def create_plant(
                 created_at=result.get('created_at', result.get('meet_day'))
             )
             
+    except DeviceClaimError:
+        raise
     except Exception as e:
         print(f"Error in create_plant: {e}")
         print(f"Error type: {type(e)}")
@@ -98,58 +95,100 @@ async def create_plant(
         print(f"Traceback: {traceback.format_exc()}")
         raise e
 
+# 만난 날짜가 없는 식물은 가장 뒤로 정렬 (NULL이면 키셋 비교가 불가능하므로 대체값 사용)
+_PLANT_SORT_COLUMNS = [("IFNULL(meet_day, DATE('1000-01-01'))", "desc"), ("plant_id", "desc")]
+
+async def _list_user_plants(
+    user_id: str,
+    conditions: List[str],
+    params: List[Any],
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool,
+    count_key: Any
+) -> PlantListResponse:
+    """사용자 식물 목록 공통 조회 (page 또는 cursor 기반)"""
+    where_conditions = ["user_id = %s"] + conditions
+    where_params = [user_id] + params
+    
+    page_conditions = list(where_conditions)
+    page_params = list(where_params)
+    offset = 0
+    if cursor:
+        keyset_sql, keyset_params = keyset_condition(
+            _PLANT_SORT_COLUMNS, decode_cursor(cursor, len(_PLANT_SORT_COLUMNS))
+        )
+        page_conditions.append(keyset_sql)
+        page_params.extend(keyset_params)
+    else:
+        offset = (page - 1) * limit
+    
+    async with get_db_connection(read_only=True, user_id=user_id) as (conn, db_cursor):
+        # 식물 목록 조회 (limit + 1건으로 다음 페이지 확인)
+        await db_cursor.execute(
+            f"""
+            SELECT *, {_PLANT_SORT_COLUMNS[0][0]} AS sort_day
+            FROM user_plant 
+            WHERE {" AND ".join(page_conditions)}
+            ORDER BY sort_day DESC, plant_id DESC
+            LIMIT %s OFFSET %s
+            """,
+            page_params + [limit + 1, offset]
+        )
+        results, next_cursor = next_cursor_from(await db_cursor.fetchall(), limit, ["sort_day", "plant_id"])
+        
+        total_count = None
+        if include_total:
+            async def _count() -> int:
+                await db_cursor.execute(
+                    f"SELECT COUNT(*) as total FROM user_plant WHERE {' AND '.join(where_conditions)}",
+                    where_params
+                )
+                return (await db_cursor.fetchone())['total']
+            
+            total_count = await count_cache.get_or_compute(count_key, _count)
+    
+    plants = [
+        PlantRegistrationResponse(
+            idx=row['plant_id'],  # plant_id를 idx로 사용
+            user_id=row['user_id'],
+            plant_name=row['plant_name'],
+            species=row['species'],
+            meet_day=row['meet_day'],
+            plant_id=row['plant_id'],
+            created_at=row.get('created_at', row.get('meet_day'))
+        )
+        for row in results
+    ]
+    
+    return PlantListResponse(
+        plants=plants,
+        total_count=total_count,
+        page=page,
+        limit=limit,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
+    )
+
 async def get_user_plants(
     user_id: str,
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> PlantListResponse:
-    """사용자의 식물 목록을 조회합니다."""
+    """
+    사용자의 식물 목록을 조회합니다.
+    cursor가 있으면 (meet_day, plant_id) 키셋으로 다음 페이지를 조회합니다.
+    """
     try:
-        async with get_db_connection() as (conn, cursor):
-            # 전체 개수 조회
-            await cursor.execute(
-                "SELECT COUNT(*) as total FROM user_plant WHERE user_id = %s",
-                (user_id,)
-            )
-            count_result = await cursor.fetchone()
-            total_count = count_result['total']
-            
-            # 페이지네이션 계산
-            offset = (page - 1) * limit
-            
-            # 식물 목록 조회
-            await cursor.execute(
-                """
-                SELECT * FROM user_plant 
-                WHERE user_id = %s
-                ORDER BY meet_day DESC
-                LIMIT %s OFFSET %s
-                """,
-                (user_id, limit, offset)
-            )
-            results = await cursor.fetchall()
-            
-            plants = [
-                PlantRegistrationResponse(
-                    idx=row['plant_id'],  # plant_id를 idx로 사용
-                    user_id=row['user_id'],
-                    plant_name=row['plant_name'],
-                    species=row['species'],
-                    meet_day=row['meet_day'],
-                    plant_id=row['plant_id'],
-                    created_at=row.get('created_at', row.get('meet_day'))
-                )
-                for row in results
-            ]
-            
-            return PlantListResponse(
-                plants=plants,
-                total_count=total_count,
-                page=page,
-                limit=limit,
-                has_more=(offset + limit) < total_count
-            )
-            
+        return await _list_user_plants(
+            user_id, [], [], page, limit, cursor, include_total,
+            count_key=(("plants", user_id), None)
+        )
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"Error in get_user_plants: {e}")
         raise e
@@ -231,6 +270,7 @@ async def update_plant(
             await cursor.execute(query, update_values)
             
             if cursor.rowcount > 0:
+                after_commit(conn, user_stats.plant_changed, user_id)
                 # 수정된 식물 정보 조회
                 await cursor.execute(
                     "SELECT * FROM user_plant WHERE plant_id = %s AND user_id = %s",
@@ -284,6 +324,9 @@ async def delete_plant(plant_idx: int, user_id: str) -> bool:
             plant_deleted = cursor.rowcount
             print(f"[DEBUG] 삭제된 식물 수: {plant_deleted}")
             
+            # 목록 개수/통계 캐시 무효화 (CASCADE로 일기·진단 기록도 함께 삭제됨)
+            after_commit(conn, user_stats.plant_changed, user_id)
+            
             return plant_deleted > 0
             
     except Exception as e:
@@ -295,115 +338,77 @@ async def delete_plant(plant_idx: int, user_id: str) -> bool:
 
 async def get_plant_stats(user_id: str) -> Dict[str, Any]:
     """사용자의 식물 통계를 조회합니다."""
-    try:
-        async with get_db_connection() as (conn, cursor):
-            # 기본 통계 조회
-            await cursor.execute(
-                """
-                SELECT 
-                    COUNT(*) as total_plants,
-                    COUNT(DISTINCT species) as unique_species,
-                    MIN(meet_day) as first_plant_date,
-                    MAX(meet_day) as latest_plant_date
-                FROM user_plant 
-                WHERE user_id = %s
-                """,
-                (user_id,)
-            )
-            stats_result = await cursor.fetchone()
-            
-            # 품종별 통계
-            await cursor.execute(
-                """
-                SELECT 
-                    species,
-                    COUNT(*) as count
-                FROM user_plant 
-                WHERE user_id = %s AND species IS NOT NULL
-                GROUP BY species
-                ORDER BY count DESC
-                LIMIT 5
-                """,
-                (user_id,)
-            )
-            species_stats = await cursor.fetchall()
-            
-            return {
-                "total_plants": stats_result['total_plants'],
-                "unique_species": stats_result['unique_species'],
-                "first_plant_date": stats_result['first_plant_date'],
-                "latest_plant_date": stats_result['latest_plant_date'],
-                "top_species": [
-                    {"species": row['species'], "count": row['count']}
-                    for row in species_stats
-                ]
-            }
+    async def _compute():
+        try:
+            async with get_db_connection(read_only=True, user_id=user_id) as (conn, cursor):
+                # 기본 통계 조회
+                await cursor.execute(
+                    """
+                    SELECT 
+                        COUNT(*) as total_plants,
+                        COUNT(DISTINCT species) as unique_species,
+                        MIN(meet_day) as first_plant_date,
+                        MAX(meet_day) as latest_plant_date
+                    FROM user_plant 
+                    WHERE user_id = %s
+                    """,
+                    (user_id,)
+                )
+                stats_result = await cursor.fetchone()
             
-    except Exception as e:
-        print(f"Error in get_plant_stats: {e}")
-        raise e
+                # 품종별 통계
+                await cursor.execute(
+                    """
+                    SELECT 
+                        species,
+                        COUNT(*) as count
+                    FROM user_plant 
+                    WHERE user_id = %s AND species IS NOT NULL
+                    GROUP BY species
+                    ORDER BY count DESC
+                    LIMIT 5
+                    """,
+                    (user_id,)
+                )
+                species_stats = await cursor.fetchall()
+            
+                return {
+                    "total_plants": stats_result['total_plants'],
+                    "unique_species": stats_result['unique_species'],
+                    "first_plant_date": stats_result['first_plant_date'],
+                    "latest_plant_date": stats_result['latest_plant_date'],
+                    "top_species": [
+                        {"species": row['species'], "count": row['count']}
+                        for row in species_stats
+                    ]
+                }
+            
+        except Exception as e:
+            print(f"Error in get_plant_stats: {e}")
+            raise e
+    
+    return await user_stats.get_or_compute(user_id, PLANT_STATS, _compute)
 
 async def search_plants(
     user_id: str,
     query: str,
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> PlantListResponse:
-    """식물을 검색합니다."""
+    """식물을 검색합니다. (cursor는 get_user_plants와 동일)"""
     try:
-        async with get_db_connection() as (conn, cursor):
-            search_term = f"%{query}%"
-            
-            # 전체 개수 조회
-            await cursor.execute(
-                """
-                SELECT COUNT(*) as total 
-                FROM user_plant 
-                WHERE user_id = %s 
-                AND (plant_name LIKE %s OR species LIKE %s)
-                """,
-                (user_id, search_term, search_term)
-            )
-            count_result = await cursor.fetchone()
-            total_count = count_result['total']
-            
-            # 페이지네이션 계산
-            offset = (page - 1) * limit
-            
-            # 검색 결과 조회
-            await cursor.execute(
-                """
-                SELECT * FROM user_plant 
-                WHERE user_id = %s 
-                AND (plant_name LIKE %s OR species LIKE %s)
-                ORDER BY meet_day DESC
-                LIMIT %s OFFSET %s
-                """,
-                (user_id, search_term, search_term, limit, offset)
-            )
-            results = await cursor.fetchall()
-            
-            plants = [
-                PlantRegistrationResponse(
-                    idx=row['plant_id'],  # plant_id를 idx로 사용
-                    user_id=row['user_id'],
-                    plant_name=row['plant_name'],
-                    species=row['species'],
-                    meet_day=row['meet_day'],
-                    plant_id=row['plant_id'],
-                    created_at=row.get('created_at', row.get('meet_day'))
-                )
-                for row in results
-            ]
-            
-            return PlantListResponse(
-                plants=plants,
-                total_count=total_count,
-                page=page,
-                limit=limit,
-                has_more=(offset + limit) < total_count
-            )
-            
+        search_term = f"%{query}%"
+        return await _list_user_plants(
+            user_id,
+            ["(plant_name LIKE %s OR species LIKE %s)"],
+            [search_term, search_term],
+            page, limit, cursor, include_total,
+            count_key=(("plants", user_id), query)
+        )
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"Error in search_plants: {e}")
         raise e
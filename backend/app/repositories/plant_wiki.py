@@ -13,7 +13,7 @@ async def get_plant_wiki_by_species(species_name: str) -> Optional[Dict[str, Any
         Dict[str, Any]: 위키 정보 또는 None
     """
     try:
-        async with get_db_connection() as (conn, cursor):
+        async with get_db_connection(read_only=True) as (conn, cursor):
             # 실제 테이블 구조에 맞게 조회 (sci_name, name_jong 등으로 검색)
             await cursor.execute(
                 """
@@ -2,7 +2,9 @@ from __future__ import annotations
 from typing import Optional, List, Dict, Any
 import aiomysql
 
+from db.pool import after_commit
 from models.user import User
+from services.user_stats import user_stats
 
 
 async def get_by_idx(db, idx: int) -> Optional[User]:
@@ -90,9 +92,13 @@ async def patch(
 
 
 async def delete_by_idx(db, idx: int) -> int:
-    """사용자 삭제"""
+    """사용자 삭제 (식물/일기/진단 기록도 CASCADE로 삭제되므로 사용자 캐시 전체 무효화)"""
     conn, cursor = db
+    await cursor.execute("SELECT user_id FROM users WHERE idx = %s", (idx,))
+    row = await cursor.fetchone()
     await cursor.execute("DELETE FROM users WHERE idx = %s", (idx,))
+    if row:
+        after_commit(conn, user_stats.plant_changed, row["user_id"])
     return cursor.rowcount
 
 
@@ -0,0 +1,63 @@
+"""
+자동 감지된 물주기 이벤트 저장소
+
+MQTT 적재 파이프라인의 물주기 감지기(services.watering_detector)가 만든 이벤트를
+watering_event 테이블에 저장합니다. (device_id, event_at)이 유니크 키이므로
+같은 배치가 재시도/재적재되어도 이벤트는 한 번만 기록됩니다.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from db.pool import get_db_connection
+
+async def insert_watering_events(cursor, events: Sequence[Any]) -> None:
+    """
+    감지된 이벤트를 저장합니다. (호출자의 트랜잭션 사용, 중복은 무시)
+    events: WateringEvent(device_id, event_at, humidity_before, humidity_after, increase_pct)
+    """
+    if not events:
+        return
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s)"] * len(events))
+    params: List[Any] = []
+    for ev in events:
+        params.extend((ev.device_id, ev.event_at, ev.humidity_before, ev.humidity_after, ev.increase_pct))
+    await cursor.execute(
+        f"""
+        INSERT IGNORE INTO watering_event
+            (device_id, event_at, humidity_before, humidity_after, increase_pct)
+        VALUES {placeholders}
+        """,
+        params,
+    )
+
+
+async def get_watering_events(device_id: int, limit: int = 10) -> List[dict]:
+    """장치의 최근 물주기 이벤트 (최신순)"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute(
+            """
+            SELECT event_id, device_id, event_at, humidity_before, humidity_after, increase_pct
+            FROM watering_event
+            WHERE device_id = %s
+            ORDER BY event_at DESC
+            LIMIT %s
+            """,
+            (device_id, limit),
+        )
+        return await cursor.fetchall()
+
+
+async def get_latest_watering_event(device_id: int) -> Optional[dict]:
+    """장치의 가장 최근 물주기 이벤트"""
+    events = await get_watering_events(device_id, limit=1)
+    return events[0] if events else None
+
+
+async def get_last_event_times() -> Dict[int, datetime]:
+    """장치별 마지막 물주기 이벤트 시각 (재시작 시 감지 상태 복원용)"""
+    async with get_db_connection() as (conn, cursor):
+        await cursor.execute("SELECT device_id, MAX(event_at) AS event_at FROM watering_event GROUP BY device_id")
+        rows = await cursor.fetchall()
+    return {row["device_id"]: row["event_at"] for row in rows}
@@ -13,6 +13,7 @@ from features.medical import router as medical_router
 from features.disease_diagnosis import router as disease_diagnosis_router
 from features import detail_router, diary_router as plant_diary_router, pest_router, watering_router, images_router
 from features.home import router as home_api_router
+from features.devices import router as devices_router
 
 router = APIRouter()
 
@@ -34,3 +35,4 @@ router.include_router(pest_router)  # /plant-detail/{plant_idx}/pest-records
 router.include_router(watering_router)  # /plant-detail/{plant_idx}/watering-records
 router.include_router(images_router)  # /plant-detail/{plant_idx}/upload-image
 router.include_router(home_api_router)  # /home (API)
+router.include_router(devices_router)  # /devices
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class PlantDeviceRequest(BaseModel):
+    """식물-센서 연결 요청 스키마"""
+    device_id: int = Field(..., ge=1, description="습도 센서 ID (MQTT payload의 deviceId)")
+
+class PlantDeviceResponse(BaseModel):
+    """식물-센서 연결 정보 응답 스키마"""
+    plant_id: int
+    plant_name: Optional[str] = None
+    device_id: int
+    is_registered: bool = Field(..., description="False면 연결된 센서가 없어 공통 센서를 사용 중")
+    registered_at: Optional[datetime] = None
+
+class PlantDeviceListResponse(BaseModel):
+    """사용자 식물별 센서 연결 현황 응답 스키마"""
+    user_id: str
+    devices: List[PlantDeviceResponse]
@@ -76,14 +76,20 @@ class DiaryListItemResponse(OrmBase):
     hist_repot: Optional[int] = None
     hist_pruning: Optional[int] = None
     hist_fertilize: Optional[int] = None
+    plant_reply_status: Optional[str] = None        # 작성/수정 직후 "pending" (답장은 백그라운드 생성)
+    # 검색 결과일 때만 채워짐
+    score: Optional[float] = None                   # 관련도 점수
+    snippet: Optional[str] = None                   # 검색어 주변 본문 발췌
+    highlights: Optional[List[List[int]]] = None    # snippet 안의 일치 구간 [시작, 끝)
 
 class DiaryListResponse(OrmBase):
     """일기 목록 응답 스키마"""
     diaries: List[DiaryListItemResponse]
-    total_count: int
+    total_count: Optional[int] = None  # include_total=false면 생략
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (키셋 페이지네이션)
 
 class DiarySearchRequest(OrmBase):
     """일기 검색 요청 스키마"""
@@ -102,6 +108,15 @@ class DiaryStatsResponse(OrmBase):
     most_active_plant: Optional[str] = None
     average_diaries_per_plant: float
 
+class DiaryTagCount(OrmBase):
+    """해시태그별 일기 수"""
+    tag: str
+    count: int
+
+class DiaryTagListResponse(OrmBase):
+    """해시태그 목록 응답 스키마 (태그 통계/자동완성)"""
+    tags: List[DiaryTagCount]
+
 # 일기 작성/수정용 스키마
 class DiaryWriteRequest(OrmBase):
     """일기 작성 요청"""
@@ -122,3 +137,9 @@ class DiaryWriteResponse(OrmBase):
     success: bool
     message: str
     diary: DiaryListItemResponse
+
+class DiaryPlantReplyResponse(OrmBase):
+    """일기 식물 답장 상태 (작성/수정 후 폴링)"""
+    diary_id: int
+    status: str                          # pending | done
+    plant_reply: Optional[str] = None
@@ -21,22 +21,27 @@ class PestWikiInfo(BaseModel):
     pest_id: int
     pest_name: str  # 병충해명
     cause: Optional[str] = None  # 원인
+    symptom: Optional[str] = None  # 증상
     cure: Optional[str] = None  # 치료법
     prevention: Optional[str] = None  # 예방법
 
 class PlantWikiListResponse(BaseModel):
     """식물 위키 목록 응답 스키마"""
     plants: List[PlantWikiInfo]
-    total_count: int
+    total_count: Optional[int] = None  # include_total=false면 생략
     page: int
     limit: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (키셋 페이지네이션)
 
 class PestWikiListResponse(BaseModel):
     """병충해 위키 목록 응답 스키마"""
     pests: List[PestWikiInfo]
-    total_count: int
+    total_count: Optional[int] = None  # include_total=false면 생략
     page: int
     limit: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (키셋 페이지네이션)
 
 class PlantWikiDetailResponse(BaseModel):
     """식물 위키 상세 정보 응답 스키마"""
@@ -57,6 +62,7 @@ class PestWikiDetailResponse(BaseModel):
     pest_id: int
     pest_name: str
     cause: Optional[str] = None
+    symptom: Optional[str] = None
     cure: Optional[str] = None
     prevention: Optional[str] = None
 
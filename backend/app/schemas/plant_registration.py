@@ -9,6 +9,7 @@ class PlantRegistrationRequest(BaseModel):
     species: Optional[str] = Field(None, max_length=100, description="식물 품종")
     meet_day: date = Field(..., description="키우기 시작한 날")
     plant_id: Optional[int] = Field(None, description="식물 위키 ID (선택사항)")
+    device_id: Optional[int] = Field(None, description="연결할 습도 센서 ID (선택사항, 없으면 공통 센서)")
 
 class PlantRegistrationResponse(BaseModel):
     """식물 등록 응답 스키마"""
@@ -37,10 +38,11 @@ class SpeciesClassificationResponse(BaseModel):
 class PlantListResponse(BaseModel):
     """식물 목록 응답 스키마"""
     plants: List[PlantRegistrationResponse]
-    total_count: int
+    total_count: Optional[int] = None  # include_total=false면 생략
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (키셋 페이지네이션)
 
 class PlantUpdateRequest(BaseModel):
     """식물 정보 수정 요청 스키마"""
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from clients.plant_llm import request_plant_reply
+from core.config import settings
+from repositories.diary_reply import (
+    claim_reply_job,
+    complete_reply_job,
+    list_pending_job_ids,
+    record_reply_failure,
+)
+
+# 재시도를 모두 실패했을 때 저장하는 기본 답변
+FALLBACK_REPLY = "안녕! 오늘도 잘 지내고 있어? 나는 너의 일기를 들을 수 있어서 기뻐!"
+
+
+class DiaryReplyQueue:
+    """
+    일기 식물 답장 백그라운드 생성
+
+    - 일기 작성/수정은 plant_content를 비운 채 커밋하고 diary_reply_job에 작업을 남긴 뒤
+      enqueue()만 호출합니다. 요청 처리 시간과 DB 연결 점유 시간이 LLM 응답 시간과 무관해집니다.
+    - DIARY_REPLY_WORKERS개의 워커가 작업을 꺼내 LLM을 호출하고(연결을 잡지 않은 상태),
+      짧은 트랜잭션으로 답장을 저장합니다.
+    - 워커는 작업 행을 DIARY_REPLY_LEASE_SECONDS 동안 점유(claimed_until)한 뒤에만 처리하므로
+      여러 프로세스가 같은 작업을 큐에 넣어도 한 곳에서만 LLM을 호출합니다.
+    - 실패하면 DIARY_REPLY_RETRY_BACKOFF 초(지수 증가) 뒤 재시도하고(next_attempt_at까지 점유 불가),
+      DIARY_REPLY_MAX_ATTEMPTS회를 넘으면 기본 답변을 저장합니다.
+    - 작업은 DB에 남아 있으므로 시작 시, 그리고 DIARY_REPLY_SWEEP_INTERVAL 초마다
+      지금 처리할 수 있는 작업을 다시 넣습니다. (재시작, 큐 초과, 다른 워커 프로세스 중단 대비)
+    - wait()로 이 프로세스에서 답장이 저장될 때까지 기다릴 수 있습니다. (롱 폴링)
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[int] = set()          # 큐에 있거나 처리 중인 diary_id
+        self._in_flight = 0
+        self._workers: List[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._waiters: Dict[int, asyncio.Event] = {}
+        self._enqueued = 0
+        self._completed = 0
+        self._stale = 0
+        self._retries = 0
+        self._fallbacks = 0
+        self._recovered = 0
+        self._dropped = 0
+        self._latency_total = 0.0
+        self._last_error: Optional[str] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=settings.DIARY_REPLY_QUEUE_MAXSIZE)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(max(1, settings.DIARY_REPLY_WORKERS))
+        ]
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        """워커 종료 (남은 작업은 DB에 있으므로 다음 시작 시 이어서 처리)"""
+        tasks = [t for t in [self._sweeper, *self._workers] if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._sweeper = None
+        self._queued.clear()
+
+    def enqueue(self, diary_id: int) -> bool:
+        """작업을 큐에 넣음 (이미 있으면 무시, 큐가 가득 차면 다음 점검 때 처리)"""
+        if self._queue is None or diary_id in self._queued:
+            return False
+        try:
+            self._queue.put_nowait(diary_id)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            print(f"[DIARY-REPLY] 큐가 가득 참, 다음 점검 때 처리: diary_id={diary_id}", flush=True)
+            return False
+        self._queued.add(diary_id)
+        self._enqueued += 1
+        return True
+
+    async def wait(self, diary_id: int, timeout: float) -> bool:
+        """이 프로세스에서 답장이 저장될 때까지 대기, 반환: 제시간에 저장되었는지"""
+        event = self._waiters.setdefault(diary_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if self._waiters.get(diary_id) is event and not event.is_set():
+                self._waiters.pop(diary_id, None)
+
+    def _notify(self, diary_id: int) -> None:
+        event = self._waiters.pop(diary_id, None)
+        if event is not None:
+            event.set()
+
+    async def sweep(self) -> int:
+        """DB에 남은 작업 중 큐에 없는 것을 다시 넣음, 반환: 넣은 개수"""
+        ids = await list_pending_job_ids(settings.DIARY_REPLY_QUEUE_MAXSIZE)
+        added = sum(1 for diary_id in ids if self.enqueue(diary_id))
+        if added:
+            self._recovered += added
+            print(f"[DIARY-REPLY] 남은 작업 {added}건 다시 등록", flush=True)
+        return added
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                print(f"[DIARY-REPLY] 남은 작업 확인 실패: {e}", flush=True)
+            await asyncio.sleep(settings.DIARY_REPLY_SWEEP_INTERVAL)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            diary_id = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._process(diary_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # DB 오류 등: 작업 행은 남아 있으므로 점유가 만료된 뒤 다음 점검 때 다시 처리
+                self._last_error = str(e)
+                print(f"[DIARY-REPLY] 작업 처리 실패 (worker {index}, diary_id={diary_id}): {e}", flush=True)
+            finally:
+                self._in_flight -= 1
+                self._queued.discard(diary_id)
+                self._queue.task_done()
+
+    async def _process(self, diary_id: int) -> None:
+        job = await claim_reply_job(diary_id, settings.DIARY_REPLY_LEASE_SECONDS)
+        if job is None:
+            return  # 이미 처리됨, 일기 삭제, 재시도 대기 중이거나 다른 워커가 처리 중
+
+        started = time.monotonic()
+        try:
+            reply = await asyncio.wait_for(
+                request_plant_reply(
+                    species=job["species"] or "식물",
+                    user_text=job["user_content"],
+                    moisture=job["moisture"],
+                    priority="diary",  # 대화 요청보다 뒤에 처리
+                    timeout=settings.DIARY_REPLY_TIMEOUT,  # 모델 서버 오류는 더미 답변 대신 예외 → 재시도
+                ),
+                settings.DIARY_REPLY_TIMEOUT,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self._last_error = error
+            delay = settings.DIARY_REPLY_RETRY_BACKOFF * (2 ** job["attempts"])
+            attempts = await record_reply_failure(diary_id, job["seq"], error, delay)
+            if 0 < attempts < settings.DIARY_REPLY_MAX_ATTEMPTS:
+                self._retries += 1
+                print(f"[DIARY-REPLY] 답장 생성 실패, {delay:.0f}초 뒤 재시도 (diary_id={diary_id}): {error}", flush=True)
+                # DB 시각 기준 next_attempt_at보다 조금 늦게 (일찍 꺼내면 점유가 안 되어 다음 점검까지 밀림)
+                asyncio.get_running_loop().call_later(delay + 1, self.enqueue, diary_id)
+                return
+            if attempts == 0:
+                return  # 그 사이 일기가 수정되어 새 작업으로 바뀜
+            self._fallbacks += 1
+            reply = FALLBACK_REPLY
+
+        if await complete_reply_job(diary_id, job["seq"], reply):
+            self._completed += 1
+            self._latency_total += time.monotonic() - started
+            self._notify(diary_id)
+        else:
+            # 답장 생성 중 일기가 수정됨: 새 작업(seq)이 따로 처리됨
+            self._stale += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": self._in_flight,
+            "enqueued": self._enqueued,
+            "completed": self._completed,
+            "stale": self._stale,
+            "retries": self._retries,
+            "fallbacks": self._fallbacks,
+            "recovered": self._recovered,
+            "dropped": self._dropped,
+            "waiters": len(self._waiters),
+            "avg_latency_ms": round(self._latency_total / self._completed * 1000, 1) if self._completed else 0.0,
+            "last_error": self._last_error,
+        }
+
+
+# 싱글톤 인스턴스
+diary_reply_queue = DiaryReplyQueue()
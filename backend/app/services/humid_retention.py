@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from repositories.humid import prune_raw_humid
+
+
+class HumidRetentionService:
+    """
+    습도 원본(humid) 보존 작업
+    - HUMID_RETENTION_INTERVAL 초마다 HUMID_RAW_RETENTION_DAYS 보다 오래된 원본 행 삭제
+      (집계는 MQTT 적재 시 이미 반영되어 있으므로 장기 차트는 집계 테이블로 조회)
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._pruned = 0
+        self._last_run_at: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    async def start(self) -> None:
+        if settings.HUMID_RAW_RETENTION_DAYS > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def prune_once(self) -> int:
+        """보존 기간이 지난 원본 행을 삭제하고 삭제 건수를 반환"""
+        cutoff = datetime.now() - timedelta(days=settings.HUMID_RAW_RETENTION_DAYS)
+        deleted = await prune_raw_humid(cutoff, settings.HUMID_PRUNE_CHUNK)
+        self._runs += 1
+        self._pruned += deleted
+        self._last_run_at = datetime.now()
+        if deleted:
+            print(f"[HUMID] retention: {deleted} rows before {cutoff:%Y-%m-%d %H:%M} deleted", flush=True)
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.prune_once()
+                self._last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                print(f"[HUMID] retention error: {e}", flush=True)
+            await asyncio.sleep(settings.HUMID_RETENTION_INTERVAL)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retention_days": settings.HUMID_RAW_RETENTION_DAYS,
+            "runs": self._runs,
+            "pruned": self._pruned,
+            "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+            "last_error": self._last_error,
+        }
+
+
+# 싱글톤 인스턴스
+humid_retention = HumidRetentionService()
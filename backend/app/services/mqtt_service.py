@@ -1,31 +1,51 @@
 from __future__ import annotations
 
 import asyncio
+import glob
 import json
+import os
 import ssl
+import time
 from datetime import datetime, timezone, timedelta, date
 
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 import paho.mqtt.client as mqtt
 
 from core.config import settings         
-from db.pool import get_pool
-from db.transaction import get_cursor   
+from db.instrument import InstrumentedDictCursor
+from db.pool import commit, get_pool
+from db.transaction import get_connection
+from repositories.humid import ROLLUP_LOCK_WAIT_INGEST, get_raw_rows_since, rollup_lock, upsert_rollups
+from repositories.watering_event import get_last_event_times, insert_watering_events
+from services.watering_detector import watering_detector
 
 # UTC <> KST
 KST = timezone(timedelta(hours=9))
 
 
+
+# 배치 종료 신호 (stop 시 큐에 넣어 컨슈머가 남은 데이터를 flush 후 종료)
+_STOP = object()
+
+INSERT_HUMID_PREFIX = "INSERT INTO humid (device_id, humidity, sensor_digit, humid_date) VALUES "
+INSERT_HUMID_ROW = "(%s, %s, %s, %s)"
+
+
 class MQTTService:
     """
     - paho-mqtt(loop_start, 별도 스레드)에서 수신 → asyncio.Queue에 적재
-    - FastAPI 이벤트 루프에서 컨슈머 태스크가 DB INSERT (db.transaction.get_cursor 사용)
+    - FastAPI 이벤트 루프의 컨슈머 태스크가 큐를 모아서 배치 INSERT (db.transaction.get_connection 사용)
+      · MQTT_BATCH_SIZE 만큼 모이거나 첫 메시지 이후 MQTT_FLUSH_INTERVAL 초가 지나면 flush
+      · 배치 1건 = multi-row INSERT 1회 + 집계(humid_hourly/humid_daily) 갱신
+        + 물주기 이벤트(watering_event) 기록 + commit 1회
+      · 실패 시 지수 백오프로 재시도, 그래도 실패하면 로컬 spill 파일(JSONL)에 보관 후
+        다음 flush 성공 시 재적재
     - payload 예:
       {"ts":1758176544,"deviceId":"1","moisture_raw":823,"moisture_pct":48}
     - humid 테이블 컬럼:
       device_id(INT), humidity(INT), sensor_digit(INT), humid_date(DATETIME)
-    - 모든 식물에 공통으로 사용되는 습도 데이터 (device_id=1)
+    - device_id는 payload의 deviceId (식물 ↔ 센서 매핑은 plant_device, 매핑이 없으면 DEFAULT_DEVICE_ID)
     """
 
     def __init__(self) -> None:
@@ -43,28 +63,41 @@ class MQTTService:
 
         # --- asyncio / 내부 상태 ---
         self._loop: Optional[asyncio.AbstractEventLoop] = None
-        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=1000)
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=settings.MQTT_QUEUE_MAXSIZE)
         self._consumer_task: Optional[asyncio.Task] = None
-
-        # 배치 처리 제거 - 즉시 저장으로 변경
+        self._spill_path = settings.MQTT_SPILL_PATH
+
+        # --- 적재 지표 ---
+        self._received = 0          # 큐에 들어간 메시지 수
+        self._dropped = 0           # 큐가 가득 차 버린 메시지 수
+        self._invalid = 0           # 파싱 불가로 버린 메시지 수
+        self._inserted = 0          # DB에 반영된 행 수
+        self._batches = 0           # 성공한 배치 수
+        self._retries = 0           # 배치 재시도 횟수
+        self._spilled = 0           # spill 파일로 보낸 행 수
+        self._replayed = 0          # spill 파일에서 재적재한 행 수
+        self._last_flush_ms: Optional[float] = None
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._last_flush_at: Optional[datetime] = None
 
         # 디버그/상태 확인용
         self.last: Optional[Dict[str, Any]] = None
 
-
-
-
-
     # ---------- FastAPI lifespan에서 호출 ----------
     async def start(self, loop: asyncio.AbstractEventLoop) -> None:
         """서비스 시작: 컨슈머 태스크 생성, MQTT 접속/수신루프 시작"""
         self._loop = loop
+        try:
+            await self._seed_detector()
+        except Exception as e:
+            print(f"[MQTT] 물주기 감지 상태 복원 실패: {e}", flush=True)
         self._consumer_task = loop.create_task(self._consumer())
         self._client.connect(settings.MQTT_HOST, settings.MQTT_PORT, keepalive=60)
         self._client.loop_start()
 
     async def stop(self) -> None:
-        """서비스 정리: MQTT/컨슈머 종료"""
+        """서비스 정리: MQTT 종료 → 큐에 남은 데이터 flush → 컨슈머 종료"""
         try:
             self._client.loop_stop()
             self._client.disconnect()
@@ -72,13 +105,71 @@ class MQTTService:
             pass
 
         if self._consumer_task:
-            self._consumer_task.cancel()
             try:
-                await self._consumer_task
-            except asyncio.CancelledError:
-                pass
+                # DB 장애로 큐가 가득 차 있으면 _STOP을 넣는 것부터 막히므로 전체를 한 제한 시간 안에서 처리
+                await asyncio.wait_for(self._drain(), timeout=settings.MQTT_FLUSH_INTERVAL + 10)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._consumer_task.cancel()
+                await asyncio.gather(self._consumer_task, return_exceptions=True)
+                self._spill_queue()
             self._consumer_task = None
 
+    async def _drain(self) -> None:
+        await self._queue.put(_STOP)
+        await self._consumer_task
+
+    def _spill_queue(self) -> None:
+        """종료 시간 안에 flush하지 못하고 큐에 남은 메시지를 spill 파일로 보냄 (다음 시작 시 재적재)"""
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is _STOP:
+                continue
+            row = self._to_row(item)
+            if row is not None:
+                rows.append(row)
+        if rows:
+            self._write_spill(rows)
+            self._spilled += len(rows)
+            print(f"[MQTT→DB] SPILL on stop: {len(rows)} rows → {self._spill_path}", flush=True)
+
+    async def _seed_detector(self) -> None:
+        """
+        재시작 직후 물을 준 경우 같은 상승을 다시 이벤트로 기록하지 않도록
+        최근 WATERING_SEED_HOURS 시간의 원본으로 감지 상태를 복원합니다.
+        최근 이벤트가 있는 장치는 그 상승 전 구간까지 포함하도록 더 앞에서부터 다시 흘립니다.
+        """
+        window = timedelta(hours=settings.WATERING_SEED_HOURS)
+        since = datetime.now(KST).replace(tzinfo=None) - window
+        last_events = await get_last_event_times()
+        since = min([since] + [event_at - window for event_at in last_events.values() if event_at >= since])
+        rows = await get_raw_rows_since(since)
+        devices = watering_detector.seed(rows, last_events)
+        print(f"[MQTT] 물주기 감지 상태 복원: 장치 {devices}개, 원본 {len(rows)}행 ({since:%Y-%m-%d %H:%M} 이후)", flush=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이, flush 지연, 드롭/spill 카운터"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_maxsize": self._queue.maxsize,
+            "received": self._received,
+            "dropped": self._dropped,
+            "invalid": self._invalid,
+            "inserted": self._inserted,
+            "batches": self._batches,
+            "retries": self._retries,
+            "spilled": self._spilled,
+            "replayed": self._replayed,
+            "spill_pending": os.path.exists(self._spill_path) or bool(self._replay_files()),
+            "last_flush_ms": self._last_flush_ms,
+            "avg_flush_ms": round(self._total_flush_ms / self._batches, 2) if self._batches else None,
+            "max_flush_ms": self._max_flush_ms,
+            "last_flush_at": self._last_flush_at.isoformat() if self._last_flush_at else None,
+        }
+
     # ---------- MQTT 콜백 ----------
     def _on_connect(self, client, userdata, flags, rc, properties=None):
         topics = getattr(settings, "mqtt_topics_list", None) or [settings.MQTT_TOPICS]
@@ -110,77 +201,220 @@ class MQTTService:
             print("[MQTT] WARNING: _loop is None; did you call mqtt_service.start(loop)?", flush=True)
             return
 
-        # 스레드 → asyncio 루프에 안전하게 enqueue
-        if self._loop:
-            try:
-                self._loop.call_soon_threadsafe(
-                    self._queue.put_nowait,
-                    {
-                        "topic": msg.topic,
-                        "data": data,
-                        "received_at": datetime.now(timezone.utc),
-                    },
-                )
-            except asyncio.QueueFull:
-                print("[MQTT] ERROR: queue full; dropping message", flush=True)
-
-    # ---------- 비동기 컨슈머(즉시 저장) ----------
+        # 스레드 → asyncio 루프에 안전하게 enqueue (QueueFull은 루프 쪽에서 처리)
+        self._loop.call_soon_threadsafe(
+            self._enqueue,
+            {
+                "topic": msg.topic,
+                "data": data,
+                "received_at": datetime.now(timezone.utc),
+            },
+        )
+
+    def _enqueue(self, item: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(item)
+            self._received += 1
+        except asyncio.QueueFull:
+            self._dropped += 1
+            print(f"[MQTT] ERROR: queue full ({self._queue.maxsize}); dropping message (dropped={self._dropped})", flush=True)
+
+    # ---------- 비동기 컨슈머(배치 저장) ----------
     async def _consumer(self) -> None:
-        while True:
+        # 이전 실행에서 남은 spill 데이터부터 재적재
+        await self._replay_spill()
+
+        stopping = False
+        while not stopping:
             item = await self._queue.get()
+            batch = [item]
+            deadline = self._loop.time() + settings.MQTT_FLUSH_INTERVAL
+            while len(batch) < settings.MQTT_BATCH_SIZE and batch[-1] is not _STOP:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            if batch[-1] is _STOP:
+                stopping = True
+
+            rows = []
+            for it in batch:
+                if it is _STOP:
+                    continue
+                row = self._to_row(it)
+                if row is None:
+                    self._invalid += 1
+                else:
+                    rows.append(row)
+
             try:
-                # MQTT 데이터 수신 시 즉시 저장
-                await self._save_row_immediate(item)
+                if rows and await self._flush_with_retry(rows):
+                    await self._replay_spill()
             except Exception as e:
-                print("[MQTT→DB] error:", e)
+                print("[MQTT→DB] error:", e, flush=True)
             finally:
-                self._queue.task_done()
+                for _ in batch:
+                    self._queue.task_done()
 
-    async def _save_row_immediate(self, item: Dict[str, Any]) -> None:
-        """MQTT 데이터를 즉시 저장 (humid 테이블 사용)"""
+    def _to_row(self, item: Dict[str, Any]) -> Optional[Tuple[int, int, int, datetime]]:
+        """MQTT 메시지 → humid 행 (device_id, humidity, sensor_digit, humid_date)"""
         data = item["data"]
-        
-        # 데이터 파싱
-        device_id = int(data.get("deviceId", 1))
-        humidity = max(0, min(100, int(round(float(data.get("moisture_pct", 0))))))
-        sensor_digit = int(float(data.get("moisture_raw", 0)))
-        
+        try:
+            device_id = int(data.get("deviceId", settings.DEFAULT_DEVICE_ID))
+            humidity = max(0, min(100, int(round(float(data.get("moisture_pct", 0))))))
+            sensor_digit = int(float(data.get("moisture_raw", 0)))
+        except (TypeError, ValueError):
+            print(f"[MQTT→DB] SKIP: invalid payload {data}", flush=True)
+            return None
+
         # datetime 변환
         ts = data.get("ts")
         if isinstance(ts, (int, float)):
             dt_utc = datetime.fromtimestamp(int(ts), tz=timezone.utc)
         else:
             dt_utc = item["received_at"]
-        dt_datetime = dt_utc.astimezone(KST)
-        
+        # humid_date는 KST naive DATETIME으로 저장
+        dt_datetime = dt_utc.astimezone(KST).replace(tzinfo=None)
+        return (device_id, humidity, sensor_digit, dt_datetime)
+
+    async def _insert_rows(self, rows: List[Tuple[int, int, int, datetime]]) -> None:
+        """multi-row INSERT 1회 + 시간/일 집계 갱신 + 물주기 이벤트 기록 + commit 1회"""
+        query = INSERT_HUMID_PREFIX + ", ".join([INSERT_HUMID_ROW] * len(rows))
+        params: List[Any] = []
+        for row in rows:
+            params.extend(row)
+        # 감지기 상태는 커밋 이후에만 반영 (실패 후 재시도해도 같은 이벤트를 다시 계산)
+        events, states = watering_detector.process(rows)
+        # 집계 재계산(backfill_humid_rollups.py) 중이면 잠금을 못 얻어 실패 → 재시도/spill 후 재적재
+        async with get_connection() as conn, conn.cursor(InstrumentedDictCursor) as cursor:
+            async with rollup_lock(cursor, ROLLUP_LOCK_WAIT_INGEST):
+                try:
+                    await cursor.execute(query, params)
+                    await upsert_rollups(cursor, rows)
+                    await insert_watering_events(cursor, events)
+                    await commit(conn)  # 잠금을 풀기 전에 커밋
+                except Exception:
+                    await conn.rollback()
+                    raise
+        watering_detector.apply(states, events)
+        for ev in events:
+            print(f"[MQTT→DB] watering detected: device_id={ev.device_id}, {ev.humidity_before}% → {ev.humidity_after}% (+{ev.increase_pct}%)", flush=True)
+
+    async def _flush_with_retry(self, rows: List[Tuple[int, int, int, datetime]], spill: bool = True) -> bool:
+        """
+        배치 INSERT (지수 백오프 재시도). 최종 실패 시 False 반환
+        spill=True면 실패한 행을 spill 파일로 보냄 (재적재 중에는 호출자가 남은 행을 처리)
+        """
+        attempts = max(1, settings.MQTT_FLUSH_RETRIES)
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                await self._insert_rows(rows)
+            except Exception as db_error:
+                print(f"[MQTT→DB] batch insert failed ({attempt + 1}/{attempts}, rows={len(rows)}): {db_error}", flush=True)
+                if attempt < attempts - 1:
+                    self._retries += 1
+                    await asyncio.sleep(settings.MQTT_RETRY_BACKOFF * (2 ** attempt))
+                continue
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._inserted += len(rows)
+            self._batches += 1
+            self._last_flush_ms = round(elapsed_ms, 2)
+            self._max_flush_ms = max(self._max_flush_ms, self._last_flush_ms)
+            self._total_flush_ms += elapsed_ms
+            self._last_flush_at = datetime.now(timezone.utc)
+            print(f"[MQTT→DB] batch saved: rows={len(rows)}, {self._last_flush_ms}ms", flush=True)
+            return True
+
+        if spill:
+            await asyncio.to_thread(self._write_spill, rows)
+            self._spilled += len(rows)
+            print(f"[MQTT→DB] SPILL: {len(rows)} rows → {self._spill_path}", flush=True)
+        return False
+
+    # ---------- spill 파일 ----------
+    def _write_spill(self, rows: List[Tuple[int, int, int, datetime]]) -> None:
+        directory = os.path.dirname(self._spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self._spill_path, "a", encoding="utf-8") as f:
+            for device_id, humidity, sensor_digit, humid_date in rows:
+                f.write(json.dumps({
+                    "device_id": device_id,
+                    "humidity": humidity,
+                    "sensor_digit": sensor_digit,
+                    "humid_date": humid_date.isoformat(),
+                }) + "\n")
+
+    def _replay_files(self) -> List[str]:
+        """재적재 중이던 파일 (이전 실행이 재적재 도중 종료되면 남아 있음), 오래된 순"""
+        legacy = self._spill_path + ".replay"  # 고유 이름을 쓰기 전 형식
+        files = [legacy] if os.path.exists(legacy) else []
+        return files + sorted(glob.glob(glob.escape(self._spill_path) + ".*.replay"))
+
+    def _take_spill(self) -> List[str]:
+        """
+        spill 파일을 고유한 이름의 재적재 파일로 옮기고, 남아 있던 재적재 파일과 함께 반환 (오래된 순)
+        재적재 파일은 모든 행이 반영되거나 남은 행을 spill 파일로 다시 보낸 뒤에만 지웁니다.
+        """
+        if os.path.exists(self._spill_path):
+            os.replace(self._spill_path, f"{self._spill_path}.{time.time_ns()}.replay")
+        return self._replay_files()
+
+    def _read_spill(self, path: str) -> List[Tuple[int, int, int, datetime]]:
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    r = json.loads(line)
+                    rows.append((int(r["device_id"]), int(r["humidity"]), int(r["sensor_digit"]),
+                                 datetime.fromisoformat(r["humid_date"])))
+                except (KeyError, TypeError, ValueError):
+                    self._invalid += 1
+        return rows
+
+    def _respill(self, path: str, rows: List[Tuple[int, int, int, datetime]]) -> None:
+        """재적재하지 못한 행을 spill 파일로 다시 보낸 뒤 재적재 파일 삭제 (그 사이 종료되면 중복될 뿐 유실은 없음)"""
+        if rows:
+            self._write_spill(rows)
+        os.remove(path)
+
+    async def _replay_spill(self) -> None:
         try:
-            print(f"[MQTT→DB] immediate save: device_id={device_id}, humidity={humidity}, sensor_digit={sensor_digit}", flush=True)
-            
-            # 기존 백엔드의 연결 풀 사용 (간단하고 안정적)
-            async with get_cursor() as cursor:
-                # humid 테이블에 직접 INSERT (device_fk 불필요)
-                await cursor.execute(
-                    """
-                    INSERT INTO humid (device_id, humidity, sensor_digit, humid_date)
-                    VALUES (%s, %s, %s, %s)
-                    """,
-                    (device_id, humidity, sensor_digit, dt_datetime)
-                )
-                
-                print("[MQTT→DB] INSERT query executed successfully", flush=True)
-                print("[MQTT→DB] immediate save ok", flush=True)
-                
-        except Exception as db_error:
-            print(f"[MQTT→DB] database error: {db_error}", flush=True)
-            # 락 타임아웃 오류는 재시도하지 않고 무시
-            if "Lock wait timeout" in str(db_error):
-                print(f"[MQTT→DB] SKIP: Lock timeout for device_id={device_id}, ignoring this message", flush=True)
-                return
-            # 기타 오류도 무시하고 계속 진행 (MQTT 데이터 손실 방지)
-            print(f"[MQTT→DB] SKIP: Other error for device_id={device_id}, ignoring this message", flush=True)
+            files = await asyncio.to_thread(self._take_spill)
+        except OSError as e:
+            print(f"[MQTT→DB] spill read error: {e}", flush=True)
             return
-
-
+        size = max(1, settings.MQTT_BATCH_SIZE)
+        for path in files:
+            try:
+                rows = await asyncio.to_thread(self._read_spill, path)
+            except OSError as e:
+                print(f"[MQTT→DB] spill read error: {e}", flush=True)
+                return
+            if rows:
+                print(f"[MQTT→DB] replaying {len(rows)} spilled rows ({os.path.basename(path)})", flush=True)
+            for i in range(0, len(rows), size):
+                chunk = rows[i:i + size]
+                if await self._flush_with_retry(chunk, spill=False):
+                    self._replayed += len(chunk)
+                    continue
+                # 남은 행(실패한 묶음 포함)은 spill 파일로 다시 보내고 다음 기회에 재시도
+                rest = rows[i:]
+                await asyncio.to_thread(self._respill, path, rest)
+                self._spilled += len(rest)
+                print(f"[MQTT→DB] SPILL: {len(rest)} rows → {self._spill_path}", flush=True)
+                return
+            # 파일의 모든 행이 반영된 뒤에만 삭제
+            await asyncio.to_thread(os.remove, path)
 
 
 # 싱글톤 인스턴스
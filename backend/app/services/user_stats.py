@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from core.config import settings
+from db.routing import read_router
+from utils.pagination import count_cache
+
+# 통계 종류
+DIARY_STATS = "diary_stats"                  # /diary-list/stats
+PLANT_DIARY_SUMMARY = "plant_diary_summary"  # /diary-list/plants/summary
+PLANT_STATS = "plant_stats"                  # /plants/stats
+MEDICAL_STATS = "medical_stats"              # /medical/stats
+
+
+class UserStatsCache:
+    """
+    사용자별 통계 캐시 (write-through 무효화)
+
+    - 통계 API는 캐시에 값이 있으면 집계 쿼리 없이 바로 반환합니다.
+    - 일기/식물/병충해 기록을 쓰는 저장소 함수가 db.pool.after_commit()으로 diary_changed()/
+      plant_changed()/pest_changed()를 등록해, 커밋된 뒤 해당 사용자의 관련 통계만 지웁니다.
+      (커밋 전에 지우면 그 사이 다른 요청이 커밋 전 스냅샷으로 다시 계산해 캐시할 수 있음)
+    - 사용자별 세대(generation) 번호로, 집계 도중 쓰기가 일어난 결과는 저장하지 않습니다.
+    - 변경 훅은 읽기 복제본 라우팅에도 쓰기 시점을 알려 직후 조회를 주 서버로 보냅니다.
+    - "최근 7일" 같은 시간 기준 값이 너무 오래 머물지 않도록 USER_STATS_TTL 초 후 만료됩니다.
+    """
+
+    def __init__(self) -> None:
+        self._store: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    async def get_or_compute(self, user_id: str, kind: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        key = (user_id, kind)
+        now = time.monotonic()
+        hit = self._store.get(key)
+        if hit and hit[0] > now:
+            self._hits += 1
+            return hit[1]
+
+        self._misses += 1
+        generation = self._generations.get(user_id, 0)
+        value = await compute()
+        if self._generations.get(user_id, 0) == generation:
+            if len(self._store) >= settings.USER_STATS_MAX_ENTRIES:
+                self._store.clear()
+            self._store[key] = (time.monotonic() + settings.USER_STATS_TTL, value)
+        return value
+
+    def invalidate(self, user_id: str, *kinds: str) -> None:
+        """사용자의 통계 삭제 (kinds를 생략하면 전체)"""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self._invalidations += 1
+        for kind in kinds or (DIARY_STATS, PLANT_DIARY_SUMMARY, PLANT_STATS, MEDICAL_STATS):
+            self._store.pop((user_id, kind), None)
+
+    def diary_changed(self, user_id: str) -> None:
+        """일기 작성/수정/삭제"""
+        read_router.mark_written(user_id)
+        count_cache.invalidate(("diary", user_id))
+        self.invalidate(user_id, DIARY_STATS, PLANT_DIARY_SUMMARY)
+
+    def plant_changed(self, user_id: str) -> None:
+        """식물 등록/수정/삭제 (삭제 시 일기·진단 기록도 CASCADE로 지워지므로 전체 무효화)"""
+        read_router.mark_written(user_id)
+        count_cache.invalidate(("plants", user_id))
+        count_cache.invalidate(("diary", user_id))
+        self.invalidate(user_id)
+
+    def pest_changed(self, user_id: str) -> None:
+        """병충해 진단 기록 추가/수정/삭제"""
+        read_router.mark_written(user_id)
+        self.invalidate(user_id, MEDICAL_STATS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._store),
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+        }
+
+
+# 싱글톤 인스턴스
+user_stats = UserStatsCache()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.config import settings
+
+
+@dataclass(frozen=True)
+class WateringEvent:
+    """감지된 물주기 이벤트"""
+    device_id: int
+    event_at: datetime
+    humidity_before: float
+    humidity_after: float
+    increase_pct: float
+
+
+@dataclass(frozen=True)
+class DeviceState:
+    """장치별 감지 상태"""
+    level: float                      # 지수 평활 습도
+    trough: float                     # 무장(armed) 상태에서의 최저 평활 습도 (상승 기준점)
+    peak: float                       # 이벤트 이후 최고 평활 습도 (재무장 기준점)
+    armed: bool                       # True면 다음 상승을 이벤트로 기록할 수 있음
+    last_humidity: int
+    last_reading_at: datetime
+    last_event_at: Optional[datetime] = None
+
+
+class WateringDetector:
+    """
+    MQTT 적재 스트림에서 물주기(급격한 습도 상승)를 증분 감지합니다.
+
+    - 장치별로 평활 습도(EMA)를 유지하고, 최저점(trough) 대비 상승률이
+      WATERING_RISE_THRESHOLD(%) 이상이면 이벤트를 1회 발생시킵니다.
+    - 이벤트 이후에는 최고점(peak)에서 WATERING_REARM_DROP(%p) 이상 내려가야
+      다시 무장되므로, 한 번의 상승 구간에서 이벤트가 중복되지 않습니다.
+    - process()는 상태를 바꾸지 않고 (이벤트, 새 상태)를 돌려주며, 배치가 DB에
+      커밋된 뒤 apply()로 반영합니다. 실패한 배치를 재시도해도 같은 이벤트가 다시 계산됩니다.
+    - 상태는 메모리에만 있으므로 시작 시 seed()로 최근 원본과 마지막 이벤트 시각에서 복원합니다.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[int, DeviceState] = {}
+        self._events = 0
+
+    def process(
+        self, rows: Sequence[Tuple[int, int, int, datetime]]
+    ) -> Tuple[List[WateringEvent], Dict[int, DeviceState]]:
+        """rows: (device_id, humidity, sensor_digit, humid_date)"""
+        alpha = settings.WATERING_SMOOTHING_ALPHA
+        threshold = settings.WATERING_RISE_THRESHOLD
+        rearm_drop = settings.WATERING_REARM_DROP
+
+        states: Dict[int, DeviceState] = {}
+        events: List[WateringEvent] = []
+        for device_id, humidity, _sensor_digit, humid_date in sorted(rows, key=lambda r: (r[0], r[3])):
+            state = states.get(device_id) or self._states.get(device_id)
+            if state is None:
+                states[device_id] = DeviceState(
+                    level=float(humidity), trough=float(humidity), peak=float(humidity),
+                    armed=True, last_humidity=humidity, last_reading_at=humid_date,
+                )
+                continue
+            # 늦게 도착한(이미 처리한 시각 이전) 행은 상태에 반영하지 않음
+            if humid_date <= state.last_reading_at:
+                continue
+
+            level = alpha * humidity + (1 - alpha) * state.level
+            trough, peak, armed, last_event_at = state.trough, state.peak, state.armed, state.last_event_at
+
+            if armed:
+                trough = min(trough, level)
+                rise = _rise_pct(trough, level)
+                if rise >= threshold:
+                    events.append(WateringEvent(
+                        device_id=device_id,
+                        event_at=humid_date,
+                        humidity_before=round(trough, 1),
+                        humidity_after=round(level, 1),
+                        increase_pct=round(rise, 1),
+                    ))
+                    armed, peak, last_event_at = False, level, humid_date
+            else:
+                peak = max(peak, level)
+                if peak - level >= rearm_drop:
+                    armed, trough = True, level
+
+            states[device_id] = DeviceState(
+                level=level, trough=trough, peak=peak, armed=armed,
+                last_humidity=humidity, last_reading_at=humid_date, last_event_at=last_event_at,
+            )
+        return events, states
+
+    def apply(self, states: Dict[int, DeviceState], events: Sequence[WateringEvent] = ()) -> None:
+        """커밋된 배치의 상태를 반영"""
+        self._states.update(states)
+        self._events += len(events)
+
+    def seed(self, rows: Sequence[Tuple[int, int, int, datetime]], last_events: Dict[int, datetime]) -> int:
+        """
+        재시작 후 상태 복원: 최근 원본 행을 다시 흘려 평활 습도/최저점/무장 여부를 되살리고
+        DB의 마지막 이벤트 시각을 채웁니다. 재생 중 감지된 이벤트는 이미 기록되어 있으므로 버립니다.
+        반환: 복원된 장치 수
+        """
+        _events, states = self.process(rows)
+        self._states.update(states)
+        for device_id, event_at in last_events.items():
+            self.seed_last_event(device_id, event_at)
+        return len(states)
+
+    def seed_last_event(self, device_id: int, event_at: datetime) -> None:
+        """DB의 마지막 이벤트 시각을 상태에 채워 넣음 (상태에 더 최근 이벤트가 있으면 유지)"""
+        state = self._states.get(device_id)
+        if state and (state.last_event_at is None or state.last_event_at < event_at):
+            self._states[device_id] = replace(state, last_event_at=event_at)
+
+    def snapshot(self, device_id: int) -> Optional[Dict[str, Any]]:
+        """읽기 API용 현재 상태"""
+        state = self._states.get(device_id)
+        if state is None:
+            return None
+        return {
+            "device_id": device_id,
+            "smoothed_humidity": round(state.level, 1),
+            "current_humidity": state.last_humidity,
+            "baseline_humidity": round(state.trough if state.armed else state.peak, 1),
+            "rise_pct": round(_rise_pct(state.trough, state.level), 1) if state.armed else 0.0,
+            "armed": state.armed,
+            "last_reading_at": state.last_reading_at,
+            "last_event_at": state.last_event_at,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"devices": len(self._states), "events": self._events}
+
+
+def _rise_pct(base: float, level: float) -> float:
+    if base <= 0:
+        return level - base
+    return (level - base) / base * 100
+
+
+# 싱글톤 인스턴스
+watering_detector = WateringDetector()
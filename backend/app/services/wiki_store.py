@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from core.config import settings
+from repositories.info_room import get_wiki_checksum, load_pest_wiki_rows, load_plant_wiki_rows
+from schemas.info_room import (
+    InfoRoomStatsResponse,
+    PestWikiDetailResponse,
+    PestWikiInfo,
+    PestWikiListResponse,
+    PlantWikiDetailResponse,
+    PlantWikiInfo,
+    PlantWikiListResponse,
+)
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def _normalize(text: Optional[str]) -> str:
+    return (text or "").casefold()
+
+
+def _contains_any(value: Optional[str], words: Sequence[str]) -> bool:
+    return any(word in (value or "") for word in words)
+
+
+# 카테고리 판정 (예전 SQL 조건과 같음)
+PLANT_CATEGORIES: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+    "flowering": lambda row: bool((row.get("flowering") or "").strip()),
+    "indoor": lambda row: _contains_any(row.get("temp"), ("실내", "18-25")),
+    "outdoor": lambda row: _contains_any(row.get("temp"), ("야외", "15-30")),
+    "easy_care": lambda row: _contains_any(row.get("watering"), ("적게", "일주일")),
+}
+
+
+@dataclass
+class _Table:
+    """이름순 정렬 목록 + 이름 부분 일치(2글자 n-gram) 색인 + 접두어 색인"""
+    items: Dict[int, Any]                           # id → 목록 항목 모델
+    details: Dict[int, Any]                         # id → 상세 모델
+    order: List[Tuple[str, int]]                    # (이름, id) 정렬 키
+    grams: Dict[str, Set[int]] = field(default_factory=dict)
+    chars: Dict[str, Set[int]] = field(default_factory=dict)
+    prefix: List[Tuple[str, int]] = field(default_factory=list)   # (정규화 이름, id) 정렬
+    names: Dict[int, str] = field(default_factory=dict)           # id → 정규화 이름
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict[str, Any]], id_key: str, name_key: str, item_model, detail_model) -> "_Table":
+        items, details, order = {}, {}, []
+        grams: Dict[str, Set[int]] = {}
+        chars: Dict[str, Set[int]] = {}
+        prefix = []
+        names = {}
+        for row in rows:
+            row = dict(row)
+            row[name_key] = row.get(name_key) or row.get("sci_name") or ""
+            row_id = row[id_key]
+            items[row_id] = item_model(**row)
+            details[row_id] = detail_model(**row)
+            order.append((row[name_key], row_id))
+            name = _normalize(row[name_key])
+            prefix.append((name, row_id))
+            names[row_id] = name
+            for ch in set(name):
+                chars.setdefault(ch, set()).add(row_id)
+            for i in range(len(name) - 1):
+                grams.setdefault(name[i:i + 2], set()).add(row_id)
+        order.sort()
+        prefix.sort()
+        return cls(items, details, order, grams, chars, prefix, names)
+
+    def search(self, query: Optional[str]) -> Optional[Set[int]]:
+        """이름에 query가 들어간 id 집합 (query가 없으면 None = 전체)"""
+        q = _normalize(query).strip()
+        if not q:
+            return None
+        if len(q) == 1:
+            return set(self.chars.get(q, ()))
+        candidates: Optional[Set[int]] = None
+        for i in range(len(q) - 1):
+            ids = self.grams.get(q[i:i + 2])
+            if not ids:
+                return set()
+            candidates = set(ids) if candidates is None else candidates & ids
+        # n-gram은 후보만 좁히므로 실제 부분 일치 확인
+        return {row_id for row_id in candidates if q in self.names[row_id]}
+
+    def starts_with(self, prefix: str, limit: int) -> List[int]:
+        """이름이 prefix로 시작하는 id (이름순)"""
+        p = _normalize(prefix).strip()
+        if not p:
+            return []
+        start = bisect.bisect_left(self.prefix, (p, -1))
+        ids = []
+        for name, row_id in self.prefix[start:]:
+            if not name.startswith(p) or len(ids) >= limit:
+                break
+            ids.append(row_id)
+        return ids
+
+    def page(
+        self,
+        matches: Optional[Set[int]],
+        page: int,
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[Any], int, Optional[str]]:
+        """(항목 목록, 전체 개수, 다음 커서) - 정렬 키 (이름, id) 키셋 또는 page 오프셋"""
+        keys = self.order if matches is None else [key for key in self.order if key[1] in matches]
+        if cursor:
+            last = decode_cursor(cursor, 2)
+            if not isinstance(last[0], str) or not isinstance(last[1], int):
+                raise InvalidCursor("invalid wiki cursor")
+            start = bisect.bisect_right(keys, (last[0], last[1]))
+        else:
+            start = (page - 1) * limit
+        selected = keys[start:start + limit]
+        next_cursor = encode_cursor(list(selected[-1])) if start + limit < len(keys) and selected else None
+        return [self.items[row_id] for _, row_id in selected], len(keys), next_cursor
+
+
+@dataclass
+class _Snapshot:
+    plants: _Table
+    pests: _Table
+    categories: Dict[str, Set[int]]
+    digest: str
+    checksum: Tuple[Any, ...]
+    loaded_at: datetime
+
+    def etag(self, *parts: Any) -> str:
+        """강한 ETag (데이터 해시 + 요청 파라미터)"""
+        key = hashlib.sha1(json.dumps(parts, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+        return f'"{self.digest[:16]}-{key[:8]}"'
+
+
+class WikiStore:
+    """
+    정보방 위키 인메모리 저장소
+
+    - 시작 시 plant_wiki / pest_wiki 전체를 읽어 이름순 목록, 이름 부분 일치(n-gram),
+      접두어, 카테고리 색인을 미리 만들어 둡니다. 정보방 조회는 MySQL에 접근하지 않습니다.
+    - WIKI_REFRESH_INTERVAL 초마다 CHECKSUM TABLE로 변경을 확인하고, 바뀌었을 때만 다시 적재해
+      스냅샷을 통째로 교체합니다. (reload()로 즉시 갱신 가능)
+    - 응답 ETag는 데이터 내용 해시 + 요청 파라미터로 만들므로 워커가 여러 개여도 같은 값이 나옵니다.
+      ETag와 응답 본문은 같은 스냅샷에서 만들어야 하므로, 라우터는 snapshot()을 한 번 받아
+      snap.etag()와 조회 메서드(snap=)에 함께 넘깁니다. (그 사이 재적재되어도 어긋나지 않음)
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Optional[_Snapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._loads = 0
+        self._checks = 0
+        self._last_error: Optional[str] = None
+
+    async def start(self) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            self._last_error = str(e)
+            print(f"[WIKI] 위키 적재 실패 (첫 요청 시 재시도): {e}", flush=True)
+        if settings.WIKI_REFRESH_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def reload(self, checksum: Optional[Tuple[Any, ...]] = None) -> None:
+        """DB에서 전체 위키를 다시 읽어 스냅샷 교체"""
+        async with self._lock:
+            await self._load(checksum)
+
+    async def _load(self, checksum: Optional[Tuple[Any, ...]]) -> None:
+        if checksum is None:
+            checksum = await get_wiki_checksum()
+        plant_rows = await load_plant_wiki_rows()
+        pest_rows = await load_pest_wiki_rows()
+        digest = hashlib.sha1(
+            json.dumps([plant_rows, pest_rows], ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        categories = {
+            name: {row["wiki_plant_id"] for row in plant_rows if rule(row)}
+            for name, rule in PLANT_CATEGORIES.items()
+        }
+        self._snapshot = _Snapshot(
+            plants=_Table.build(plant_rows, "wiki_plant_id", "name_jong", PlantWikiInfo, PlantWikiDetailResponse),
+            pests=_Table.build(pest_rows, "pest_id", "pest_name", PestWikiInfo, PestWikiDetailResponse),
+            categories=categories,
+            digest=digest,
+            checksum=checksum,
+            loaded_at=datetime.now(),
+        )
+        self._loads += 1
+        self._last_error = None
+        print(f"[WIKI] 위키 적재: 식물 {len(plant_rows)}, 병충해 {len(pest_rows)}", flush=True)
+
+    async def refresh_if_changed(self) -> bool:
+        """체크섬이 바뀌었으면 다시 적재"""
+        self._checks += 1
+        checksum = await get_wiki_checksum()
+        if self._snapshot is not None and checksum == self._snapshot.checksum:
+            return False
+        await self.reload(checksum)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.WIKI_REFRESH_INTERVAL)
+            try:
+                await self.refresh_if_changed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                print(f"[WIKI] 위키 변경 확인 실패: {e}", flush=True)
+
+    async def snapshot(self) -> _Snapshot:
+        if self._snapshot is None:
+            # 시작 시 적재에 실패했으면 첫 요청에서 한 번만 적재 (동시 요청은 대기)
+            async with self._lock:
+                if self._snapshot is None:
+                    await self._load(None)
+        return self._snapshot
+
+    async def list_plants(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        category: Optional[str] = None,
+        snap: Optional[_Snapshot] = None,
+    ) -> PlantWikiListResponse:
+        snap = snap or await self.snapshot()
+        matches = snap.plants.search(search)
+        if category is not None:
+            in_category = snap.categories.get(category, set())
+            matches = in_category if matches is None else matches & in_category
+        plants, total, next_cursor = snap.plants.page(matches, page, limit, cursor)
+        return PlantWikiListResponse(
+            plants=plants,
+            total_count=total if include_total else None,
+            page=page,
+            limit=limit,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
+        )
+
+    async def get_plant(self, wiki_plant_id: int, snap: Optional[_Snapshot] = None) -> Optional[PlantWikiDetailResponse]:
+        return (snap or await self.snapshot()).plants.details.get(wiki_plant_id)
+
+    async def list_pests(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        snap: Optional[_Snapshot] = None,
+    ) -> PestWikiListResponse:
+        snap = snap or await self.snapshot()
+        pests, total, next_cursor = snap.pests.page(snap.pests.search(search), page, limit, cursor)
+        return PestWikiListResponse(
+            pests=pests,
+            total_count=total if include_total else None,
+            page=page,
+            limit=limit,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
+        )
+
+    async def get_pest(self, pest_id: int, snap: Optional[_Snapshot] = None) -> Optional[PestWikiDetailResponse]:
+        return (snap or await self.snapshot()).pests.details.get(pest_id)
+
+    async def suggest(
+        self, prefix: str, limit: int = 10, snap: Optional[_Snapshot] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """이름 앞부분 자동완성 (식물/병충해)"""
+        snap = snap or await self.snapshot()
+        return {
+            "plants": [
+                {"wiki_plant_id": i, "name_jong": snap.plants.items[i].name_jong}
+                for i in snap.plants.starts_with(prefix, limit)
+            ],
+            "pests": [
+                {"pest_id": i, "pest_name": snap.pests.items[i].pest_name}
+                for i in snap.pests.starts_with(prefix, limit)
+            ],
+        }
+
+    async def info_stats(self, snap: Optional[_Snapshot] = None) -> InfoRoomStatsResponse:
+        snap = snap or await self.snapshot()
+        return InfoRoomStatsResponse(
+            total_plants=len(snap.plants.items),
+            total_pests=len(snap.pests.items),
+            last_updated=snap.loaded_at,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snapshot
+        return {
+            "loaded": snap is not None,
+            "plants": len(snap.plants.items) if snap else 0,
+            "pests": len(snap.pests.items) if snap else 0,
+            "loads": self._loads,
+            "checks": self._checks,
+            "loaded_at": snap.loaded_at.isoformat() if snap else None,
+            "last_error": self._last_error,
+        }
+
+
+# 싱글톤 인스턴스
+wiki_store = WikiStore()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Sequence, Tuple
+
+# 스트리밍 내보내기 유틸
+# - 행(dict) 비동기 이터레이터를 CSV / NDJSON 바이트 청크로 변환
+# - 일정 크기(flush_bytes)마다 청크를 내보내므로 전체 결과를 메모리에 올리지 않음
+# - 첫 행은 모으지 않고 바로 내보내 클라이언트가 첫 바이트를 기다리지 않게 함 (이후는 묶어서)
+# - gzip_stream()으로 감싸면 전송 중에 바로 압축
+
+FLUSH_BYTES = 64 * 1024
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def csv_stream(
+    rows: AsyncIterable[Dict[str, Any]],
+    columns: Sequence[Tuple[str, str]],
+    flush_bytes: int = FLUSH_BYTES,
+) -> AsyncIterator[bytes]:
+    """
+    columns: (행 키, 헤더명) 목록
+    엑셀에서 한글이 깨지지 않도록 UTF-8 BOM을 먼저 보냅니다.
+    """
+    buffer = io.StringIO()
+    buffer.write("\ufeff")
+    writer = csv.writer(buffer)
+    writer.writerow([header for _, header in columns])
+
+    # 헤더는 첫 행과 함께 (행이 없으면 끝에서 헤더만)
+    first = True
+    async for row in rows:
+        writer.writerow(["" if row.get(key) is None else _plain(row.get(key)) for key, _ in columns])
+        if first or buffer.tell() >= flush_bytes:
+            first = False
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def ndjson_stream(
+    rows: AsyncIterable[Dict[str, Any]],
+    flush_bytes: int = FLUSH_BYTES,
+) -> AsyncIterator[bytes]:
+    """한 줄에 JSON 객체 하나 (application/x-ndjson)"""
+    chunk = bytearray()
+    first = True
+    async for row in rows:
+        chunk += json.dumps({k: _plain(v) for k, v in row.items()}, ensure_ascii=False).encode("utf-8")
+        chunk += b"\n"
+        if first or len(chunk) >= flush_bytes:
+            first = False
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+async def json_array_stream(
+    rows: AsyncIterable[Dict[str, Any]],
+    flush_bytes: int = FLUSH_BYTES,
+) -> AsyncIterator[bytes]:
+    """JSON 배열 하나를 행 단위로 이어 붙여 전달 ([{...},{...}], 여는 괄호는 첫 행과 함께)"""
+    chunk = bytearray(b"[")
+    first = True
+    async for row in rows:
+        if not first:
+            chunk += b","
+        chunk += json.dumps({k: _plain(v) for k, v in row.items()}, ensure_ascii=False).encode("utf-8")
+        if first or len(chunk) >= flush_bytes:
+            first = False
+            yield bytes(chunk)
+            chunk.clear()
+    chunk += b"]"
+    yield bytes(chunk)
+
+
+async def gzip_stream(chunks: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """바이트 청크를 gzip 형식으로 압축하며 전달 (첫 청크는 바로 flush해 압축기 안에 머물지 않게 함)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    first = True
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if first:
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+            first = False
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,45 @@
+"""
+HTTP 조건부 요청 (ETag / If-None-Match) 도우미
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from core.config import settings
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match가 etag와 일치하는지 (*, 쉼표 목록, 약한 비교 W/ 허용)"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str, max_age: Optional[int] = None) -> Dict[str, str]:
+    age = settings.WIKI_CACHE_MAX_AGE if max_age is None else max_age
+    return {"ETag": etag, "Cache-Control": f"public, max-age={age}"}
+
+
+def not_modified(etag: str, max_age: Optional[int] = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, max_age))
+
+
+def conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    일치하면 304 응답을 돌려주고, 아니면 response에 ETag/Cache-Control을 붙이고 None
+    """
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return None
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import bisect
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# /metrics 공통 유틸
+# - 고정 구간 히스토그램 (누적 개수로 Prometheus histogram 형식 출력, 분위수 근사)
+# - 통계 dict의 숫자 값을 Prometheus gauge 줄로 변환
+
+# 지연 시간 구간(초)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """고정 구간 히스토그램"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """분위수 근사값 (해당 구간의 상한)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def prometheus_lines(self, name: str, labels: str = "") -> List[str]:
+        sep = "," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+def escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def render_gauges(prefix: str, values: Mapping[str, Any], labels: Optional[Dict[str, Any]] = None) -> List[str]:
+    """{"in_use": 3, ...} → ["pland_db_pool_in_use 3", ...] (숫자가 아닌 값은 건너뜀)"""
+    label_text = ""
+    if labels:
+        label_text = "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items()) + "}"
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            lines.append(f"{prefix}_{key}{label_text} {value}")
+    return lines
+
+
+def join_lines(groups: Iterable[List[str]]) -> str:
+    return "\n".join(line for group in groups for line in group) + "\n"
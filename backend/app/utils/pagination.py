@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import base64
+import json
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# 키셋(커서) 페이지네이션 공통 유틸
+# - 커서는 마지막 행의 정렬 키 값을 JSON → base64url로 감싼 불투명 문자열
+# - WHERE (정렬키) < (마지막 값) 조건으로 다음 페이지를 조회하므로 깊은 페이지도 첫 페이지와 비용이 같음
+# - 전체 개수(COUNT)는 요청 시에만 계산하고 짧게 캐시
+
+
+class InvalidCursor(ValueError):
+    """잘못된 커서 문자열"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "t" in value:
+            return datetime.fromisoformat(value["t"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursor("unknown cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값 목록 → 불투명 커서"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """불투명 커서 → 정렬 키 값 목록 (size개)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(values, list) or len(values) != size:
+            raise InvalidCursor("cursor size mismatch")
+        return [_decode_value(v) for v in values]
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def keyset_condition(
+    columns: Sequence[Tuple[str, str]],
+    values: Sequence[Any],
+) -> Tuple[str, List[Any]]:
+    """
+    (컬럼, 방향) 목록과 마지막 행의 값으로 "다음 페이지" 조건을 만듭니다.
+    예) [("d.created_at", "desc"), ("d.diary_id", "desc")]
+        → (d.created_at < %s OR (d.created_at = %s AND d.diary_id < %s))
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    for i, (column, direction) in enumerate(columns):
+        op = "<" if direction.lower() == "desc" else ">"
+        parts = [f"{columns[j][0]} = %s" for j in range(i)] + [f"{column} {op} %s"]
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:i])
+        params.append(values[i])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def next_cursor_from(rows: List[Dict[str, Any]], limit: int, keys: Sequence[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    limit + 1건을 조회한 결과에서 실제 페이지와 다음 커서를 분리합니다.
+    keys: 정렬 키로 쓰인 결과 컬럼명
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor([last[k] for k in keys])
+
+
+def _key_prefix(key: Hashable) -> Hashable:
+    return key[0] if isinstance(key, tuple) and key else key
+
+
+class CountCache:
+    """
+    목록 전체 개수 TTL 캐시 (프로세스 로컬)
+    접두사별 세대 번호로, 개수를 세는 도중 무효화된 결과는 저장하지 않습니다.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._store: Dict[Hashable, Tuple[float, int]] = {}
+        self._generations: Dict[Hashable, int] = {}
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[int]]) -> int:
+        now = time.monotonic()
+        hit = self._store.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        prefix = _key_prefix(key)
+        generation = self._generations.get(prefix, 0)
+        value = await compute()
+        if self._generations.get(prefix, 0) == generation:
+            if len(self._store) >= self._max_entries:
+                self._store.clear()
+            self._store[key] = (now + self._ttl, value)
+        return value
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def invalidate(self, prefix: Hashable) -> None:
+        """key[0] == prefix 인 항목 삭제 (예: 사용자별 목록 변경 시, 커밋 후 호출)"""
+        self._generations[prefix] = self._generations.get(prefix, 0) + 1
+        for key in [k for k in self._store if _key_prefix(k) == prefix]:
+            self._store.pop(key, None)
+
+
+# 공용 인스턴스
+count_cache = CountCache()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# 일기 검색용 한국어 텍스트 유틸
+# - 검색어 토큰화: 공백/기호로 분리하고 한글 어절 끝의 조사를 떼어냄 ("몬스테라에게" → "몬스테라")
+# - MySQL ngram 전문 검색(BOOLEAN MODE) 질의 생성
+# - 결과 본문에서 검색어 주변을 잘라 스니펫과 강조 구간을 만듦
+
+_WORD_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+_HANGUL_RE = re.compile(r"^[가-힣]+$")
+
+# 긴 것부터 검사해야 "에서"가 "서"보다 먼저 잘림
+_JOSA = sorted(
+    [
+        "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "와", "과", "랑", "만",
+        "에서", "에게", "한테", "으로", "이랑", "까지", "부터", "보다", "처럼", "이나",
+        "이다", "이고", "에는", "에도", "으로는", "에서는",
+    ],
+    key=len,
+    reverse=True,
+)
+
+
+def strip_josa(word: str, min_stem: int = 2) -> str:
+    """한글 어절 끝의 조사를 제거합니다. (어간이 min_stem 글자 이상 남을 때만)"""
+    if not _HANGUL_RE.match(word):
+        return word
+    for josa in _JOSA:
+        if word.endswith(josa) and len(word) - len(josa) >= min_stem:
+            return word[: -len(josa)]
+    return word
+
+
+def tokenize_query(query: str) -> List[str]:
+    """검색어 → 중복 없는 검색 토큰 목록 (소문자, 조사 제거)"""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(query or ""):
+        token = strip_josa(word.lower())
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def build_boolean_query(tokens: Sequence[str]) -> str:
+    """
+    토큰 목록 → BOOLEAN MODE 질의 (모든 토큰 필수)
+    ngram 파서는 따옴표 구를 연속 n-gram으로 검사하므로 "물주기"는 "물주 주기"가 이어진 문서만 찾음
+    """
+    return " ".join(f'+"{token}"' for token in tokens)
+
+
+def make_snippet(
+    text: Optional[str],
+    tokens: Sequence[str],
+    width: int = 80,
+) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    본문에서 첫 번째 일치 위치 주변을 width 글자 정도로 잘라 반환합니다.
+    반환: (스니펫, 스니펫 안에서 일치한 [시작, 끝) 구간 목록)
+    """
+    if not text:
+        return "", []
+    lowered = text.lower()
+    first = min((pos for pos in (lowered.find(t) for t in tokens if t) if pos >= 0), default=-1)
+    if first < 0:
+        snippet = text[:width]
+        return (snippet + "…" if len(text) > width else snippet), []
+
+    start = max(0, first - width // 3)
+    end = min(len(text), start + width)
+    start = max(0, end - width)
+    snippet = text[start:end]
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+
+    highlights: List[Tuple[int, int]] = []
+    lowered_snippet = snippet.lower()
+    for token in tokens:
+        if not token:
+            continue
+        pos = lowered_snippet.find(token)
+        while pos >= 0:
+            highlights.append((pos + len(prefix), pos + len(prefix) + len(token)))
+            pos = lowered_snippet.find(token, pos + len(token))
+    return prefix + snippet + suffix, _merge_spans(highlights)
+
+
+def _merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for s, e in sorted(spans):
+        if merged and s <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+_TAG_SPLIT_RE = re.compile(r"[\s,#]+")
+TAG_MAX_LENGTH = 100
+
+
+def parse_hashtags(hashtag: Optional[str]) -> List[str]:
+    """
+    해시태그 문자열 → 정규화된 태그 목록
+    "#물주기 #자동감지", "물주기, 자동감지" 모두 ["물주기", "자동감지"]
+    """
+    tags: List[str] = []
+    for raw in _TAG_SPLIT_RE.split(hashtag or ""):
+        tag = raw.strip().lower()[:TAG_MAX_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
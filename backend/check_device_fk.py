@@ -13,17 +13,22 @@ async def check_device_fk():
     )
     try:
         async with conn.cursor() as cursor:
-            # device_info 테이블에서 idx=21 확인
-            await cursor.execute('SELECT idx, plant_id, device_id FROM device_info WHERE idx = 21')
-            result = await cursor.fetchone()
-            if result:
-                print(f'✅ device_fk=21 존재: {result}')
+            # plant_device 매핑 확인
+            await cursor.execute('SELECT plant_id, device_id FROM plant_device ORDER BY device_id LIMIT 20')
+            mappings = await cursor.fetchall()
+            print(f'📋 식물-센서 매핑: {mappings}')
+
+            # humid에 데이터는 있지만 어떤 식물에도 연결되지 않은 센서
+            await cursor.execute(
+                'SELECT DISTINCT h.device_id FROM humid h '
+                'LEFT JOIN plant_device pd ON pd.device_id = h.device_id '
+                'WHERE pd.plant_id IS NULL'
+            )
+            orphans = await cursor.fetchall()
+            if orphans:
+                print(f'⚠️ 매핑되지 않은 센서: {[row[0] for row in orphans]}')
             else:
-                print('❌ device_fk=21 미존재')
-                # 전체 device_info 확인
-                await cursor.execute('SELECT idx, plant_id, device_id FROM device_info LIMIT 10')
-                all_devices = await cursor.fetchall()
-                print(f'📋 사용 가능한 device_fk: {all_devices}')
+                print('✅ 모든 센서가 식물에 매핑되어 있습니다')
     finally:
         await conn.ensure_closed()
 
@@ -31,6 +31,7 @@ import { startLoading, stopLoading } from "../../../components/common/loading";
 import { Alert } from "react-native";
 import { getToken } from "../../../libs/auth";
 import { getApiUrl } from "../../../config/api";
+import { waitForPlantReply } from "../../../libs/diaryReply";
 
 // ✅ 데코 이미지 (LLM 답변 시 표시)
 const LLMDecoImage = require("../../../assets/images/LLM_setting.png"); // 고정
@@ -672,6 +673,10 @@ export default function DiaryEdit() {
       // AI 답변을 상태에 저장
       if (result.diary?.plant_reply) {
         setAiText(result.diary.plant_reply);
+      } else if (result.diary?.plant_reply_status === "pending" && token) {
+        // 답장은 서버에서 백그라운드로 생성되므로 완료될 때까지 대기
+        const reply = await waitForPlantReply(result.diary.idx, token);
+        if (reply) setAiText(reply);
       }
 
       setAiPreviewVisible(true);
@@ -767,6 +772,10 @@ export default function DiaryEdit() {
       // AI 답변을 상태에 저장
       if (result.diary?.plant_reply) {
         setAiText(result.diary.plant_reply);
+      } else if (result.diary?.plant_reply_status === "pending" && token) {
+        // 답장은 서버에서 백그라운드로 생성되므로 완료될 때까지 대기
+        const reply = await waitForPlantReply(result.diary.idx, token);
+        if (reply) setAiText(reply);
       }
 
       // AI 답변 생성 완료
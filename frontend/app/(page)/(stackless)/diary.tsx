@@ -30,6 +30,7 @@ import { startLoading, stopLoading } from "../../../components/common/loading";
 import { showAlert } from "../../../components/common/appAlert";
 import { getToken } from "../../../libs/auth";
 import { getApiUrl } from "../../../config/api";
+import { waitForPlantReply } from "../../../libs/diaryReply";
 
 // ✅ 데코 이미지 (LLM 답변 시 표시)
 const LLMDecoImage = require("../../../assets/images/LLM_setting.png"); // 고정
@@ -638,6 +639,10 @@ export default function Diary() {
       // AI 답변을 상태에 저장
       if (result.diary?.plant_reply) {
         setAiText(result.diary.plant_reply);
+      } else if (result.diary?.plant_reply_status === "pending" && token) {
+        // 답장은 서버에서 백그라운드로 생성되므로 완료될 때까지 대기
+        const reply = await waitForPlantReply(result.diary.idx, token);
+        if (reply) setAiText(reply);
       }
 
       // 서버에서 반환된 이미지 경로로 업데이트 (file:// 경로 → 서버 경로)
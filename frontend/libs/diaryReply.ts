@@ -0,0 +1,32 @@
+// libs/diaryReply.ts
+// 일기 작성/수정 후 백그라운드에서 생성되는 식물 답장을 기다립니다. (롱 폴링)
+import { getApiUrl } from "../config/api";
+
+type PlantReplyStatus = {
+  diary_id: number;
+  status: "pending" | "done";
+  plant_reply: string | null;
+};
+
+export async function waitForPlantReply(
+  diaryId: number,
+  token: string,
+  maxRounds = 6,
+  waitSeconds = 20
+): Promise<string | null> {
+  for (let round = 0; round < maxRounds; round++) {
+    try {
+      const response = await fetch(
+        getApiUrl(`/diary-list/${diaryId}/plant-reply?wait=${waitSeconds}`),
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
+      if (!response.ok) return null;
+      const data: PlantReplyStatus = await response.json();
+      if (data.status === "done") return data.plant_reply;
+    } catch {
+      // 네트워크 오류: 잠시 뒤 다시 시도
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+  }
+  return null;
+}
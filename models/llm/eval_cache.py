@@ -0,0 +1,81 @@
+# eval_cache.py
+"""
+답장 캐시 점검 (로컬 가짜 LLM 사용, API 호출 없음)
+
+라벨링 문장(eval/mode_cases.jsonl)과 표기만 조금 다른 변형(문장부호, ㅠㅠ, 띄어쓰기)을
+여러 번 재생해 캐시 없음 / 정확 일치 / 정확 일치+의미 유사 세 구성의
+LLM 호출 수, 적중률, 평균 응답 시간, 답장 다양성(키별 서로 다른 답장 수)을 비교합니다.
+
+실행 (models/llm 에서):
+    python eval_cache.py
+    python eval_cache.py --rounds 5 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import defaultdict
+
+parser = argparse.ArgumentParser(description="답장 캐시 점검 (가짜 LLM)")
+parser.add_argument("--rounds", type=int, default=3)
+parser.add_argument("--latency", type=float, default=0.05, help="가짜 LLM 호출당 지연(초)")
+parser.add_argument("--threshold", type=float, default=0.85, help="의미 유사 임계값")
+args = parser.parse_args()
+
+# 설정은 임포트 시 읽으므로 먼저 가짜 LLM 환경 지정
+os.environ.setdefault("OPENAI_API_KEY", "offline-eval")
+os.environ["LLM_FAKE"] = "true"
+os.environ["LLM_FAKE_LATENCY"] = str(args.latency)
+
+from src import orchestrator  # noqa: E402
+from src.cache import ReplyCache, normalize_text  # noqa: E402
+from src.fake_llm import NgramEmbeddings, fake_call_counts, reset_fake_call_counts  # noqa: E402
+from eval_reflection import DEFAULT_DATA, load_cases  # noqa: E402
+
+SPECIES = ["몬스테라", "스투키", "호접란"]
+
+
+def variants(text: str):
+    """같은 질문의 표기 변형"""
+    base = text.rstrip("?!. ")
+    return [text, base + "ㅠㅠㅠ", base + "!!", "  " + base.replace(" ", "  ") + " ?", base + " 어떡해"]
+
+
+async def run(label: str, cache, cases, rounds: int) -> None:
+    orchestrator.reply_cache = cache
+    reset_fake_call_counts()
+    replies = defaultdict(set)
+    started = time.perf_counter()
+    requests = 0
+    for _ in range(rounds):
+        for i, case in enumerate(cases):
+            species = SPECIES[i % len(SPECIES)]
+            for text in variants(case["text"]):
+                result = await orchestrator.plant_talk(species, text, case.get("moisture"))
+                replies[(species, normalize_text(case["text"]))].add(result.reply)
+                requests += 1
+    elapsed = time.perf_counter() - started
+    calls = fake_call_counts()
+    variety = sum(len(v) for v in replies.values()) / max(len(replies), 1)
+    print(f"\n[{label}] 요청 {requests}회")
+    print(f"  LLM 호출: {calls['invoke'] + calls['stream']}회  |  평균 {elapsed / requests * 1000:.1f}ms/요청")
+    print(f"  질문별 서로 다른 답장 수(평균): {variety:.2f}")
+    if cache is not None:
+        print(f"  캐시: {cache.snapshot()}")
+
+
+async def main() -> None:
+    cases = load_cases(DEFAULT_DATA)
+    embeddings = NgramEmbeddings()
+
+    async def embed(text):
+        return await embeddings.aembed_query(text)
+
+    print(f"=== 답장 캐시 점검: 문장 {len(cases)}개 × 변형 5개 × {args.rounds}회 (가짜 LLM 지연 {args.latency}s) ===")
+    await run("캐시 없음", None, cases, args.rounds)
+    await run("정확 일치", ReplyCache(), cases, args.rounds)
+    await run("정확 일치 + 의미 유사", ReplyCache(embedder=embed, sim_threshold=args.threshold), cases, args.rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
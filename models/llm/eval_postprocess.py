@@ -0,0 +1,112 @@
+# eval_postprocess.py
+"""
+후처리 파이프라인 골든 점검 (LLM 호출 없음)
+
+eval/postprocess_golden.jsonl에 기록된 LLM 원문(품종 × 모드, 인사말/3인칭/extra_tip 유출/금칙어/
+이모지/길이 초과 등)을 배치 후처리(postprocess.finish)와 스트리밍 후처리(SentenceStreamer, 5글자 조각)에
+통과시켜 기록된 결과와 한 글자라도 다르면 실패(종료 코드 1)합니다.
+스트리밍 케이스는 문장을 이어 붙인 결과가 같은 원문의 배치 결과와 다를 때도 실패합니다. (--update로 갱신 안 됨)
+후처리 규칙을 의도적으로 바꾼 경우에만 --update로 기대값을 다시 기록하고 diff를 검토하세요.
+
+실행 (models/llm 에서):
+    python eval_postprocess.py
+    python eval_postprocess.py --bench       # 답장/문장당 후처리 시간
+    python eval_postprocess.py --update      # 기대값 다시 기록
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# 설정은 임포트 시 읽으므로 먼저 가짜 LLM 환경 지정
+os.environ.setdefault("OPENAI_API_KEY", "offline-eval")
+os.environ["LLM_FAKE"] = "true"
+
+from src.chat_logic import SentenceStreamer  # noqa: E402
+from src.postprocess import finish  # noqa: E402
+
+DEFAULT_GOLDEN = Path(__file__).parent / "eval" / "postprocess_golden.jsonl"
+STREAM_CHUNK = 5
+
+
+def load_golden(path: Path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def stream_sentences(mode: str, species: str, raw: str):
+    streamer = SentenceStreamer(mode, species)
+    out = []
+    for i in range(0, len(raw), STREAM_CHUNK):
+        out += streamer.feed(raw[i:i + STREAM_CHUNK])
+    return out + streamer.finish()
+
+
+def run_case(case):
+    if case["kind"] == "stream":
+        return stream_sentences(case["mode"], case["species"], case["raw"])
+    return finish(case["mode"], case["raw"], case["species"])
+
+
+def bench(cases, repeat: int) -> None:
+    for kind in ("finish", "stream"):
+        subset = [c for c in cases if c["kind"] == kind]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for case in subset:
+                run_case(case)
+        elapsed = time.perf_counter() - started
+        n = len(subset) * repeat
+        print(f"  {kind:<6}: {elapsed / n * 1e6:7.1f}µs/답장 ({len(subset)}개 × {repeat}회)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="후처리 파이프라인 골든 점검")
+    parser.add_argument("--golden", type=Path, default=DEFAULT_GOLDEN)
+    parser.add_argument("--update", action="store_true", help="현재 출력으로 기대값 다시 기록")
+    parser.add_argument("--bench", action="store_true", help="후처리 시간 측정")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = load_golden(args.golden)
+    failures = []
+    mismatched = []  # 스트리밍 ≠ 배치
+    for case in cases:
+        actual = run_case(case)
+        if actual != case["expected"]:
+            failures.append((case, actual))
+        if case["kind"] == "stream":
+            batch = finish(case["mode"], case["raw"], case["species"])
+            if " ".join(actual) != batch:
+                mismatched.append((case, " ".join(actual), batch))
+
+    if args.update:
+        for case, actual in failures:
+            case["expected"] = actual
+        with open(args.golden, "w", encoding="utf-8") as f:
+            for case in cases:
+                f.write(json.dumps(case, ensure_ascii=False) + "\n")
+        print(f"기대값 {len(failures)}건 갱신 → {args.golden}")
+        return 0
+
+    print(f"=== 후처리 골든 점검: {len(cases)}건, 불일치 {len(failures)}건 ===")
+    for case, actual in failures[:20]:
+        print(f"\n[{case['id']}]")
+        print(f"  원문: {case['raw']}")
+        print(f"  기대: {case['expected']}")
+        print(f"  실제: {actual}")
+    print(f"\n=== 스트리밍/배치 일치 점검: 불일치 {len(mismatched)}건 ===")
+    for case, joined, batch in mismatched[:20]:
+        print(f"\n[{case['id']}]")
+        print(f"  원문: {case['raw']}")
+        print(f"  스트리밍: {joined}")
+        print(f"  배치: {batch}")
+    if args.bench:
+        bench(cases, args.repeat)
+    return 1 if failures or mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# eval_reflection.py
+"""
+리플렉션 게이트 오프라인 평가
+
+라벨링된 문장을 재생하며 REFLECT_CONFIDENCE_THRESHOLD 값별로
+- 최종 모드 정답률(라벨 일치율)
+- 생략된 리플렉션 LLM 호출 비율
+을 비교합니다.
+
+리플렉션 결과는 데이터 파일의 "reflect_mode" 필드를 그대로 재생합니다. (LLM 호출 없음)
+--live로 실행하면 해당 필드가 없는 문장만 reflect_mode를 실제 호출해 채우고,
+--save로 결과를 저장해 두면 이후에는 오프라인으로 반복 평가할 수 있습니다.
+
+실행 (models/llm 에서):
+    python eval_reflection.py
+    python eval_reflection.py --live --save eval/mode_cases.jsonl
+    python eval_reflection.py --thresholds 0.5,0.75,0.9
+"""
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 오프라인 재생은 LLM을 부르지 않지만 chat_logic 임포트 시 클라이언트를 만들기 때문에 임시 키 지정
+os.environ.setdefault("OPENAI_API_KEY", "offline-eval")
+
+from src.chat_logic import detect_mode, reflect_mode  # noqa: E402
+from src.config import settings  # noqa: E402
+
+DEFAULT_DATA = Path(__file__).parent / "eval" / "mode_cases.jsonl"
+DEFAULT_THRESHOLDS = [0.0, 0.25, 0.5, 0.6, 0.75, 0.9, 1.01]
+
+
+def load_cases(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def fill_reflections(cases: List[Dict[str, Any]], concurrency: int) -> int:
+    """reflect_mode 결과가 없는 문장만 실제 호출, 반환: 호출 수"""
+    sem = asyncio.Semaphore(concurrency)
+    todo = [case for case in cases if case.get("reflect_mode") not in ("daily", "plant", "hybrid")]
+
+    async def run(case: Dict[str, Any]) -> None:
+        async with sem:
+            first_mode, _ = detect_mode(case["text"], case.get("moisture"))
+            case["reflect_mode"] = await reflect_mode(case["text"], first_mode, case.get("moisture"))
+
+    await asyncio.gather(*(run(case) for case in todo))
+    return len(todo)
+
+
+def evaluate(cases: List[Dict[str, Any]], threshold: float) -> Dict[str, Any]:
+    correct = skipped = changed = 0
+    misses = []
+    for case in cases:
+        first_mode, confidence = detect_mode(case["text"], case.get("moisture"))
+        if confidence >= threshold:
+            skipped += 1
+            final = first_mode
+        else:
+            # 기록이 없으면 리플렉션이 1차 모드를 유지했다고 가정
+            final = case.get("reflect_mode") or first_mode
+            changed += final != first_mode
+        if final == case["label"]:
+            correct += 1
+        else:
+            misses.append((case["text"], case["label"], final, confidence))
+    n = len(cases) or 1
+    return {
+        "threshold": threshold,
+        "accuracy": correct / n,
+        "saved": skipped / n,
+        "changed": changed,
+        "misses": misses,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="리플렉션 게이트 오프라인 평가")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--thresholds", type=str, default=None, help="쉼표 구분 임계값 목록")
+    parser.add_argument("--live", action="store_true", help="기록 없는 문장만 reflect_mode 실제 호출")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--save", type=Path, default=None, help="리플렉션 결과를 포함해 저장할 경로")
+    parser.add_argument("--show-misses", action="store_true")
+    args = parser.parse_args()
+
+    cases = load_cases(args.data)
+    recorded = sum(1 for case in cases if case.get("reflect_mode"))
+    print(f"=== 리플렉션 게이트 평가: {len(cases)}문장 (리플렉션 기록 {recorded}개) ===")
+
+    if args.live:
+        calls = asyncio.run(fill_reflections(cases, args.concurrency))
+        print(f"🔁 reflect_mode 호출 {calls}회")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            for case in cases:
+                f.write(json.dumps(case, ensure_ascii=False) + "\n")
+        print(f"💾 저장: {args.save}")
+
+    thresholds = (
+        [float(t) for t in args.thresholds.split(",")] if args.thresholds else DEFAULT_THRESHOLDS
+    )
+    baseline = evaluate(cases, 1.01)  # 항상 리플렉션
+    print(f"\n기준(항상 리플렉션) 정답률: {baseline['accuracy']:.1%}")
+    print(f"{'임계값':>8} | {'정답률':>7} | {'기준 대비':>8} | {'호출 절감':>8} | {'모드 변경':>8}")
+    for threshold in thresholds:
+        r = evaluate(cases, threshold)
+        mark = "  ← 현재" if abs(threshold - settings.REFLECT_CONFIDENCE_THRESHOLD) < 1e-9 else ""
+        print(
+            f"{threshold:>8.2f} | {r['accuracy']:>7.1%} | {r['accuracy'] - baseline['accuracy']:>+8.1%} | "
+            f"{r['saved']:>8.1%} | {r['changed']:>8}{mark}"
+        )
+        if args.show_misses:
+            for text, label, final, confidence in r["misses"]:
+                print(f"      ✗ [{label}→{final} conf={confidence:.2f}] {text}")
+
+
+if __name__ == "__main__":
+    main()
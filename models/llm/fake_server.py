@@ -0,0 +1,225 @@
+# fake_server.py
+"""
+OpenAI 호환 가짜 LLM 서버 (API 키/비용 없이 실제 HTTP 경로 점검용)
+
+모델 서버를 OPENAI_BASE_URL=http://127.0.0.1:5055/v1 로 띄우면 ChatOpenAI가 그대로 이 서버를 호출합니다.
+- POST /v1/chat/completions : 일반/스트리밍(SSE), response_format json_object, usage 포함
+- POST /v1/embeddings       : 글자 2-gram 해시 벡터
+- GET  /stats, POST /stats/reset : 프롬프트 종류별 호출 수/지연
+
+답장은 src/fake_llm.canned_reply(프롬프트 종류·모드별 고정 문장 조합)를 쓰고,
+(--seed, 프롬프트, 같은 프롬프트의 몇 번째 호출인지)로 난수를 고정해 결과와 지연이 결정적입니다.
+
+지연 분포 (--latency 종류=분포, 여러 번 지정 가능, 종류: default/reflect/opening/structured/text/embeddings):
+    fixed:0.3          항상 0.3초
+    uniform:0.1:0.5    0.1~0.5초 균등
+    normal:0.3:0.1     평균 0.3, 표준편차 0.1 (0 미만은 0)
+    lognormal:0.3:0.5  중앙값 0.3, 로그 표준편차 0.5 (긴 꼬리)
+    exp:0.3            평균 0.3 지수 분포
+
+실행 (models/llm 에서):
+    python fake_server.py --port 5055
+    python fake_server.py --latency default=lognormal:0.6:0.4 --latency reflect=fixed:0.2
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.fake_llm import NgramEmbeddings, canned_reply, prompt_template, reply_mode
+
+Sampler = Callable[[random.Random], float]
+
+
+def parse_distribution(spec: str) -> Sampler:
+    name, *params = spec.split(":")
+    p = [float(x) for x in params]
+    if name == "fixed":
+        return lambda rng: p[0]
+    if name == "uniform":
+        return lambda rng: rng.uniform(p[0], p[1])
+    if name == "normal":
+        return lambda rng: max(0.0, rng.gauss(p[0], p[1]))
+    if name == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(p[0]), p[1])
+    if name == "exp":
+        return lambda rng: rng.expovariate(1.0 / p[0])
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+class FakeOpenAI:
+    def __init__(self, latencies: Dict[str, Sampler], seed: int, chunk_size: int, ttft_ratio: float) -> None:
+        self.latencies = latencies
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.ttft_ratio = ttft_ratio
+        self.embeddings = NgramEmbeddings()
+        self._seen: Dict[str, int] = defaultdict(int)
+        self.reset()
+
+    def reset(self) -> None:
+        self._seen.clear()
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.latency_total: Dict[str, float] = defaultdict(float)
+        self.started_at = time.time()
+
+    def _rng(self, payload: Any) -> random.Random:
+        """같은 요청의 n번째 호출은 항상 같은 난수열"""
+        digest = hashlib.sha1(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        self._seen[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{self._seen[digest]}")
+
+    def _delay(self, kind: str, rng: random.Random) -> float:
+        sampler = self.latencies.get(kind.split(":")[0]) or self.latencies["default"]
+        delay = sampler(rng)
+        self.calls[kind] += 1
+        self.latency_total[kind] += delay
+        return delay
+
+    def complete(self, body: Dict[str, Any]):
+        messages: List[Dict[str, Any]] = body.get("messages", [])
+        system = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+        human = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+        template = prompt_template(system)
+        kind = f"{template}:{reply_mode(system)}" if template in ("structured", "text") else template
+        rng = self._rng([body.get("model"), messages])
+        text = canned_reply(system, human, rng)
+        delay = self._delay(kind, rng)
+        prompt_tokens = math.ceil(sum(len(str(m.get("content", ""))) for m in messages) / 1.5)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": math.ceil(len(text) / 1.5),
+            "total_tokens": prompt_tokens + math.ceil(len(text) / 1.5),
+        }
+        return text, delay, usage
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": dict(self.calls),
+            "total_calls": sum(self.calls.values()),
+            "avg_latency_ms": {
+                kind: round(self.latency_total[kind] / n * 1000, 1) for kind, n in self.calls.items() if n
+            },
+            "since": self.started_at,
+        }
+
+
+def create_app(fake: FakeOpenAI) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        text, delay, usage = fake.complete(body)
+        model = body.get("model", "fake")
+        created = int(time.time())
+        completion_id = f"chatcmpl-fake-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}"
+
+        if not body.get("stream"):
+            await asyncio.sleep(delay)
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        pieces = [text[i:i + fake.chunk_size] for i in range(0, len(text), fake.chunk_size)] or [""]
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None, extra: Optional[Dict] = None) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}] if delta is not None else [],
+            }
+            if extra:
+                data.update(extra)
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        async def events():
+            # 첫 조각까지 지연의 ttft_ratio, 나머지는 조각마다 나눠서 대기
+            await asyncio.sleep(delay * fake.ttft_ratio)
+            yield chunk({"role": "assistant", "content": ""})
+            rest = delay * (1 - fake.ttft_ratio) / len(pieces)
+            for piece in pieces:
+                yield chunk({"content": piece})
+                await asyncio.sleep(rest)
+            yield chunk({}, "stop")
+            if include_usage:
+                yield chunk(None, extra={"usage": usage})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input")
+        texts = [inputs] if isinstance(inputs, str) else list(inputs or [])
+        # langchain은 토큰 ID 목록을 보낼 수 있음 (check_embedding_ctx_length)
+        texts = [t if isinstance(t, str) else " ".join(map(str, t)) for t in texts]
+        rng = fake._rng(["embeddings", texts])
+        await asyncio.sleep(fake._delay("embeddings", rng))
+        return JSONResponse({
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake.embeddings.embed_query(t)}
+                for i, t in enumerate(texts)
+            ],
+            "model": body.get("model", "fake-embedding"),
+            "usage": {"prompt_tokens": sum(len(t) for t in texts), "total_tokens": sum(len(t) for t in texts)},
+        })
+
+    @app.get("/stats")
+    async def stats():
+        return fake.stats()
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        fake.reset()
+        return {"ok": True}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI 호환 가짜 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--latency", action="append", default=[], help="종류=분포 (예: reflect=fixed:0.2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=4, help="스트리밍 조각당 글자 수")
+    parser.add_argument("--ttft-ratio", type=float, default=0.3, help="스트리밍 첫 조각까지의 지연 비율")
+    args = parser.parse_args()
+
+    latencies: Dict[str, Sampler] = {"default": parse_distribution("lognormal:0.5:0.35"), "embeddings": parse_distribution("fixed:0.05")}
+    for item in args.latency:
+        kind, _, spec = item.partition("=")
+        latencies[kind] = parse_distribution(spec)
+
+    import uvicorn
+
+    fake = FakeOpenAI(latencies, args.seed, args.chunk_size, args.ttft_ratio)
+    print(f"🧪 가짜 OpenAI 서버: http://{args.host}:{args.port}/v1 (지연: {', '.join(args.latency) or '기본'})")
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
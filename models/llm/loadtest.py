@@ -0,0 +1,298 @@
+# loadtest.py
+"""
+대화 파이프라인 부하 테스트 (고정 동시성)
+
+라벨링 문장(eval/mode_cases.jsonl)을 돌려 가며 요청을 보내고
+지연 p50/p95/p99, 요청당 LLM 호출 수, 모델 서버 이벤트 루프 지연을 보고합니다.
+
+대상:
+    llm         모델 서버 POST /llm
+    llm-stream  모델 서버 POST /llm/stream (첫 문장까지 시간 포함)
+    diary       백엔드 일기 작성 → 답장 완료까지 (POST /diary-list/create → GET /diary-list/{id}/plant-reply 롱 폴링)
+
+LLM 호출 수는 --fake-url(fake_server.py)이 있으면 그 서버의 호출 수, 없으면 모델 서버 /health의 llm_gateway 지표로 셉니다.
+측정 전에 모델 서버 /health/reset으로 지표를 초기화합니다.
+
+오프라인 예 (models/llm 에서, 터미널 3개):
+    python fake_server.py --port 5055 --latency default=lognormal:0.5:0.35
+    (models 에서) OPENAI_BASE_URL=http://127.0.0.1:5055/v1 OPENAI_API_KEY=fake uvicorn main:app --port 5000
+    python loadtest.py --target llm --concurrency 16 --requests 400 --fake-url http://127.0.0.1:5055
+
+    python loadtest.py --target diary --url http://127.0.0.1:8000 --user tester --password ****
+    python loadtest.py --target llm --json result.json --max-p95 3000   # CI: p95가 3초를 넘으면 종료 코드 1
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from eval_reflection import DEFAULT_DATA, load_cases
+from src.loop_monitor import LoopLagMonitor, percentile
+
+SPECIES = ["몬스테라", "스투키", "호접란", "선인장", "보스턴고사리"]
+
+
+@dataclass
+class Sample:
+    ok: bool
+    latency: float
+    first: Optional[float] = None       # 스트리밍: 첫 문장까지 / 일기: 작성 응답까지
+    error: Optional[str] = None
+
+
+@dataclass
+class Context:
+    args: argparse.Namespace
+    client: httpx.AsyncClient
+    cases: List[Dict[str, Any]]
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _payload(ctx: Context, i: int) -> Dict[str, Any]:
+    case = ctx.cases[i % len(ctx.cases)]
+    return {
+        "species": SPECIES[i % len(SPECIES)],
+        "user_text": case["text"],
+        "moisture": case.get("moisture"),
+        "priority": ctx.args.priority,
+    }
+
+
+async def run_llm(ctx: Context, i: int) -> Sample:
+    started = time.perf_counter()
+    response = await ctx.client.post(f"{ctx.args.url}/llm", json=_payload(ctx, i))
+    data = response.json()
+    ok = response.status_code == 200 and data.get("success", False)
+    return Sample(ok, time.perf_counter() - started, error=None if ok else data.get("message"))
+
+
+async def run_llm_stream(ctx: Context, i: int) -> Sample:
+    started = time.perf_counter()
+    first = None
+    event = None
+    async with ctx.client.stream("POST", f"{ctx.args.url}/llm/stream", json=_payload(ctx, i)) as response:
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+                if event == "delta" and first is None:
+                    first = time.perf_counter() - started
+            elif event == "error" and line.startswith("data:"):
+                return Sample(False, time.perf_counter() - started, first, line[5:].strip())
+    ok = response.status_code == 200 and event == "done"
+    return Sample(ok, time.perf_counter() - started, first, None if ok else f"status {response.status_code}")
+
+
+async def run_diary(ctx: Context, i: int) -> Sample:
+    args = ctx.args
+    case = ctx.cases[i % len(ctx.cases)]
+    form = {
+        "user_title": f"부하 테스트 #{i}",
+        "user_content": case["text"],
+        "plant_species": SPECIES[i % len(SPECIES)],
+        "hashtag": "#부하테스트",
+    }
+    if args.plant_id:
+        form["plant_id"] = str(args.plant_id)
+    started = time.perf_counter()
+    response = await ctx.client.post(f"{args.url}/diary-list/create", data=form, headers=ctx.headers)
+    created = time.perf_counter() - started
+    data = response.json()
+    diary = data.get("diary") or {}
+    if response.status_code != 200 or not data.get("success") or not diary.get("idx"):
+        return Sample(False, created, created, f"create {response.status_code}")
+    diary_id = diary["idx"]
+    try:
+        reply = diary.get("plant_reply")
+        while not reply:
+            if time.perf_counter() - started > args.reply_timeout:
+                return Sample(False, time.perf_counter() - started, created, "reply timeout")
+            poll = await ctx.client.get(
+                f"{args.url}/diary-list/{diary_id}/plant-reply",
+                params={"wait": args.reply_wait},
+                headers=ctx.headers,
+            )
+            status = poll.json()
+            if status.get("status") == "done":
+                reply = status.get("plant_reply") or "(empty)"
+        return Sample(True, time.perf_counter() - started, created)
+    finally:
+        if not args.keep:
+            await ctx.client.delete(f"{args.url}/diary-list/{diary_id}", headers=ctx.headers)
+
+
+RUNNERS = {"llm": run_llm, "llm-stream": run_llm_stream, "diary": run_diary}
+
+
+async def _get_json(client: httpx.AsyncClient, url: str) -> Optional[Dict[str, Any]]:
+    try:
+        response = await client.get(url)
+        return response.json() if response.status_code == 200 else None
+    except httpx.HTTPError:
+        return None
+
+
+async def _post(client: httpx.AsyncClient, url: str) -> None:
+    try:
+        await client.post(url)
+    except httpx.HTTPError:
+        pass
+
+
+def _gateway_calls(health: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    gateway = (health or {}).get("llm_gateway")
+    if not gateway:
+        return None
+    return {kind: stats["calls"] for kind, stats in gateway.get("kinds", {}).items()}
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="대화 파이프라인 부하 테스트")
+    parser.add_argument("--target", choices=sorted(RUNNERS), default="llm")
+    parser.add_argument("--url", default=None, help="대상 서버 (llm: 모델 서버 :5000, diary: 백엔드 :8000)")
+    parser.add_argument("--models-url", default="http://127.0.0.1:5000", help="지표를 읽을 모델 서버")
+    parser.add_argument("--fake-url", default=None, help="fake_server.py 주소 (LLM 호출 수 집계)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=0, help="측정 전 버리는 요청 수")
+    parser.add_argument("--priority", choices=["chat", "diary"], default="chat")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    # diary 대상
+    parser.add_argument("--user", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--token", default=None, help="이미 발급받은 액세스 토큰")
+    parser.add_argument("--plant-id", type=int, default=None)
+    parser.add_argument("--reply-wait", type=float, default=20.0, help="롱 폴링 1회 대기(초)")
+    parser.add_argument("--reply-timeout", type=float, default=120.0)
+    parser.add_argument("--keep", action="store_true", help="테스트 일기를 지우지 않음")
+    # 결과
+    parser.add_argument("--json", type=Path, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--max-p95", type=float, default=None, help="p95(ms)가 넘으면 종료 코드 1")
+    args = parser.parse_args()
+    if args.url is None:
+        args.url = "http://127.0.0.1:8000" if args.target == "diary" else args.models_url
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        ctx = Context(args, client, load_cases(args.data))
+        if args.target == "diary":
+            token = args.token
+            if token is None:
+                login = await client.post(
+                    f"{args.url}/auth/login", json={"id_or_email": args.user, "password": args.password}
+                )
+                login.raise_for_status()
+                token = login.json()["access_token"]
+            ctx.headers = {"Authorization": f"Bearer {token}"}
+
+        runner = RUNNERS[args.target]
+
+        async def guarded(i: int) -> Sample:
+            started = time.perf_counter()
+            try:
+                return await runner(ctx, i)
+            except Exception as e:
+                return Sample(False, time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+
+        for i in range(args.warmup):
+            await guarded(-1 - i)
+
+        await _post(client, f"{args.models_url}/health/reset")
+        if args.fake_url:
+            await _post(client, f"{args.fake_url}/stats/reset")
+
+        # 하네스 자신의 루프 지연 (하네스가 병목이 아닌지 확인)
+        own_loop = LoopLagMonitor()
+        own_loop.start()
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(i)
+        samples: List[Sample] = []
+
+        async def worker() -> None:
+            while not queue.empty():
+                samples.append(await guarded(queue.get_nowait()))
+
+        print(f"=== 부하 테스트: {args.target} {args.url} | 동시성 {args.concurrency} × 요청 {args.requests} ===")
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        await own_loop.stop()
+
+        health = await _get_json(client, f"{args.models_url}/health")
+        fake_stats = await _get_json(client, f"{args.fake_url}/stats") if args.fake_url else None
+
+    ok = [s for s in samples if s.ok]
+    latencies = [s.latency for s in ok]
+    firsts = [s.first for s in ok if s.first is not None]
+    errors: Dict[str, int] = {}
+    for s in samples:
+        if not s.ok:
+            errors[s.error or "unknown"] = errors.get(s.error or "unknown", 0) + 1
+
+    if fake_stats is not None:
+        calls_by_kind = fake_stats.get("calls", {})
+        calls_source = "fake_server"
+    else:
+        calls_by_kind = _gateway_calls(health) or {}
+        calls_source = "llm_gateway" if health else None
+    total_calls = sum(calls_by_kind.values())
+
+    def ms(values, q):
+        return round(percentile(values, q) * 1000, 1)
+
+    result = {
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "requests": len(samples),
+        "ok": len(ok),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {"p50": ms(latencies, 50), "p95": ms(latencies, 95), "p99": ms(latencies, 99),
+                       "max": round(max(latencies, default=0) * 1000, 1)},
+        "first_ms": {"p50": ms(firsts, 50), "p95": ms(firsts, 95), "p99": ms(firsts, 99)} if firsts else None,
+        "llm_calls": {"source": calls_source, "total": total_calls,
+                      "per_request": round(total_calls / len(samples), 2) if samples and calls_source else None,
+                      "by_kind": calls_by_kind},
+        "server_event_loop": (health or {}).get("event_loop"),
+        "client_event_loop": own_loop.snapshot(),
+    }
+
+    lat = result["latency_ms"]
+    print(f"  성공 {len(ok)}/{len(samples)}  |  {result['throughput_rps']} req/s  |  {elapsed:.1f}s")
+    print(f"  지연 p50 {lat['p50']}ms  p95 {lat['p95']}ms  p99 {lat['p99']}ms  max {lat['max']}ms")
+    if result["first_ms"]:
+        label = "작성 응답" if args.target == "diary" else "첫 문장"
+        first = result["first_ms"]
+        print(f"  {label} p50 {first['p50']}ms  p95 {first['p95']}ms  p99 {first['p99']}ms")
+    if calls_source:
+        print(f"  LLM 호출 {total_calls}회 ({calls_source})  |  요청당 {result['llm_calls']['per_request']}  |  {calls_by_kind}")
+    loop = result["server_event_loop"]
+    if loop:
+        print(f"  모델 서버 루프 지연 p99 {loop['p99_ms']}ms  max {loop['max_ms']}ms  |  "
+              f"{loop['block_threshold_ms']:.0f}ms 이상 막힘 {loop['blocked']}회 ({loop['blocked_ms']}ms)")
+    client_loop = result["client_event_loop"]
+    print(f"  하네스 루프 지연 p99 {client_loop['p99_ms']}ms  max {client_loop['max_ms']}ms")
+    for error, count in sorted(errors.items(), key=lambda item: -item[1])[:5]:
+        print(f"  ✗ {count}회: {error}")
+
+    if args.json:
+        args.json.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 저장: {args.json}")
+    if args.max_p95 is not None and lat["p95"] > args.max_p95:
+        print(f"❌ p95 {lat['p95']}ms > 기준 {args.max_p95}ms")
+        return 1
+    if not ok:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -18,7 +18,7 @@ def _short(s: str, n: int = 120) -> str:
 async def run():
     print("=== LLM 채팅 테스트 ===")
     for title, species, text, moisture in CASES:
-        r = plant_talk(species, text, moisture)
+        r = await plant_talk(species, text, moisture)
         print(f"\n[{title}]")
         print(f"- 입력: species={species} | moisture={moisture} | text='{text}'")
         print(f"- 결과: mode={r.mode} | state={r.state}")
@@ -27,7 +27,7 @@ async def run():
     print("\n=== DB 저장 테스트 ===")
     # DB 저장 예시
     try:
-        chat_data = talk_for_db(
+        chat_data = await talk_for_db(
             user_id="test_user_001",
             plant_id=1,
             plant_name="우리집 호접란",
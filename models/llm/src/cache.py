@@ -0,0 +1,250 @@
+# src/cache.py
+"""
+LLM 답장 캐시 (2단계)
+
+1) 정확 일치: (품종, 모드, 습도 구간, 정규화한 문장) 키
+   - 습도 구간은 rules.judge_moisture의 상태(물이부족/적정/과습주의/없음)라
+     프롬프트에 들어가는 관리 안내가 같은 입력끼리만 묶입니다.
+2) 의미 유사(선택): 같은 (품종, 모드, 습도 구간) 안에서 문장 임베딩 코사인 유사도가
+   LLM_CACHE_SIM_THRESHOLD 이상인 가장 가까운 항목
+
+항목마다 만료 시각(TTL)이 있고, 전체 항목 수는 LRU로 제한합니다.
+답장이 매번 같아지지 않도록 키마다 답장 변형을 LLM_CACHE_VARIANTS개까지 모으며
+(모이는 동안은 LLM_CACHE_FRESH_RATE 확률로 일부러 새로 생성), 직전에 준 변형은 피해서 고릅니다.
+"""
+import random
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import settings
+from .rules import judge_moisture_with_none
+
+Embedder = Callable[[str], Awaitable[List[float]]]
+
+_PUNCT_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_REPEAT_RE = re.compile(r"(.)\1{2,}")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 문장 정규화: 전각/반각 통일, 소문자, 문장부호·이모지 제거, 반복 글자(ㅠㅠㅠ) 축약"""
+    s = unicodedata.normalize("NFKC", text or "").casefold()
+    s = _PUNCT_RE.sub(" ", s)
+    s = _REPEAT_RE.sub(r"\1\1", s)
+    return " ".join(s.split())
+
+
+def moisture_bucket(moisture: Optional[float]) -> str:
+    return judge_moisture_with_none(moisture).state
+
+
+def _unit(vector: List[float]) -> Optional[np.ndarray]:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm else None
+
+
+@dataclass
+class _Entry:
+    replies: List[str]
+    expires_at: float
+    vector: Optional[np.ndarray] = None     # 단위 벡터
+    last_served: int = -1
+    hits: int = 0
+
+
+@dataclass
+class CacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    fresh_bypass: int = 0       # 변형을 모으려고 일부러 새로 생성한 횟수
+    mode_hits: int = 0
+    evictions: int = 0
+    embed_errors: int = 0
+
+
+class ReplyCache:
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        variants: Optional[int] = None,
+        fresh_rate: Optional[float] = None,
+        embedder: Optional[Embedder] = None,
+        sim_threshold: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.max_entries = settings.LLM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl = settings.LLM_CACHE_TTL if ttl is None else ttl
+        self.variants = settings.LLM_CACHE_VARIANTS if variants is None else variants
+        self.fresh_rate = settings.LLM_CACHE_FRESH_RATE if fresh_rate is None else fresh_rate
+        self.sim_threshold = settings.LLM_CACHE_SIM_THRESHOLD if sim_threshold is None else sim_threshold
+        self.embedder = embedder
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._entries: "OrderedDict[Tuple[str, str, str, str], _Entry]" = OrderedDict()
+        self._modes: "OrderedDict[Tuple[str, str, str], Tuple[str, float]]" = OrderedDict()
+        # 조회 때 만든 임베딩을 put에서 재사용 (같은 문장을 두 번 임베딩하지 않음)
+        self._recent_vectors: "OrderedDict[str, Optional[np.ndarray]]" = OrderedDict()
+        self.stats = CacheStats()
+
+    # ---------- 키 ----------
+    @staticmethod
+    def key(species: str, mode: str, moisture: Optional[float], user_text: str) -> Tuple[str, str, str, str]:
+        return (species, mode, moisture_bucket(moisture), normalize_text(user_text))
+
+    # ---------- 답장 ----------
+    async def get(self, species: str, mode: str, moisture: Optional[float], user_text: str) -> Optional[str]:
+        key = self.key(species, mode, moisture, user_text)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            # 변형이 덜 모였으면 일정 확률로 새로 생성 (put에서 변형으로 추가됨)
+            if len(entry.replies) < self.variants and self._rng.random() < self.fresh_rate:
+                self.stats.fresh_bypass += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.exact_hits += 1
+            return self._serve(entry)
+
+        if self.embedder is not None and key[3]:
+            entry = await self._nearest(key, now)
+            if entry is not None:
+                self.stats.semantic_hits += 1
+                return self._serve(entry)
+
+        self.stats.misses += 1
+        return None
+
+    async def put(
+        self,
+        species: str,
+        mode: str,
+        moisture: Optional[float],
+        user_text: str,
+        reply: str,
+        ttl: Optional[float] = None,
+    ) -> None:
+        if not reply:
+            return
+        key = self.key(species, mode, moisture, user_text)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            if reply not in entry.replies and len(entry.replies) < self.variants:
+                entry.replies.append(reply)
+            self._entries.move_to_end(key)
+            return
+
+        vector = None
+        if self.embedder is not None and key[3]:
+            if key[3] in self._recent_vectors:
+                vector = self._recent_vectors.pop(key[3])
+            else:
+                vector = await self._embed(key[3])
+        self._entries[key] = _Entry([reply], now + (self.ttl if ttl is None else ttl), vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _serve(self, entry: _Entry) -> str:
+        """직전에 준 변형은 피해서 선택"""
+        entry.hits += 1
+        choices = [i for i in range(len(entry.replies)) if i != entry.last_served] or [0]
+        entry.last_served = self._rng.choice(choices)
+        return entry.replies[entry.last_served]
+
+    async def _nearest(self, key: Tuple[str, str, str, str], now: float) -> Optional[_Entry]:
+        candidates = [
+            entry for k, entry in self._entries.items()
+            if k[:3] == key[:3] and entry.vector is not None and entry.expires_at > now
+        ]
+        if not candidates:
+            return None
+        vector = await self._embed(key[3])
+        self._recent_vectors[key[3]] = vector
+        while len(self._recent_vectors) > 256:
+            self._recent_vectors.popitem(last=False)
+        if vector is None:
+            return None
+        sims = np.stack([entry.vector for entry in candidates]) @ vector
+        best = int(np.argmax(sims))
+        return candidates[best] if sims[best] >= self.sim_threshold else None
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            return _unit(await self.embedder(text))
+        except Exception as e:
+            self.stats.embed_errors += 1
+            print(f"[LLM-CACHE] 임베딩 실패: {e}", flush=True)
+            return None
+
+    # ---------- 리플렉션 결과 ----------
+    def get_mode(self, first_mode: str, moisture: Optional[float], user_text: str) -> Optional[str]:
+        key = (first_mode, moisture_bucket(moisture), normalize_text(user_text))
+        item = self._modes.get(key)
+        if item is None:
+            return None
+        mode, expires_at = item
+        if expires_at <= self._clock():
+            del self._modes[key]
+            return None
+        self.stats.mode_hits += 1
+        return mode
+
+    def put_mode(self, first_mode: str, moisture: Optional[float], user_text: str, mode: str) -> None:
+        key = (first_mode, moisture_bucket(moisture), normalize_text(user_text))
+        self._modes[key] = (mode, self._clock() + self.ttl)
+        self._modes.move_to_end(key)
+        while len(self._modes) > self.max_entries:
+            self._modes.popitem(last=False)
+
+    # ---------- 관리 ----------
+    def clear(self) -> None:
+        self._entries.clear()
+        self._modes.clear()
+        self._recent_vectors.clear()
+        self.stats = CacheStats()
+
+    def snapshot(self) -> Dict[str, Any]:
+        s = self.stats
+        lookups = s.exact_hits + s.semantic_hits + s.misses + s.fresh_bypass
+        return {
+            "entries": len(self._entries),
+            "exact_hits": s.exact_hits,
+            "semantic_hits": s.semantic_hits,
+            "misses": s.misses,
+            "fresh_bypass": s.fresh_bypass,
+            "mode_hits": s.mode_hits,
+            "evictions": s.evictions,
+            "embed_errors": s.embed_errors,
+            "hit_rate": round((s.exact_hits + s.semantic_hits) / lookups, 3) if lookups else 0.0,
+            "semantic": self.embedder is not None,
+        }
+
+
+def _default_embedder() -> Optional[Embedder]:
+    if not settings.LLM_CACHE_SEMANTIC:
+        return None
+    from .llm import embeddings  # 의미 캐시를 켤 때만 임베딩 클라이언트 생성
+
+    async def embed(text: str) -> List[float]:
+        return await embeddings.aembed_query(text)
+
+    return embed
+
+
+# 싱글톤 인스턴스 (LLM_CACHE_ENABLED=False면 None)
+reply_cache: Optional[ReplyCache] = ReplyCache(embedder=_default_embedder()) if settings.LLM_CACHE_ENABLED else None
@@ -1,6 +1,10 @@
 # src/chat_logic.py
+import json
 import re
-from typing import Optional, Literal
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Literal, Tuple
+
+from pydantic import BaseModel
 
 # --- ChatPromptTemplate import (langchain-core 우선, 없으면 langchain로 폴백) ---
 try:
@@ -11,34 +15,24 @@ except Exception:  # pragma: no cover
 from .llm import llm
 from .species_meta import SPECIES_META, DEFAULT_SPECIES
 from .rules import judge_moisture, judge_moisture_with_none
-from .utils import pick_memes, sanitize
+from .utils import BANNED as BANNED_WORDS, pick_memes, sanitize
 from .config import settings  # noqa: F401  # 향후 플래그/환경값 쓸 때 대비
-
-# =============================
-#  키워드 세트 (분리: STRICT / SOFT / LIFE)
-#   - STRICT: 식물 맥락에서만 거의 쓰이는 강신호
-#   - SOFT  : 일상과 겹치기 쉬운 약신호 (단독으로 plant 유도 X)
-#   - LIFE  : 일상/감정/직장/학업 등
-# =============================
-PLANT_KEYWORDS_STRICT = {
-    # 관리/환경/증상(식물 전용 신호)
-    "물","급수","흙","토양","분갈이","분무","습도","광","빛","통풍","배수","과습","건조",
-    "잎","줄기","뿌리","시들","갈변","처짐",
-    # 품종명
-    "몬스테라","스투키","산세베리아","금전수","선인장","호접란",
-    "테이블야자","홍콩야자","스파티필럼","관음죽",
-    "벵갈고무나무","올리브나무","디펜바키아","보스턴고사리",
-}
-PLANT_KEYWORDS_SOFT = {
-    # 애매한 상태 표현(일상과도 겹침 → 단독 사용 금지)
-    "아프","괜찮","상태","건강","힘들","죽","살아"
-}
-LIFE_KEYWORDS = {
-    # 일상/감정/직장/학업/교통 등 (확장)
-    "배고프","밥","야근","퇴근","피곤","스트레스","회의","상사","회사","출근","퇴사",
-    "프로젝트","지각","버스","지하철","시험","월급","연애","날씨","멘붕","짜증","우울",
-    "기분","털림","멘탈","힘듦","화남","화가","짜증남","슬픔","분노","걱정","불안","짜증남"
-}
+# 키워드 세트(STRICT / SOFT / LIFE)는 lexicon에서 밈 트리거와 함께 오토마톤 하나로 컴파일
+from .lexicon import LIFE_KEYWORDS, PLANT_KEYWORDS_SOFT, PLANT_KEYWORDS_STRICT, hit_words  # noqa: F401
+from .lexicon import scan as scan_keywords
+from .postprocess import (
+    FINISH_LIMITS,
+    SENTENCE_SPLIT,
+    drop_first_person,
+    finish as finish_reply,
+    finish_daily,
+    finish_hybrid,
+    finish_plant,
+    has_first_person,
+    is_greeting_only,
+    rewriter_for,
+    tidy_korean,
+)
 
 # =============================
 #  스타일/모드 판별
@@ -54,17 +48,19 @@ W_SOFT   = 0.5
 MARGIN_PLANT = 1.5
 MARGIN_DAILY = 1.5
 MOISTURE_BOOST = 0.5  # moisture가 있을 때 식물 측 스코어 부스터
+# 확신도: plant/daily 점수 차가 이 값 이상이면 1.0 (STRICT 2개 차이)
+CONFIDENCE_FULL_GAP = 2 * W_STRICT
 
-def _distinct_hits(text: str, vocab: set[str]) -> int:
-    """부분일치로 토큰을 찾되, 같은 토큰 반복은 1회만 카운트."""
-    hits = set()
-    for tk in vocab:
-        if tk in text:
-            hits.add(tk)
-    return len(hits)
 
-def detect_mode(text: str, moisture: Optional[float]) -> Literal["daily","plant","hybrid"]:
+def _confidence(s_plant: float, s_daily: float) -> float:
+    return round(min(1.0, abs(s_plant - s_daily) / CONFIDENCE_FULL_GAP), 3)
+
+def detect_mode(text: str, moisture: Optional[float]) -> Tuple[Literal["daily","plant","hybrid"], float]:
     """
+    반환: (모드, 확신도 0~1)
+    확신도는 plant/daily 점수 차로 계산합니다. 마진으로 확실히 이긴 경우만 높고,
+    hybrid 귀결이나 신호가 없는 경우는 낮아 리플렉션 대상이 됩니다.
+
     규칙:
     - STRICT(강신호) >> LIFE,SOFT보다 우선.
     - SOFT는 단독으로 plant 유도 금지. (daily/hybrid의 보조)
@@ -74,9 +70,11 @@ def detect_mode(text: str, moisture: Optional[float]) -> Literal["daily","plant"
     """
     t = text.strip()
 
-    n_strict = _distinct_hits(t, PLANT_KEYWORDS_STRICT)
-    n_soft   = _distinct_hits(t, PLANT_KEYWORDS_SOFT)
-    n_life   = _distinct_hits(t, LIFE_KEYWORDS)
+    # 부분일치로 토큰을 찾되, 같은 토큰 반복은 1회만 카운트 (한 번의 스캔으로 세 범주 모두)
+    hits = scan_keywords(t)
+    n_strict = len(hit_words(hits, "plant_strict"))
+    n_soft   = len(hit_words(hits, "plant_soft"))
+    n_life   = len(hit_words(hits, "life"))
 
     s_strict = n_strict * W_STRICT
     s_life   = n_life   * W_LIFE
@@ -88,20 +86,22 @@ def detect_mode(text: str, moisture: Optional[float]) -> Literal["daily","plant"
     s_plant = s_strict + (s_soft * 0.6)  # SOFT 일부만 plant에 기여
     s_daily = s_life   + (s_soft * 0.4)  # SOFT 일부는 daily에도 기여
 
+    confidence = _confidence(s_plant, s_daily)
+
     if s_plant >= s_daily + MARGIN_PLANT:
-        return "plant"
+        return "plant", confidence
     if s_daily >= s_plant + MARGIN_DAILY:
-        return "daily"
+        return "daily", confidence
 
     if moisture is not None:
         if n_life > 0:
-            return "hybrid"
+            return "hybrid", confidence
         if n_strict == 0 and n_soft > 0:
-            return "hybrid"
+            return "hybrid", confidence
         if n_strict > 0:
-            return "hybrid"
+            return "hybrid", confidence
 
-    return "daily"
+    return "daily", confidence
 
 # =============================
 #  리플렉션(2차 검토) 레이어 (선택 사용)
@@ -126,19 +126,18 @@ REFLECT_PROMPT = ChatPromptTemplate.from_messages([
      "Requirement: Return JSON only.")
 ])
 
-def reflect_mode(user_text: str, first_mode: str, moisture: Optional[float]) -> Literal["daily","plant","hybrid"]:
+async def reflect_mode(user_text: str, first_mode: str, moisture: Optional[float]) -> Literal["daily","plant","hybrid"]:
     """
     detect_mode 결과를 LLM으로 2차 검토.
     - JSON 파싱 실패/이상치면 first_mode 그대로 반환(페일세이프).
     """
     m = "null" if moisture is None else f"{float(moisture):.1f}"
-    out = (REFLECT_PROMPT | llm).invoke({
+    out = (await (REFLECT_PROMPT | llm.bind(prompt_kind="reflect")).ainvoke({
         "user_text": user_text,
         "first_mode": first_mode,
         "moisture": m
-    }).content.strip()
+    })).content.strip()
     try:
-        import json
         data = json.loads(out)
         fm = str(data.get("final_mode","")).strip()
         if fm in ("daily","plant","hybrid"):
@@ -162,9 +161,9 @@ EMP_PROMPT = ChatPromptTemplate.from_messages([
     ("human", "User text: {user_text}\nTask: Return exactly 1 empathetic sentence in Korean.")
 ])
 
-def empathy_opening(user_text: str) -> str:
+async def empathy_opening(user_text: str) -> str:
     style = infer_style(user_text)
-    res = (EMP_PROMPT | llm).invoke({"user_text": user_text, "style": style}).content.strip()
+    res = (await (EMP_PROMPT | llm.bind(prompt_kind="opening")).ainvoke({"user_text": user_text, "style": style})).content.strip()
     res = sanitize(res)
     if len(res) > 45:
         res = res[:45].rstrip() + "…"
@@ -172,51 +171,6 @@ def empathy_opening(user_text: str) -> str:
         res += "."
     return res
 
-# =============================
-#  한국어 출력 다듬기/1인칭 보정
-# =============================
-_FIRST_PERSON_FIX = [
-    (r"(?:이 )?식물은", "나는"),
-    (r"(?:이 )?아이(?:가|는|도)?", "나는"),
-    (r"(?:그|이) 친구(?:가|는|도)?", "나는"),
-]
-
-def _has_first_person_kor(s: str) -> bool:
-    return re.search(r"\b(나|난|나는|내|내가)\b", s) is not None
-
-def _tidy_korean(s: str) -> str:
-    # '나는야' → '나는'
-    s = re.sub(r"나는야", "나는", s)
-    # 문장 시작부의 '나 나는', '나는 나는' 등 중복 제거
-    s = re.sub(r"^(?:나\s+)?나는(?:\s+나는)+", "나는", s)
-    # '나는 안녕' → '안녕, 나는' (자연스럽게)
-    s = re.sub(r"^나는\s+(안녕(?:하세요)?)([,!]?)\s*", r"\1, 나는 ", s)
-    # 공백 정리
-    s = re.sub(r"\s{2,}", " ", s).strip()
-    return s
-
-def _enforce_first_person(text: str, species: str) -> str:
-    s = text
-    s = re.sub(rf"{re.escape(species)}(?:이|가|는|도)?", "나는", s)
-    for pat, rep in _FIRST_PERSON_FIX:
-        s = re.sub(pat, rep, s)
-    # 첫 단어 강제 '나는 ' 삭제: 인사말과 충돌 방지
-    if not _has_first_person_kor(s):
-        # 인사말 뒤에 삽입
-        m = re.match(r"^(안녕|안녕하세요|헬로|hello)[, ]+", s, flags=re.IGNORECASE)
-        if m:
-            s = s[:m.end()] + "나는 " + s[m.end():]
-        else:
-            s = "나는 " + s.lstrip()
-    return _tidy_korean(s)
-
-def _strip_extra_tip_leak(text: str, extra_tip: str) -> str:
-    if not extra_tip:
-        return text
-    s = text.replace(extra_tip, "")
-    s = s.replace(f"“{extra_tip}”", "").replace(f"\"{extra_tip}\"", "").replace(f"'{extra_tip}'", "")
-    return re.sub(r"\s{2,}", " ", s).strip()
-
 # =============================
 #  2) 일상 모드
 # =============================
@@ -235,19 +189,18 @@ DAILY_PROMPT = ChatPromptTemplate.from_messages([
     ("human", "User text: {user_text}\nTask: Reply in Korean with exactly 2 sentences under 100 chars.")
 ])
 
-def build_daily(species: str, user_text: str) -> str:
+async def build_daily(species: str, user_text: str, opening: Optional[str] = None) -> str:
+    """opening: 미리 만든 공감 오프닝 (없으면 여기서 생성)"""
     persona = SPECIES_META.get(species, SPECIES_META[DEFAULT_SPECIES])["persona"]
     style = infer_style(user_text)
-    opening = empathy_opening(user_text)
+    if opening is None:
+        opening = await empathy_opening(user_text)
     memes = ", ".join(pick_memes(1))
-    raw = (DAILY_PROMPT | llm).invoke({
+    raw = (await (DAILY_PROMPT | llm.bind(prompt_kind="daily")).ainvoke({
         "style": style, "persona": persona,
         "opening": opening, "meme_hint": memes, "user_text": user_text
-    }).content.strip()
-    s = sanitize(raw)
-    parts = re.split(r'(?<=[.!?])\s+', s)
-    s = " ".join(parts[:2])
-    return s[:100] + ("…" if len(s) > 100 else "")
+    })).content.strip()
+    return finish_daily(raw)
 
 # =============================
 #  3) 식물 모드 (1인칭)
@@ -271,11 +224,11 @@ PLANT_PROMPT = ChatPromptTemplate.from_messages([
     ("human", "Species: {species}\nUser text: {user_text}\nTask: Write in Korean per rules above.")
 ])
 
-def build_plant(species: str, user_text: str, moisture: float = None) -> str:
+async def build_plant(species: str, user_text: str, moisture: float = None) -> str:
     advice = judge_moisture_with_none(moisture)
     meta = SPECIES_META.get(species, SPECIES_META[DEFAULT_SPECIES])
     memes = ", ".join(pick_memes(1))
-    raw = (PLANT_PROMPT | llm).invoke({
+    raw = (await (PLANT_PROMPT | llm.bind(prompt_kind="plant")).ainvoke({
         "persona": meta["persona"],
         "action": advice.action,
         "checklist": ", ".join(advice.checklist),
@@ -283,14 +236,8 @@ def build_plant(species: str, user_text: str, moisture: float = None) -> str:
         "extra_tip": meta.get("extra_tip", ""),
         "meme_hint": memes,
         "species": species, "user_text": user_text
-    }).content.strip()
-    s = _enforce_first_person(sanitize(raw), species)
-    s = _strip_extra_tip_leak(s, meta.get("extra_tip", ""))
-    parts = re.split(r'(?<=[.!?])\s+', s)
-    s = " ".join(parts[:4])
-    if len(s) > 350:
-        s = s[:350].rstrip() + "…"
-    return _tidy_korean(s)
+    })).content.strip()
+    return finish_plant(raw, species)
 
 # =============================
 #  4) 하이브리드 모드
@@ -312,24 +259,14 @@ HYBRID_PROMPT = ChatPromptTemplate.from_messages([
     ("human", "Species: {species}\nUser text: {user_text}\nTask: Write in Korean per rules above.")
 ])
 
-def _enforce_hybrid_pov(text: str, species: str) -> str:
-    parts = re.split(r'(?<=[.!?])\s+', sanitize(text))
-    if not parts:
-        return text
-    first = parts[0]
-    # 오프닝(사람 관점)에서 1인칭 제거
-    first = re.sub(r"\b(나는|난|내가|내 )", "", first).strip()
-    tail = " ".join(parts[1:])
-    tail = _enforce_first_person(tail, species) if tail else ""
-    s = (first + ("" if first.endswith(('.', '!', '?')) else ".") + (" " + tail if tail else "")).strip()
-    return _tidy_korean(s)
-
-def build_hybrid(species: str, user_text: str, moisture_guess: float = None) -> str:
-    opening = empathy_opening(user_text)
+async def build_hybrid(species: str, user_text: str, moisture_guess: float = None, opening: Optional[str] = None) -> str:
+    """opening: 미리 만든 공감 오프닝 (없으면 여기서 생성)"""
+    if opening is None:
+        opening = await empathy_opening(user_text)
     advice = judge_moisture_with_none(moisture_guess)
     meta = SPECIES_META.get(species, SPECIES_META[DEFAULT_SPECIES])
     memes = ", ".join(pick_memes(1))
-    raw = (HYBRID_PROMPT | llm).invoke({
+    raw = (await (HYBRID_PROMPT | llm.bind(prompt_kind="hybrid")).ainvoke({
         "opening": opening,
         "action": advice.action,
         "checklist": ", ".join(advice.checklist),
@@ -337,13 +274,320 @@ def build_hybrid(species: str, user_text: str, moisture_guess: float = None) ->
         "extra_tip": meta.get("extra_tip", ""),
         "meme_hint": memes,
         "species": species, "user_text": user_text, "persona": meta["persona"]
-    }).content.strip()
-    s = _enforce_hybrid_pov(raw, species)
-    parts = re.split(r'(?<=[.!?])\s+', s)
-    s = " ".join(parts[:4])
-    if len(s) > 300:
-        s = s[:300].rstrip() + "…"
-    return _tidy_korean(s)
+    })).content.strip()
+    return finish_hybrid(raw, species)
+
+# =============================
+#  5) 구조화 출력 (오프닝 + 본문을 한 번의 호출로)
+#   - JSON {"opener", "body"}를 요청하고 길이/문장 수/시점 규칙을 로컬에서 검증
+#   - 검증 실패 시 오류 내용을 붙여 1회만 재요청, 그래도 실패하면 기존 정규식 보정으로 마무리
+# =============================
+class ReplyDraft(BaseModel):
+    opener: str = ""
+    body: str
+
+
+@dataclass(frozen=True)
+class ReplySpec:
+    opener_rule: str
+    body_rule: str
+    opener_max: int          # 0이면 오프닝 없음
+    body_max: int
+    body_sentences: Tuple[int, int]
+    body_first_person: bool
+
+
+REPLY_SPECS = {
+    "daily": ReplySpec(
+        opener_rule="exactly 1 sentence empathizing with/acknowledging the user (lightly vary it), max 45 chars",
+        body_rule="exactly 1 sentence with a subtle quip/meme to lift the mood, max 55 chars. "
+                  "Do NOT mention plant care/watering/numbers/checklists",
+        opener_max=45, body_max=55, body_sentences=(1, 1), body_first_person=False,
+    ),
+    "plant": ReplySpec(
+        opener_rule='empty string "" (no greetings or self-introduction)',
+        body_rule="speak as the user's houseplant in first person (나/내) only. 3~4 sentences, max 350 chars. "
+                  "Current state + care guidance with Action/Checklist/Caution, concise",
+        opener_max=0, body_max=350, body_sentences=(3, 4), body_first_person=True,
+    ),
+    "hybrid": ReplySpec(
+        opener_rule="exactly 1 sentence empathizing with the user's daily life from a human viewpoint "
+                    "(NOT as the plant, no first person, no greetings), max 45 chars",
+        body_rule="switch to the plant's first person (나/내): 2~3 sentences with state + care, max 250 chars",
+        opener_max=45, body_max=250, body_sentences=(2, 3), body_first_person=True,
+    ),
+}
+
+STRUCTURED_SYSTEM = """Return ONLY a JSON object: {{"opener": "...", "body": "..."}}
+- All text strictly in Korean. Max 1 emoji in total. Style: {style}. Persona: {persona} (tone only).
+- opener: {opener_rule}.
+- body: {body_rule}.
+- Optional 0~1 light meme/quip from the candidates.
+- 'extra_tip' is a tone hint; NEVER output it."""
+
+STRUCTURED_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", STRUCTURED_SYSTEM),
+    ("system", "{context}"),
+    ("system", "Tone hint (DO NOT OUTPUT): {extra_tip}"),
+    ("system", "Meme candidates: {meme_hint}"),
+    ("human", "Species: {species}\nUser text: {user_text}\nTask: Return the JSON object only."),
+])
+
+# OpenAI JSON 모드 (응답이 항상 JSON 객체)
+_json_llm = llm.bind(response_format={"type": "json_object"}, prompt_kind="structured")
+
+def _sentences(text: str) -> list:
+    return [p for p in SENTENCE_SPLIT.split(text.strip()) if p]
+
+
+def _parse_draft(raw: str) -> Tuple[Optional[ReplyDraft], List[str]]:
+    try:
+        return ReplyDraft(**json.loads(raw)), []
+    except Exception:
+        return None, ["output must be a JSON object with string fields 'opener' and 'body'"]
+
+
+def validate_draft(mode: str, draft: ReplyDraft, extra_tip: str = "") -> List[str]:
+    """규칙 위반 목록 (비어 있으면 통과)"""
+    spec = REPLY_SPECS[mode]
+    errors = []
+    opener, body = draft.opener.strip(), draft.body.strip()
+    if spec.opener_max:
+        if not opener:
+            errors.append("opener is empty")
+        elif len(opener) > spec.opener_max:
+            errors.append(f"opener is {len(opener)} chars (max {spec.opener_max})")
+        elif len(_sentences(opener)) > 1:
+            errors.append("opener must be exactly 1 sentence")
+        if mode == "hybrid" and has_first_person(opener):
+            errors.append("opener must not use the plant's first person")
+    if not body:
+        errors.append("body is empty")
+    else:
+        if len(body) > spec.body_max:
+            errors.append(f"body is {len(body)} chars (max {spec.body_max})")
+        lo, hi = spec.body_sentences
+        n = len(_sentences(body))
+        if not lo <= n <= hi:
+            errors.append(f"body has {n} sentences (need {lo}~{hi})")
+        if spec.body_first_person and not has_first_person(body):
+            errors.append("body must be in the plant's first person (나/내)")
+    if extra_tip and extra_tip in f"{opener} {body}":
+        errors.append("the tone hint (extra_tip) must not appear in the output")
+    return errors
+
+
+def _join_draft(mode: str, draft: ReplyDraft) -> str:
+    opener = sanitize(draft.opener)
+    body = sanitize(draft.body)
+    if not REPLY_SPECS[mode].opener_max or not opener:
+        return tidy_korean(body)
+    if not re.search(r"[.!?]$", opener):
+        opener += "."
+    return tidy_korean(f"{opener} {body}")
+
+
+def _reply_inputs(mode: str, species: str, user_text: str, moisture: Optional[float], spec: ReplySpec, meta: dict) -> dict:
+    """구조화/스트리밍 프롬프트 공통 입력"""
+    if mode == "daily":
+        context = "Context: the user's daily life. No plant care content."
+    else:
+        advice = judge_moisture_with_none(moisture)
+        context = (
+            f"Action: {advice.action}\n"
+            f"Checklist: {', '.join(advice.checklist)}\n"
+            f"Caution: {advice.caution}"
+        )
+    return {
+        "style": infer_style(user_text),
+        "persona": meta["persona"],
+        "opener_rule": spec.opener_rule,
+        "body_rule": spec.body_rule,
+        "context": context,
+        "extra_tip": meta.get("extra_tip", ""),
+        "meme_hint": ", ".join(pick_memes(1)),
+        "species": species,
+        "user_text": user_text,
+    }
+
+
+async def build_reply(mode: str, species: str, user_text: str, moisture: Optional[float] = None) -> str:
+    """
+    오프닝 + 본문을 구조화 출력 1회로 생성 (검증 실패 시 1회 재시도)
+    build_daily/build_plant/build_hybrid(오프닝 호출 포함 2회)와 같은 형태의 답장을 돌려줍니다.
+    """
+    spec = REPLY_SPECS[mode]
+    meta = SPECIES_META.get(species, SPECIES_META[DEFAULT_SPECIES])
+    extra_tip = meta.get("extra_tip", "")
+    messages = STRUCTURED_PROMPT.format_messages(**_reply_inputs(mode, species, user_text, moisture, spec, meta))
+
+    raw = (await _json_llm.ainvoke(messages)).content.strip()
+    draft, errors = _parse_draft(raw)
+    if draft is not None:
+        errors = validate_draft(mode, draft, extra_tip)
+    if errors:
+        retry = messages + [
+            ("ai", raw),
+            ("human", "The JSON violated these rules: " + "; ".join(errors)
+             + ". Fix them and return the corrected JSON object only."),
+        ]
+        raw = (await _json_llm.ainvoke(retry, prompt_kind="structured_retry")).content.strip()
+        draft, errors = _parse_draft(raw)
+        if draft is not None:
+            errors = validate_draft(mode, draft, extra_tip)
+    if not errors:
+        return _join_draft(mode, draft)
+
+    # 재시도 후에도 규칙 위반 → 기존 보정 로직으로 마무리 (추가 호출 없음)
+    text = raw if draft is None else f"{draft.opener} {draft.body}".strip()
+    return finish_reply(mode, text, species)
+
+# =============================
+#  6) 스트리밍 (문장 단위 후처리)
+#   - 구조화 출력과 같은 규칙을 평문으로 요청해 astream으로 받고,
+#     문장 경계마다 금칙어/이모지/1인칭/길이 보정을 적용해 바로 내보냄
+# =============================
+STREAM_SYSTEM = """Output plain Korean text only (no JSON, no labels).
+- First the opener, then the body, as continuous sentences. Max 1 emoji in total.
+- Style: {style}. Persona: {persona} (tone only).
+- opener: {opener_rule}.
+- body: {body_rule}.
+- Optional 0~1 light meme/quip from the candidates.
+- 'extra_tip' is a tone hint; NEVER output it."""
+
+STREAM_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", STREAM_SYSTEM),
+    ("system", "{context}"),
+    ("system", "Tone hint (DO NOT OUTPUT): {extra_tip}"),
+    ("system", "Meme candidates: {meme_hint}"),
+    ("human", "Species: {species}\nUser text: {user_text}\nTask: Write the reply in Korean per rules above."),
+])
+
+# 모드별 (최대 문장 수, 최대 글자 수) - 배치 후처리(postprocess.finish)와 같은 한도
+STREAM_LIMITS = FINISH_LIMITS
+
+_EMOJI_RE = re.compile(r"[\u2600-\u27BF\U0001F300-\U0001FAFF]")
+_STREAM_BOUNDARY = re.compile(r"(?<=[.!?…])\s+")
+
+
+class SentenceStreamer:
+    """
+    토큰 조각을 받아 완성된 문장만 후처리해 돌려줌
+    - sanitize: 금칙어 제거, 이모지는 답장 전체에서 1개만
+    - plant: 모든 문장 1인칭 보정, 첫 문장에 1인칭이 없으면 '나는' 삽입
+      (첫 문장이 '안녕!'처럼 인사말뿐이면 다음 문장과 합쳐 보정 → 배치와 같은 '안녕! 나는 …')
+    - hybrid: 첫 문장(오프닝)은 1인칭 제거, 둘째 문장부터 plant와 같은 보정
+    - 문장 수/글자 수 한도를 넘으면 잘라내고 이후 조각은 무시
+    """
+
+    def __init__(self, mode: str, species: str) -> None:
+        self.mode = mode
+        self.species = species
+        self.rewriter = rewriter_for(species)  # 품종별 사전 컴파일 규칙
+        self.max_sentences, self.max_chars = STREAM_LIMITS[mode]
+        self.buffer = ""
+        self.sentences: List[str] = []
+        self.count = 0          # 문장 수 (합쳐 낸 인사말 포함)
+        self.length = 0
+        self.emoji_used = False
+        self.closed = False
+        self.greeting = ""      # 다음 문장과 합칠 인사말
+        self.greeting_held = False
+
+    def feed(self, chunk: str) -> List[str]:
+        if self.closed:
+            return []
+        self.buffer += chunk
+        parts = _STREAM_BOUNDARY.split(self.buffer)
+        self.buffer = parts.pop()
+        return [out for out in (self._emit(p) for p in parts) if out]
+
+    def finish(self) -> List[str]:
+        rest, self.buffer = self.buffer, ""
+        if not rest.strip() and self.greeting:
+            # 인사말 뒤에 문장이 없으면 인사말만 보정해서 내보냄
+            rest, self.greeting = self.greeting, ""
+        out = self._emit(rest) if rest.strip() and not self.closed else None
+        self.closed = True
+        return [out] if out else []
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.sentences)
+
+    def _limit_emoji(self, s: str) -> str:
+        if _EMOJI_RE.search(s) is None:
+            return s
+        out = []
+        for ch in s:
+            if _EMOJI_RE.match(ch):
+                if self.emoji_used:
+                    continue
+                self.emoji_used = True
+            out.append(ch)
+        return "".join(out)
+
+    def _emit(self, sentence: str) -> Optional[str]:
+        if self.closed:
+            return None
+        index = len(self.sentences)
+        first_plant_sentence = self.mode in ("plant", "hybrid") and index == (1 if self.mode == "hybrid" else 0)
+        if first_plant_sentence and not self.greeting_held and is_greeting_only(sentence):
+            self.greeting_held = True
+            self.greeting = sentence.strip()
+            return None
+        merged = 0
+        if self.greeting:
+            sentence, self.greeting, merged = f"{self.greeting} {sentence}", "", 1
+
+        s = sentence
+        for bad in BANNED_WORDS:
+            s = s.replace(bad, "")
+        s = " ".join(self._limit_emoji(s).split())
+        s = self.rewriter.strip_tip(s)
+        if self.mode == "hybrid" and index == 0:
+            s = drop_first_person(s)
+        elif self.mode in ("plant", "hybrid"):
+            if first_plant_sentence:
+                s = self.rewriter.first_person(s)
+            else:
+                s = self.rewriter.rewrite(s)
+        s = tidy_korean(s)
+        if not s:
+            return None
+
+        room = self.max_chars - self.length - (1 if self.sentences else 0)
+        if len(s) > room:
+            s = s[:max(room, 0)]
+            s = (s if self.mode == "daily" else s.rstrip()) + "…"  # 배치(_clip)와 같은 자르기
+            self.closed = True
+        self.sentences.append(s)
+        self.count += 1 + merged
+        self.length += len(s) + (1 if index else 0)
+        if self.count >= self.max_sentences:
+            self.closed = True
+        return s
+
+
+async def stream_reply(
+    mode: str, species: str, user_text: str, moisture: Optional[float] = None
+) -> AsyncIterator[str]:
+    """답장을 후처리된 문장 단위로 생성 (LLM 호출 1회, astream)"""
+    spec = REPLY_SPECS[mode]
+    meta = SPECIES_META.get(species, SPECIES_META[DEFAULT_SPECIES])
+    streamer = SentenceStreamer(mode, species)
+    stream = (STREAM_PROMPT | llm.bind(prompt_kind="stream")).astream(_reply_inputs(mode, species, user_text, moisture, spec, meta))
+    try:
+        async for chunk in stream:
+            for sentence in streamer.feed(chunk.content or ""):
+                yield sentence
+            if streamer.closed:
+                # 한도를 채웠으면 나머지 생성은 받지 않음
+                return
+        for sentence in streamer.finish():
+            yield sentence
+    finally:
+        await stream.aclose()
 
 # 내보낼 심볼
 __all__ = [
@@ -354,4 +598,8 @@ __all__ = [
     "build_daily",
     "build_plant",
     "build_hybrid",
+    "build_reply",
+    "validate_draft",
+    "stream_reply",
+    "SentenceStreamer",
 ]
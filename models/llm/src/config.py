@@ -1,10 +1,42 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # OpenAI 설정
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_BASE_URL: Optional[str] = None   # OpenAI 호환 서버 주소 (가짜 서버: http://127.0.0.1:5055/v1)
     DEFAULT_SPECIES: str = "몬스테라"
+    # detect_mode 확신도가 이 값 미만일 때만 LLM 리플렉션 실행 (0이면 끔, 1 초과면 항상 실행)
+    REFLECT_CONFIDENCE_THRESHOLD: float = 0.75
+    # 오프닝+본문을 JSON 구조화 출력 한 번으로 생성 (False면 오프닝 호출 후 본문 호출)
+    STRUCTURED_REPLY: bool = True
+
+    # 답장 캐시 (src/cache.py)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_TTL: float = 6 * 3600           # 항목 유지 시간(초)
+    LLM_CACHE_VARIANTS: int = 3                # 키마다 모아 둘 답장 변형 수
+    LLM_CACHE_FRESH_RATE: float = 0.3          # 변형이 덜 모였을 때 새로 생성할 확률
+    LLM_CACHE_SEMANTIC: bool = False           # 임베딩 유사도 조회 사용
+    LLM_CACHE_SIM_THRESHOLD: float = 0.92
+    LLM_EMBED_MODEL: str = "text-embedding-3-small"
+
+    # LLM 게이트웨이 (src/gateway.py) - 분당 한도는 OpenAI 계정 등급에 맞춰 설정, 0이면 제한 없음
+    LLM_GATEWAY_ENABLED: bool = True
+    LLM_RPM: float = 500                      # 분당 요청 수
+    LLM_TPM: float = 200000                   # 분당 토큰 수 (프롬프트 + 완성)
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_MAX_RETRIES: int = 3                  # 429 재시도 횟수 (게이트웨이에서 한 번에 처리)
+    LLM_RETRY_BACKOFF: float = 1.0            # Retry-After가 없을 때 기본 대기(초), 지수 증가
+    LLM_COALESCE: bool = True                 # 동시에 들어온 같은 프롬프트는 호출 1회 공유
+    LLM_CHARS_PER_TOKEN: float = 1.5          # 프롬프트 토큰 추정용 (한글 위주)
+    LLM_EST_COMPLETION_TOKENS: int = 300      # 입장 시 미리 차감할 완성 토큰 (응답 후 실제 값으로 정산)
+
+    # 로컬 가짜 LLM (API 키/비용 없이 경로 점검용)
+    LLM_FAKE: bool = False
+    LLM_FAKE_LATENCY: float = 0.3
 
     # MySQL DB 설정 (ERD의 실제 DB 구조에 맞춤)
     MYSQL_HOST: str = "127.0.0.1"
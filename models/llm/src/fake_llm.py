@@ -0,0 +1,159 @@
+# src/fake_llm.py
+"""
+로컬 가짜 LLM / 임베딩 (LLM_FAKE=true)
+
+API 키나 비용 없이 오케스트레이터·캐시·스트리밍 경로를 돌려 보기 위한 모델입니다.
+프롬프트 종류(리플렉션 / 구조화 출력 / 평문)를 시스템 메시지로 구분해 규칙을 만족하는 답을 돌려주고,
+호출 수를 세어 캐시 효과를 확인할 수 있게 합니다.
+prompt_template / canned_reply는 HTTP 가짜 서버(fake_server.py)와 함께 씁니다.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_CALLS: Dict[str, int] = {"invoke": 0, "stream": 0}
+
+_OPENERS = ["오늘 하루 정말 고생 많았어.", "그랬구나, 많이 지쳤겠다.", "마음 쓰였겠다, 토닥토닥."]
+_DAILY_BODIES = ["치킨각으로 기분 풀자!", "오늘은 힐링타임 각이야!", "텐션 올려서 내일 또 가보자!"]
+_PLANT_BODIES = [
+    "나는 지금 흙 상태를 살피는 중이야. 겉흙이 마르면 물을 조금씩 줘. 잎 끝 색도 한 번 봐줘.",
+    "나는 요즘 잎을 열심히 키우고 있어. 물은 겉흙이 마른 뒤에 줘. 통풍도 잊지 말아줘.",
+]
+_HYBRID_BODIES = [
+    "나는 물이 조금 필요해. 겉흙이 마르면 조금씩 줘.",
+    "나는 네 옆에서 잘 버티는 중이야. 흙이 마르면 물 한 컵이면 충분해.",
+]
+
+
+def fake_call_counts() -> Dict[str, int]:
+    return dict(_CALLS)
+
+
+def reset_fake_call_counts() -> None:
+    for key in _CALLS:
+        _CALLS[key] = 0
+
+
+def _text(messages: List[BaseMessage], kind: str) -> str:
+    return "\n".join(str(m.content) for m in messages if m.type == kind)
+
+
+def _usage(messages: List[BaseMessage], text: str) -> Dict[str, int]:
+    """게이트웨이 토큰 지표용 대략적인 사용량 (한글 약 1.5자 = 1토큰)"""
+    prompt = math.ceil(sum(len(str(m.content)) for m in messages) / 1.5)
+    completion = math.ceil(len(text) / 1.5)
+    return {"input_tokens": prompt, "output_tokens": completion, "total_tokens": prompt + completion}
+
+
+def prompt_template(system: str) -> str:
+    """시스템 프롬프트로 프롬프트 종류 판별: reflect / opening / structured / text"""
+    if "mode reviewer" in system:
+        return "reflect"
+    if "empathy opener" in system:
+        return "opening"
+    if "Return ONLY a JSON object" in system:
+        return "structured"
+    return "text"
+
+
+def reply_mode(system: str) -> str:
+    """답장 프롬프트의 모드: daily / plant / hybrid"""
+    if "human viewpoint" in system:
+        return "hybrid"
+    if 'empty string ""' in system or "houseplant" in system:
+        return "plant"
+    return "daily"
+
+
+def canned_reply(system: str, human: str, rng: Any = random) -> str:
+    """프롬프트 종류/모드별 고정 문장 조합 (rng를 고정하면 결정적)"""
+    template = prompt_template(system)
+    if template == "reflect":
+        m = re.search(r"first_mode:\s*(\w+)", human)
+        return json.dumps({"final_mode": m.group(1) if m else "daily", "confidence": 0.9, "reasons": "fake"})
+    if template == "opening":
+        return rng.choice(_OPENERS)
+
+    mode = reply_mode(system)
+    if mode == "hybrid":
+        opener, body = rng.choice(_OPENERS), rng.choice(_HYBRID_BODIES)
+    elif mode == "plant":
+        opener, body = "", rng.choice(_PLANT_BODIES)
+    else:
+        opener, body = rng.choice(_OPENERS), rng.choice(_DAILY_BODIES)
+    if template == "structured":
+        return json.dumps({"opener": opener, "body": body}, ensure_ascii=False)
+    return f"{opener} {body}".strip()
+
+
+class FakePlantChatModel(BaseChatModel):
+    """프롬프트 형식에 맞춰 고정 문장 조합을 돌려주는 가짜 채팅 모델"""
+
+    latency: float = 0.3     # 호출당 지연(초), 스트리밍은 조각마다 나눠서 대기
+    chunk_size: int = 4
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-plant"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        return canned_reply(_text(messages, "system"), _text(messages, "human"))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        _CALLS["invoke"] += 1
+        text = self._reply(messages)
+        message = AIMessage(content=text, usage_metadata=_usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+    def _pieces(self, messages: List[BaseMessage]) -> List[str]:
+        text = self._reply(messages)
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        _CALLS["stream"] += 1
+        for piece in self._pieces(messages):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        _CALLS["stream"] += 1
+        pieces = self._pieces(messages)
+        for i, piece in enumerate(pieces):
+            await asyncio.sleep(self.latency / max(len(pieces), 1))
+            # 사용량은 마지막 조각에 실음 (OpenAI stream_usage와 같음)
+            usage = _usage(messages, "".join(pieces)) if i == len(pieces) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+
+class NgramEmbeddings(Embeddings):
+    """글자 2-gram 해시 벡터 (비슷한 문장은 코사인 유사도가 높게 나옴)"""
+
+    def __init__(self, size: int = 256) -> None:
+        self.size = size
+
+    def embed_query(self, text: str) -> List[float]:
+        vec = [0.0] * self.size
+        s = text.replace(" ", "")
+        for i in range(len(s) - 1):
+            h = int(hashlib.md5(s[i:i + 2].encode("utf-8")).hexdigest(), 16)
+            vec[h % self.size] += 1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
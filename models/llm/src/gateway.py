@@ -0,0 +1,428 @@
+# src/gateway.py
+"""
+LLM 게이트웨이 (모든 채팅 모델 호출이 지나는 곳)
+
+- 토큰 버킷 2개(분당 요청 수 LLM_RPM, 분당 토큰 수 LLM_TPM)와 동시 호출 수(LLM_MAX_CONCURRENCY)로 입장 제어
+  · 토큰은 프롬프트 길이로 추정해 먼저 차감하고, 응답의 실제 사용량으로 차액을 정산합니다.
+- 우선순위 대기열: 대화(chat)가 일기 답장(diary) 같은 백그라운드 호출보다 먼저 입장합니다.
+  우선순위는 요청 진입점에서 llm_priority 컨텍스트 변수로 지정합니다.
+- 429(rate limit)는 게이트웨이가 한 번에 처리: 전체 입장을 Retry-After(없으면 지수 증가)만큼 멈추고
+  같은 요청을 LLM_MAX_RETRIES회까지 다시 보냅니다. (클라이언트 자체 재시도는 끔)
+- 같은 프롬프트가 동시에 들어오면 상류 호출 1회를 함께 기다립니다. (스트리밍 제외)
+  기다리던 호출자가 모두 취소되면 상류 호출도 취소합니다.
+- 프롬프트 종류(reflect/opening/structured/stream ...)별 호출 수, 토큰, 지연 시간을 집계합니다.
+"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+from .config import settings
+
+T = TypeVar("T")
+
+PRIORITIES: Dict[str, int] = {"chat": 0, "diary": 10}
+
+# 요청 진입점(/llm 등)에서 지정, 만들어진 asyncio 작업에도 그대로 이어짐
+llm_priority: ContextVar[str] = ContextVar("llm_priority", default="chat")
+
+
+class TokenBucket:
+    """분당 한도 토큰 버킷 (per_minute <= 0이면 무제한)"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 꺼내려면 기다려야 하는 시간(초) (한도보다 큰 요청은 가득 찼을 때 허용)"""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """추정치와 실제 사용량 차이 정산 (음수면 돌려받음, 빚은 다음 입장에서 갚음)"""
+        if not self.unlimited and delta:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+@dataclass
+class KindStats:
+    calls: int = 0              # 상류 호출 수 (재시도 포함)
+    coalesced: int = 0          # 진행 중인 같은 호출에 합류한 수
+    errors: int = 0
+    rate_limited: int = 0       # 429 응답 수
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    wait_total: float = 0.0     # 입장 대기 시간
+
+    def snapshot(self) -> Dict[str, Any]:
+        done = max(self.calls - self.errors - self.rate_limited, 0)
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_latency_ms": round(self.latency_total / done * 1000, 1) if done else 0.0,
+            "max_latency_ms": round(self.latency_max * 1000, 1),
+            "avg_wait_ms": round(self.wait_total / self.calls * 1000, 1) if self.calls else 0.0,
+        }
+
+
+class _Shared:
+    """동시 중복 호출이 함께 기다리는 상류 호출"""
+
+    def __init__(self, task: "asyncio.Task") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    return type(error).__name__ == "RateLimitError" or getattr(error, "status_code", None) == 429
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        coalesce: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests = TokenBucket(settings.LLM_RPM if rpm is None else rpm, clock)
+        self.tokens = TokenBucket(settings.LLM_TPM if tpm is None else tpm, clock)
+        self.max_concurrency = settings.LLM_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = settings.LLM_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.coalesce = settings.LLM_COALESCE if coalesce is None else coalesce
+        self._clock = clock
+        self._waiters: List[Tuple[int, int, "asyncio.Future", float]] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._cooldown_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._shared: Dict[str, _Shared] = {}
+        self._kinds: Dict[str, KindStats] = {}
+
+    # ---------- 입장 제어 ----------
+    def _dispatch(self) -> None:
+        """대기열 앞쪽부터 한도가 허락하는 만큼 입장시킴"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters and self._in_flight < self.max_concurrency:
+            _, _, future, est_tokens = self._waiters[0]
+            if future.done():  # 대기 중 취소됨
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(
+                self._cooldown_until - self._clock(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(est_tokens),
+            )
+            if wait > 0:
+                # 우선순위가 가장 높은 요청이 자리를 얻을 때까지 뒤 요청도 기다림
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(est_tokens)
+            self._in_flight += 1
+            future.set_result(None)
+
+    async def _acquire(self, est_tokens: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        priority = PRIORITIES.get(llm_priority.get(), PRIORITIES["chat"])
+        heapq.heappush(self._waiters, (priority, next(self._seq), future, est_tokens))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(est_tokens, est_tokens)  # 입장 직후 취소
+            raise
+
+    def _release(self, est_tokens: float, used_tokens: float) -> None:
+        self._in_flight -= 1
+        self.tokens.adjust(used_tokens - est_tokens)
+        self._dispatch()
+
+    def _pause(self, error: BaseException, attempt: int) -> float:
+        delay = _retry_after(error) or self.retry_backoff * (2 ** attempt)
+        self._cooldown_until = max(self._cooldown_until, self._clock() + delay)
+        return delay
+
+    # ---------- 호출 ----------
+    def _stats(self, kind: str) -> KindStats:
+        return self._kinds.setdefault(kind, KindStats())
+
+    async def run(
+        self,
+        kind: str,
+        est_tokens: float,
+        call: Callable[[], Awaitable[T]],
+        usage: Callable[[T], Tuple[int, int]],
+        key: Optional[str] = None,
+    ) -> T:
+        """
+        한도 안에서 call() 실행, usage(결과) → (프롬프트 토큰, 완성 토큰)
+        key가 같은 호출이 진행 중이면 합류
+        """
+        if key is None or not self.coalesce:
+            return await self._call(kind, est_tokens, call, usage)
+        shared = self._shared.get(key)
+        if shared is None:
+            shared = _Shared(asyncio.ensure_future(self._call(kind, est_tokens, call, usage)))
+            self._shared[key] = shared
+            shared.task.add_done_callback(lambda _: self._shared.pop(key, None))
+        else:
+            self._stats(kind).coalesced += 1
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            if shared.task.cancelled():
+                raise
+            shared.waiters -= 1
+            if shared.waiters == 0:
+                shared.task.cancel()
+            raise
+
+    async def _call(
+        self,
+        kind: str,
+        est_tokens: float,
+        call: Callable[[], Awaitable[T]],
+        usage: Callable[[T], Tuple[int, int]],
+    ) -> T:
+        stats = self._stats(kind)
+        for attempt in range(self.max_retries + 1):
+            queued = self._clock()
+            await self._acquire(est_tokens)
+            started = self._clock()
+            stats.calls += 1
+            stats.wait_total += started - queued
+            used = est_tokens
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                self._release(est_tokens, used)
+                raise
+            except Exception as e:
+                self._release(est_tokens, used)
+                if _is_rate_limit(e) and attempt < self.max_retries:
+                    stats.rate_limited += 1
+                    delay = self._pause(e, attempt)
+                    print(f"[LLM-GATEWAY] 429 ({kind}), {delay:.1f}초 동안 입장 중지 후 재시도", flush=True)
+                    continue
+                stats.errors += 1
+                raise
+            prompt_tokens, completion_tokens = usage(result)
+            if prompt_tokens or completion_tokens:
+                used = prompt_tokens + completion_tokens
+            self._release(est_tokens, used)
+            self._record(stats, started, prompt_tokens, completion_tokens)
+            return result
+        raise RuntimeError("unreachable")
+
+    async def stream(
+        self,
+        kind: str,
+        est_tokens: float,
+        open_stream: Callable[[], AsyncIterator[T]],
+        usage: Callable[[T], Tuple[int, int]],
+    ) -> AsyncIterator[T]:
+        """스트리밍 호출 (합류 없음, 첫 조각 전에 429가 나면 재시도)"""
+        stats = self._stats(kind)
+        for attempt in range(self.max_retries + 1):
+            queued = self._clock()
+            await self._acquire(est_tokens)
+            started = self._clock()
+            stats.calls += 1
+            stats.wait_total += started - queued
+            prompt_tokens = completion_tokens = 0
+            emitted = False
+            try:
+                async for chunk in open_stream():
+                    p, c = usage(chunk)
+                    prompt_tokens += p
+                    completion_tokens += c
+                    emitted = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                self._release(est_tokens, prompt_tokens + completion_tokens or est_tokens)
+                raise
+            except Exception as e:
+                self._release(est_tokens, est_tokens)
+                if not emitted and _is_rate_limit(e) and attempt < self.max_retries:
+                    stats.rate_limited += 1
+                    delay = self._pause(e, attempt)
+                    print(f"[LLM-GATEWAY] 429 ({kind}), {delay:.1f}초 동안 입장 중지 후 재시도", flush=True)
+                    continue
+                stats.errors += 1
+                raise
+            self._release(est_tokens, prompt_tokens + completion_tokens or est_tokens)
+            self._record(stats, started, prompt_tokens, completion_tokens)
+            return
+
+    def _record(self, stats: KindStats, started: float, prompt_tokens: int, completion_tokens: int) -> None:
+        elapsed = self._clock() - started
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        stats.latency_total += elapsed
+        stats.latency_max = max(stats.latency_max, elapsed)
+
+    # ---------- 관리 ----------
+    def reset_stats(self) -> None:
+        self._kinds.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.requests.per_minute,
+            "tpm": self.tokens.per_minute,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for _, _, future, _ in self._waiters if not future.done()),
+            "coalescing": len(self._shared),
+            "cooldown_s": round(max(self._cooldown_until - self._clock(), 0.0), 2),
+            "kinds": {kind: stats.snapshot() for kind, stats in sorted(self._kinds.items())},
+        }
+
+
+# ---------- 채팅 모델 래퍼 ----------
+def estimate_tokens(messages: List[BaseMessage]) -> float:
+    """프롬프트 토큰 추정 (글자 수 기반) + 완성 토큰 예상치"""
+    chars = sum(len(str(m.content)) for m in messages)
+    return math.ceil(chars / settings.LLM_CHARS_PER_TOKEN) + settings.LLM_EST_COMPLETION_TOKENS
+
+
+def _message_usage(message: Any) -> Tuple[int, int]:
+    meta = getattr(message, "usage_metadata", None) or {}
+    return int(meta.get("input_tokens", 0)), int(meta.get("output_tokens", 0))
+
+
+def _result_usage(result: ChatResult) -> Tuple[int, int]:
+    prompt = completion = 0
+    for generation in result.generations:
+        p, c = _message_usage(generation.message)
+        prompt += p
+        completion += c
+    return prompt, completion
+
+
+def _chunk_usage(chunk: ChatGenerationChunk) -> Tuple[int, int]:
+    return _message_usage(chunk.message)
+
+
+class GatewayChatModel(BaseChatModel):
+    """
+    실제 채팅 모델을 감싸 모든 호출을 게이트웨이로 보내는 모델
+    프롬프트 종류는 llm.bind(prompt_kind="reflect")처럼 지정합니다. (없으면 "other")
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    gateway: Any = None      # None이면 한도/합류 없이 바로 호출
+
+    @property
+    def _llm_type(self) -> str:
+        return f"gateway-{self.inner._llm_type}"
+
+    def _key(self, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> str:
+        payload = [
+            self.inner._llm_type,
+            self.inner._identifying_params,
+            stop,
+            kwargs,
+            [(m.type, m.content) for m in messages],
+        ]
+        return hashlib.sha1(
+            json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def _generate(self, messages, stop=None, run_manager=None, prompt_kind: str = "other", **kwargs: Any) -> ChatResult:
+        # 동기 경로는 게이트웨이를 거치지 않음 (서버는 비동기 호출만 사용)
+        return self.inner._generate(messages, stop=stop, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, prompt_kind: str = "other", **kwargs: Any) -> ChatResult:
+        if self.gateway is None:
+            return await self.inner._agenerate(messages, stop=stop, **kwargs)
+        return await self.gateway.run(
+            prompt_kind,
+            estimate_tokens(messages),
+            lambda: self.inner._agenerate(messages, stop=stop, **kwargs),
+            _result_usage,
+            key=self._key(messages, stop, kwargs),
+        )
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, prompt_kind: str = "stream", **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if self.gateway is None:
+            stream = self.inner._astream(messages, stop=stop, **kwargs)
+        else:
+            stream = self.gateway.stream(
+                prompt_kind,
+                estimate_tokens(messages),
+                lambda: self.inner._astream(messages, stop=stop, **kwargs),
+                _chunk_usage,
+            )
+        try:
+            async for chunk in stream:
+                if run_manager is not None and chunk.message.content:
+                    await run_manager.on_llm_new_token(str(chunk.message.content), chunk=chunk)
+                yield chunk
+        finally:
+            await stream.aclose()
+
+
+# 싱글톤 인스턴스 (LLM_GATEWAY_ENABLED=False면 None)
+gateway: Optional[LLMGateway] = LLMGateway() if settings.LLM_GATEWAY_ENABLED else None
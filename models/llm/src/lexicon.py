@@ -0,0 +1,138 @@
+# src/lexicon.py
+"""
+키워드/밈 트리거 사전 + 다중 패턴 매처 (Aho-Corasick)
+
+모드 판별 키워드(STRICT/SOFT/LIFE)와 밈 트리거·회피 단어를 범주별로 모아
+임포트 시 오토마톤 하나로 컴파일합니다. scan(text)은 문장을 한 번만 훑어
+범주별로 일치한 단어 집합을 돌려줍니다. (부분 문자열 일치, 겹치는 일치 포함)
+사전에 품종/신조어를 추가해도 판별 비용은 문장 길이에만 비례합니다.
+"""
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set, Tuple
+
+# =============================
+#  모드 판별 키워드 (분리: STRICT / SOFT / LIFE)
+#   - STRICT: 식물 맥락에서만 거의 쓰이는 강신호
+#   - SOFT  : 일상과 겹치기 쉬운 약신호 (단독으로 plant 유도 X)
+#   - LIFE  : 일상/감정/직장/학업 등
+# =============================
+PLANT_KEYWORDS_STRICT = {
+    # 관리/환경/증상(식물 전용 신호)
+    "물","급수","흙","토양","분갈이","분무","습도","광","빛","통풍","배수","과습","건조",
+    "잎","줄기","뿌리","시들","갈변","처짐",
+    # 품종명
+    "몬스테라","스투키","산세베리아","금전수","선인장","호접란",
+    "테이블야자","홍콩야자","스파티필럼","관음죽",
+    "벵갈고무나무","올리브나무","디펜바키아","보스턴고사리",
+}
+PLANT_KEYWORDS_SOFT = {
+    # 애매한 상태 표현(일상과도 겹침 → 단독 사용 금지)
+    "아프","괜찮","상태","건강","힘들","죽","살아"
+}
+LIFE_KEYWORDS = {
+    # 일상/감정/직장/학업/교통 등 (확장)
+    "배고프","밥","야근","퇴근","피곤","스트레스","회의","상사","회사","출근","퇴사",
+    "프로젝트","지각","버스","지하철","시험","월급","연애","날씨","멘붕","짜증","우울",
+    "기분","털림","멘탈","힘듦","화남","화가","짜증남","슬픔","분노","걱정","불안","짜증남"
+}
+
+# =============================
+#  밈 트리거/회피 단어 (utils.MEME_CATALOG가 범주 이름으로 참조)
+# =============================
+FOOD_WORDS = ("먹","맛","배고프","밥","야식","점심","저녁","간식","치킨","피자","라면","카페","디저트","떡볶이","맛집","비주얼","사진","음식")
+CRY_WORDS  = ("울","눈물","펑펑","멘탈","버티","괜찮","힘들","위로","다독","침착","진정")
+WOW_WORDS  = ("헉","헐","대박","충격","와우","미쳤","엄청","어마어마","쏟아","폭발","신상","행사","혜택","할인","몰아","왕창")
+BRAINROT_WORDS = ("멘붕","현타","뇌절","멍","지루","집중안","아무말","정신없","혼돈","카혼란","카오스")
+
+# 민감/엄숙 토픽: 밈 전면 회피
+SERIOUS_WORDS = ("장례","상중","사망","부고","병원","중환자","수술","우울증","공황","상처","폭력","학대")
+
+VOCABULARY: Dict[str, Iterable[str]] = {
+    "plant_strict": PLANT_KEYWORDS_STRICT,
+    "plant_soft": PLANT_KEYWORDS_SOFT,
+    "life": LIFE_KEYWORDS,
+    "serious": SERIOUS_WORDS,
+    "meme.food": FOOD_WORDS,
+    "meme.food_visual": ("비주얼","탐난다","먹음직","군침"),
+    "meme.cry": CRY_WORDS,
+    "meme.grace": ("기품","우아","퀸","여왕","품위"),
+    "meme.wow": WOW_WORDS,
+    "meme.plenty": ("넘친","한가득","산더미","빽빽","우수수","쇄도"),
+    "meme.brainrot": BRAINROT_WORDS,
+    "meme.beat": ("반복","중독","퉁","둥둥","북소리"),
+    "meme.formal": ("사과","정중","사실관계","고충접수"),
+    "meme.abuse": ("타인비하","가스라이팅"),
+}
+
+Hits = Dict[str, FrozenSet[str]]
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+class KeywordAutomaton:
+    """
+    범주별 단어 목록을 하나로 합친 Aho-Corasick 오토마톤
+    실패 링크를 미리 따라가 둔 전이표(없는 전이는 루트)와 상태별 출력 집합을 만들어
+    scan은 글자마다 dict 조회 한 번으로 진행합니다. 대소문자는 구분하지 않습니다(casefold).
+    """
+
+    def __init__(self, vocabulary: Mapping[str, Iterable[str]]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[Tuple[str, str]]] = [set()]
+        for category, words in vocabulary.items():
+            for word in words:
+                key = word.casefold()
+                if not key:
+                    continue
+                state = 0
+                for ch in key:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append(set())
+                    state = nxt
+                outputs[state].add((category, word))
+
+        # BFS로 실패 링크 계산 + 전이표 완성 (루트로 가는 전이는 생략)
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            outputs[state] |= outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs: List[Tuple[Tuple[str, str], ...]] = [tuple(out) for out in outputs]
+        self.categories = tuple(vocabulary)
+        self.size = len(goto)
+
+    def scan(self, text: str) -> Hits:
+        """범주 → 일치한 단어 집합 (일치가 없는 범주는 빠짐)"""
+        delta, outputs = self._delta, self._outputs
+        found: Set[Tuple[str, str]] = set()
+        state = 0
+        for ch in (text or "").casefold():
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        hits: Dict[str, Set[str]] = {}
+        for category, word in found:
+            hits.setdefault(category, set()).add(word)
+        return {category: frozenset(words) for category, words in hits.items()}
+
+
+# 임포트 시 1회 컴파일
+AUTOMATON = KeywordAutomaton(VOCABULARY)
+
+
+def scan(text: str) -> Hits:
+    return AUTOMATON.scan(text)
+
+
+def hit_words(hits: Hits, category: str) -> FrozenSet[str]:
+    return hits.get(category, _EMPTY)
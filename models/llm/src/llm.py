@@ -1,14 +1,40 @@
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from .config import settings
+from .gateway import GatewayChatModel, gateway
 
-llm = ChatOpenAI(
-    model=settings.OPENAI_MODEL,
-    temperature=0.7,
-    api_key=settings.OPENAI_API_KEY
-)
-
-judge_llm = ChatOpenAI(
-    model=settings.OPENAI_MODEL,
-    temperature=0.2,
-    api_key=settings.OPENAI_API_KEY
-)
+if settings.LLM_FAKE:
+    # 로컬 가짜 모델 (API 호출 없음)
+    from .fake_llm import FakePlantChatModel, NgramEmbeddings
+
+    base_llm = FakePlantChatModel(latency=settings.LLM_FAKE_LATENCY)
+    base_judge_llm = base_llm
+    embeddings = NgramEmbeddings()
+else:
+    # 429 재시도는 게이트웨이가 전체 입장을 멈추고 한 번에 처리하므로 클라이언트 재시도는 끔
+    base_llm = ChatOpenAI(
+        model=settings.OPENAI_MODEL,
+        temperature=0.7,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_retries=0 if gateway else 2,
+        stream_usage=True
+    )
+
+    base_judge_llm = ChatOpenAI(
+        model=settings.OPENAI_MODEL,
+        temperature=0.2,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_retries=0 if gateway else 2
+    )
+
+    # 의미 유사 캐시(LLM_CACHE_SEMANTIC)용
+    embeddings = OpenAIEmbeddings(
+        model=settings.LLM_EMBED_MODEL,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL
+    )
+
+# 모든 호출은 게이트웨이(한도/우선순위/중복 합류/지표)를 거침
+llm = GatewayChatModel(inner=base_llm, gateway=gateway)
+judge_llm = GatewayChatModel(inner=base_judge_llm, gateway=gateway)
@@ -0,0 +1,78 @@
+# src/loop_monitor.py
+"""
+이벤트 루프 지연 측정
+
+interval마다 깨어나도록 잠든 뒤 실제로 깨어난 시각과의 차이(지연)를 기록합니다.
+동기 호출(파일/DB/CPU 작업 등)이 루프를 막으면 지연이 커지므로,
+부하 테스트(loadtest.py) 전후 스냅샷으로 오케스트레이션 변경이 루프를 막는지 확인합니다.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+def percentile(values, q: float) -> float:
+    """최근접 순위 백분위수 (values가 비면 0)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), int(-(-q * len(ordered) // 100))))
+    return ordered[rank - 1]
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.05, block_threshold: float = 0.1, window: int = 2000) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.reset()
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self.ticks = 0
+        self.blocked = 0            # block_threshold 이상 막힌 횟수
+        self.blocked_total = 0.0    # 막힌 시간 합(초)
+        self.max_lag = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self.ticks += 1
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.block_threshold:
+                self.blocked += 1
+                self.blocked_total += lag
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "ticks": self.ticks,
+            "p50_ms": round(percentile(self._samples, 50) * 1000, 2),
+            "p99_ms": round(percentile(self._samples, 99) * 1000, 2),
+            "max_ms": round(self.max_lag * 1000, 2),
+            "blocked": self.blocked,
+            "blocked_ms": round(self.blocked_total * 1000, 1),
+            "block_threshold_ms": self.block_threshold * 1000,
+        }
+
+
+# 싱글톤 인스턴스 (모델 서버 시작 시 start)
+loop_monitor = LoopLagMonitor()
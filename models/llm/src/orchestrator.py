@@ -1,12 +1,16 @@
 # src/orchestrator.py
-from typing import Optional, Literal
+import asyncio
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Literal
 from pydantic import BaseModel
 
 # detect_mode + reflect_mode(리플렉션) 모두 사용
-from .chat_logic import detect_mode, reflect_mode, build_daily, build_plant, build_hybrid
+from .chat_logic import detect_mode, reflect_mode, empathy_opening, build_daily, build_plant, build_hybrid, build_reply, stream_reply
 from .rules import judge_moisture, judge_moisture_with_none
 from .species_meta import DEFAULT_SPECIES
 from .utils import sanitize
+from .config import settings
+from .cache import reply_cache
 
 
 class TalkResult(BaseModel):
@@ -16,45 +20,216 @@ class TalkResult(BaseModel):
     reply: str
 
 
-def plant_talk(species: str, user_text: str, moisture: Optional[float] = None) -> TalkResult:
+# 리플렉션 실행/생략/모드 변경 횟수
+_REFLECT_STATS = {"reflected": 0, "skipped": 0, "changed": 0}
+
+
+def reflection_stats() -> dict:
+    return dict(_REFLECT_STATS)
+
+
+async def _generate(
+    mode: str,
+    species: str,
+    user_text: str,
+    moisture: Optional[float],
+    opening_task: "Optional[asyncio.Task[str]]",
+) -> str:
+    """
+    최종 모드의 답장 생성 (답장 캐시를 먼저 확인)
+    - STRUCTURED_REPLY: 오프닝+본문 구조화 출력 1회
+    - 아니면 daily/hybrid는 공감 오프닝 완료 후 본문 생성
+    """
+    if reply_cache is not None:
+        cached = await reply_cache.get(species, mode, moisture, user_text)
+        if cached is not None:
+            return cached
+    reply = await _build(mode, species, user_text, moisture, opening_task)
+    if reply_cache is not None:
+        await reply_cache.put(species, mode, moisture, user_text, sanitize(reply))
+    return reply
+
+
+async def _build(
+    mode: str,
+    species: str,
+    user_text: str,
+    moisture: Optional[float],
+    opening_task: "Optional[asyncio.Task[str]]",
+) -> str:
+    if settings.STRUCTURED_REPLY:
+        return await build_reply(mode, species, user_text, moisture)
+    if mode == "plant":
+        return await build_plant(species, user_text, moisture)
+    # 추측 생성이 취소돼도 공유 중인 오프닝 호출은 살려 둠 (None이면 빌더가 직접 생성)
+    opening = await asyncio.shield(opening_task) if opening_task is not None else None
+    if mode == "daily":
+        return await build_daily(species, user_text, opening)
+    return await build_hybrid(species, user_text, moisture, opening)
+
+
+async def _reflect(user_text: str, first_mode: str, moisture: Optional[float]) -> str:
+    if reply_cache is not None:
+        cached = reply_cache.get_mode(first_mode, moisture, user_text)
+        if cached is not None:
+            return cached
+    try:
+        mode = await reflect_mode(user_text, first_mode, moisture)
+        if reply_cache is not None:
+            reply_cache.put_mode(first_mode, moisture, user_text, mode)
+        return mode
+    except Exception as e:
+        # 리플렉션은 보조 단계라 호출 실패 시 1차 분류 유지
+        print(f"[LLM] reflect_mode 실패, 1차 모드 유지: {e}", flush=True)
+        return first_mode
+
+
+async def plant_talk(species: str, user_text: str, moisture: Optional[float] = None) -> TalkResult:
     """
-    대화 오케스트레이션:
-    1) 1차 분류(detect_mode)
-    2) 리플렉션으로 2차 감수(reflect_mode)
-    3) 최종 모드에 맞는 빌더 호출
+    대화 오케스트레이션 (비동기 호출 그래프):
+    1) 1차 분류(detect_mode, 로컬 규칙) → 모드 + 확신도
+    2) 확신도가 REFLECT_CONFIDENCE_THRESHOLD 이상이면 리플렉션 없이 1차 모드로 바로 생성
+    3) 애매한 구간이면 동시에 시작: 리플렉션(reflect_mode) / 1차 모드 답장 추측 생성
+       (STRUCTURED_REPLY=False면 공감 오프닝 호출도 함께 시작)
+    4) 리플렉션 결과가 1차 모드와 같으면 추측 생성 결과 사용,
+       다르면 추측 생성을 취소하고 최종 모드로 다시 생성 (오프닝은 재사용)
+    5) 쓰이지 않은 호출(plant 모드의 오프닝 등)은 취소
+
+    LLM 왕복은 순차 3회 → 보통 1~2회 분량의 대기 시간으로 줄어듭니다.
+    호출자가 취소되면(클라이언트 연결 끊김 등) 진행 중인 호출도 모두 취소됩니다.
     """
     species = species or DEFAULT_SPECIES
 
-    # 1차 분류 → 2차 리플렉션(보수적 수정; 파싱 실패 시 원래 모드 유지)
-    first_mode = detect_mode(user_text, moisture)
-    mode = reflect_mode(user_text, first_mode, moisture)
+    first_mode, confidence = detect_mode(user_text, moisture)
+    reflect = confidence < settings.REFLECT_CONFIDENCE_THRESHOLD
+    _REFLECT_STATS["reflected" if reflect else "skipped"] += 1
+
+    tasks: List[asyncio.Task] = []
+    opening_task = None
+    if not settings.STRUCTURED_REPLY and (reflect or first_mode != "plant"):
+        opening_task = asyncio.create_task(empathy_opening(user_text))
+        tasks.append(opening_task)
+    speculative = asyncio.create_task(_generate(first_mode, species, user_text, moisture, opening_task))
+    tasks.append(speculative)
 
+    try:
+        mode = first_mode
+        if reflect:
+            reflect_task = asyncio.create_task(_reflect(user_text, first_mode, moisture))
+            tasks.append(reflect_task)
+            mode = await reflect_task
+        if mode == first_mode:
+            raw = await speculative
+        else:
+            _REFLECT_STATS["changed"] += 1
+            speculative.cancel()
+            final = asyncio.create_task(_generate(mode, species, user_text, moisture, opening_task))
+            tasks.append(final)
+            raw = await final
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        # 취소/실패한 작업의 예외 회수
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    reply = sanitize(raw)
     if mode == "daily":
-        reply = sanitize(build_daily(species, user_text))
         return TalkResult(mode="daily", species=species, reply=reply)
 
-    if mode == "plant":
-        reply = sanitize(build_plant(species, user_text, moisture))
-        advice = judge_moisture_with_none(moisture)
-        return TalkResult(
-            mode="plant",
-            species=species,
-            state=advice.state,
-            reply=reply,
-        )
-
-    # hybrid
-    reply = sanitize(build_hybrid(species, user_text, moisture))
     advice = judge_moisture_with_none(moisture)
     return TalkResult(
-        mode="hybrid",
+        mode=mode,
         species=species,
         state=advice.state,
         reply=reply,
     )
 
 
-def talk_for_db(
+_END = object()
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?…])\s+")
+
+
+def _start_stream(mode: str, species: str, user_text: str, moisture: Optional[float]):
+    """답장 문장을 큐로 받아 두는 생성 작업 (리플렉션 결과 전까지는 내보내지 않음)"""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            cached = None
+            if reply_cache is not None:
+                cached = await reply_cache.get(species, mode, moisture, user_text)
+            if cached is not None:
+                for sentence in _SENTENCE_SPLIT.split(cached):
+                    queue.put_nowait(sentence)
+            else:
+                sentences = []
+                async for sentence in stream_reply(mode, species, user_text, moisture):
+                    sentences.append(sentence)
+                    queue.put_nowait(sentence)
+                if reply_cache is not None:
+                    await reply_cache.put(species, mode, moisture, user_text, " ".join(sentences))
+            queue.put_nowait(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            queue.put_nowait(e)
+
+    return asyncio.create_task(produce()), queue
+
+
+async def plant_talk_stream(
+    species: str, user_text: str, moisture: Optional[float] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    스트리밍 대화. 이벤트 순서:
+    {"event": "meta", mode, species, state} → {"event": "delta", text}... → {"event": "done", reply}
+
+    plant_talk과 같은 그래프를 따르되 본문은 stream_reply로 문장 단위 생성합니다.
+    리플렉션이 필요하면 1차 모드 답장을 미리 받아 두었다가 모드가 같으면 이어서 내보내고,
+    다르면 취소 후 최종 모드로 다시 생성합니다. 소비자가 중단하면 진행 중인 호출도 취소됩니다.
+    """
+    species = species or DEFAULT_SPECIES
+
+    first_mode, confidence = detect_mode(user_text, moisture)
+    reflect = confidence < settings.REFLECT_CONFIDENCE_THRESHOLD
+    _REFLECT_STATS["reflected" if reflect else "skipped"] += 1
+
+    producer, queue = _start_stream(first_mode, species, user_text, moisture)
+    tasks: List[asyncio.Task] = [producer]
+    try:
+        mode = first_mode
+        if reflect:
+            reflect_task = asyncio.create_task(_reflect(user_text, first_mode, moisture))
+            tasks.append(reflect_task)
+            mode = await reflect_task
+            if mode != first_mode:
+                _REFLECT_STATS["changed"] += 1
+                producer.cancel()
+                producer, queue = _start_stream(mode, species, user_text, moisture)
+                tasks.append(producer)
+
+        state = None if mode == "daily" else judge_moisture_with_none(moisture).state
+        yield {"event": "meta", "mode": mode, "species": species, "state": state}
+
+        sentences: List[str] = []
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            sentences.append(item)
+            yield {"event": "delta", "text": item}
+        yield {"event": "done", "reply": " ".join(sentences)}
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def talk_for_db(
     user_id: str,
     plant_id: int,
     plant_name: str,
@@ -69,7 +244,7 @@ def talk_for_db(
     DB 저장용 필드만 반환하는 헬퍼.
     ERD의 diary 테이블 구조에 맞춰 데이터를 반환합니다.
     """
-    result = plant_talk(species, user_content, moisture)
+    result = await plant_talk(species, user_content, moisture)
     
     return {
         "user_id": user_id,
@@ -0,0 +1,194 @@
+# src/postprocess.py
+"""
+LLM 출력 후처리 파이프라인 (품종별 규칙 사전 컴파일)
+
+SPECIES_META의 품종마다 1인칭 치환 규칙(품종명+조사, '이 식물은', '이 아이가' 등)과
+extra_tip 유출 제거 문자열을 임포트 시 한 번 컴파일해 둡니다. (메타에 없는 품종은 처음 쓸 때 컴파일)
+- 치환 규칙 전체를 하나로 합친 정규식으로 먼저 한 번 훑어, 걸리는 게 없는 문장(대부분)은 바로 통과
+- 걸리면 기존과 같은 순서로 규칙을 차례로 적용 (결과가 순서에 따라 달라지는 경우가 있어 순서 유지)
+- 문장 자르기는 필요한 개수까지만 split
+
+배치 후처리(finish)와 스트리밍 문장 후처리(chat_logic.SentenceStreamer)가 같은 규칙 객체를 쓰고,
+배치도 문장 단위로 보정해 스트리밍 문장을 이어 붙인 결과와 같습니다.
+동작은 eval/postprocess_golden.jsonl(기록된 출력)로 고정되어 있습니다: python eval_postprocess.py
+"""
+import re
+from typing import Dict, List, Pattern, Tuple
+
+from .species_meta import SPECIES_META, DEFAULT_SPECIES
+from .utils import sanitize
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# 모드별 (최대 문장 수, 최대 글자 수)
+FINISH_LIMITS = {"daily": (2, 100), "plant": (4, 350), "hybrid": (4, 300)}
+
+# 3인칭 지칭 → 1인칭 (품종명 규칙 다음에 이 순서대로 적용)
+FIRST_PERSON_FIX: List[Tuple[Pattern, str]] = [
+    (re.compile(r"(?:이 )?식물은"), "나는"),
+    (re.compile(r"(?:이 )?아이(?:가|는|도)?"), "나는"),
+    (re.compile(r"(?:그|이) 친구(?:가|는|도)?"), "나는"),
+]
+
+_FIRST_PERSON_RE = re.compile(r"\b(나|난|나는|내|내가)\b")
+_DROP_FIRST_PERSON_RE = re.compile(r"\b(나는|난|내가|내 )")
+_GREETING_RE = re.compile(r"^(안녕|안녕하세요|헬로|hello)[, ]+", flags=re.IGNORECASE)
+_GREETING_ONLY_RE = re.compile(r"^(안녕|안녕하세요|헬로|hello)[\s,.!?~]*$", flags=re.IGNORECASE)
+_SPACES_RE = re.compile(r"\s{2,}")
+_TIDY_RULES: List[Tuple[Pattern, str]] = [
+    # '나는야' → '나는'
+    (re.compile(r"나는야"), "나는"),
+    # 문장 시작부의 '나 나는', '나는 나는' 등 중복 제거
+    (re.compile(r"^(?:나\s+)?나는(?:\s+나는)+"), "나는"),
+    # '나는 안녕' → '안녕, 나는' (자연스럽게)
+    (re.compile(r"^나는\s+(안녕(?:하세요)?)([,!]?)\s*"), r"\1, 나는 "),
+]
+
+# 메타에 없는 품종(사용자 입력)은 이 개수까지만 보관
+_MAX_EXTRA_SPECIES = 256
+
+
+def has_first_person(s: str) -> bool:
+    return _FIRST_PERSON_RE.search(s) is not None
+
+
+def is_greeting_only(s: str) -> bool:
+    """인사말만 있는 문장 ('안녕!', 'hello~' 등)"""
+    return _GREETING_ONLY_RE.match(s.strip()) is not None
+
+
+def drop_first_person(s: str) -> str:
+    """사람 관점 문장(하이브리드 오프닝)에서 1인칭 제거"""
+    return _DROP_FIRST_PERSON_RE.sub("", s).strip()
+
+
+def tidy_korean(s: str) -> str:
+    if "나는" in s:  # 세 규칙 모두 '나는'이 있어야 걸림
+        for pat, rep in _TIDY_RULES:
+            s = pat.sub(rep, s)
+    # 공백 정리
+    return _SPACES_RE.sub(" ", s).strip()
+
+
+class SpeciesRewriter:
+    """품종 하나의 1인칭 보정 + extra_tip 유출 제거 규칙"""
+
+    def __init__(self, species: str, extra_tip: str = "") -> None:
+        self.species = species
+        self.extra_tip = extra_tip
+        self._rules: List[Tuple[Pattern, str]] = [
+            (re.compile(rf"{re.escape(species)}(?:이|가|는|도)?"), "나는"),
+            *FIRST_PERSON_FIX,
+        ]
+        # 치환 결과('나는')로는 새 일치가 생기지 않으므로, 원문에 아무 규칙도 안 걸리면 전부 생략 가능
+        self._any = re.compile("|".join(f"(?:{pat.pattern})" for pat, _ in self._rules))
+        self._leaks = (extra_tip, f"“{extra_tip}”", f"\"{extra_tip}\"", f"'{extra_tip}'") if extra_tip else ()
+
+    def rewrite(self, s: str) -> str:
+        """품종명/3인칭 지칭 → '나는'"""
+        if self._any.search(s) is None:
+            return s
+        for pat, rep in self._rules:
+            s = pat.sub(rep, s)
+        return s
+
+    def first_person(self, s: str) -> str:
+        """치환 후에도 1인칭이 없으면 '나는' 삽입 (인사말이 있으면 그 뒤에)"""
+        s = self.rewrite(s)
+        if not has_first_person(s):
+            m = _GREETING_RE.match(s)
+            if m:
+                s = s[:m.end()] + "나는 " + s[m.end():]
+            else:
+                s = "나는 " + s.lstrip()
+        return tidy_korean(s)
+
+    def strip_tip(self, s: str) -> str:
+        if not self.extra_tip:
+            return s
+        if self.extra_tip in s:  # 따옴표로 감싼 형태도 extra_tip을 포함
+            for leak in self._leaks:
+                s = s.replace(leak, "")
+        return _SPACES_RE.sub(" ", s).strip()
+
+
+def _default_tip(species: str) -> str:
+    return SPECIES_META.get(species, SPECIES_META[DEFAULT_SPECIES]).get("extra_tip", "")
+
+
+# 임포트 시 메타의 전 품종 컴파일
+_REWRITERS: Dict[str, SpeciesRewriter] = {species: SpeciesRewriter(species, _default_tip(species)) for species in SPECIES_META}
+
+
+def rewriter_for(species: str) -> SpeciesRewriter:
+    rewriter = _REWRITERS.get(species)
+    if rewriter is None:
+        rewriter = SpeciesRewriter(species, _default_tip(species))
+        if len(_REWRITERS) < len(SPECIES_META) + _MAX_EXTRA_SPECIES:
+            _REWRITERS[species] = rewriter
+    return rewriter
+
+
+def _clip(s: str, mode: str) -> str:
+    """최대 문장 수/글자 수로 자르기 (필요한 만큼만 split)"""
+    max_sentences, max_chars = FINISH_LIMITS[mode]
+    s = " ".join(SENTENCE_SPLIT.split(s, maxsplit=max_sentences)[:max_sentences])
+    if len(s) <= max_chars:
+        return s
+    if mode == "daily":
+        return s[:max_chars] + "…"
+    return s[:max_chars].rstrip() + "…"
+
+
+def finish_daily(raw: str) -> str:
+    return _clip(sanitize(raw), "daily")
+
+
+def _sentences(raw: str, species: str) -> List[str]:
+    """sanitize 후 문장 단위로 나누고 extra_tip 유출 제거 (빈 문장은 버림)"""
+    rewriter = rewriter_for(species)
+    parts = (rewriter.strip_tip(p) for p in SENTENCE_SPLIT.split(sanitize(raw)))
+    return [p for p in parts if p]
+
+
+def plant_pov(sentences: List[str], species: str) -> List[str]:
+    """
+    식물 1인칭 보정 (스트리밍과 같은 문장 단위)
+    첫 문장(인사말뿐이면 다음 문장까지)에 1인칭이 없을 때만 '나는' 삽입, 나머지는 치환만
+    """
+    if not sentences:
+        return []
+    rewriter = rewriter_for(species)
+    head = 2 if len(sentences) > 1 and is_greeting_only(sentences[0]) else 1
+    out = [rewriter.first_person(" ".join(sentences[:head]))]
+    out += [tidy_korean(rewriter.rewrite(p)) for p in sentences[head:]]
+    return [p for p in out if p]
+
+
+def finish_plant(raw: str, species: str) -> str:
+    s = " ".join(plant_pov(_sentences(raw, species), species))
+    return tidy_korean(_clip(s, "plant"))
+
+
+def hybrid_pov(text: str, species: str) -> str:
+    """첫 문장(사람 관점 오프닝)은 1인칭 제거, 나머지는 식물 1인칭"""
+    parts = _sentences(text, species)
+    if not parts:
+        return ""
+    first = tidy_korean(drop_first_person(parts[0]))
+    tail = " ".join(plant_pov(parts[1:], species))
+    s = (first + ("" if first.endswith(('.', '!', '?')) else ".") + (" " + tail if tail else "")).strip()
+    return tidy_korean(s)
+
+
+def finish_hybrid(raw: str, species: str) -> str:
+    return tidy_korean(_clip(hybrid_pov(raw, species), "hybrid"))
+
+
+def finish(mode: str, raw: str, species: str) -> str:
+    """모드별 배치 후처리 (생성된 답장 전체)"""
+    if mode == "daily":
+        return finish_daily(raw)
+    if mode == "plant":
+        return finish_plant(raw, species)
+    return finish_hybrid(raw, species)
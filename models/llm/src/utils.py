@@ -3,6 +3,8 @@ import re
 import random
 from typing import List, Optional
 
+from .lexicon import Hits, scan
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 밈 카탈로그: 의미/트리거/회피 조건
 #  - 퉁퉁퉁… 사후르: 브레인롯(Brainrot) 계열의 무의미/난장/템포업 훅.
@@ -27,14 +29,8 @@ MEME_SEEDS = [
 
 BANNED = ["병신","ㅄ","ㅂㅅ","씨발","ㅆㅂ","좆","지랄","멍청","루저"]
 
-# 상황별 트리거 키워드(정규식 일부 포함 가능)
-FOOD_WORDS = r"(먹|맛|배고프|밥|야식|점심|저녁|간식|치킨|피자|라면|카페|디저트|떡볶이|맛집|비주얼|사진|음식)"
-CRY_WORDS  = r"(울|눈물|펑펑|멘탈|버티|괜찮|힘들|위로|다독|침착|진정)"
-WOW_WORDS  = r"(헉|헐|대박|충격|와우|미쳤|엄청|어마어마|쏟아|폭발|신상|행사|혜택|할인|몰아|왕창)"
-BRAINROT_WORDS = r"(멘붕|현타|뇌절|멍|지루|집중안|아무말|정신없|혼돈|카혼란|카오스)"
-
-# 민감/엄숙 토픽: 밈 전면 회피
-SERIOUS_WORDS = r"(장례|상중|사망|부고|병원|중환자|수술|우울증|공황|상처|폭력|학대)"
+# 상황별 트리거/회피 단어는 src/lexicon.py에 범주별로 모아 오토마톤 하나로 매칭합니다.
+# MemeRule은 정규식 대신 범주 이름(예: "meme.food", "serious")을 참조합니다.
 
 
 class MemeRule:
@@ -47,57 +43,55 @@ class MemeRule:
                  base: float = 0.0):
         self.name = name
         self.meaning = meaning
-        self.triggers = [re.compile(p, re.I) for p in triggers]
-        self.avoid = [re.compile(p, re.I) for p in avoid_patterns]
+        self.triggers = list(triggers)
+        self.avoid = list(avoid_patterns)
         self.modes_allow = set(modes_allow) if modes_allow else None
         self.base = base
 
-    def score(self, text: str, mode: Optional[str]) -> float:
+    def score(self, text: str, mode: Optional[str], hits: Optional[Hits] = None) -> float:
+        """hits: lexicon.scan(text) 결과 (여러 룰을 채점할 때 한 번만 계산해 넘김)"""
         # 모드 제한
         if self.modes_allow and (mode not in self.modes_allow):
             return -1e9
+        if hits is None:
+            hits = scan(text)
         # 회피 조건
-        for pat in self.avoid:
-            if pat.search(text):
-                return -1e9
+        if any(category in hits for category in self.avoid):
+            return -1e9
         # 트리거 득점
-        s = self.base
-        for pat in self.triggers:
-            if pat.search(text):
-                s += 1.0
-        return s
+        return self.base + sum(1.0 for category in self.triggers if category in hits)
 
 
 MEME_CATALOG = [
     MemeRule(
         name="퉁퉁퉁퉁퉁퉁퉁 사후르",
         meaning="의미 없이 텐션 올리는 브레인롯 훅(난장/멍/지루함 깨기).",
-        triggers=[BRAINROT_WORDS, r"(반복|중독|퉁|둥둥|북소리)"],
-        avoid_patterns=[SERIOUS_WORDS, r"(사과|정중|사실관계|고충접수)"],
+        triggers=["meme.brainrot", "meme.beat"],
+        avoid_patterns=["serious", "meme.formal"],
         modes_allow=["daily","hybrid"],
         base=0.2,
     ),
     MemeRule(
         name="섹시푸드",
         meaning="비주얼/맛/식감/무드가 압도적인 음식에 감탄할 때.",
-        triggers=[FOOD_WORDS, r"(비주얼|탐난다|먹음직|군침)"],
-        avoid_patterns=[SERIOUS_WORDS],
+        triggers=["meme.food", "meme.food_visual"],
+        avoid_patterns=["serious"],
         modes_allow=["daily","hybrid"],  # 순수 plant 문맥에선 어색하므로 제한
         base=0.3,
     ),
     MemeRule(
         name="허거덩거덩스",
         meaning="놀라움/규모·양이 많음/혜택 큼을 과장해 유쾌하게 표현.",
-        triggers=[WOW_WORDS, r"(넘친|한가득|산더미|빽빽|우수수|쇄도)"],
-        avoid_patterns=[SERIOUS_WORDS],
+        triggers=["meme.wow", "meme.plenty"],
+        avoid_patterns=["serious"],
         modes_allow=["daily","hybrid","plant"],
         base=0.1,
     ),
     MemeRule(
         name="퀸 네버 크라이",
         meaning="‘침착/품위 유지’ 다짐. 울컥/멘탈 흔들릴 때 다독임.",
-        triggers=[CRY_WORDS, r"(기품|우아|퀸|여왕|품위)"],
-        avoid_patterns=[SERIOUS_WORDS, r"(타인비하|가스라이팅)"],
+        triggers=["meme.cry", "meme.grace"],
+        avoid_patterns=["serious", "meme.abuse"],
         modes_allow=["daily","hybrid"],
         base=0.5,
     ),
@@ -107,8 +101,8 @@ MEME_CATALOG = [
 MEME_BY_NAME = {m.name: m for m in MEME_CATALOG}
 
 
-def _serious(text: str) -> bool:
-    return re.search(SERIOUS_WORDS, text, flags=re.I) is not None
+def _serious(text: str, hits: Optional[Hits] = None) -> bool:
+    return "serious" in (scan(text) if hits is None else hits)
 
 
 def pick_memes(k: int = 1, text: Optional[str] = None, mode: Optional[str] = None) -> List[str]:
@@ -124,12 +118,13 @@ def pick_memes(k: int = 1, text: Optional[str] = None, mode: Optional[str] = Non
         return pool[:k]
 
     # 엄숙/민감 이슈면 밈 비사용(빈 목록) → 호출측에서 선택적으로 무시
-    if _serious(text):
+    hits = scan(text)  # 모든 룰이 같은 스캔 결과를 공유
+    if _serious(text, hits):
         return []
 
     scored = []
     for m in MEME_CATALOG:
-        s = m.score(text, mode)
+        s = m.score(text, mode, hits)
         scored.append((s, m.name))
 
     # 점수 0.5 이상만 “맥락 적합”으로 간주
@@ -153,16 +148,19 @@ def pick_memes(k: int = 1, text: Optional[str] = None, mode: Optional[str] = Non
     return names
 
 
+_EMOJI_RE = re.compile(r"[\u2600-\u27BF\U0001F300-\U0001FAFF]")
+
+
 def sanitize(text: str) -> str:
     s = text
     for bad in BANNED:
         s = s.replace(bad, "")
     # 이모지 1개만 남기기
-    emojis = re.findall(r"[\u2600-\u27BF\U0001F300-\U0001FAFF]", s)
+    emojis = _EMOJI_RE.findall(s)
     if len(emojis) > 1:
         keep, out = 1, []
         for ch in s:
-            if re.match(r"[\u2600-\u27BF\U0001F300-\U0001FAFF]", ch):
+            if _EMOJI_RE.match(ch):
                 if keep:
                     out.append(ch)
                     keep -= 1
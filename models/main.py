@@ -333,15 +333,21 @@ async def classify_disease(
         raise HTTPException(status_code=500, detail=f"병충해/질병 분류 중 오류가 발생했습니다: {str(e)}")
 
 # -------------------------- LLM 처리 API
-from llm.src.orchestrator import plant_talk
+from llm.src.orchestrator import plant_talk, plant_talk_stream, reflection_stats
+from llm.src.cache import reply_cache
+from llm.src.gateway import gateway as llm_gateway, llm_priority
+from llm.src.loop_monitor import loop_monitor
+from fastapi.responses import StreamingResponse
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 
 class LLMRequest(BaseModel):
     species: str
     user_text: str
     moisture: Optional[float] = None
+    # LLM 게이트웨이 우선순위: 대화(chat)가 일기 답장(diary) 같은 백그라운드 호출보다 먼저 처리됨
+    priority: Literal["chat", "diary"] = "chat"
 
 @app.post("/llm")
 async def process_with_llm(request: LLMRequest):
@@ -349,7 +355,8 @@ async def process_with_llm(request: LLMRequest):
     LLM을 사용한 식물 대화 처리
     """
     try:
-        result = plant_talk(request.species, request.user_text, request.moisture)
+        llm_priority.set(request.priority)
+        result = await plant_talk(request.species, request.user_text, request.moisture)
         
         return JSONResponse(content={
             'success': True,
@@ -367,7 +374,43 @@ async def process_with_llm(request: LLMRequest):
             'error': 'llm_processing_error'
         })
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/llm/stream")
+async def process_with_llm_stream(request: LLMRequest):
+    """
+    LLM 식물 대화 스트리밍 (Server-Sent Events)
+    이벤트: meta(mode/species/state) → delta(후처리된 문장) ... → done(reply 전체), 실패 시 error
+    """
+    async def events():
+        llm_priority.set(request.priority)
+        try:
+            async for item in plant_talk_stream(request.species, request.user_text, request.moisture):
+                event = item.pop("event")
+                yield _sse(event, item)
+        except Exception as e:
+            yield _sse("error", {
+                "message": f"LLM 처리 중 오류가 발생했습니다: {str(e)}",
+                "error": "llm_processing_error"
+            })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # -------------------------- 헬스 체크 API
+@app.on_event("startup")
+async def start_loop_monitor():
+    # 이벤트 루프 지연 측정 (부하 테스트 시 동기 호출로 루프가 막히는지 확인)
+    loop_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
 @app.get("/")
 async def root():
     return {"message": "Plant AI API is running!"}
@@ -384,6 +427,10 @@ async def health_check():
             "llm": False  # 비활성화됨
         },
         "device": device,
+        "llm_reflection": reflection_stats(),  # 확신도 게이트로 생략된 리플렉션 호출 수
+        "llm_cache": reply_cache.snapshot() if reply_cache else None,
+        "llm_gateway": llm_gateway.snapshot() if llm_gateway else None,  # 한도/대기열, 프롬프트 종류별 토큰·지연
+        "event_loop": loop_monitor.snapshot(),
         "available_classes": {
             "species": CLASSES,  # 새로운 모델 구조 사용
             "health": ["healthy", "unhealthy", "diseased"] if health_model is not None else []
@@ -394,9 +441,19 @@ async def health_check():
             "POST /health - 건강 상태 분류", 
             "POST /disease - 병충해/질병 분류 (통합)",
             "POST /llm - 식물 관련 질문 답변 (비활성화됨)",
-            "GET /health - API 상태 확인"
+            "POST /llm/stream - 식물 답변 스트리밍 (SSE)",
+            "GET /health - API 상태 확인",
+            "POST /health/reset - 부하 테스트용 지표 초기화"
         ]
     }
+
+@app.post("/health/reset")
+async def reset_runtime_stats():
+    """부하 테스트 구간 측정용: 이벤트 루프 지연/LLM 게이트웨이 지표 초기화"""
+    loop_monitor.reset()
+    if llm_gateway:
+        llm_gateway.reset_stats()
+    return {"ok": True}
     
 
 # -------------------------- 습도 코치 API